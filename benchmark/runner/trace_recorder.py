@@ -195,26 +195,39 @@ class BenchmarkTraceRecorder:
                             if isinstance(value, int):
                                 turn_event[key] = value
 
-                self._emit_event(turn_event)
+                progress = entry.get("progress")
+                if isinstance(progress, dict):
+                    for key, value in progress.items():
+                        if isinstance(value, int):
+                            turn_event[key] = value
 
                 tool_results = entry.get("tool_results")
                 if not isinstance(tool_results, list):
+                    self._emit_event(turn_event)
                     continue
-                for tool_result in tool_results:
-                    if not isinstance(tool_result, dict):
-                        continue
-                    self._emit_event(
-                        {
-                            **base,
-                            "kind": "tool_call",
-                            "turn": turn,
-                            "tool_call_id": tool_result.get("id"),
-                            "tool_name": tool_result.get("name"),
-                            "latency_ms": tool_result.get("latency_ms"),
-                            "success": tool_result.get("success"),
-                        }
+                tool_results = [item for item in tool_results if isinstance(item, dict)]
+                # memo_hit is only present when SEARCH_TOOL_MEMO is enabled.
+                if any("memo_hit" in item for item in tool_results):
+                    turn_event["memo_hits"] = sum(
+                        1 for item in tool_results if item.get("memo_hit")
                     )
 
+                self._emit_event(turn_event)
+
+                for tool_result in tool_results:
+                    tool_event: dict[str, Any] = {
+                        **base,
+                        "kind": "tool_call",
+                        "turn": turn,
+                        "tool_call_id": tool_result.get("id"),
+                        "tool_name": tool_result.get("name"),
+                        "latency_ms": tool_result.get("latency_ms"),
+                        "success": tool_result.get("success"),
+                    }
+                    if "memo_hit" in tool_result:
+                        tool_event["memo_hit"] = bool(tool_result["memo_hit"])
+                    self._emit_event(tool_event)
+
         self._emit_event(
             build_search_complete_event(
                 case_id=case_id,
@@ -140,3 +140,77 @@ def test_trace_recorder_writes_trace_meta_and_events(tmp_path: Path) -> None:
         "tool_call",
         "search_complete",
     ]
+
+
+def test_trace_recorder_reports_tool_memo_hits(tmp_path: Path) -> None:
+    recorder = BenchmarkTraceRecorder(
+        enabled=True,
+        experiment_root=tmp_path / "experiment",
+        run_id="run_1",
+        search_mode="agentic",
+    )
+    turns_log = [
+        {
+            "turn": 2,
+            "llm_latency_ms": 8.0,
+            "tool_results": [
+                {
+                    "id": "a",
+                    "name": "grep_search",
+                    "latency_ms": 0.0,
+                    "success": True,
+                    "memo_hit": True,
+                },
+                {
+                    "id": "b",
+                    "name": "view_file",
+                    "latency_ms": 2.1,
+                    "success": True,
+                    "memo_hit": False,
+                },
+                {"id": "c", "name": "bash", "latency_ms": 5.0, "success": True},
+            ],
+        }
+    ]
+    benchmark_result = BenchmarkResult(
+        case_id="case_1",
+        repo="example/repo",
+        completed=True,
+        returned_files_count=0,
+        ground_truth_files_count=1,
+        file_recall=0.0,
+        file_precision=0.0,
+        line_coverage=0.0,
+        line_precision_matched=0.0,
+        context_line_coverage=0.0,
+        context_line_precision_matched=0.0,
+        function_hit_rate=0.0,
+        functions_hit=0,
+        functions_total=1,
+        turns_used=2,
+        latency_s=0.1,
+        search_mode="agentic",
+    )
+
+    recorder.start_run()
+    try:
+        recorder.write_case_events(
+            case_id="case_1",
+            repo="example/repo",
+            benchmark_result=benchmark_result,
+            result={},
+            turns_log=turns_log,
+        )
+    finally:
+        recorder.finish_run()
+
+    assert recorder.events_path is not None
+    events = [
+        json.loads(line) for line in recorder.events_path.read_text(encoding="utf-8").splitlines()
+    ]
+    turn_event = next(event for event in events if event["kind"] == "search_turn")
+    assert turn_event["memo_hits"] == 1
+    tool_events = {event["tool_call_id"]: event for event in events if event["kind"] == "tool_call"}
+    assert tool_events["a"]["memo_hit"] is True
+    assert tool_events["b"]["memo_hit"] is False
+    assert "memo_hit" not in tool_events["c"]
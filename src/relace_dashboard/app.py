@@ -17,7 +17,9 @@ from .log_reader import (
     INSIGHTS_KINDS,
     filter_event,
     get_log_path,
+    iter_log_events,
     parse_log_event,
+    read_trace_events,
 )
 from .widgets import (
     CompactHeader,
@@ -50,6 +52,8 @@ class LogViewerApp(App[None]):
         Binding("right,l", "next_tab", "Next Tab"),
         # Time shortcuts
         Binding("t", "toggle_time", "Time"),
+        # Full LLM trace of the selected (or most recent) search
+        Binding("v", "view_trace", "Trace"),
     ]
 
     _TAB_ORDER = ["all", "apply", "search", "insights", "errors"]
@@ -93,6 +97,9 @@ class LogViewerApp(App[None]):
         # When reloading, pause tailing to avoid interleaving/duplicates.
         self._reload_in_progress = False
 
+        # Most recent trace_id seen, used by the trace view when nothing is selected.
+        self._last_trace_id: str | None = None
+
     def compose(self) -> ComposeResult:
         yield CompactHeader(id="header")
         with ContentSwitcher(initial="log-all"):
@@ -135,6 +142,15 @@ class LogViewerApp(App[None]):
                 max_lines=10000,
                 wrap=True,
             )
+
+            # 6. TRACE (opened on demand, not part of the tab cycle)
+            yield RichLog(
+                highlight=True,
+                markup=True,
+                id="log-trace",
+                max_lines=10000,
+                wrap=True,
+            )
         yield Footer()
 
     async def on_mount(self) -> None:
@@ -164,6 +180,8 @@ class LogViewerApp(App[None]):
     def _route_event(self, event: dict[str, Any]) -> None:
         """Route a single event into pending buffers (rendered later in batches)."""
         kind = event.get("kind", "")
+        if event.get("trace_id"):
+            self._last_trace_id = str(event["trace_id"])
 
         # Stats
         self._stats_total += 1
@@ -286,6 +304,40 @@ class LogViewerApp(App[None]):
 
         return line
 
+    def _format_trace_event(self, event: dict[str, Any]) -> Text:
+        kind = event.get("kind", "unknown")
+        ts = event.get("timestamp", "")[11:23]
+
+        line = Text()
+        line.append(f"{ts} ", style="dim white")
+        line.append(f"{kind:<16}", style=self._get_kind_style(kind))
+
+        if kind == "llm_request":
+            messages = event.get("messages") or []
+            line.append(f" {event.get('model', '')}", style="bold cyan")
+            line.append(f" msgs:{len(messages)}", style="dim")
+            if messages and isinstance(messages[-1], dict):
+                content = str(messages[-1].get("content") or "")
+                preview = " ".join(content.split())[:120]
+                if preview:
+                    line.append(f' "{preview}"', style="italic white")
+        elif kind == "llm_response":
+            response = event.get("response")
+            usage = response.get("usage") if isinstance(response, dict) else None
+            if isinstance(usage, dict):
+                line.append(
+                    f" tok:{usage.get('prompt_tokens', 0)}+{usage.get('completion_tokens', 0)}",
+                    style="dim",
+                )
+        elif "error" in kind:
+            line.append(f" {event.get('error', '')}", style="bold red")
+        elif event.get("tool_name"):
+            line.append(f" {event['tool_name']}")
+
+        if "latency_ms" in event:
+            line.append(f" ({event['latency_ms'] / 1000.0:.3f}s)", style="dim")
+        return line
+
     def _get_kind_style(self, kind: str) -> str:
         if "error" in kind:
             return "bold red reversed"
@@ -467,42 +519,53 @@ class LogViewerApp(App[None]):
         try:
             self._reset_view_state()
 
-            log_path = get_log_path()
-            if not log_path.exists():
-                return
-
-            # Snapshot size to avoid duplicating lines written while reloading (tail will pick them up).
-            snapshot_size = log_path.stat().st_size
-            bytes_read = 0
+            # Seeks to the time range in each (rotated) log and reads each file up to
+            # its current size; lines written while reloading are picked up by tail.
             matched = 0
-            scanned = 0
-
-            # Stream + yield so the UI can keep responding while loading lots of events.
-            with open(log_path, "rb") as f:
-                while bytes_read < snapshot_size and matched < 1_000_000:
-                    line_bytes = f.readline()
-                    if not line_bytes:
-                        break
-                    bytes_read += len(line_bytes)
-                    scanned += 1
-
-                    line = line_bytes.decode("utf-8", errors="replace")
-                    event = parse_log_event(line)
-                    if event and filter_event(
-                        event,
-                        enabled_kinds=None,
-                        time_start=self._time_start,
-                        time_end=self._time_end,
-                    ):
-                        self._route_event(event)
-                        matched += 1
-                        if matched % 5000 == 0:
-                            await asyncio.sleep(0)
-                    if scanned % 5000 == 0:
-                        await asyncio.sleep(0)
+            for event in iter_log_events(time_start=self._time_start, time_end=self._time_end):
+                self._route_event(event)
+                matched += 1
+                if matched >= 1_000_000:
+                    break
+                # Yield so the UI can keep responding while loading lots of events.
+                if matched % 5000 == 0:
+                    await asyncio.sleep(0)
         finally:
             self._reload_in_progress = False
 
+    def _selected_trace_id(self) -> str | None:
+        switcher = self.query_one(ContentSwitcher)
+        if switcher.current != "tree-search":
+            return None
+        node = self.query_one("#tree-search", SearchTree).cursor_node
+        while node is not None:
+            if node.data and node.data.get("trace_id"):
+                return str(node.data["trace_id"])
+            node = node.parent
+        return None
+
+    async def action_view_trace(self) -> None:
+        trace_id = self._selected_trace_id() or self._last_trace_id
+        if trace_id is None:
+            self.notify("No trace to show yet", title="Trace", severity="warning")
+            return
+
+        events = await asyncio.to_thread(read_trace_events, trace_id)
+        if not events:
+            self.notify(
+                f"No trace events for {trace_id} (requires MCP_LOGGING=full)",
+                title="Trace",
+                severity="warning",
+            )
+            return
+
+        trace_log = self.query_one("#log-trace", RichLog)
+        trace_log.clear()
+        trace_log.write(Text(f"Trace {trace_id} ({len(events)} events)", style="bold"))
+        for event in events:
+            trace_log.write(self._format_trace_event(event))
+        self.query_one(ContentSwitcher).current = "log-trace"
+
     def action_filter(self, filter_type: str) -> None:
         header = self.query_one("#header", CompactHeader)
         header.set_filter_by_key(filter_type)
@@ -1,8 +1,10 @@
+import itertools
 import json
-from collections.abc import Callable
+import os
+from collections.abc import Callable, Iterator
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from platformdirs import user_state_dir
 
@@ -55,6 +57,7 @@ LSP_KINDS = frozenset(
         "lsp_request_error",
         "lsp_client_created",
         "lsp_client_evicted",
+        "lsp_client_prewarmed",
     }
 )
 TOOLING_KINDS = frozenset(
@@ -84,11 +87,58 @@ ERROR_KINDS = frozenset(
 )
 ALL_KINDS = APPLY_KINDS | SEARCH_KINDS | BACKEND_KINDS | CLOUD_KINDS | LSP_KINDS | TOOLING_KINDS
 
+_READ_CHUNK_BYTES = 64 * 1024
+
 
 def get_log_path() -> Path:
     return Path(user_state_dir("relace", appauthor=False)) / "relace.log"
 
 
+def get_trace_path() -> Path:
+    """Trace file the MCP server writes to (settings.TRACE_PATH)."""
+    from relace_mcp.config import settings
+
+    return Path(settings.TRACE_PATH)
+
+
+def get_trace_files() -> list[Path]:
+    """Return rotated plain trace files oldest first, followed by the live one."""
+    trace_path = get_trace_path()
+    files = sorted(
+        p for p in trace_path.parent.glob(f"{trace_path.stem}.*{trace_path.suffix}") if p.is_file()
+    )
+    if trace_path.exists():
+        files.append(trace_path)
+    return files
+
+
+def read_trace_events(trace_id: str) -> list[dict[str, Any]]:
+    """Return all trace events for trace_id, oldest first.
+
+    Uses the segment index when MCP_TRACE_SEGMENTS wrote compressed
+    segments, otherwise scans the plain trace file and its rotations.
+    """
+    trace_path = get_trace_path()
+    from relace_mcp.observability.segments import INDEX_SUFFIX, read_trace
+
+    if any(trace_path.parent.glob(f"{trace_path.stem}.*{INDEX_SUFFIX}")):
+        return read_trace(trace_path, trace_id)
+
+    events = []
+    for path in get_trace_files():
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if trace_id not in line:
+                        continue
+                    event = parse_log_event(line)
+                    if event and event.get("trace_id") == trace_id:
+                        events.append(event)
+        except OSError:
+            continue
+    return events
+
+
 def parse_log_event(line: str) -> dict[str, Any] | None:
     line = line.strip()
     if not line:
@@ -141,6 +191,125 @@ def filter_event(
     return True
 
 
+def get_log_files() -> list[Path]:
+    """Return rotated logs oldest first, followed by the live log."""
+    log_path = get_log_path()
+    files = sorted(
+        p for p in log_path.parent.glob(f"{log_path.stem}.*{log_path.suffix}") if p.is_file()
+    )
+    if log_path.exists():
+        files.append(log_path)
+    return files
+
+
+def _line_timestamp(line: bytes) -> datetime | None:
+    event = parse_log_event(line.decode("utf-8", errors="replace"))
+    return get_event_timestamp(event) if event else None
+
+
+def _find_offset(f: BinaryIO, end: int, target: datetime, *, after: bool = False) -> int:
+    """Binary search for the first line in f[:end] timestamped at/after target.
+
+    With after=True, lines timestamped exactly at target are skipped too.
+    Assumes timestamps are (mostly) ascending, as appended logs are; lines
+    without a timestamp never move the bound.
+    """
+    lo, hi = 0, end
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if mid == 0:
+            start = 0
+        else:
+            f.seek(mid - 1)
+            f.readline()
+            start = f.tell()
+        pos = start
+        ts = None
+        line = b""
+        while pos < hi:
+            f.seek(pos)
+            line = f.readline()
+            ts = _line_timestamp(line)
+            if ts is not None:
+                break
+            pos += len(line)
+        if ts is None:
+            hi = mid
+        elif ts < target or (after and ts == target):
+            lo = pos + len(line)
+        else:
+            hi = start
+    return lo
+
+
+def _iter_lines(f: BinaryIO, start: int, end: int) -> Iterator[bytes]:
+    f.seek(start)
+    pos = start
+    while pos < end:
+        line = f.readline()
+        if not line:
+            break
+        pos += len(line)
+        yield line
+
+
+def _iter_lines_reverse(f: BinaryIO, start: int, end: int) -> Iterator[bytes]:
+    pos = end
+    tail = b""
+    while pos > start:
+        size = min(_READ_CHUNK_BYTES, pos - start)
+        pos -= size
+        f.seek(pos)
+        lines = (f.read(size) + tail).split(b"\n")
+        tail = lines.pop(0)
+        for line in reversed(lines):
+            if line:
+                yield line
+    if tail:
+        yield tail
+
+
+def iter_log_events(
+    *,
+    enabled_kinds: set[str] | None = None,
+    ignored_tools: set[str] | None = None,
+    time_start: datetime | None = None,
+    time_end: datetime | None = None,
+    reverse: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Lazily yield matching events across rotated logs and the live log.
+
+    The time range is located by binary search over byte offsets in each
+    file, so only lines inside it are read and parsed. With reverse=True
+    events come newest first. Each file is read up to its size when opened;
+    later appends are left to tail_log.
+    """
+    files = get_log_files()
+    if reverse:
+        files.reverse()
+    for path in files:
+        try:
+            f = open(path, "rb")
+        except OSError:
+            continue
+        with f:
+            end = os.fstat(f.fileno()).st_size
+            start = _find_offset(f, end, time_start) if time_start else 0
+            if time_end and start < end:
+                end = _find_offset(f, end, time_end, after=True)
+            lines = _iter_lines_reverse(f, start, end) if reverse else _iter_lines(f, start, end)
+            for line in lines:
+                event = parse_log_event(line.decode("utf-8", errors="replace"))
+                if event and filter_event(
+                    event,
+                    enabled_kinds=enabled_kinds,
+                    ignored_tools=ignored_tools,
+                    time_start=time_start,
+                    time_end=time_end,
+                ):
+                    yield event
+
+
 def read_log_events(
     *,
     enabled_kinds: set[str] | None = None,
@@ -149,24 +318,20 @@ def read_log_events(
     time_end: datetime | None = None,
     max_events: int = 1000,
 ) -> list[dict[str, Any]]:
-    log_path = get_log_path()
-    if not log_path.exists():
-        return []
-
-    events = []
-    with open(log_path, encoding="utf-8", errors="replace") as f:
-        for line in f:
-            event = parse_log_event(line)
-            if event and filter_event(
-                event,
+    """Return the most recent max_events matching events, oldest first."""
+    events = list(
+        itertools.islice(
+            iter_log_events(
                 enabled_kinds=enabled_kinds,
                 ignored_tools=ignored_tools,
                 time_start=time_start,
                 time_end=time_end,
-            ):
-                events.append(event)
-                if len(events) >= max_events:
-                    break
+                reverse=True,
+            ),
+            max_events,
+        )
+    )
+    events.reverse()
     return events
 
 
@@ -22,6 +22,7 @@ TOOL_ABBREVIATIONS = {
     "grep_search": "grep",
     "view_file": "read",
     "fast_apply": "apply",
+    "fast_apply_batch": "batch",
     "report_back": "rep",
     "find_symbol": "sym",
     "view_directory": "ls",
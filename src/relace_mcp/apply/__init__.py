@@ -1,3 +1,4 @@
+from .batch import apply_batch_logic
 from .core import apply_file_logic
 
-__all__ = ["apply_file_logic"]
+__all__ = ["apply_batch_logic", "apply_file_logic"]
@@ -0,0 +1,384 @@
+import asyncio
+import difflib
+import logging
+import uuid
+from collections.abc import Mapping, Sequence
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from ..clients.apply import ApplyLLMClient
+from ..config import settings as _settings
+from ..encoding import atomic_write, get_project_encoding
+from ..observability import get_trace_id
+from ..observability import tool_name as tool_name_ctx
+from . import error_responses, snippet
+from . import logging as apply_logging
+from .core import (
+    ApplyContext,
+    MergedEdit,
+    _content_conflict,
+    _exception_result,
+    _get_path_lock,
+    _log_merged_write,
+    _merge_existing_file,
+    _precheck_existing_file,
+    _resolve_path,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _FileGroup:
+    """All edits in a batch that target one resolved file."""
+
+    ctx: ApplyContext
+    resolved_path: Path
+    file_exists: bool
+    file_size: int
+    snippets: list[str] = field(default_factory=list)
+    instructions: list[str] = field(default_factory=list)
+    # Filled in by the merge phase.
+    merged: MergedEdit | None = None
+    result: dict[str, Any] | None = None
+
+    @property
+    def edit_snippet(self) -> str:
+        if not self.file_exists:
+            return self.snippets[0]
+        return snippet.join_edit_snippets(self.snippets, str(self.resolved_path))
+
+
+def _labeled_diff(path: str, before: str, after: str) -> str:
+    return "".join(
+        difflib.unified_diff(
+            before.splitlines(keepends=True),
+            after.splitlines(keepends=True),
+            fromfile=f"a/{path}",
+            tofile=f"b/{path}",
+        )
+    )
+
+
+def _relabel_diff(path: str, diff: str) -> str:
+    """Swap the before/after headers of a merge diff for a/ and b/ path labels."""
+    _, _, body = diff.partition("\n+++ after\n")
+    return f"--- a/{path}\n+++ b/{path}\n{body}"
+
+
+def _batch_error(
+    code: str,
+    message: str,
+    trace_id: str,
+    started_at: datetime,
+    results: list[dict[str, Any]],
+) -> dict[str, Any]:
+    return {
+        "status": "error",
+        "code": code,
+        "message": message,
+        "trace_id": trace_id,
+        "timing_ms": int((datetime.now(UTC) - started_at).total_seconds() * 1000),
+        "results": results,
+    }
+
+
+def _group_edits(
+    edits: Sequence[Mapping[str, Any]],
+    instruction: str | None,
+    base_dir: str | None,
+    extra_paths: Sequence[str],
+    trace_id: str,
+    started_at: datetime,
+) -> tuple[list[_FileGroup], list[dict[str, Any]]]:
+    """Resolve every edit and group them by target file, preserving order.
+
+    Returns:
+        (groups, errors) where errors holds one entry per invalid edit.
+    """
+    groups: dict[Path, _FileGroup] = {}
+    errors: list[dict[str, Any]] = []
+    for edit in edits:
+        file_path = str(edit.get("path") or "")
+        edit_instruction = edit.get("instruction") or instruction
+        ctx = ApplyContext(
+            trace_id=trace_id,
+            started_at=started_at,
+            file_path=file_path,
+            instruction=edit_instruction,
+        )
+        edit_snippet = snippet.normalize_edit_snippet(
+            str(edit.get("edit_snippet") or ""), file_path
+        )
+        if not file_path or not edit_snippet.strip():
+            errors.append(
+                error_responses.recoverable_error(
+                    "INVALID_INPUT",
+                    "Each edit needs a path and a non-empty edit_snippet",
+                    file_path,
+                    edit_instruction,
+                    trace_id,
+                    ctx.elapsed_ms(),
+                )
+            )
+            continue
+
+        resolved = _resolve_path(file_path, base_dir, ctx, extra_paths=extra_paths)
+        if isinstance(resolved, dict):
+            errors.append(resolved)
+            continue
+        resolved_path, file_exists, file_size = resolved
+
+        group = groups.get(resolved_path)
+        if group is None:
+            group = _FileGroup(ctx, resolved_path, file_exists, file_size)
+            groups[resolved_path] = group
+        elif not file_exists:
+            errors.append(
+                error_responses.recoverable_error(
+                    "INVALID_INPUT",
+                    "New file creation accepts a single edit per path; "
+                    "provide the complete file content in one edit_snippet.",
+                    file_path,
+                    edit_instruction,
+                    trace_id,
+                    ctx.elapsed_ms(),
+                )
+            )
+            continue
+        group.snippets.append(edit_snippet)
+        if edit_instruction and edit_instruction not in group.instructions:
+            group.instructions.append(edit_instruction)
+
+    for group in groups.values():
+        group.ctx.instruction = "; ".join(group.instructions) or None
+    return list(groups.values()), errors
+
+
+async def _merge_group(
+    group: _FileGroup, backend: ApplyLLMClient, slots: asyncio.Semaphore
+) -> None:
+    ctx = group.ctx
+    edit_snippet = group.edit_snippet
+    try:
+        if not group.file_exists:
+            if snippet.contains_truncation_markers(edit_snippet):
+                group.result = error_responses.recoverable_error(
+                    "INVALID_INPUT",
+                    "New file creation does not support truncation markers. "
+                    "Provide the complete file content.",
+                    ctx.file_path,
+                    ctx.instruction,
+                    ctx.trace_id,
+                    ctx.elapsed_ms(),
+                )
+            return
+
+        precheck_error = _precheck_existing_file(
+            ctx, group.resolved_path, edit_snippet, group.file_size
+        )
+        if precheck_error is not None:
+            group.result = precheck_error
+            return
+        async with slots:
+            merged = await _merge_existing_file(
+                ctx,
+                backend,
+                group.resolved_path,
+                edit_snippet,
+                group.file_size,
+                tool="fast_apply_batch",
+            )
+        if isinstance(merged, dict):
+            group.result = merged
+        else:
+            group.merged = merged
+    except Exception as exc:
+        apply_logging.log_apply_error(
+            ctx.trace_id, ctx.started_at, ctx.file_path, edit_snippet, ctx.instruction, exc
+        )
+        group.result = _exception_result(ctx, exc)
+
+
+def _commit_groups(groups: list[_FileGroup]) -> _FileGroup | None:
+    """Write every merged file, restoring already-written files if one write fails.
+
+    Returns:
+        The group whose write failed (with its error result set), or None.
+    """
+    written: list[_FileGroup] = []
+    for group in groups:
+        try:
+            if group.merged is not None:
+                merged = group.merged
+                atomic_write(merged.resolved_path, merged.merged_code, encoding=merged.encoding)
+            elif not group.file_exists:
+                group.resolved_path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write(
+                    group.resolved_path,
+                    group.edit_snippet,
+                    encoding=get_project_encoding() or "utf-8",
+                )
+            else:
+                continue
+        except OSError as exc:
+            group.result = _exception_result(group.ctx, exc)
+            _rollback(written)
+            return group
+        written.append(group)
+    return None
+
+
+def _rollback(written: list[_FileGroup]) -> None:
+    for group in reversed(written):
+        try:
+            if group.merged is not None:
+                merged = group.merged
+                atomic_write(merged.resolved_path, merged.initial_code, encoding=merged.encoding)
+            else:
+                group.resolved_path.unlink(missing_ok=True)
+        except OSError as exc:
+            logger.error(
+                "[%s] Rollback failed for %s: %s", group.ctx.trace_id, group.resolved_path, exc
+            )
+
+
+async def apply_batch_logic(
+    backend: ApplyLLMClient,
+    edits: Sequence[Mapping[str, Any]],
+    instruction: str | None,
+    base_dir: str | None,
+    *,
+    extra_paths: Sequence[str] = (),
+) -> dict[str, Any]:
+    """Core logic for fast_apply_batch.
+
+    Edits are grouped by target file (several snippets for one file become a
+    single merge), merged concurrently under APPLY_BATCH_MAX_CONCURRENCY, and
+    written only if every file merged and validated cleanly. Path locks for
+    all targets are taken in sorted order, so batches never deadlock with each
+    other or with single-file fast_apply calls.
+
+    Args:
+        backend: Apply backend instance.
+        edits: Items with `path`, `edit_snippet` and optional `instruction`.
+        instruction: Default instruction for edits that do not set their own.
+        base_dir: Base directory restriction. If None, only absolute paths are accepted.
+        extra_paths: Additional allowed directories.
+
+    Returns:
+        A dict with status, trace_id, timing_ms, per-file results, and a
+        combined unified diff on success.
+    """
+    trace_id = get_trace_id() if tool_name_ctx.get() else str(uuid.uuid4())[:8]
+    started_at = datetime.now(UTC)
+
+    if not edits:
+        return _batch_error("INVALID_INPUT", "edits cannot be empty", trace_id, started_at, [])
+
+    groups, errors = _group_edits(edits, instruction, base_dir, extra_paths, trace_id, started_at)
+    if errors:
+        return _batch_error(
+            "BATCH_ABORTED",
+            f"{len(errors)} of {len(edits)} edits are invalid; no files were changed.",
+            trace_id,
+            started_at,
+            errors,
+        )
+
+    slots = asyncio.Semaphore(_settings.APPLY_BATCH_MAX_CONCURRENCY)
+    async with AsyncExitStack() as stack:
+        for group in sorted(groups, key=lambda g: str(g.resolved_path)):
+            await stack.enter_async_context(_get_path_lock(str(group.resolved_path)))
+
+        await asyncio.gather(*(_merge_group(group, backend, slots) for group in groups))
+
+        # Re-check every target before the first write so a late conflict
+        # cannot leave the batch half applied.
+        for group in groups:
+            if group.result is not None:
+                continue
+            if group.merged is not None:
+                group.result = _content_conflict(group.ctx, group.merged)
+            elif not group.file_exists and group.resolved_path.exists():
+                group.result = error_responses.recoverable_error(
+                    "FILE_EXISTS",
+                    f"File already exists (created by concurrent operation): {group.ctx.file_path}",
+                    group.ctx.file_path,
+                    group.ctx.instruction,
+                    trace_id,
+                    group.ctx.elapsed_ms(),
+                )
+
+        failed = [g for g in groups if g.result is not None and g.result.get("status") == "error"]
+        if failed:
+            for group in failed:
+                result = group.result or {}
+                apply_logging.log_apply_recoverable_error(
+                    trace_id,
+                    started_at,
+                    group.ctx.file_path,
+                    group.edit_snippet,
+                    group.ctx.instruction,
+                    error_code=str(result.get("code") or "") or None,
+                    message=str(result.get("message") or ""),
+                )
+            return _batch_error(
+                "BATCH_ABORTED",
+                f"{len(failed)} of {len(groups)} files failed; no files were changed.",
+                trace_id,
+                started_at,
+                [g.result for g in failed if g.result is not None],
+            )
+
+        failed_write = _commit_groups(groups)
+        if failed_write is not None:
+            return _batch_error(
+                "BATCH_ABORTED",
+                "Writing a file failed; files already written were restored.",
+                trace_id,
+                started_at,
+                [failed_write.result or {}],
+            )
+
+    results: list[dict[str, Any]] = []
+    diffs: list[str] = []
+    for group in groups:
+        ctx = group.ctx
+        label = str(group.resolved_path)
+        if base_dir and group.resolved_path.is_relative_to(base_dir):
+            label = group.resolved_path.relative_to(base_dir).as_posix()
+        if group.merged is not None:
+            _log_merged_write(ctx, group.merged)
+            diffs.append(_relabel_diff(label, group.merged.diff))
+            message = "Applied code changes successfully."
+        elif not group.file_exists:
+            apply_logging.log_create_success(
+                trace_id, group.resolved_path, group.edit_snippet, ctx.instruction
+            )
+            diffs.append(_labeled_diff(label, "", group.edit_snippet))
+            message = f"Created new file ({group.resolved_path.stat().st_size} bytes)"
+        else:
+            message = (group.result or {}).get("message") or "No changes needed"
+        file_result: dict[str, Any] = {
+            "status": "ok",
+            "path": str(group.resolved_path),
+            "edits": len(group.snippets),
+            "message": message,
+        }
+        if group.merged is not None:
+            file_result["merge_path"] = group.merged.merge_path
+        results.append(file_result)
+
+    changed = sum(1 for g in groups if g.merged is not None or not g.file_exists)
+    return {
+        "status": "ok",
+        "trace_id": trace_id,
+        "timing_ms": int((datetime.now(UTC) - started_at).total_seconds() * 1000),
+        "diff": "".join(diffs) or None,
+        "results": results,
+        "message": f"Applied {len(edits)} edits; {changed} of {len(groups)} files changed.",
+    }
@@ -4,6 +4,7 @@ import hashlib
 import logging
 import math
 import os
+import time
 import uuid
 from collections.abc import Awaitable, Callable, Sequence
 from dataclasses import dataclass
@@ -14,6 +15,7 @@ from typing import Any
 import openai
 
 from ..clients.apply import ApplyLLMClient, ApplyRequest, ApplyResponse
+from ..config import settings as _settings
 from ..config.settings import APPLY_SEMANTIC_CHECK, MAX_FILE_SIZE_BYTES
 from ..encoding import atomic_write, get_project_encoding, read_text_with_fallback
 from ..encoding.exceptions import EncodingDetectionError as BaseEncodingDetectionError
@@ -28,6 +30,8 @@ from .exceptions import (
     FileNotWritableError,
     FileTooLargeError,
 )
+from .local_merge import splice_snippet
+from .window import MergeWindow, locate_window
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +62,78 @@ class ApplyContext:
         return int((datetime.now(UTC) - self.started_at).total_seconds() * 1000)
 
 
+@dataclass
+class MergedEdit:
+    """A validated merge result that has not been written yet."""
+
+    resolved_path: Path
+    initial_code: str
+    merged_code: str
+    encoding: str
+    initial_hash: str
+    diff: str
+    usage: dict[str, Any]
+    edit_snippet: str
+    file_size: int
+    # "local" when served by the anchor splice, "remote" for the merge API,
+    # "window" when the merge API only saw the anchored region of the file.
+    merge_path: str = "remote"
+
+
+_MARKER_LEAKAGE_MESSAGE = (
+    "Detected truncation marker text in merged output. "
+    "This usually means the merge model treated markers as literal text instead of expanding them. "
+    "Simplify edit_snippet and add more unique anchor lines."
+)
+
+
+class _MergeAborted(Exception):
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class _MergeStreamMonitor:
+    """Checks streamed merge output as it arrives and reports byte progress.
+
+    Marker leakage is detected per completed line, so the request is aborted as
+    soon as a leaked placeholder is emitted. Truncation guards still run on the
+    final output: the merged text only grows, so loss is never certain mid-stream.
+    """
+
+    # Report progress at most every 1/_PROGRESS_STEPS of the expected size.
+    _PROGRESS_STEPS = 20
+
+    def __init__(
+        self,
+        *,
+        check_markers: bool,
+        expected_bytes: int,
+        on_progress: Callable[[float, float, str], Awaitable[None]] | None,
+    ) -> None:
+        self._check_markers = check_markers
+        self._expected = max(1, expected_bytes)
+        self._on_progress = on_progress
+        self._pending = ""
+        self.received_bytes = 0
+        self._next_report = self._expected // self._PROGRESS_STEPS
+
+    async def __call__(self, delta: str) -> None:
+        self.received_bytes += len(delta.encode("utf-8"))
+        if self._check_markers:
+            *complete, self._pending = (self._pending + delta).split("\n")
+            if any(snippet.contains_truncation_markers(line) for line in complete):
+                raise _MergeAborted("MARKER_LEAKAGE", _MARKER_LEAKAGE_MESSAGE)
+        if self._on_progress and self.received_bytes >= self._next_report:
+            self._next_report = self.received_bytes + self._expected // self._PROGRESS_STEPS
+            # Stay inside the (1, 2) "Merging" step so progress never goes backwards.
+            fraction = min(self.received_bytes / self._expected, 0.99)
+            await self._on_progress(
+                1 + round(fraction, 2), 2, f"Merging ({self.received_bytes} bytes received)"
+            )
+
+
 def _ok_result(
     ctx: ApplyContext,
     path: str,
@@ -75,7 +151,7 @@ def _ok_result(
 
 
 async def _report_apply_done(
-    on_progress: Callable[[int, int, str], Awaitable[None]] | None,
+    on_progress: Callable[[float, float, str], Awaitable[None]] | None,
 ) -> None:
     if on_progress:
         await on_progress(2, 2, "Done")
@@ -178,17 +254,19 @@ async def _create_new_file(
     )
 
 
-async def _apply_to_existing_file(
-    ctx: ApplyContext,
-    backend: ApplyLLMClient,
-    resolved_path: Path,
-    edit_snippet: str,
-    file_size: int,
-    on_progress: Callable[[int, int, str], Awaitable[None]] | None = None,
-) -> dict[str, Any]:
+def _precheck_existing_file(
+    ctx: ApplyContext, resolved_path: Path, edit_snippet: str, file_size: int
+) -> dict[str, Any] | None:
+    """Cheap checks run before taking the path lock or calling the merge API.
+
+    Returns:
+        Error dict for a recoverable problem, otherwise None.
+
+    Raises:
+        FileTooLargeError: If the file exceeds MAX_FILE_SIZE_BYTES.
+        FileNotWritableError: If the file or its directory is not writable.
+    """
     concrete = snippet.concrete_lines(edit_snippet)
-    has_markers = snippet.contains_truncation_markers(edit_snippet)
-    has_explicit_remove = bool(snippet.extract_remove_targets(edit_snippet))
     if not concrete:
         # Try to provide symbol hints even for empty-concrete path
         try:
@@ -219,49 +297,141 @@ async def _apply_to_existing_file(
     if not os.access(resolved_path.parent, os.W_OK):
         raise FileNotWritableError(f"Directory not writable: {resolved_path.parent}")
 
-    async with _get_path_lock(str(resolved_path)):
-        initial_code, detected_encoding = read_text_with_fallback(resolved_path)
-        initial_hash = hashlib.sha256(resolved_path.read_bytes()).hexdigest()
+    return None
 
-        file_lines = initial_code.count("\n") + 1
 
-        anchor_passed, _ = snippet.anchor_precheck(concrete, initial_code)
-        if not anchor_passed:
-            symbols = snippet.extract_top_level_symbols(initial_code, str(resolved_path))
-            hint = ""
-            if symbols:
-                sym_preview = symbols[:10]
-                hint = (
-                    f" The file defines: {', '.join(sym_preview)}."
-                    " Include 1-2 lines near your target as anchors."
+async def _merge_existing_file(
+    ctx: ApplyContext,
+    backend: ApplyLLMClient,
+    resolved_path: Path,
+    edit_snippet: str,
+    file_size: int,
+    on_progress: Callable[[float, float, str], Awaitable[None]] | None = None,
+    *,
+    tool: str = "fast_apply",
+) -> MergedEdit | dict[str, Any]:
+    """Read, merge and validate an edit without writing it.
+
+    The caller must hold the path lock for resolved_path until the returned
+    edit is committed. Returns a dict for recoverable errors and no-op merges.
+    """
+    concrete = snippet.concrete_lines(edit_snippet)
+    has_markers = snippet.contains_truncation_markers(edit_snippet)
+
+    initial_code, detected_encoding = read_text_with_fallback(resolved_path)
+    initial_hash = hashlib.sha256(resolved_path.read_bytes()).hexdigest()
+
+    file_lines = initial_code.count("\n") + 1
+
+    anchor_passed, _ = snippet.anchor_precheck(concrete, initial_code)
+    if not anchor_passed:
+        symbols = snippet.extract_top_level_symbols(initial_code, str(resolved_path))
+        hint = ""
+        if symbols:
+            sym_preview = symbols[:10]
+            hint = (
+                f" The file defines: {', '.join(sym_preview)}."
+                " Include 1-2 lines near your target as anchors."
+            )
+        return error_responses.recoverable_error(
+            "NEEDS_MORE_CONTEXT",
+            f"Anchor lines in edit_snippet cannot be located in the file ({file_lines} lines).{hint}",
+            ctx.file_path,
+            ctx.instruction,
+            ctx.trace_id,
+            ctx.elapsed_ms(),
+            file_lines=file_lines,
+        )
+
+    if on_progress:
+        await on_progress(1, 2, "Merging")
+
+    merge_path = "remote"
+    usage: dict[str, Any] = {}
+    checked: str | dict[str, Any] | None = None
+    if _settings.APPLY_LOCAL_MERGE:
+        started = time.perf_counter()
+        local_code = splice_snippet(initial_code, edit_snippet)
+        if local_code is not None:
+            checked = await _check_merged_code(
+                ctx, resolved_path, initial_code, local_code, edit_snippet, on_progress
+            )
+            if isinstance(checked, dict) and checked.get("status") == "error":
+                logger.debug(
+                    "[%s] Local merge for %s rejected (%s); falling back to remote merge",
+                    ctx.trace_id,
+                    resolved_path,
+                    checked.get("code"),
                 )
-            return error_responses.recoverable_error(
-                "NEEDS_MORE_CONTEXT",
-                f"Anchor lines in edit_snippet cannot be located in the file ({file_lines} lines).{hint}",
-                ctx.file_path,
-                ctx.instruction,
+                checked = None
+            else:
+                merged_code = local_code
+                merge_path = "local"
+                logger.debug(
+                    "[%s] Local merge for %s (%.2fms)",
+                    ctx.trace_id,
+                    resolved_path,
+                    (time.perf_counter() - started) * 1000,
+                )
+
+    if checked is None:
+        window: MergeWindow | None = None
+        if _settings.APPLY_WINDOW_MIN_LINES and file_lines >= _settings.APPLY_WINDOW_MIN_LINES:
+            window = locate_window(initial_code, edit_snippet)
+        request_code = initial_code
+        if window is not None:
+            request_code = window.text
+            merge_path = "window"
+            logger.debug(
+                "[%s] Windowed merge for %s: lines %d-%d of %d",
                 ctx.trace_id,
-                ctx.elapsed_ms(),
-                file_lines=file_lines,
+                resolved_path,
+                window.start + 1,
+                window.end,
+                file_lines,
             )
 
-        if on_progress:
-            await on_progress(1, 2, "Merging")
-
         metadata = {
             "source": "fastmcp",
-            "tool": "fast_apply",
+            "tool": tool,
             "file_path": str(resolved_path),
             "trace_id": ctx.trace_id,
         }
 
         request = ApplyRequest(
-            initial_code=initial_code,
+            initial_code=request_code,
             edit_snippet=edit_snippet,
             instruction=ctx.instruction,
             metadata=metadata,
         )
-        response: ApplyResponse = await backend.apply(request)
+        response: ApplyResponse
+        if _settings.APPLY_STREAM:
+            monitor = _MergeStreamMonitor(
+                check_markers=has_markers and not snippet.contains_truncation_markers(request_code),
+                expected_bytes=len(request_code.encode("utf-8")),
+                on_progress=on_progress,
+            )
+            try:
+                response = await backend.apply_stream(request, monitor)
+            except _MergeAborted as abort:
+                logger.warning(
+                    "[%s] %s for %s: merge aborted after %d bytes",
+                    ctx.trace_id,
+                    abort.code,
+                    resolved_path,
+                    monitor.received_bytes,
+                )
+                return error_responses.recoverable_error(
+                    abort.code,
+                    abort.message,
+                    ctx.file_path,
+                    ctx.instruction,
+                    ctx.trace_id,
+                    ctx.elapsed_ms(),
+                    file_lines=file_lines,
+                )
+        else:
+            response = await backend.apply(request)
 
         merged_code = response.merged_code
         usage = response.usage
@@ -269,6 +439,60 @@ async def _apply_to_existing_file(
         if not isinstance(merged_code, str):
             raise ApiInvalidResponseError()
 
+        checked = await _check_merged_code(
+            ctx, resolved_path, request_code, merged_code, edit_snippet, on_progress, window=window
+        )
+        if window is not None:
+            merged_code = window.splice(merged_code)
+
+    if isinstance(checked, dict):
+        if checked.get("status") == "ok":
+            checked["merge_path"] = merge_path
+        return checked
+
+    return MergedEdit(
+        resolved_path=resolved_path,
+        initial_code=initial_code,
+        merged_code=merged_code,
+        encoding=detected_encoding,
+        initial_hash=initial_hash,
+        diff=checked,
+        usage=usage,
+        edit_snippet=edit_snippet,
+        file_size=file_size,
+        merge_path=merge_path,
+    )
+
+
+async def _check_merged_code(
+    ctx: ApplyContext,
+    resolved_path: Path,
+    initial_code: str,
+    merged_code: str,
+    edit_snippet: str,
+    on_progress: Callable[[float, float, str], Awaitable[None]] | None,
+    *,
+    window: MergeWindow | None = None,
+) -> str | dict[str, Any]:
+    """Run the post-merge guards on a candidate merge.
+
+    With a window, initial_code and merged_code are the window text before and
+    after the merge: the diff, truncation and blast-radius guards are measured
+    against the window, while syntax and symbol checks see the spliced file.
+
+    Returns:
+        The unified diff when the merge is acceptable, otherwise a recoverable
+        error dict (or an ok dict when no change is needed).
+    """
+    has_markers = snippet.contains_truncation_markers(edit_snippet)
+    has_explicit_remove = bool(snippet.extract_remove_targets(edit_snippet))
+    file_lines = initial_code.count("\n") + 1
+
+    if window is not None:
+        diff = window.diff(merged_code)
+        full_initial = window.prefix + initial_code + window.suffix
+        full_merged = window.splice(merged_code)
+    else:
         diff = "".join(
             difflib.unified_diff(
                 initial_code.splitlines(keepends=True),
@@ -277,67 +501,46 @@ async def _apply_to_existing_file(
                 tofile="after",
             )
         )
-        added_lines, deleted_lines = snippet.count_nonempty_diff_lines(diff)
-        lines_touched = max(added_lines, deleted_lines)
-        deletion_dominant_diff = deleted_lines > added_lines
-
-        original_chars = len(initial_code)
-        original_lines = file_lines if initial_code else 0
-        merged_chars = len(merged_code)
-        merged_lines = merged_code.count("\n") + 1 if merged_code else 0
-
-        if has_markers:
-            initial_had_markers = snippet.contains_truncation_markers(initial_code)
-            merged_has_markers = snippet.contains_truncation_markers(merged_code)
-            if merged_has_markers and not initial_had_markers:
-                file_lines = initial_code.count("\n") + 1
-                return error_responses.recoverable_error(
-                    "MARKER_LEAKAGE",
-                    "Detected truncation marker text in merged output. "
-                    "This usually means the merge model treated markers as literal text instead of expanding them. "
-                    "Simplify edit_snippet and add more unique anchor lines.",
-                    ctx.file_path,
-                    ctx.instruction,
-                    ctx.trace_id,
-                    ctx.elapsed_ms(),
-                    file_lines=file_lines,
-                )
+        full_initial, full_merged = initial_code, merged_code
+    added_lines, deleted_lines = snippet.count_nonempty_diff_lines(diff)
+    lines_touched = max(added_lines, deleted_lines)
+    deletion_dominant_diff = deleted_lines > added_lines
+
+    original_chars = len(initial_code)
+    original_lines = file_lines if initial_code else 0
+    merged_chars = len(merged_code)
+    merged_lines = merged_code.count("\n") + 1 if merged_code else 0
+
+    if has_markers:
+        initial_had_markers = snippet.contains_truncation_markers(initial_code)
+        merged_has_markers = snippet.contains_truncation_markers(merged_code)
+        if merged_has_markers and not initial_had_markers:
+            file_lines = initial_code.count("\n") + 1
+            return error_responses.recoverable_error(
+                "MARKER_LEAKAGE",
+                _MARKER_LEAKAGE_MESSAGE,
+                ctx.file_path,
+                ctx.instruction,
+                ctx.trace_id,
+                ctx.elapsed_ms(),
+                file_lines=file_lines,
+            )
 
-        if original_chars > 0 and original_lines > 0:
-            char_loss = max(0.0, (original_chars - merged_chars) / original_chars)
-            line_loss = max(0.0, (original_lines - merged_lines) / original_lines)
-            if char_loss > 0.6 and line_loss > 0.5:
-                if has_explicit_remove:
-                    logger.debug(
-                        "[%s] EXPLICIT_DELETE_INTENT for %s: skipping TRUNCATION_DETECTED (remove directives present)",
-                        ctx.trace_id,
-                        resolved_path,
-                    )
-                else:
-                    return error_responses.recoverable_error(
-                        "TRUNCATION_DETECTED",
-                        f"Catastrophic truncation detected (charLoss={int(char_loss * 100)}%, "
-                        f"lineLoss={int(line_loss * 100)}%).",
-                        ctx.file_path,
-                        ctx.instruction,
-                        ctx.trace_id,
-                        ctx.elapsed_ms(),
-                        file_lines=file_lines,
-                    )
-
-        if not diff:
-            if snippet.expects_changes(edit_snippet, initial_code):
-                logger.warning(
-                    "[%s] APPLY_NOOP: Expected changes but got no diff for %s",
+    if original_chars > 0 and original_lines > 0:
+        char_loss = max(0.0, (original_chars - merged_chars) / original_chars)
+        line_loss = max(0.0, (original_lines - merged_lines) / original_lines)
+        if char_loss > 0.6 and line_loss > 0.5:
+            if has_explicit_remove:
+                logger.debug(
+                    "[%s] EXPLICIT_DELETE_INTENT for %s: skipping TRUNCATION_DETECTED (remove directives present)",
                     ctx.trace_id,
                     resolved_path,
                 )
-                file_lines = initial_code.count("\n") + 1
+            else:
                 return error_responses.recoverable_error(
-                    "APPLY_NOOP",
-                    f"Merged result is identical to original file ({file_lines} lines). "
-                    "The edit may lack sufficient context for the merge model to locate the target. "
-                    "Add 1-3 unique anchor lines from near the edit target.",
+                    "TRUNCATION_DETECTED",
+                    f"Catastrophic truncation detected (charLoss={int(char_loss * 100)}%, "
+                    f"lineLoss={int(line_loss * 100)}%).",
                     ctx.file_path,
                     ctx.instruction,
                     ctx.trace_id,
@@ -345,30 +548,19 @@ async def _apply_to_existing_file(
                     file_lines=file_lines,
                 )
 
-            logger.debug("[%s] No changes needed (idempotent) for %s", ctx.trace_id, resolved_path)
-            await _report_apply_done(on_progress)
-            return _ok_result(
-                ctx,
-                str(resolved_path),
-                "No changes needed (already matches)",
-                diff=None,
-            )
-
-        # L1 Syntax validation (always enabled for Python files)
-        syntax_passed, syntax_reason = snippet.validate_syntax_delta(
-            initial_code, merged_code, str(resolved_path)
-        )
-        if not syntax_passed:
+    if not diff:
+        if snippet.expects_changes(edit_snippet, initial_code):
             logger.warning(
-                "[%s] SYNTAX_CHECK_FAILED for %s: %s",
+                "[%s] APPLY_NOOP: Expected changes but got no diff for %s",
                 ctx.trace_id,
                 resolved_path,
-                syntax_reason,
             )
             file_lines = initial_code.count("\n") + 1
             return error_responses.recoverable_error(
-                "SYNTAX_CHECK_FAILED",
-                f"Merged code has syntax error: {syntax_reason}",
+                "APPLY_NOOP",
+                f"Merged result is identical to original file ({file_lines} lines). "
+                "The edit may lack sufficient context for the merge model to locate the target. "
+                "Add 1-3 unique anchor lines from near the edit target.",
                 ctx.file_path,
                 ctx.instruction,
                 ctx.trace_id,
@@ -376,55 +568,61 @@ async def _apply_to_existing_file(
                 file_lines=file_lines,
             )
 
-        # Blast-radius guard: reject diffs that rewrite most of the file.
-        blast_radius_limit = max(1, math.ceil(file_lines * 0.8))
-        if lines_touched > blast_radius_limit:
-            if has_explicit_remove and deletion_dominant_diff:
-                logger.debug(
-                    "[%s] EXPLICIT_DELETE_INTENT for %s: skipping BLAST_RADIUS_EXCEEDED (remove directives present)",
-                    ctx.trace_id,
-                    resolved_path,
-                )
-            else:
-                logger.warning(
-                    "[%s] BLAST_RADIUS_EXCEEDED for %s: %d lines touched, file=%d lines, limit=%d",
-                    ctx.trace_id,
-                    resolved_path,
-                    lines_touched,
-                    file_lines,
-                    blast_radius_limit,
-                )
-                return error_responses.recoverable_error(
-                    "BLAST_RADIUS_EXCEEDED",
-                    f"Diff touches {lines_touched} lines but file only has {file_lines} lines "
-                    f"(limit={blast_radius_limit}, 80% of file). "
-                    "This looks like a full-file rewrite. Split into smaller edits.",
-                    ctx.file_path,
-                    ctx.instruction,
-                    ctx.trace_id,
-                    ctx.elapsed_ms(),
-                    file_lines=file_lines,
-                )
+        logger.debug("[%s] No changes needed (idempotent) for %s", ctx.trace_id, resolved_path)
+        await _report_apply_done(on_progress)
+        return _ok_result(
+            ctx,
+            str(resolved_path),
+            "No changes needed (already matches)",
+            diff=None,
+        )
 
-        # Symbol preservation guard: reject if top-level symbols unexpectedly disappeared
-        sym_passed, sym_reason = snippet.check_symbol_preservation(
-            initial_code, merged_code, edit_snippet, str(resolved_path)
+    # L1 Syntax validation (always enabled for Python files)
+    syntax_passed, syntax_reason = snippet.validate_syntax_delta(
+        full_initial, full_merged, str(resolved_path)
+    )
+    if not syntax_passed:
+        logger.warning(
+            "[%s] SYNTAX_CHECK_FAILED for %s: %s",
+            ctx.trace_id,
+            resolved_path,
+            syntax_reason,
+        )
+        file_lines = initial_code.count("\n") + 1
+        return error_responses.recoverable_error(
+            "SYNTAX_CHECK_FAILED",
+            f"Merged code has syntax error: {syntax_reason}",
+            ctx.file_path,
+            ctx.instruction,
+            ctx.trace_id,
+            ctx.elapsed_ms(),
+            file_lines=file_lines,
         )
-        if sym_passed and sym_reason:
+
+    # Blast-radius guard: reject diffs that rewrite most of the file (or window).
+    scope = "window" if window is not None else "file"
+    blast_radius_limit = max(1, math.ceil(file_lines * 0.8))
+    if lines_touched > blast_radius_limit:
+        if has_explicit_remove and deletion_dominant_diff:
             logger.debug(
-                "[%s] SYMBOL_CHANGE_DETECTED for %s: %s", ctx.trace_id, resolved_path, sym_reason
+                "[%s] EXPLICIT_DELETE_INTENT for %s: skipping BLAST_RADIUS_EXCEEDED (remove directives present)",
+                ctx.trace_id,
+                resolved_path,
             )
-        if not sym_passed:
+        else:
             logger.warning(
-                "[%s] SYMBOL_LOST for %s: %s",
+                "[%s] BLAST_RADIUS_EXCEEDED for %s: %d lines touched, file=%d lines, limit=%d",
                 ctx.trace_id,
                 resolved_path,
-                sym_reason,
+                lines_touched,
+                file_lines,
+                blast_radius_limit,
             )
-            file_lines = initial_code.count("\n") + 1
             return error_responses.recoverable_error(
-                "SYMBOL_LOST",
-                f"Merge would remove symbols not targeted by edit: {sym_reason}",
+                "BLAST_RADIUS_EXCEEDED",
+                f"Diff touches {lines_touched} lines but {scope} only has {file_lines} lines "
+                f"(limit={blast_radius_limit}, 80% of {scope}). "
+                "This looks like a full-file rewrite. Split into smaller edits.",
                 ctx.file_path,
                 ctx.instruction,
                 ctx.trace_id,
@@ -432,72 +630,211 @@ async def _apply_to_existing_file(
                 file_lines=file_lines,
             )
 
-        # Semantic check is opt-in because context-only intent checks can add false positives.
-        if APPLY_SEMANTIC_CHECK:
-            post_check_passed, post_check_reason = snippet.post_check_merged_code(
-                edit_snippet, merged_code, initial_code
-            )
-            if not post_check_passed:
-                logger.warning(
-                    "[%s] SEMANTIC_CHECK_FAILED for %s: %s",
-                    ctx.trace_id,
-                    resolved_path,
-                    post_check_reason,
-                )
-                return error_responses.recoverable_error(
-                    "SEMANTIC_CHECK_FAILED",
-                    f"Merged code does not match expected changes: {post_check_reason}",
-                    ctx.file_path,
-                    ctx.instruction,
-                    ctx.trace_id,
-                    ctx.elapsed_ms(),
-                )
+    # Symbol preservation guard: reject if top-level symbols unexpectedly disappeared
+    sym_passed, sym_reason = snippet.check_symbol_preservation(
+        full_initial, full_merged, edit_snippet, str(resolved_path)
+    )
+    if sym_passed and sym_reason:
+        logger.debug(
+            "[%s] SYMBOL_CHANGE_DETECTED for %s: %s", ctx.trace_id, resolved_path, sym_reason
+        )
+    if not sym_passed:
+        logger.warning(
+            "[%s] SYMBOL_LOST for %s: %s",
+            ctx.trace_id,
+            resolved_path,
+            sym_reason,
+        )
+        file_lines = initial_code.count("\n") + 1
+        return error_responses.recoverable_error(
+            "SYMBOL_LOST",
+            f"Merge would remove symbols not targeted by edit: {sym_reason}",
+            ctx.file_path,
+            ctx.instruction,
+            ctx.trace_id,
+            ctx.elapsed_ms(),
+            file_lines=file_lines,
+        )
 
-        # Optimistic concurrency: verify file unchanged since read
-        current_hash = hashlib.sha256(resolved_path.read_bytes()).hexdigest()
-        if current_hash != initial_hash:
+    # Semantic check is opt-in because context-only intent checks can add false positives.
+    if APPLY_SEMANTIC_CHECK:
+        post_check_passed, post_check_reason = snippet.post_check_merged_code(
+            edit_snippet, merged_code, initial_code
+        )
+        if not post_check_passed:
             logger.warning(
-                "[%s] CONTENT_CONFLICT for %s: file changed during apply",
+                "[%s] SEMANTIC_CHECK_FAILED for %s: %s",
                 ctx.trace_id,
                 resolved_path,
+                post_check_reason,
             )
-            file_lines = initial_code.count("\n") + 1
             return error_responses.recoverable_error(
-                "CONTENT_CONFLICT",
-                "File was modified by another process during apply. Please retry.",
+                "SEMANTIC_CHECK_FAILED",
+                f"Merged code does not match expected changes: {post_check_reason}",
                 ctx.file_path,
                 ctx.instruction,
                 ctx.trace_id,
                 ctx.elapsed_ms(),
-                file_lines=file_lines,
             )
 
-        atomic_write(resolved_path, merged_code, encoding=detected_encoding)
+    return diff
+
+
+def _content_conflict(ctx: ApplyContext, merged: MergedEdit) -> dict[str, Any] | None:
+    """Optimistic concurrency: verify the file is unchanged since it was read."""
+    resolved_path = merged.resolved_path
+    current_hash = hashlib.sha256(resolved_path.read_bytes()).hexdigest()
+    if current_hash == merged.initial_hash:
+        return None
+    logger.warning(
+        "[%s] CONTENT_CONFLICT for %s: file changed during apply",
+        ctx.trace_id,
+        resolved_path,
+    )
+    return error_responses.recoverable_error(
+        "CONTENT_CONFLICT",
+        "File was modified by another process during apply. Please retry.",
+        ctx.file_path,
+        ctx.instruction,
+        ctx.trace_id,
+        ctx.elapsed_ms(),
+        file_lines=merged.initial_code.count("\n") + 1,
+    )
+
+
+def _log_merged_write(ctx: ApplyContext, merged: MergedEdit) -> None:
+    apply_logging.log_apply_success(
+        ctx.trace_id,
+        ctx.started_at,
+        merged.resolved_path,
+        merged.file_size,
+        merged.edit_snippet,
+        ctx.instruction,
+        merged.usage,
+        merge_path=merged.merge_path,
+    )
+    logger.debug(
+        "[%s] Applied edit to %s (latency=%dms)",
+        ctx.trace_id,
+        merged.resolved_path,
+        ctx.elapsed_ms(),
+    )
+
+
+async def _apply_to_existing_file(
+    ctx: ApplyContext,
+    backend: ApplyLLMClient,
+    resolved_path: Path,
+    edit_snippet: str,
+    file_size: int,
+    on_progress: Callable[[float, float, str], Awaitable[None]] | None = None,
+) -> dict[str, Any]:
+    precheck_error = _precheck_existing_file(ctx, resolved_path, edit_snippet, file_size)
+    if precheck_error is not None:
+        return precheck_error
+
+    async with _get_path_lock(str(resolved_path)):
+        merged = await _merge_existing_file(
+            ctx, backend, resolved_path, edit_snippet, file_size, on_progress
+        )
+        if isinstance(merged, dict):
+            return merged
+
+        conflict = _content_conflict(ctx, merged)
+        if conflict is not None:
+            return conflict
+
+        atomic_write(resolved_path, merged.merged_code, encoding=merged.encoding)
+        _log_merged_write(ctx, merged)
+
+        await _report_apply_done(on_progress)
+        result = _ok_result(
+            ctx,
+            str(resolved_path),
+            "Applied code changes successfully.",
+            diff=merged.diff,
+        )
+        result["merge_path"] = merged.merge_path
+        return result
+
 
-        apply_logging.log_apply_success(
+def _exception_result(ctx: ApplyContext, exc: Exception) -> dict[str, Any]:
+    """Map an exception raised while applying an edit to a recoverable error."""
+    if isinstance(exc, openai.APIError):
+        logger.warning(
+            "[%s] Apply API error for %s: %s",
             ctx.trace_id,
-            ctx.started_at,
-            resolved_path,
-            file_size,
-            edit_snippet,
+            ctx.file_path,
+            exc,
+        )
+        return error_responses.openai_error_to_recoverable(
+            exc, ctx.file_path, ctx.instruction, ctx.trace_id, ctx.elapsed_ms()
+        )
+
+    if isinstance(exc, ValueError):
+        logger.warning(
+            "[%s] API response parsing error for %s: %s",
+            ctx.trace_id,
+            ctx.file_path,
+            exc,
+        )
+        return error_responses.recoverable_error(
+            "API_INVALID_RESPONSE",
+            str(exc),
+            ctx.file_path,
             ctx.instruction,
-            usage,
+            ctx.trace_id,
+            ctx.elapsed_ms(),
         )
-        logger.debug(
-            "[%s] Applied edit to %s (latency=%dms)",
+
+    if isinstance(exc, (ApplyError, BaseEncodingDetectionError)):
+        error_code = getattr(exc, "error_code", "ENCODING_ERROR")
+        message = getattr(exc, "message", str(exc))
+        logger.warning(
+            "[%s] Apply error (%s) for %s: %s",
+            ctx.trace_id,
+            error_code,
+            ctx.file_path,
+            message,
+        )
+        return error_responses.recoverable_error(
+            error_code, message, ctx.file_path, ctx.instruction, ctx.trace_id, ctx.elapsed_ms()
+        )
+
+    if isinstance(exc, PermissionError):
+        logger.warning("[%s] Permission error for %s: %s", ctx.trace_id, ctx.file_path, exc)
+        return error_responses.recoverable_error(
+            "PERMISSION_ERROR",
+            f"Permission denied: {exc}",
+            ctx.file_path,
+            ctx.instruction,
             ctx.trace_id,
-            resolved_path,
             ctx.elapsed_ms(),
         )
 
-        await _report_apply_done(on_progress)
-        return _ok_result(
-            ctx,
-            str(resolved_path),
-            "Applied code changes successfully.",
-            diff=diff,
+    if isinstance(exc, OSError):
+        errno_info = f"errno={exc.errno}" if exc.errno else ""
+        strerror = exc.strerror or str(exc)
+        logger.warning("[%s] Filesystem error for %s: %s", ctx.trace_id, ctx.file_path, exc)
+        return error_responses.recoverable_error(
+            "FS_ERROR",
+            f"Filesystem error ({type(exc).__name__}, {errno_info}): {strerror}",
+            ctx.file_path,
+            ctx.instruction,
+            ctx.trace_id,
+            ctx.elapsed_ms(),
         )
 
+    logger.error("[%s] Apply failed for %s: %s", ctx.trace_id, ctx.file_path, exc)
+    return error_responses.recoverable_error(
+        "INTERNAL_ERROR",
+        f"Unexpected error ({type(exc).__name__}): {exc}",
+        ctx.file_path,
+        ctx.instruction,
+        ctx.trace_id,
+        ctx.elapsed_ms(),
+    )
+
 
 async def apply_file_logic(
     backend: ApplyLLMClient,
@@ -507,7 +844,7 @@ async def apply_file_logic(
     base_dir: str | None,
     *,
     extra_paths: Sequence[str] = (),
-    on_progress: Callable[[int, int, str], Awaitable[None]] | None = None,
+    on_progress: Callable[[float, float, str], Awaitable[None]] | None = None,
 ) -> dict[str, Any]:
     """Core logic for fast_apply (testable independently).
 
@@ -552,7 +889,6 @@ async def apply_file_logic(
         )
         return empty_result
 
-    logged_error_event = False
     result: dict[str, Any]
 
     try:
@@ -577,84 +913,9 @@ async def apply_file_logic(
         apply_logging.log_apply_error(
             ctx.trace_id, ctx.started_at, file_path, edit_snippet, instruction, exc
         )
-        logged_error_event = True
-
-        if isinstance(exc, openai.APIError):
-            logger.warning(
-                "[%s] Apply API error for %s: %s",
-                ctx.trace_id,
-                file_path,
-                exc,
-            )
-            return error_responses.openai_error_to_recoverable(
-                exc, file_path, instruction, ctx.trace_id, ctx.elapsed_ms()
-            )
-
-        if isinstance(exc, ValueError):
-            logger.warning(
-                "[%s] API response parsing error for %s: %s",
-                ctx.trace_id,
-                file_path,
-                exc,
-            )
-            return error_responses.recoverable_error(
-                "API_INVALID_RESPONSE",
-                str(exc),
-                file_path,
-                instruction,
-                ctx.trace_id,
-                ctx.elapsed_ms(),
-            )
-
-        if isinstance(exc, (ApplyError, BaseEncodingDetectionError)):
-            error_code = getattr(exc, "error_code", "ENCODING_ERROR")
-            message = getattr(exc, "message", str(exc))
-            logger.warning(
-                "[%s] Apply error (%s) for %s: %s",
-                ctx.trace_id,
-                error_code,
-                file_path,
-                message,
-            )
-            return error_responses.recoverable_error(
-                error_code, message, file_path, instruction, ctx.trace_id, ctx.elapsed_ms()
-            )
-
-        if isinstance(exc, PermissionError):
-            logger.warning("[%s] Permission error for %s: %s", ctx.trace_id, file_path, exc)
-            return error_responses.recoverable_error(
-                "PERMISSION_ERROR",
-                f"Permission denied: {exc}",
-                file_path,
-                instruction,
-                ctx.trace_id,
-                ctx.elapsed_ms(),
-            )
-
-        if isinstance(exc, OSError):
-            errno_info = f"errno={exc.errno}" if exc.errno else ""
-            strerror = exc.strerror or str(exc)
-            logger.warning("[%s] Filesystem error for %s: %s", ctx.trace_id, file_path, exc)
-            return error_responses.recoverable_error(
-                "FS_ERROR",
-                f"Filesystem error ({type(exc).__name__}, {errno_info}): {strerror}",
-                file_path,
-                instruction,
-                ctx.trace_id,
-                ctx.elapsed_ms(),
-            )
-
-        logger.error("[%s] Apply failed for %s: %s", ctx.trace_id, file_path, exc)
-        result = error_responses.recoverable_error(
-            "INTERNAL_ERROR",
-            f"Unexpected error ({type(exc).__name__}): {exc}",
-            file_path,
-            instruction,
-            ctx.trace_id,
-            ctx.elapsed_ms(),
-        )
+        return _exception_result(ctx, exc)
 
-    if result.get("status") == "error" and not logged_error_event:
+    if result.get("status") == "error":
         apply_logging.log_apply_recoverable_error(
             ctx.trace_id,
             ctx.started_at,
@@ -0,0 +1,89 @@
+from .snippet import _is_trivial_line, contains_truncation_markers, extract_remove_targets
+
+# A segment may replace at most this many file lines per snippet line (plus
+# slack) before the splice is considered ambiguous: beyond that, lines the
+# snippet never mentions would be deleted silently.
+_MAX_SPAN_RATIO = 2
+_SPAN_SLACK = 2
+
+
+def _split_segments(edit_snippet: str) -> list[list[str]]:
+    """Split a snippet into runs of concrete lines separated by placeholders."""
+    segments: list[list[str]] = [[]]
+    for line in edit_snippet.splitlines():
+        if contains_truncation_markers(line):
+            segments.append([])
+        else:
+            segments[-1].append(line)
+    trimmed: list[list[str]] = []
+    for segment in segments:
+        while segment and not segment[0].strip():
+            segment.pop(0)
+        while segment and not segment[-1].strip():
+            segment.pop()
+        if segment:
+            trimmed.append(segment)
+    return trimmed
+
+
+def _unique_anchor(line: str, positions: dict[str, list[int]], lo: int) -> int | None:
+    """Position of the only file line equal to line, if it is distinctive and at/after lo."""
+    if not line.strip() or _is_trivial_line(line.strip()):
+        return None
+    found = positions.get(line.rstrip())
+    if not found or len(found) != 1 or found[0] < lo:
+        return None
+    return found[0]
+
+
+def splice_snippet(initial_code: str, edit_snippet: str) -> str | None:
+    """Merge an edit snippet locally by exact anchor splicing.
+
+    Each placeholder-separated segment must start and end with a distinctive
+    line that occurs exactly once in the file (ignoring trailing whitespace);
+    the file lines between those anchors are replaced by the segment. Segments
+    must appear in file order and not overlap.
+
+    Returns:
+        The merged code, or None when the splice is ambiguous and the merge
+        should go to the model (missing/duplicate anchors, remove directives,
+        out-of-order segments, or a replacement span much larger than the
+        segment).
+    """
+    if not initial_code or extract_remove_targets(edit_snippet):
+        return None
+    segments = _split_segments(edit_snippet)
+    if not segments:
+        return None
+
+    file_lines = [line.rstrip() for line in initial_code.splitlines()]
+    positions: dict[str, list[int]] = {}
+    for idx, line in enumerate(file_lines):
+        positions.setdefault(line, []).append(idx)
+
+    original = initial_code.splitlines()
+    out: list[str] = []
+    cursor = 0
+    for segment in segments:
+        start = _unique_anchor(segment[0], positions, cursor)
+        if start is None:
+            return None
+        end = _unique_anchor(segment[-1], positions, start)
+        if end is None or (len(segment) > 1 and end == start):
+            return None
+        if end - start + 1 > _MAX_SPAN_RATIO * len(segment) + _SPAN_SLACK:
+            return None
+        out.extend(original[cursor:start])
+        # Keep the file's own anchor lines (trailing whitespace included).
+        out.append(original[start])
+        if end > start:
+            out.extend(segment[1:-1])
+            out.append(original[end])
+        cursor = end + 1
+    out.extend(original[cursor:])
+
+    newline = "\r\n" if "\r\n" in initial_code else "\n"
+    merged = newline.join(out)
+    if initial_code.endswith(("\n", "\r")):
+        merged += newline
+    return merged
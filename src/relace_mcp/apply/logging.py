@@ -40,6 +40,8 @@ def log_apply_success(
     edit_snippet: str,
     instruction: str | None,
     usage: dict[str, Any],
+    *,
+    merge_path: str | None = None,
 ) -> None:
     """Log successful edit application.
 
@@ -51,6 +53,8 @@ def log_apply_success(
         edit_snippet: Edit snippet.
         instruction: Optional instruction.
         usage: API usage information.
+        merge_path: "local" for anchor-spliced merges, "remote" for the merge API,
+            "window" for merge API calls that only received part of the file.
     """
     latency_ms = int((datetime.now(UTC) - started_at).total_seconds() * 1000)
     log_event(
@@ -65,6 +69,7 @@ def log_apply_success(
             "instruction": redact_value(instruction, 200) if instruction else None,
             "edit_snippet_preview": redact_value(edit_snippet, 200),
             "usage": usage,
+            "merge_path": merge_path,
         }
     )
 
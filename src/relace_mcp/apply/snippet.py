@@ -6,6 +6,25 @@ from bisect import bisect_right
 # Directive patterns for remove operations
 _REMOVE_DIRECTIVE_PATTERNS = ("// remove ", "# remove ")
 
+# Files whose comments start with "#"; everything else gets a "//" placeholder.
+_HASH_COMMENT_EXTENSIONS = {
+    ".py",
+    ".pyi",
+    ".sh",
+    ".bash",
+    ".zsh",
+    ".rb",
+    ".pl",
+    ".r",
+    ".yaml",
+    ".yml",
+    ".toml",
+    ".cfg",
+    ".ini",
+    ".ex",
+    ".exs",
+}
+
 _FENCE_PREFIX = "```"
 _MARKDOWN_FENCE_LITERAL_EXTENSIONS = {".md", ".mdx"}
 
@@ -84,6 +103,20 @@ def _is_explicit_marker_line(line: str) -> bool:
     )
 
 
+def join_edit_snippets(snippets: list[str], file_path: str) -> str:
+    """Combine several snippets for one file into a single merge request.
+
+    Snippets are separated by an `... existing code ...` placeholder in the
+    file's comment style, so the merge model keeps the code between them.
+    """
+    if len(snippets) == 1:
+        return snippets[0]
+    ext = os.path.splitext(file_path)[1].lower()
+    prefix = "#" if ext in _HASH_COMMENT_EXTENSIONS else "//"
+    separator = f"\n{prefix} ... existing code ...\n"
+    return separator.join(part.strip("\n") for part in snippets) + "\n"
+
+
 def contains_truncation_markers(text: str) -> bool:
     """Return True if text contains any explicit truncation marker line."""
     return any(_is_explicit_marker_line(line) for line in text.splitlines())
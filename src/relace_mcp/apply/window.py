@@ -0,0 +1,92 @@
+import difflib
+import re
+from dataclasses import dataclass
+
+from .snippet import _is_trivial_line, concrete_lines, extract_remove_targets
+
+# Lines of unchanged context kept on each side of the anchored region.
+WINDOW_CONTEXT_LINES = 50
+
+_HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class MergeWindow:
+    """A contiguous slice of a file sent to the merge model instead of the whole file."""
+
+    start: int  # 0-based index of the first window line
+    end: int  # exclusive
+    prefix: str
+    text: str
+    suffix: str
+
+    def splice(self, merged_window: str) -> str:
+        """Put a merged window back between the untouched prefix and suffix."""
+        if self.suffix and merged_window and not merged_window.endswith(("\n", "\r")):
+            newline = "\r\n" if self.text.endswith("\r\n") else "\n"
+            merged_window += newline
+        return self.prefix + merged_window + self.suffix
+
+    def diff(self, merged_window: str) -> str:
+        """Unified diff of the window only, with hunk headers in file line numbers."""
+        diff = "".join(
+            difflib.unified_diff(
+                self.text.splitlines(keepends=True),
+                merged_window.splitlines(keepends=True),
+                fromfile="before",
+                tofile="after",
+            )
+        )
+        if not self.start:
+            return diff
+
+        def shift(m: re.Match[str]) -> str:
+            old_start = int(m.group(1)) + self.start
+            new_start = int(m.group(3)) + self.start
+            return f"@@ -{old_start}{m.group(2) or ''} +{new_start}{m.group(4) or ''} @@"
+
+        return _HUNK_HEADER_RE.sub(shift, diff)
+
+
+def locate_window(
+    initial_code: str, edit_snippet: str, *, context: int = WINDOW_CONTEXT_LINES
+) -> MergeWindow | None:
+    """Find the region of the file an edit snippet targets.
+
+    The region spans every distinctive snippet line that occurs exactly once in
+    the file, plus `context` lines on each side.
+
+    Returns:
+        The window, or None when the snippet cannot be localized (no unique
+        anchors, remove directives that may target code anywhere) or when the
+        window would cover more than half of the file.
+    """
+    if extract_remove_targets(edit_snippet):
+        return None
+    lines = initial_code.splitlines(keepends=True)
+    positions: dict[str, list[int]] = {}
+    for idx, line in enumerate(lines):
+        positions.setdefault(line.strip(), []).append(idx)
+
+    hits: list[int] = []
+    for line in concrete_lines(edit_snippet):
+        stripped = line.strip()
+        if not stripped or _is_trivial_line(stripped):
+            continue
+        found = positions.get(stripped)
+        if found and len(found) == 1:
+            hits.append(found[0])
+    if not hits:
+        return None
+
+    start = max(0, min(hits) - context)
+    end = min(len(lines), max(hits) + context + 1)
+    if (end - start) * 2 > len(lines):
+        return None
+    return MergeWindow(
+        start=start,
+        end=end,
+        prefix="".join(lines[:start]),
+        text="".join(lines[start:end]),
+        suffix="".join(lines[end:]),
+    )
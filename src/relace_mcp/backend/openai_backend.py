@@ -1,10 +1,11 @@
 import logging
 import time
+from collections.abc import Awaitable, Callable
 from typing import Any, cast
 
 import openai
-from openai import AsyncOpenAI, OpenAI
-from openai.types.chat import ChatCompletionMessageParam
+from openai import AsyncOpenAI, AsyncStream, OpenAI
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessageParam
 from tenacity import RetryCallState, retry, stop_after_attempt, wait_exponential
 
 from ..config.provider import ProviderConfig
@@ -212,3 +213,135 @@ class OpenAIChatClient:
                 latency_ms,
             )
             raise
+
+    @retry(
+        stop=stop_after_attempt(MAX_RETRIES + 1),
+        wait=wait_exponential(multiplier=RETRY_BASE_DELAY, max=60),
+        retry=_should_retry,
+        reraise=True,
+    )
+    async def _open_stream_async(
+        self,
+        messages: list[dict[str, Any]],
+        *,
+        temperature: float,
+        extra_body: dict[str, Any] | None,
+    ) -> AsyncStream[ChatCompletionChunk]:
+        # Retried like chat_completions_async: nothing has been consumed yet.
+        return await self._async_client.chat.completions.create(
+            model=self._model,
+            messages=cast(list[ChatCompletionMessageParam], messages),
+            temperature=temperature,
+            extra_body=extra_body,
+            stream=True,
+            # Ask for the final usage-only chunk; streams omit usage otherwise.
+            stream_options={"include_usage": True},
+        )
+
+    async def chat_completions_stream_async(
+        self,
+        messages: list[dict[str, Any]],
+        *,
+        temperature: float,
+        on_delta: Callable[[str], Awaitable[None]],
+        extra_body: dict[str, Any] | None = None,
+        trace_id: str = "unknown",
+    ) -> tuple[dict[str, Any], float]:
+        """Stream a chat completion, awaiting on_delta with each content delta.
+
+        Opening the stream is retried like chat_completions_async; errors after
+        the first chunk are not, since on_delta has already seen partial output.
+        An exception raised by on_delta closes the stream and propagates.
+
+        Returns:
+            Tuple of (response dict shaped like a non-streaming completion, latency in ms).
+
+        Raises:
+            openai.APIError: API call failed.
+        """
+        start = time.perf_counter()
+        log_trace_event(
+            {
+                "kind": "llm_request",
+                "trace_id": trace_id,
+                "mode": "stream",
+                "model": self._model,
+                "base_url": self._config.base_url,
+                "temperature": temperature,
+                "extra_body": extra_body,
+                "messages": messages,
+            }
+        )
+        parts: list[str] = []
+        finish_reason: str | None = None
+        usage: dict[str, Any] = {}
+        first_chunk_ms: float | None = None
+        try:
+            stream = await self._open_stream_async(
+                messages, temperature=temperature, extra_body=extra_body
+            )
+            try:
+                async for chunk in stream:
+                    if chunk.usage is not None:
+                        usage = chunk.usage.model_dump()
+                    if not chunk.choices:
+                        continue
+                    choice = chunk.choices[0]
+                    finish_reason = choice.finish_reason or finish_reason
+                    delta = choice.delta.content
+                    if delta:
+                        if first_chunk_ms is None:
+                            first_chunk_ms = round((time.perf_counter() - start) * 1000, 2)
+                        parts.append(delta)
+                        await on_delta(delta)
+            finally:
+                await stream.close()
+        except openai.APIError as exc:
+            latency_ms = round((time.perf_counter() - start) * 1000, 2)
+            error_event: dict[str, Any] = {
+                "kind": "llm_error",
+                "trace_id": trace_id,
+                "mode": "stream",
+                "latency_ms": latency_ms,
+                "error_type": type(exc).__name__,
+                "error": str(exc),
+            }
+            if isinstance(exc, openai.APIStatusError):
+                error_event["status_code"] = exc.status_code
+            log_trace_event(error_event)
+            logger.warning(
+                "[%s] chat_completions_stream_async error: %s (latency=%.1fms)",
+                trace_id,
+                exc,
+                latency_ms,
+            )
+            raise
+
+        latency_ms = round((time.perf_counter() - start) * 1000, 2)
+        payload: dict[str, Any] = {
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(parts)},
+                    "finish_reason": finish_reason,
+                }
+            ],
+            "usage": usage,
+        }
+        log_trace_event(
+            {
+                "kind": "llm_response",
+                "trace_id": trace_id,
+                "mode": "stream",
+                "latency_ms": latency_ms,
+                "first_chunk_ms": first_chunk_ms,
+                "response": payload,
+            }
+        )
+        logger.debug(
+            "[%s] chat_completions_stream_async ok (first_chunk=%sms, latency=%.1fms)",
+            trace_id,
+            first_chunk_ms,
+            latency_ms,
+        )
+        return payload, latency_ms
@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -83,6 +84,36 @@ class ApplyLLMClient:
             latency_ms=latency_ms,
         )
 
+    async def apply_stream(
+        self,
+        request: ApplyRequest,
+        on_delta: Callable[[str], Awaitable[None]],
+    ) -> ApplyResponse:
+        """Like `apply`, but consumes the merged code as it is generated.
+
+        on_delta is awaited with each chunk of raw model output; raising from
+        it aborts the request and propagates to the caller.
+
+        Raises:
+            ValueError: Cannot parse merged code from API response.
+            openai.APIError: API call failed (rate limit, timeout, etc.).
+        """
+        messages = self._build_messages(request)
+        trace_id = request.metadata.get("trace_id", "unknown")
+
+        data, latency_ms = await self._chat_client.chat_completions_stream_async(
+            messages=messages,
+            temperature=self._temperature,
+            on_delta=on_delta,
+            trace_id=trace_id,
+        )
+
+        return ApplyResponse(
+            merged_code=self._extract_merged_code(data),
+            usage=data.get("usage", {}),
+            latency_ms=latency_ms,
+        )
+
     def _build_messages(self, request: ApplyRequest) -> list[dict[str, Any]]:
         instruction = (request.instruction or "").strip()
         parts: list[str] = []
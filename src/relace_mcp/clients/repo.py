@@ -1,5 +1,8 @@
+import asyncio
+import importlib.util
 import logging
 import random
+import threading
 import time
 from typing import Any, cast
 
@@ -19,11 +22,58 @@ from .exceptions import RelaceAPIError, raise_for_status
 logger = logging.getLogger(__name__)
 
 
+# Connection pool shared by all Repos API calls of one client. Keep-alive
+# connections avoid a TCP + TLS handshake per request.
+_POOL_LIMITS = httpx.Limits(
+    max_connections=32,
+    max_keepalive_connections=16,
+    keepalive_expiry=60.0,
+)
+# HTTP/2 multiplexing is used when the optional `h2` package is installed.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _backoff_delay(attempt: int, retry_after: float | None = None) -> float:
+    delay = retry_after or RETRY_BASE_DELAY * (2**attempt)
+    return float(delay + random.uniform(0, 0.5))  # nosec B311
+
+
+def _retrieve_payload(
+    query: str,
+    branch: str,
+    hash: str,
+    score_threshold: float,
+    token_limit: int,
+    include_content: bool,
+) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "query": query,
+        "score_threshold": score_threshold,
+        "token_limit": token_limit,
+        "include_content": include_content,
+    }
+    if branch:
+        payload["branch"] = branch
+    if hash:
+        payload["hash"] = hash
+    return payload
+
+
+async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except Exception as exc:
+        logger.debug("Failed to close replaced async HTTP client: %s", exc)
+
+
 class RelaceRepoClient:
     """Client for Relace Repos API (api.relace.run).
 
     Provides source control operations (list, create, upload) and
     semantic retrieval for cloud-based code search.
+
+    A single keep-alive connection pool is shared across calls and threads.
+    Async callers get a separate pool bound to their event loop.
     """
 
     def __init__(self, config: RelaceConfig) -> None:
@@ -31,6 +81,11 @@ class RelaceRepoClient:
         self._base_url = RELACE_API_ENDPOINT.rstrip("/")
         self._forced_repo_id: str | None = RELACE_REPO_ID
         self._cached_repo_ids: dict[str, str] = {}
+        self._client_lock = threading.Lock()
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
+        self._async_client_loop: asyncio.AbstractEventLoop | None = None
+        self._closing_tasks: set[asyncio.Task[None]] = set()
 
     def _get_headers(self, content_type: str = "application/json") -> dict[str, str]:
         """Build request headers with authorization."""
@@ -39,6 +94,156 @@ class RelaceRepoClient:
             "Content-Type": content_type,
         }
 
+    def _get_client(self) -> httpx.Client:
+        """Return the shared pooled client, creating it on first use."""
+        client = self._client
+        if client is None or client.is_closed:
+            with self._client_lock:
+                client = self._client
+                if client is None or client.is_closed:
+                    client = httpx.Client(http2=_HTTP2_AVAILABLE, limits=_POOL_LIMITS, timeout=60.0)
+                    self._client = client
+        return client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the pooled async client for the running event loop.
+
+        Async connections are bound to the loop that opened them, so a new pool
+        is created when called from a different loop.
+        """
+        loop = asyncio.get_running_loop()
+        stale: httpx.AsyncClient | None = None
+        stale_loop: asyncio.AbstractEventLoop | None = None
+        with self._client_lock:
+            client = self._async_client
+            if client is None or client.is_closed or self._async_client_loop is not loop:
+                if client is not None and not client.is_closed:
+                    stale, stale_loop = client, self._async_client_loop
+                client = httpx.AsyncClient(
+                    http2=_HTTP2_AVAILABLE, limits=_POOL_LIMITS, timeout=60.0
+                )
+                self._async_client = client
+                self._async_client_loop = loop
+        if stale is not None:
+            self._close_stale_async_client(stale, stale_loop)
+        return client
+
+    def _close_stale_async_client(
+        self, client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None
+    ) -> None:
+        """Release a pool replaced by one for another event loop.
+
+        The pool is closed on its own loop when that loop is still running;
+        otherwise its connections are closed best-effort from the current loop.
+        """
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_aclose_quietly(client), loop)
+            return
+        task = asyncio.get_running_loop().create_task(_aclose_quietly(client))
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+    def close(self) -> None:
+        """Close the pooled sync client. It is recreated on next use."""
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close both the async and sync connection pools."""
+        with self._client_lock:
+            async_client, self._async_client = self._async_client, None
+            self._async_client_loop = None
+        if async_client is not None:
+            await async_client.aclose()
+        self.close()
+
+    def _check_response(
+        self,
+        resp: httpx.Response,
+        trace_id: str,
+        latency_ms: int,
+        attempt: int,
+    ) -> float | None:
+        """Classify a response.
+
+        Returns:
+            None on success, or the delay before the next attempt for retryable errors.
+
+        Raises:
+            RuntimeError: On non-retryable errors or when retries are exhausted.
+        """
+        try:
+            raise_for_status(resp)
+        except RelaceAPIError as exc:
+            if not exc.retryable:
+                logger.error(
+                    "[%s] Repos API %s (status=%d, latency=%dms): %s",
+                    trace_id,
+                    exc.code,
+                    resp.status_code,
+                    latency_ms,
+                    exc.message,
+                )
+                raise RuntimeError(f"Repos API error ({exc.code}): {exc.message}") from exc
+
+            logger.warning(
+                "[%s] Repos API %s (status=%d, latency=%dms, attempt=%d/%d)",
+                trace_id,
+                exc.code,
+                resp.status_code,
+                latency_ms,
+                attempt + 1,
+                MAX_RETRIES + 1,
+            )
+            if attempt < MAX_RETRIES:
+                return _backoff_delay(attempt, exc.retry_after)
+            raise RuntimeError(f"Repos API error ({exc.code}): {exc.message}") from exc
+
+        logger.debug(
+            "[%s] Repos API success (status=%d, latency=%dms)",
+            trace_id,
+            resp.status_code,
+            latency_ms,
+        )
+        return None
+
+    def _check_transport_error(
+        self,
+        exc: httpx.RequestError,
+        trace_id: str,
+        timeout: float,
+        attempt: int,
+    ) -> float:
+        """Log a timeout/network error and return the retry delay.
+
+        Raises:
+            RuntimeError: When retries are exhausted.
+        """
+        if isinstance(exc, httpx.TimeoutException):
+            logger.warning(
+                "[%s] Repos API timeout after %.1fs (attempt=%d/%d)",
+                trace_id,
+                timeout,
+                attempt + 1,
+                MAX_RETRIES + 1,
+            )
+            if attempt < MAX_RETRIES:
+                return _backoff_delay(attempt)
+            raise RuntimeError(f"Repos API request timed out after {timeout}s") from exc
+
+        logger.warning(
+            "[%s] Repos API network error: %s (attempt=%d/%d)",
+            trace_id,
+            exc,
+            attempt + 1,
+            MAX_RETRIES + 1,
+        )
+        if attempt < MAX_RETRIES:
+            return _backoff_delay(attempt)
+        raise RuntimeError(f"Repos API network error: {exc}") from exc
+
     def _request_with_retry(
         self,
         method: str,
@@ -63,82 +268,53 @@ class RelaceRepoClient:
             RuntimeError: When request fails after all retries.
         """
         last_exc: Exception | None = None
+        client = self._get_client()
 
         for attempt in range(MAX_RETRIES + 1):
             try:
                 started_at = time.monotonic()
-                with httpx.Client(timeout=timeout) as client:
-                    resp = client.request(method, url, **kwargs)
+                resp = client.request(method, url, timeout=timeout, **kwargs)
                 latency_ms = int((time.monotonic() - started_at) * 1000)
+            except httpx.RequestError as exc:
+                last_exc = exc
+                time.sleep(self._check_transport_error(exc, trace_id, timeout, attempt))
+                continue
 
-                try:
-                    raise_for_status(resp)
-                except RelaceAPIError as exc:
-                    if not exc.retryable:
-                        logger.error(
-                            "[%s] Repos API %s (status=%d, latency=%dms): %s",
-                            trace_id,
-                            exc.code,
-                            resp.status_code,
-                            latency_ms,
-                            exc.message,
-                        )
-                        raise RuntimeError(f"Repos API error ({exc.code}): {exc.message}") from exc
-
-                    last_exc = exc
-                    logger.warning(
-                        "[%s] Repos API %s (status=%d, latency=%dms, attempt=%d/%d)",
-                        trace_id,
-                        exc.code,
-                        resp.status_code,
-                        latency_ms,
-                        attempt + 1,
-                        MAX_RETRIES + 1,
-                    )
-                    if attempt < MAX_RETRIES:
-                        delay = exc.retry_after or RETRY_BASE_DELAY * (2**attempt)
-                        delay += random.uniform(0, 0.5)  # nosec B311
-                        time.sleep(delay)
-                        continue
-                    raise RuntimeError(f"Repos API error ({exc.code}): {exc.message}") from exc
-
-                logger.debug(
-                    "[%s] Repos API success (status=%d, latency=%dms)",
-                    trace_id,
-                    resp.status_code,
-                    latency_ms,
-                )
+            delay = self._check_response(resp, trace_id, latency_ms, attempt)
+            if delay is None:
                 return resp
+            time.sleep(delay)
 
-            except httpx.TimeoutException as exc:
-                last_exc = exc
-                logger.warning(
-                    "[%s] Repos API timeout after %.1fs (attempt=%d/%d)",
-                    trace_id,
-                    timeout,
-                    attempt + 1,
-                    MAX_RETRIES + 1,
-                )
-                if attempt < MAX_RETRIES:
-                    delay = RETRY_BASE_DELAY * (2**attempt) + random.uniform(0, 0.5)  # nosec B311
-                    time.sleep(delay)
-                    continue
-                raise RuntimeError(f"Repos API request timed out after {timeout}s") from exc
+        raise RuntimeError(
+            f"Repos API request failed after {MAX_RETRIES + 1} attempts"
+        ) from last_exc
 
+    async def _arequest_with_retry(
+        self,
+        method: str,
+        url: str,
+        trace_id: str = "unknown",
+        timeout: float = 60.0,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Async counterpart of `_request_with_retry` using the pooled async client."""
+        last_exc: Exception | None = None
+        client = self._get_async_client()
+
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                started_at = time.monotonic()
+                resp = await client.request(method, url, timeout=timeout, **kwargs)
+                latency_ms = int((time.monotonic() - started_at) * 1000)
             except httpx.RequestError as exc:
                 last_exc = exc
-                logger.warning(
-                    "[%s] Repos API network error: %s (attempt=%d/%d)",
-                    trace_id,
-                    exc,
-                    attempt + 1,
-                    MAX_RETRIES + 1,
-                )
-                if attempt < MAX_RETRIES:
-                    delay = RETRY_BASE_DELAY * (2**attempt) + random.uniform(0, 0.5)  # nosec B311
-                    time.sleep(delay)
-                    continue
-                raise RuntimeError(f"Repos API network error: {exc}") from exc
+                await asyncio.sleep(self._check_transport_error(exc, trace_id, timeout, attempt))
+                continue
+
+            delay = self._check_response(resp, trace_id, latency_ms, attempt)
+            if delay is None:
+                return resp
+            await asyncio.sleep(delay)
 
         raise RuntimeError(
             f"Repos API request failed after {MAX_RETRIES + 1} attempts"
@@ -378,23 +554,37 @@ class RelaceRepoClient:
         Returns:
             Search results with matching files and content.
         """
-        url = f"{self._base_url}/repo/{repo_id}/retrieve"
-        payload: dict[str, Any] = {
-            "query": query,
-            "score_threshold": score_threshold,
-            "token_limit": token_limit,
-            "include_content": include_content,
-        }
-        if branch:
-            payload["branch"] = branch
-        if hash:
-            payload["hash"] = hash
         resp = self._request_with_retry(
             "POST",
-            url,
+            f"{self._base_url}/repo/{repo_id}/retrieve",
             trace_id=trace_id,
             headers=self._get_headers(),
-            json=payload,
+            json=_retrieve_payload(
+                query, branch, hash, score_threshold, token_limit, include_content
+            ),
+        )
+        return cast(dict[str, Any], resp.json())
+
+    async def aretrieve(
+        self,
+        repo_id: str,
+        query: str,
+        branch: str = "",
+        hash: str = "",
+        score_threshold: float = 0.3,
+        token_limit: int = 30000,
+        include_content: bool = True,
+        trace_id: str = "unknown",
+    ) -> dict[str, Any]:
+        """Async counterpart of `retrieve`; see it for argument details."""
+        resp = await self._arequest_with_retry(
+            "POST",
+            f"{self._base_url}/repo/{repo_id}/retrieve",
+            trace_id=trace_id,
+            headers=self._get_headers(),
+            json=_retrieve_payload(
+                query, branch, hash, score_threshold, token_limit, include_content
+            ),
         )
         return cast(dict[str, Any], resp.json())
 
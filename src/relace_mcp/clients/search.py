@@ -64,6 +64,11 @@ class SearchLLMClient:
         """Return the API compatibility mode (relace or openai)."""
         return self._provider_config.api_compat
 
+    @property
+    def model(self) -> str:
+        """Return the configured search model name."""
+        return self._provider_config.model
+
     def chat(
         self,
         messages: list[dict[str, Any]],
@@ -193,7 +193,15 @@ APPLY_PROMPT_FILE: str | None
 SEARCH_TEMPERATURE: float
 SEARCH_TIMEOUT_SECONDS: float
 SEARCH_MAX_TURNS: int
+SEARCH_STALL_TURNS: int
 SEARCH_PARALLEL_TOOL_CALLS: bool
+SEARCH_MAX_CONCURRENT_TOOLS: int
+SEARCH_PREFETCH: bool
+SEARCH_RESULT_CACHE: bool
+SEARCH_RESULT_CACHE_TTL_SECONDS: int
+SEARCH_TOOL_MEMO: bool
+SEARCH_TOOL_MEMO_SESSION: bool
+SEARCH_TOOL_MEMO_REFERENCE: bool
 SEARCH_TOP_P: float | None
 SEARCH_PROVIDER: str
 SEARCH_API_KEY: str
@@ -208,7 +216,13 @@ REPO_SYNC_MAX_FILES: int
 REPO_LIST_MAX: int
 RELACE_DEFAULT_ENCODING: str | None
 APPLY_SEMANTIC_CHECK: bool
+APPLY_STREAM: bool
+APPLY_LOCAL_MERGE: bool
+APPLY_WINDOW_MIN_LINES: int
+APPLY_BATCH_MAX_CONCURRENCY: int
 MCP_LOG_LEVEL: str
+MCP_LOG_ASYNC: bool
+MCP_TRACE_SEGMENTS: bool
 MCP_LOGGING_MODE: str
 MCP_LOGGING: bool
 MCP_LOG_REDACT: bool
@@ -222,10 +236,21 @@ SEARCH_BASH_TOOLS: bool
 SEARCH_LSP_TOOLS: bool
 SEARCH_LSP_TIMEOUT_SECONDS: float
 SEARCH_LSP_MAX_CLIENTS: int
+SEARCH_LSP_MAX_OPEN_DOCUMENTS: int
+SEARCH_LSP_FS_WATCH: bool
+SEARCH_LSP_PIPELINE: bool
+SEARCH_LSP_REPLICAS: int
+SEARCH_LSP_PREWARM: bool
+SEARCH_LSP_IDLE_TTL_SECONDS: int
+SEARCH_LSP_READY_TIMEOUT_SECONDS: int
+SEARCH_GREP_INDEX: bool
+MCP_FILE_CACHE_MB: int
 MCP_BACKGROUND_INDEX_MONITOR: bool
 MCP_BACKGROUND_INDEX_INTERVAL_SECONDS: int
 MCP_BACKGROUND_INDEX_INITIAL_DELAY_SECONDS: int
 RELACE_UPLOAD_MAX_WORKERS: int
+RELACE_SYNC_BATCH_BYTES: int
+RELACE_SYNC_GIT_DIFF: bool
 RELACE_API_KEY: str | None
 MCP_BASE_DIR: str | None
 MCP_EXTRA_PATHS: tuple[str, ...]
@@ -250,7 +275,17 @@ def reload_settings_from_env() -> None:
         "SEARCH_TEMPERATURE": _parse_float_env("SEARCH_TEMPERATURE", 1.0),
         "SEARCH_TIMEOUT_SECONDS": _parse_positive_float_env("SEARCH_TIMEOUT_SECONDS", 120.0),
         "SEARCH_MAX_TURNS": _parse_positive_int_env("SEARCH_MAX_TURNS", 6),
+        "SEARCH_STALL_TURNS": _parse_nonnegative_int_env("SEARCH_STALL_TURNS", 0),
         "SEARCH_PARALLEL_TOOL_CALLS": env_bool("SEARCH_PARALLEL_TOOL_CALLS", default=True),
+        "SEARCH_MAX_CONCURRENT_TOOLS": _parse_positive_int_env("SEARCH_MAX_CONCURRENT_TOOLS", 16),
+        "SEARCH_PREFETCH": env_bool("SEARCH_PREFETCH", default=False),
+        "SEARCH_RESULT_CACHE": env_bool("SEARCH_RESULT_CACHE", default=False),
+        "SEARCH_RESULT_CACHE_TTL_SECONDS": _parse_positive_int_env(
+            "SEARCH_RESULT_CACHE_TTL_SECONDS", 3600
+        ),
+        "SEARCH_TOOL_MEMO": env_bool("SEARCH_TOOL_MEMO", default=False),
+        "SEARCH_TOOL_MEMO_SESSION": env_bool("SEARCH_TOOL_MEMO_SESSION", default=False),
+        "SEARCH_TOOL_MEMO_REFERENCE": env_bool("SEARCH_TOOL_MEMO_REFERENCE", default=False),
         "SEARCH_TOP_P": _parse_optional_float_env("SEARCH_TOP_P"),
         "SEARCH_PROVIDER": os.getenv("SEARCH_PROVIDER", "").strip(),
         "SEARCH_API_KEY": os.getenv("SEARCH_API_KEY", "").strip(),
@@ -268,7 +303,13 @@ def reload_settings_from_env() -> None:
         "REPO_LIST_MAX": _parse_positive_int_env("RELACE_REPO_LIST_MAX", 10000),
         "RELACE_DEFAULT_ENCODING": _parse_optional_stripped_env("RELACE_DEFAULT_ENCODING"),
         "APPLY_SEMANTIC_CHECK": env_bool("APPLY_SEMANTIC_CHECK", default=False),
+        "APPLY_STREAM": env_bool("APPLY_STREAM", default=False),
+        "APPLY_LOCAL_MERGE": env_bool("APPLY_LOCAL_MERGE", default=False),
+        "APPLY_WINDOW_MIN_LINES": _parse_nonnegative_int_env("APPLY_WINDOW_MIN_LINES", 0),
+        "APPLY_BATCH_MAX_CONCURRENCY": _parse_positive_int_env("APPLY_BATCH_MAX_CONCURRENCY", 4),
         "MCP_LOG_LEVEL": _parse_log_level(),
+        "MCP_LOG_ASYNC": env_bool("MCP_LOG_ASYNC", default=True),
+        "MCP_TRACE_SEGMENTS": env_bool("MCP_TRACE_SEGMENTS", default=False),
         "MCP_LOGGING_MODE": _parse_logging_mode(),
         "RELACE_CLOUD_TOOLS": env_bool("RELACE_CLOUD_TOOLS", default=False),
         "RETRIEVAL_BACKEND": _parse_retrieval_backend(),
@@ -279,6 +320,19 @@ def reload_settings_from_env() -> None:
         "SEARCH_LSP_TOOLS": env_bool("SEARCH_LSP_TOOLS", default=False),
         "SEARCH_LSP_TIMEOUT_SECONDS": _parse_positive_float_env("SEARCH_LSP_TIMEOUT_SECONDS", 15.0),
         "SEARCH_LSP_MAX_CLIENTS": _parse_nonnegative_int_env("SEARCH_LSP_MAX_CLIENTS", 2),
+        "SEARCH_LSP_MAX_OPEN_DOCUMENTS": _parse_nonnegative_int_env(
+            "SEARCH_LSP_MAX_OPEN_DOCUMENTS", 32
+        ),
+        "SEARCH_LSP_FS_WATCH": env_bool("SEARCH_LSP_FS_WATCH", default=False),
+        "SEARCH_LSP_PIPELINE": env_bool("SEARCH_LSP_PIPELINE", default=False),
+        "SEARCH_LSP_REPLICAS": _parse_positive_int_env("SEARCH_LSP_REPLICAS", 1),
+        "SEARCH_LSP_PREWARM": env_bool("SEARCH_LSP_PREWARM", default=False),
+        "SEARCH_LSP_IDLE_TTL_SECONDS": _parse_nonnegative_int_env("SEARCH_LSP_IDLE_TTL_SECONDS", 0),
+        "SEARCH_LSP_READY_TIMEOUT_SECONDS": _parse_nonnegative_int_env(
+            "SEARCH_LSP_READY_TIMEOUT_SECONDS", 10
+        ),
+        "SEARCH_GREP_INDEX": env_bool("SEARCH_GREP_INDEX", default=False),
+        "MCP_FILE_CACHE_MB": _parse_nonnegative_int_env("MCP_FILE_CACHE_MB", 64),
         "MCP_BACKGROUND_INDEX_MONITOR": env_bool(
             "MCP_BACKGROUND_INDEX_MONITOR",
             default=False,
@@ -292,6 +346,8 @@ def reload_settings_from_env() -> None:
             30,
         ),
         "RELACE_UPLOAD_MAX_WORKERS": _parse_positive_int_env("RELACE_UPLOAD_MAX_WORKERS", 8),
+        "RELACE_SYNC_BATCH_BYTES": _parse_nonnegative_int_env("RELACE_SYNC_BATCH_BYTES", 0),
+        "RELACE_SYNC_GIT_DIFF": env_bool("RELACE_SYNC_GIT_DIFF", default=False),
         "RELACE_API_KEY": _parse_optional_stripped_env("RELACE_API_KEY"),
         "MCP_BASE_DIR": _parse_optional_stripped_env("MCP_BASE_DIR"),
         "MCP_EXTRA_PATHS": _parse_extra_paths(),
@@ -1,3 +1,4 @@
+from .cache import CachedText, clear_text_cache, load_text, warm_text
 from .codec import (
     atomic_write,
     decode_text_best_effort,
@@ -11,13 +12,17 @@ from .detect import detect_project_encoding
 from .exceptions import EncodingDetectionError
 
 __all__ = [
+    "CachedText",
     "EncodingDetectionError",
     "atomic_write",
+    "clear_text_cache",
     "decode_text_best_effort",
     "decode_text_with_fallback",
     "detect_project_encoding",
     "get_project_encoding",
+    "load_text",
     "read_text_best_effort",
     "read_text_with_fallback",
     "set_project_encoding",
+    "warm_text",
 ]
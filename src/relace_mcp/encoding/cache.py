@@ -0,0 +1,191 @@
+import os
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+from ..utils import racy_cutoff_ns
+from .codec import _looks_like_binary, decode_text_with_fallback, get_project_encoding
+from .exceptions import EncodingDetectionError
+
+# Characters str.splitlines() treats as line boundaries ("\r\n" counts as one).
+_LINE_BREAKS = frozenset("\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029")
+
+_CacheKey = tuple[str, int, int, int, str | None]
+
+
+class CachedText:
+    """Decoded content of one file version, with a lazily built line index.
+
+    `text` follows read_text_best_effort semantics (None for binary files);
+    `with_fallback()` follows read_text_with_fallback semantics. Both are
+    derived from a single read so view_file and fast_apply share one entry.
+    """
+
+    __slots__ = ("text", "encoding", "_strict", "_starts", "_ends", "nbytes")
+
+    def __init__(self, text: str | None, encoding: str | None, strict: str | None) -> None:
+        self.text = text
+        # Encoding detected with read_text_with_fallback rules, None if undetectable.
+        self.encoding = encoding
+        # Strict decoding when it differs from `text` (low-confidence detections).
+        self._strict = strict
+        self._starts: array[int] | None = None
+        self._ends: array[int] | None = None
+        self.nbytes = sys.getsizeof(text) + (sys.getsizeof(strict) if strict else 0)
+
+    def with_fallback(self) -> tuple[str, str] | None:
+        """Return (content, encoding) as read_text_with_fallback would, or None."""
+        if self.text is None or self.encoding is None:
+            return None
+        return (self._strict if self._strict is not None else self.text), self.encoding
+
+    def _index(self) -> tuple["array[int]", "array[int]"]:
+        if self._starts is None or self._ends is None:
+            starts: array[int] = array("q")
+            ends: array[int] = array("q")
+            pos = 0
+            for line in (self.text or "").splitlines(keepends=True):
+                starts.append(pos)
+                end = pos + len(line)
+                if line.endswith("\r\n"):
+                    ends.append(end - 2)
+                elif line[-1] in _LINE_BREAKS:
+                    ends.append(end - 1)
+                else:
+                    ends.append(end)
+                pos = end
+            self._starts, self._ends = starts, ends
+            self.nbytes += starts.itemsize * len(starts) * 2
+        return self._starts, self._ends
+
+    @property
+    def line_count(self) -> int:
+        return len(self._index()[0])
+
+    def lines(self, start_idx: int, end_idx: int) -> list[str]:
+        """Return lines [start_idx, end_idx) as str.splitlines() would, in O(range)."""
+        text = self.text or ""
+        starts, ends = self._index()
+        return [text[starts[i] : ends[i]] for i in range(start_idx, min(end_idx, len(starts)))]
+
+
+def _decode(raw: bytes, path: Path) -> CachedText:
+    if _looks_like_binary(raw):
+        return CachedText(None, None, None)
+    preferred = get_project_encoding()
+    try:
+        # Same rules as decode_text_best_effort; any success here is also what
+        # read_text_with_fallback's lower coherence threshold would return.
+        text, encoding = decode_text_with_fallback(
+            raw, path=path, preferred_encoding=preferred, min_coherence=0.2
+        )
+        return CachedText(text, encoding, None)
+    except EncodingDetectionError:
+        pass
+    display = raw.decode("utf-8", errors="replace")
+    try:
+        strict, encoding = decode_text_with_fallback(
+            raw, path=path, preferred_encoding=preferred, min_coherence=0.0
+        )
+    except EncodingDetectionError:
+        return CachedText(display, None, None)
+    return CachedText(display, encoding, strict)
+
+
+class TextCache:
+    """LRU of decoded files keyed by (path, mtime_ns, size, inode, project encoding)."""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[_CacheKey, CachedText] = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path: Path, budget_bytes: int) -> CachedText:
+        """Return the cached entry for path, reading it on a miss.
+
+        Raises:
+            OSError: If the file cannot be stat'ed or read.
+        """
+        st = os.stat(path)
+        key = (str(path), st.st_mtime_ns, st.st_size, st.st_ino, get_project_encoding())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = _decode(path.read_bytes(), path)
+        # Files modified this close to the read are not cached.
+        if st.st_mtime_ns < racy_cutoff_ns():
+            self._store(key, entry, budget_bytes)
+        return entry
+
+    def _store(self, key: _CacheKey, entry: CachedText, budget_bytes: int) -> None:
+        if entry.nbytes > budget_bytes // 4:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= old.nbytes
+            self._entries[key] = entry
+            self._nbytes += entry.nbytes
+            self._evict_locked(budget_bytes)
+
+    def _evict_locked(self, budget_bytes: int) -> None:
+        # Recount: line indexes built after insertion grow entries in place.
+        self._nbytes = sum(e.nbytes for e in self._entries.values())
+        while self._entries and self._nbytes > budget_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+
+    def contains(self, path: Path) -> bool:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        key = (str(path), st.st_mtime_ns, st.st_size, st.st_ino, get_project_encoding())
+        with self._lock:
+            return key in self._entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+
+_TEXT_CACHE = TextCache()
+
+
+def _budget_bytes() -> int:
+    from ..config import settings as _settings
+
+    return _settings.MCP_FILE_CACHE_MB * 1024 * 1024
+
+
+def load_text(path: Path) -> CachedText:
+    """Read and decode a file through the shared cache (raises OSError)."""
+    budget = _budget_bytes()
+    if budget <= 0:
+        return _decode(path.read_bytes(), path)
+    return _TEXT_CACHE.load(path, budget)
+
+
+def warm_text(path: Path) -> bool:
+    """Load a file into the shared cache ahead of use; return True if it was read now."""
+    if _TEXT_CACHE.contains(path):
+        return False
+    try:
+        load_text(path)._index()
+    except OSError:
+        return False
+    return True
+
+
+def clear_text_cache() -> None:
+    _TEXT_CACHE.clear()
@@ -211,13 +211,14 @@ def read_text_with_fallback(path: Path) -> tuple[str, str]:
     Raises:
         EncodingDetectionError: If encoding cannot be detected or file is not text.
     """
-    raw = path.read_bytes()
-    return decode_text_with_fallback(
-        raw,
-        path=path,
-        preferred_encoding=_project_encoding,
-        min_coherence=0.0,
-    )
+    from .cache import load_text
+
+    # Served from the shared decoded-text cache, so a file fast_apply just
+    # read through view_file (or vice versa) is not decoded twice.
+    decoded = load_text(path).with_fallback()
+    if decoded is None:
+        raise EncodingDetectionError(str(path))
+    return decoded
 
 
 def read_text_best_effort(path: Path, *, errors: str = "replace") -> str | None:
@@ -1,13 +1,32 @@
 import logging
 import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from relace_mcp.lsp.events import log_lsp_request_error
 from relace_mcp.lsp.types import LSPError
+from relace_mcp.utils import racy_cutoff_ns, uri_to_path
 
 logger = logging.getLogger(__name__)
 
+# Recorded for documents read within the racy-stat window: a same-tick,
+# same-size edit keeps mtime and size, so the next open_file resends the text.
+_UNTRUSTED_MTIME_NS = -1
+
+
+@dataclass
+class _OpenDocument:
+    version: int
+    mtime_ns: int
+    size: int
+
+
+def _trusted_mtime_ns(st: os.stat_result) -> int:
+    return st.st_mtime_ns if st.st_mtime_ns < racy_cutoff_ns() else _UNTRUSTED_MTIME_NS
+
 
 class LSPSession:
     """Handles LSP protocol handshake, document lifecycle, and server-initiated requests.
@@ -24,6 +43,8 @@ class LSPSession:
         send_notification_fn: Any,
         send_response_fn: Any,
         send_error_response_fn: Any,
+        *,
+        max_open_documents: int = 0,
     ) -> None:
         self._config = config
         self._workspace = workspace
@@ -32,6 +53,15 @@ class LSPSession:
         self._send_notification = send_notification_fn
         self._send_response = send_response_fn
         self._send_error_response = send_error_response_fn
+        # Documents kept open between requests (LRU); 0 closes after every request.
+        self._max_open_documents = max_open_documents
+        self._documents: OrderedDict[str, _OpenDocument] = OrderedDict()
+        # Requests currently using each URI; such documents are never closed.
+        self._in_use: dict[str, int] = {}
+        # Work-done progress tokens the server has created or begun but not ended
+        # (e.g. initial indexing). Written by the reader thread.
+        self._progress = threading.Condition()
+        self._active_progress: set[Any] = set()
 
     def initialize(self, startup_timeout: float) -> None:
         """Send LSP initialize + initialized handshake."""
@@ -72,6 +102,10 @@ class LSPSession:
     def open_file(self, file_path: str) -> str:
         """Open a file in the language server and return its URI.
 
+        A document that is still open from an earlier request is reused; its
+        text is resent with didChange only if the file's mtime or size changed.
+        Every successful call must be paired with release_file.
+
         Args:
             file_path: Relative path within the workspace.
 
@@ -95,13 +129,27 @@ class LSPSession:
             raise LSPError(f"Path escapes workspace: {file_path}")
 
         uri = abs_path.as_uri()
+        doc = self._documents.get(uri)
 
         try:
+            st = abs_path.stat()
+            if doc is not None and (doc.mtime_ns, doc.size) == (st.st_mtime_ns, st.st_size):
+                self._documents.move_to_end(uri)
+                self._acquire(uri)
+                return uri
             with open(abs_path, encoding="utf-8", errors="replace") as f:
                 content = f.read()
         except Exception as e:
+            if doc is not None and not self._in_use.get(uri):
+                self.close_file(uri)
             raise LSPError(f"Cannot read file: {e}") from e
 
+        if doc is not None:
+            self._documents.move_to_end(uri)
+            self._send_change(uri, doc, content, st)
+            self._acquire(uri)
+            return uri
+
         self._send_notification(
             "textDocument/didOpen",
             {
@@ -113,12 +161,126 @@ class LSPSession:
                 }
             },
         )
+        self._acquire(uri)
+        if self._max_open_documents > 0:
+            self._documents[uri] = _OpenDocument(1, _trusted_mtime_ns(st), st.st_size)
+            self._evict_documents()
         return uri
 
+    def _send_change(self, uri: str, doc: _OpenDocument, content: str, st: os.stat_result) -> None:
+        doc.version += 1
+        doc.mtime_ns, doc.size = _trusted_mtime_ns(st), st.st_size
+        self._send_notification(
+            "textDocument/didChange",
+            {
+                "textDocument": {"uri": uri, "version": doc.version},
+                "contentChanges": [{"text": content}],
+            },
+        )
+
+    def apply_workspace_changes(self, changes: list[dict[str, Any]]) -> None:
+        """Bring open documents in line with file events from a workspace sync.
+
+        The server treats open documents as owned by the client and ignores
+        didChangeWatchedFiles for them, so changed ones get their new text
+        via didChange and deleted ones are closed.
+        """
+        if not self._documents:
+            return
+        for change in changes:
+            try:
+                uri = Path(uri_to_path(str(change["uri"]))).resolve().as_uri()
+            except (KeyError, OSError, RuntimeError, ValueError):
+                continue
+            doc = self._documents.get(uri)
+            if doc is None:
+                continue
+            if change.get("type") != 3:
+                try:
+                    path = uri_to_path(uri)
+                    st = os.stat(path)
+                    if (doc.mtime_ns, doc.size) == (st.st_mtime_ns, st.st_size):
+                        continue
+                    with open(path, encoding="utf-8", errors="replace") as f:
+                        content = f.read()
+                except OSError:
+                    pass
+                else:
+                    self._send_change(uri, doc, content, st)
+                    continue
+            if self._in_use.get(uri):
+                # release_file closes it once the in-flight request is done.
+                del self._documents[uri]
+            else:
+                self.close_file(uri)
+
+    def _acquire(self, uri: str) -> None:
+        self._in_use[uri] = self._in_use.get(uri, 0) + 1
+
+    def _evict_documents(self) -> None:
+        excess = len(self._documents) - self._max_open_documents
+        for evicted_uri in list(self._documents):
+            if excess <= 0:
+                break
+            if self._in_use.get(evicted_uri):
+                continue
+            del self._documents[evicted_uri]
+            self._send_notification("textDocument/didClose", {"textDocument": {"uri": evicted_uri}})
+            excess -= 1
+
+    def release_file(self, uri: str) -> None:
+        """Finish a request on a document; closes it unless it is kept open or in use."""
+        remaining = self._in_use.get(uri, 0) - 1
+        if remaining > 0:
+            self._in_use[uri] = remaining
+            return
+        self._in_use.pop(uri, None)
+        if uri not in self._documents:
+            self.close_file(uri)
+        elif len(self._documents) > self._max_open_documents:
+            self._evict_documents()
+
     def close_file(self, uri: str) -> None:
         """Close a file in the language server."""
+        self._documents.pop(uri, None)
         self._send_notification("textDocument/didClose", {"textDocument": {"uri": uri}})
 
+    def forget_documents(self) -> None:
+        """Drop open-document state after the server process went away."""
+        self._documents.clear()
+        self._in_use.clear()
+
+    def wait_until_ready(self, timeout: float) -> bool:
+        """Wait until the server reports no work-done progress in flight.
+
+        Returns:
+            False if progress was still active when the timeout expired.
+        """
+        with self._progress:
+            return self._progress.wait_for(lambda: not self._active_progress, timeout=timeout)
+
+    def _track_progress(self, token: Any, active: bool) -> None:
+        if not isinstance(token, str | int):
+            return
+        with self._progress:
+            if active:
+                self._active_progress.add(token)
+            else:
+                self._active_progress.discard(token)
+                if not self._active_progress:
+                    self._progress.notify_all()
+
+    def handle_server_notification(self, method: str, params: Any) -> None:
+        """Track $/progress begin/end notifications for readiness."""
+        if method != "$/progress" or not isinstance(params, dict):
+            return
+        value = params.get("value")
+        kind = value.get("kind") if isinstance(value, dict) else None
+        if kind == "begin":
+            self._track_progress(params.get("token"), True)
+        elif kind == "end":
+            self._track_progress(params.get("token"), False)
+
     def get_settings_section(self, section: Any) -> Any:
         if not section or not isinstance(section, str):
             return self._workspace_settings
@@ -140,11 +302,15 @@ class LSPSession:
             return
 
         try:
-            if method in (
-                "client/registerCapability",
-                "client/unregisterCapability",
-                "window/workDoneProgress/create",
-            ):
+            if method == "window/workDoneProgress/create":
+                # Count the token as active right away so a request sent before
+                # the matching "begin" notification still waits for it.
+                if isinstance(params, dict):
+                    self._track_progress(params.get("token"), True)
+                self._send_response(req_id, None)
+                return
+
+            if method in ("client/registerCapability", "client/unregisterCapability"):
                 self._send_response(req_id, None)
                 return
 
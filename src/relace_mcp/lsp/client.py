@@ -1,10 +1,14 @@
 import atexit
+import concurrent.futures
 import logging
 import subprocess  # nosec B404 - required for LSP server communication
 import threading
 import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from typing import Any
 
+from relace_mcp.config import settings as _settings
 from relace_mcp.config.fs_policy import LSP_IGNORED_DIR_NAMES
 from relace_mcp.lsp._session import LSPSession
 from relace_mcp.lsp.events import (
@@ -38,9 +42,13 @@ from relace_mcp.lsp.types import (
 )
 from relace_mcp.lsp.workspace.settings import build_workspace_settings
 from relace_mcp.lsp.workspace.sync import (
+    WorkspaceFileFilter,
+    WorkspaceSyncOutcome,
     WorkspaceSyncState,
+    flush_workspace_changes,
     sync_workspace_changes,
 )
+from relace_mcp.lsp.workspace.watcher import InotifyWorkspaceWatcher, inotify_available
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +63,7 @@ _FS_SYNC_MIN_INTERVAL_SECONDS = 5.0
 _FS_SYNC_BUDGET_SECONDS = 1.0
 _FS_SYNC_MAX_FILES = 20000
 _FS_SYNC_MAX_EVENTS = 2000
+_FS_WATCH_MAX_DIRS = 8192
 
 _DEFAULT_IGNORED_DIR_NAMES = LSP_IGNORED_DIR_NAMES
 
@@ -77,6 +86,11 @@ class LSPClient:
         self._workspace = workspace
         self._lock = threading.RLock()
         self._request_lock = threading.RLock()
+        # With pipelining, requests only hold _request_lock while syncing and
+        # opening documents; _idle lets a restart wait for in-flight requests.
+        self._pipeline = _settings.SEARCH_LSP_PIPELINE
+        self._inflight = 0
+        self._idle = threading.Condition(self._request_lock)
         self._send_lock = threading.Lock()
         self._stop_event = threading.Event()
 
@@ -98,6 +112,7 @@ class LSPClient:
             stop_event=self._stop_event,
             on_server_request=self._on_server_request,
             read_chunk_size=_READ_CHUNK_SIZE,
+            on_server_notification=self._on_server_notification,
         )
         self._initialized = False
 
@@ -109,6 +124,8 @@ class LSPClient:
             snapshot_initialized=False,
             last_sync=0.0,
         )
+        self._fs_watcher: InotifyWorkspaceWatcher | None = None
+        self._fs_watch_failed = False
 
         self._atexit_cleanup_handler = self._cleanup
         atexit.register(self._atexit_cleanup_handler)
@@ -129,10 +146,14 @@ class LSPClient:
             send_notification_fn=self._send_notification,
             send_response_fn=self._send_response,
             send_error_response_fn=self._send_error_response,
+            max_open_documents=_settings.SEARCH_LSP_MAX_OPEN_DOCUMENTS,
         )
 
     def _restart_language_server(self, _reason: str) -> None:
         logger.debug("Restarting language server")
+        with self._request_lock:
+            if not self._idle.wait_for(lambda: self._inflight == 0, timeout=self._request_timeout):
+                logger.debug("Restarting language server with requests still in flight")
         self._fs_sync_state = WorkspaceSyncState(
             snapshot={},
             snapshot_initialized=False,
@@ -143,22 +164,82 @@ class LSPClient:
         self.shutdown()
         self.start()
 
-    def _sync_workspace_changes(self) -> None:
-        if not self._initialized:
-            return
-
-        outcome = sync_workspace_changes(
+    def _file_filter(self) -> WorkspaceFileFilter:
+        return WorkspaceFileFilter.build(
             workspace=self._workspace,
             workspace_settings=self._workspace_settings,
             config_files=self._config.config_files,
             file_extensions=self._config.file_extensions,
             ignored_dir_names=_DEFAULT_IGNORED_DIR_NAMES,
-            state=self._fs_sync_state,
-            min_interval_seconds=_FS_SYNC_MIN_INTERVAL_SECONDS,
-            budget_seconds=_FS_SYNC_BUDGET_SECONDS,
-            max_files=_FS_SYNC_MAX_FILES,
-            max_events=_FS_SYNC_MAX_EVENTS,
         )
+
+    def _ensure_fs_watcher(self) -> tuple[InotifyWorkspaceWatcher | None, bool]:
+        """Start the inotify watcher if enabled; returns (watcher, just_started)."""
+        if self._fs_watcher is not None:
+            return self._fs_watcher, False
+        if self._fs_watch_failed or not _settings.SEARCH_LSP_FS_WATCH:
+            return None, False
+        if not inotify_available():
+            self._fs_watch_failed = True
+            return None, False
+        watcher = InotifyWorkspaceWatcher(self._file_filter(), max_watches=_FS_WATCH_MAX_DIRS)
+        try:
+            watcher.start()
+        except OSError as exc:
+            logger.debug("Workspace watcher unavailable, using periodic scans: %s", exc)
+            self._fs_watch_failed = True
+            return None, False
+        self._fs_watcher = watcher
+        return watcher, True
+
+    def _stop_fs_watcher(self) -> None:
+        watcher = self._fs_watcher
+        self._fs_watcher = None
+        if watcher is not None:
+            watcher.close()
+
+    def _sync_workspace_changes(self) -> None:
+        if not self._initialized:
+            return
+
+        watcher, just_started = self._ensure_fs_watcher()
+        if watcher is not None and watcher.failed:
+            self._stop_fs_watcher()
+            self._fs_watch_failed = True
+            watcher = None
+        if watcher is not None and watcher.overflowed:
+            # Events were lost; rescan everything once and keep watching.
+            watcher.overflowed = False
+            just_started = True
+        outcome: WorkspaceSyncOutcome | None
+        if watcher is not None and not just_started and self._fs_sync_state.snapshot_initialized:
+            changed_paths, changed_dirs = watcher.drain()
+            if not changed_paths and not changed_dirs:
+                return
+            outcome = flush_workspace_changes(
+                file_filter=self._file_filter(),
+                state=self._fs_sync_state,
+                changed_paths=changed_paths,
+                changed_dirs=changed_dirs,
+                max_events=_FS_SYNC_MAX_EVENTS,
+            )
+        else:
+            if watcher is not None:
+                # The scan below covers everything the watcher saw so far.
+                watcher.drain()
+                self._fs_sync_state.last_sync = float("-inf")
+            outcome = sync_workspace_changes(
+                workspace=self._workspace,
+                workspace_settings=self._workspace_settings,
+                config_files=self._config.config_files,
+                file_extensions=self._config.file_extensions,
+                ignored_dir_names=_DEFAULT_IGNORED_DIR_NAMES,
+                state=self._fs_sync_state,
+                min_interval_seconds=_FS_SYNC_MIN_INTERVAL_SECONDS,
+                budget_seconds=_FS_SYNC_BUDGET_SECONDS,
+                max_files=_FS_SYNC_MAX_FILES,
+                max_events=_FS_SYNC_MAX_EVENTS,
+            )
         if outcome is None:
             return
 
@@ -170,6 +251,7 @@ class LSPClient:
 
         if outcome.changes:
             self._send_notification("workspace/didChangeWatchedFiles", {"changes": outcome.changes})
+            self._session.apply_workspace_changes(outcome.changes)
 
     def _sync_workspace_changes_best_effort(self) -> None:
         try:
@@ -189,6 +271,8 @@ class LSPClient:
             self._initialized = False
 
             self._transport.cancel_all_pending()
+            self._session.forget_documents()
+            self._stop_fs_watcher()
 
             process = self._process
             self._process = None
@@ -228,6 +312,9 @@ class LSPClient:
     def _on_server_request(self, req_id: Any, method: Any, params: Any) -> None:
         self._session.handle_server_request(req_id, method, params)
 
+    def _on_server_notification(self, method: str, params: Any) -> None:
+        self._session.handle_server_notification(method, params)
+
     def _send_message(self, content: dict[str, Any]) -> None:
         """Send a message to the language server."""
         self._transport.send_message(self._process, content)
@@ -244,6 +331,14 @@ class LSPClient:
             timeout=effective_timeout,
         )
 
+    def _start_request(
+        self, method: str, params: dict[str, Any]
+    ) -> tuple[int, concurrent.futures.Future[Any]]:
+        return self._transport.start_request(self._process, method, params)
+
+    def _cancel_request(self, req_id: int) -> None:
+        self._transport.cancel_request(self._process, req_id)
+
     def _send_notification(self, method: str, params: dict[str, Any]) -> None:
         """Send a notification (no response expected)."""
         self._transport.send_notification(self._process, method, params)
@@ -303,103 +398,181 @@ class LSPClient:
                 latency_ms,
             )
 
-    def definition(self, file_path: str, line: int, column: int) -> list[Location]:
-        """Get definition locations for a symbol."""
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        """Wait for reported server work (e.g. initial indexing) to finish.
+
+        Args:
+            timeout: Seconds to wait; defaults to SEARCH_LSP_READY_TIMEOUT_SECONDS,
+                capped at the request timeout.
+
+        Returns:
+            True if the server reported no work in progress before the timeout.
+        """
+        if timeout is None:
+            timeout = min(float(_settings.SEARCH_LSP_READY_TIMEOUT_SECONDS), self._request_timeout)
+        ready = self._session.wait_until_ready(max(0.0, timeout))
+        if not ready and timeout > 0:
+            logger.debug("Language server still busy after %.1fs, continuing", timeout)
+        return ready
+
+    @contextmanager
+    def _request_scope(self) -> Iterator[None]:
+        """Serialize whole requests unless pipelining (SEARCH_LSP_PIPELINE) is on."""
+        if self._pipeline:
+            yield
+            return
+        with self._request_lock:
+            yield
+
+    @contextmanager
+    def _begin_request(self, file_path: str | None = None) -> Iterator[str]:
+        """Sync the workspace, open file_path (if any) and yield its URI."""
+        if _settings.SEARCH_LSP_READY_TIMEOUT_SECONDS > 0:
+            self.wait_until_ready()
         with self._request_lock:
             with self._lock:
                 if not self._initialized:
                     raise LSPError("Language server not initialized")
 
             self._sync_workspace_changes_best_effort()
-            uri = self._session.open_file(file_path)
-            try:
-                result = self._send_request(
-                    "textDocument/definition",
-                    {
-                        "textDocument": {"uri": uri},
-                        "position": {"line": line, "character": column},
-                    },
-                )
-                return parse_locations(result)
-            finally:
-                self._session.close_file(uri)
+            uri = self._session.open_file(file_path) if file_path is not None else ""
+            self._inflight += 1
+        try:
+            yield uri
+        finally:
+            with self._request_lock:
+                self._inflight -= 1
+                if uri:
+                    self._session.release_file(uri)
+                self._idle.notify_all()
+
+    def _first_locations(
+        self,
+        method: str,
+        uri: str,
+        line: int,
+        columns: Sequence[int],
+        extra_params: dict[str, Any],
+    ) -> list[Location]:
+        """Query several positions on one line at once.
 
-    def references(
-        self, file_path: str, line: int, column: int, include_declaration: bool = True
+        All requests are sent before waiting. Answers are taken in column
+        order: the first non-empty one wins and the requests still pending
+        are cancelled with $/cancelRequest.
+
+        Raises:
+            LSPError: Every position failed; the first position's error is raised.
+        """
+
+        def position_params(column: int) -> dict[str, Any]:
+            return {
+                "textDocument": {"uri": uri},
+                "position": {"line": line, "character": column},
+                **extra_params,
+            }
+
+        if len(columns) == 1:
+            return parse_locations(self._send_request(method, position_params(columns[0])))
+
+        deadline = time.monotonic() + self._request_timeout
+        pending = [
+            (column, *self._start_request(method, position_params(column))) for column in columns
+        ]
+        errors: list[Exception] = []
+        try:
+            for column, _req_id, future in pending:
+                try:
+                    result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except TimeoutError:
+                    errors.append(LSPError(f"Request {method} timed out"))
+                    continue
+                except concurrent.futures.CancelledError:
+                    errors.append(LSPError(f"Request {method} cancelled"))
+                    continue
+                except LSPError as exc:
+                    errors.append(exc)
+                    continue
+                locations = parse_locations(result)
+                if locations:
+                    if column != columns[0]:
+                        logger.debug(
+                            "Column fallback succeeded: line=%d, col=%d -> %d",
+                            line,
+                            columns[0],
+                            column,
+                        )
+                    return locations
+        finally:
+            for _column, req_id, future in pending:
+                if not future.done():
+                    self._cancel_request(req_id)
+        if len(errors) == len(pending):
+            raise errors[0]
+        return []
+
+    def definition(
+        self,
+        file_path: str,
+        line: int,
+        column: int,
+        *,
+        fallback_columns: Sequence[int] = (),
     ) -> list[Location]:
-        """Get all reference locations for a symbol."""
-        with self._request_lock:
-            with self._lock:
-                if not self._initialized:
-                    raise LSPError("Language server not initialized")
+        """Get definition locations for a symbol.
 
-            self._sync_workspace_changes_best_effort()
-            uri = self._session.open_file(file_path)
-            try:
-                result = self._send_request(
-                    "textDocument/references",
-                    {
-                        "textDocument": {"uri": uri},
-                        "position": {"line": line, "character": column},
-                        "context": {"includeDeclaration": include_declaration},
-                    },
-                )
-                return parse_locations(result)
-            finally:
-                self._session.close_file(uri)
+        fallback_columns are other positions on the same line, queried
+        concurrently and used in order when `column` yields nothing.
+        """
+        with self._request_scope(), self._begin_request(file_path) as uri:
+            return self._first_locations(
+                "textDocument/definition", uri, line, [column, *fallback_columns], {}
+            )
+
+    def references(
+        self,
+        file_path: str,
+        line: int,
+        column: int,
+        include_declaration: bool = True,
+        *,
+        fallback_columns: Sequence[int] = (),
+    ) -> list[Location]:
+        """Get all reference locations for a symbol (see definition for fallback_columns)."""
+        with self._request_scope(), self._begin_request(file_path) as uri:
+            return self._first_locations(
+                "textDocument/references",
+                uri,
+                line,
+                [column, *fallback_columns],
+                {"context": {"includeDeclaration": include_declaration}},
+            )
 
     def workspace_symbols(self, query: str) -> list[SymbolInfo]:
         """Search for symbols by name across the workspace."""
-
-        with self._request_lock:
-            with self._lock:
-                if not self._initialized:
-                    raise LSPError("Language server not initialized")
-
-            self._sync_workspace_changes_best_effort()
+        with self._request_scope(), self._begin_request():
             result = self._send_request("workspace/symbol", {"query": query})
             return parse_symbol_info(result)
 
     def document_symbols(self, file_path: str) -> list[DocumentSymbol]:
         """Get all symbols defined in a file."""
-
-        with self._request_lock:
-            with self._lock:
-                if not self._initialized:
-                    raise LSPError("Language server not initialized")
-
-            self._sync_workspace_changes_best_effort()
-            uri = self._session.open_file(file_path)
-            try:
-                result = self._send_request(
-                    "textDocument/documentSymbol",
-                    {"textDocument": {"uri": uri}},
-                )
-                return parse_document_symbols(result)
-            finally:
-                self._session.close_file(uri)
+        with self._request_scope(), self._begin_request(file_path) as uri:
+            result = self._send_request(
+                "textDocument/documentSymbol",
+                {"textDocument": {"uri": uri}},
+            )
+            return parse_document_symbols(result)
 
     def hover(self, file_path: str, line: int, column: int) -> HoverInfo | None:
         """Get type information at position."""
-
-        with self._request_lock:
-            with self._lock:
-                if not self._initialized:
-                    raise LSPError("Language server not initialized")
-
-            self._sync_workspace_changes_best_effort()
-            uri = self._session.open_file(file_path)
-            try:
-                result = self._send_request(
-                    "textDocument/hover",
-                    {
-                        "textDocument": {"uri": uri},
-                        "position": {"line": line, "character": column},
-                    },
-                )
-                return parse_hover(result)
-            finally:
-                self._session.close_file(uri)
+        with self._request_scope(), self._begin_request(file_path) as uri:
+            result = self._send_request(
+                "textDocument/hover",
+                {
+                    "textDocument": {"uri": uri},
+                    "position": {"line": line, "character": column},
+                },
+            )
+            return parse_hover(result)
 
     def call_hierarchy(
         self, file_path: str, line: int, column: int, direction: str = "incoming"
@@ -415,41 +588,31 @@ class LSPClient:
         Returns:
             List of CallInfo representing callers or callees.
         """
+        with self._request_scope(), self._begin_request(file_path) as uri:
+            prepare_result = self._send_request(
+                "textDocument/prepareCallHierarchy",
+                {
+                    "textDocument": {"uri": uri},
+                    "position": {"line": line, "character": column},
+                },
+            )
 
-        with self._request_lock:
-            with self._lock:
-                if not self._initialized:
-                    raise LSPError("Language server not initialized")
-
-            self._sync_workspace_changes_best_effort()
-            uri = self._session.open_file(file_path)
-            try:
-                prepare_result = self._send_request(
-                    "textDocument/prepareCallHierarchy",
-                    {
-                        "textDocument": {"uri": uri},
-                        "position": {"line": line, "character": column},
-                    },
-                )
-
-                if not prepare_result or not isinstance(prepare_result, list):
-                    return []
+            if not prepare_result or not isinstance(prepare_result, list):
+                return []
 
-                raw_item = prepare_result[0]
-                item = parse_call_hierarchy_item(raw_item)
-                if not item:
-                    return []
+            raw_item = prepare_result[0]
+            item = parse_call_hierarchy_item(raw_item)
+            if not item:
+                return []
 
-                method = (
-                    "callHierarchy/incomingCalls"
-                    if direction == "incoming"
-                    else "callHierarchy/outgoingCalls"
-                )
-                calls_result = self._send_request(method, {"item": raw_item})
+            method = (
+                "callHierarchy/incomingCalls"
+                if direction == "incoming"
+                else "callHierarchy/outgoingCalls"
+            )
+            calls_result = self._send_request(method, {"item": raw_item})
 
-                return parse_call_info_list(calls_result, direction)
-            finally:
-                self._session.close_file(uri)
+            return parse_call_info_list(calls_result, direction)
 
     def shutdown(self) -> None:
         """Shutdown the language server gracefully."""
@@ -117,3 +117,21 @@ def log_lsp_client_evicted(
             "reason": reason,
         }
     )
+
+
+def log_lsp_client_prewarmed(
+    language_id: str,
+    workspace: str,
+    latency_ms: float,
+    ready: bool,
+) -> None:
+    log_event(
+        {
+            "kind": "lsp_client_prewarmed",
+            "level": "info",
+            "language_id": language_id,
+            "workspace": workspace,
+            "latency_ms": int(latency_ms),
+            "ready": ready,
+        }
+    )
@@ -22,11 +22,13 @@ class JsonRpcTransport:
         stop_event: threading.Event,
         on_server_request: Callable[[Any, Any, Any], None],
         read_chunk_size: int,
+        on_server_notification: Callable[[str, Any], None] | None = None,
     ) -> None:
         self._lock = lock
         self._send_lock = send_lock
         self._stop_event = stop_event
         self._on_server_request = on_server_request
+        self._on_server_notification = on_server_notification
         self._read_chunk_size = read_chunk_size
         self._message_buffer = MessageBuffer()
         self._request_id = 0
@@ -80,6 +82,8 @@ class JsonRpcTransport:
             if method == "window/logMessage":
                 params = msg.get("params", {})
                 logger.debug("LSP: %s", params.get("message", ""))
+            elif self._on_server_notification is not None and isinstance(method, str):
+                self._on_server_notification(method, msg.get("params"))
 
     def read_stdout_loop(self, process: Any) -> None:
         if not process or not process.stdout:
@@ -138,14 +142,13 @@ class JsonRpcTransport:
             },
         )
 
-    def send_request(
+    def start_request(
         self,
         process: Any,
         method: str,
         params: dict[str, Any],
-        *,
-        timeout: float,
-    ) -> Any:
+    ) -> tuple[int, concurrent.futures.Future[Any]]:
+        """Send a request without waiting; returns (request id, response future)."""
         with self._lock:
             if not process:
                 raise LSPError("Language server not running")
@@ -168,16 +171,32 @@ class JsonRpcTransport:
             with self._lock:
                 self._pending_requests.pop(req_id, None)
             raise
+        return req_id, future
 
+    def cancel_request(self, process: Any, req_id: int) -> None:
+        """Stop waiting for a request and send $/cancelRequest (best-effort)."""
+        with self._lock:
+            future = self._pending_requests.pop(req_id, None)
+        if future is not None:
+            future.cancel()
+        try:
+            self.send_notification(process, "$/cancelRequest", {"id": req_id})
+        except Exception:  # nosec B110 - best-effort cancellation
+            pass
+
+    def send_request(
+        self,
+        process: Any,
+        method: str,
+        params: dict[str, Any],
+        *,
+        timeout: float,
+    ) -> Any:
+        req_id, future = self.start_request(process, method, params)
         try:
             return future.result(timeout=timeout)
         except TimeoutError:
-            with self._lock:
-                self._pending_requests.pop(req_id, None)
-            try:
-                self.send_notification(process, "$/cancelRequest", {"id": req_id})
-            except Exception:  # nosec B110 - best-effort cancellation
-                pass
+            self.cancel_request(process, req_id)
             raise LSPError(f"Request {method} timed out") from None
 
 
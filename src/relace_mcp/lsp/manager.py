@@ -1,16 +1,29 @@
 import atexit
+import logging
 import threading
-from collections.abc import Generator
+import time
+from collections.abc import Generator, Iterable
 from contextlib import contextmanager
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from relace_mcp.config import settings as _settings
-from relace_mcp.lsp.events import log_lsp_client_created, log_lsp_client_evicted
+from relace_mcp.lsp.events import (
+    log_lsp_client_created,
+    log_lsp_client_evicted,
+    log_lsp_client_prewarmed,
+)
 from relace_mcp.lsp.languages.base import LanguageServerConfig
 
 if TYPE_CHECKING:
     from relace_mcp.lsp.client import LSPClient
 
+logger = logging.getLogger(__name__)
+
+# Bounds on how often the idle reaper wakes up (SEARCH_LSP_IDLE_TTL_SECONDS).
+_REAP_MIN_INTERVAL_SECONDS = 1.0
+_REAP_MAX_INTERVAL_SECONDS = 30.0
+
 
 class LSPClientManager:
     """Process-scoped singleton manager for LSP clients.
@@ -25,6 +38,12 @@ class LSPClientManager:
         self._lock = threading.RLock()
         self._clients: dict[tuple[str, str], LSPClient] = {}
         self._lease_counts: dict[tuple[str, str], int] = {}
+        # Monotonic time each client was last leased or released.
+        self._last_used: dict[tuple[str, str], float] = {}
+        # Slots reserved by a client that is starting outside the lock; set when done.
+        self._starting: dict[tuple[str, str], threading.Event] = {}
+        self._reaper: threading.Thread | None = None
+        self._reaper_stop = threading.Event()
         atexit.register(self._cleanup_all)
 
     @classmethod
@@ -41,6 +60,28 @@ class LSPClientManager:
     def _max_clients(self) -> int:
         return _settings.SEARCH_LSP_MAX_CLIENTS
 
+    def _pick_replica_key_locked(self, workspace: str, language_id: str) -> tuple[str, str]:
+        """Choose the client key for a new lease (SEARCH_LSP_REPLICAS).
+
+        Replica 0 is keyed (workspace, language_id); extra replicas use
+        "language_id#N". An idle running replica is preferred, then a replica
+        that is not running or starting yet, then the least leased one, and
+        only then one that is still starting.
+        """
+        keys = [(workspace, language_id)] + [
+            (workspace, f"{language_id}#{n}") for n in range(1, _settings.SEARCH_LSP_REPLICAS)
+        ]
+        running = [key for key in keys if key in self._clients]
+        for key in running:
+            if self._lease_counts.get(key, 0) == 0:
+                return key
+        for key in keys:
+            if key not in self._clients and key not in self._starting:
+                return key
+        if running:
+            return min(running, key=lambda k: self._lease_counts.get(k, 0))
+        return keys[0]
+
     def _new_client(
         self,
         config: LanguageServerConfig,
@@ -53,6 +94,7 @@ class LSPClientManager:
 
     def _cleanup_all(self) -> None:
         """Cleanup all clients."""
+        self._reaper_stop.set()
         with self._lock:
             for client in list(self._clients.values()):
                 try:
@@ -61,61 +103,140 @@ class LSPClientManager:
                     pass
             self._clients.clear()
             self._lease_counts.clear()
+            self._last_used.clear()
+
+    def _pop_client_locked(self, key: tuple[str, str]) -> "LSPClient":
+        self._lease_counts.pop(key, None)
+        self._last_used.pop(key, None)
+        return self._clients.pop(key)
 
     def _pop_oldest_idle_client_locked(self) -> tuple[tuple[str, str], "LSPClient"] | None:
         for key in list(self._clients.keys()):
             if self._lease_counts.get(key, 0) != 0:
                 continue
-            client = self._clients.pop(key)
-            self._lease_counts.pop(key, None)
-            return (key, client)
+            return (key, self._pop_client_locked(key))
         return None
 
-    def _get_or_create_client_locked(
+    def _ensure_reaper_locked(self) -> None:
+        if _settings.SEARCH_LSP_IDLE_TTL_SECONDS <= 0 or self._reaper is not None:
+            return
+        self._reaper = threading.Thread(target=self._reap_loop, name="lsp-idle-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        while True:
+            ttl = _settings.SEARCH_LSP_IDLE_TTL_SECONDS
+            interval = min(
+                max(ttl / 2, _REAP_MIN_INTERVAL_SECONDS),
+                _REAP_MAX_INTERVAL_SECONDS,
+            )
+            if self._reaper_stop.wait(interval):
+                return
+            self.reap_idle_clients()
+
+    def reap_idle_clients(self) -> int:
+        """Shut down unleased clients idle longer than SEARCH_LSP_IDLE_TTL_SECONDS.
+
+        Returns:
+            Number of clients shut down.
+        """
+        ttl = _settings.SEARCH_LSP_IDLE_TTL_SECONDS
+        if ttl <= 0:
+            return 0
+        expired: list[LSPClient] = []
+        now = time.monotonic()
+        with self._lock:
+            for key in list(self._clients.keys()):
+                if self._lease_counts.get(key, 0) != 0:
+                    continue
+                if now - self._last_used.get(key, now) < ttl:
+                    continue
+                expired.append(self._pop_client_locked(key))
+                log_lsp_client_evicted(key[1], key[0], len(self._clients), "idle_ttl")
+
+        for client in expired:
+            try:
+                client.shutdown()
+            except Exception:  # nosec B110 - best-effort cleanup
+                pass
+        return len(expired)
+
+    def _get_or_create_client(
         self,
         config: LanguageServerConfig,
         workspace: str,
         *,
         timeout_seconds: float | None,
         lease: bool,
-    ) -> tuple["LSPClient", list[tuple[tuple[str, str], "LSPClient"]]]:
-        key = (workspace, config.language_id)
-        existing = self._clients.get(key)
-        if existing is not None:
-            self._clients.pop(key, None)
-            self._clients[key] = existing
-            if lease:
-                self._lease_counts[key] = self._lease_counts.get(key, 0) + 1
-            else:
-                self._lease_counts.setdefault(key, 0)
-            return (existing, [])
-
-        evicted: list[tuple[tuple[str, str], LSPClient]] = []
-        if self._max_clients > 0:
-            while len(self._clients) >= self._max_clients:
-                popped = self._pop_oldest_idle_client_locked()
-                if popped is None:
+        pick_replica: bool = False,
+    ) -> tuple[tuple[str, str], "LSPClient", list[tuple[tuple[str, str], "LSPClient"]]]:
+        """Return (key, client, evicted) for a workspace, starting a client if needed.
+
+        A new client's slot is reserved under the lock but the server is
+        started outside it, so a slow start does not block other workspaces
+        or languages. Callers asking for a slot that is still starting wait
+        for it and then try again.
+        """
+        while True:
+            with self._lock:
+                if pick_replica:
+                    key = self._pick_replica_key_locked(workspace, config.language_id)
+                else:
+                    key = (workspace, config.language_id)
+                existing = self._clients.get(key)
+                if existing is not None:
+                    self._clients.pop(key, None)
+                    self._clients[key] = existing
+                    self._last_used[key] = time.monotonic()
+                    if lease:
+                        self._lease_counts[key] = self._lease_counts.get(key, 0) + 1
+                    else:
+                        self._lease_counts.setdefault(key, 0)
+                    return (key, existing, [])
+
+                pending = self._starting.get(key)
+                if pending is None:
+                    ready = threading.Event()
+                    self._starting[key] = ready
+                    evicted: list[tuple[tuple[str, str], LSPClient]] = []
+                    if self._max_clients > 0:
+                        while len(self._clients) + len(self._starting) > self._max_clients:
+                            popped = self._pop_oldest_idle_client_locked()
+                            if popped is None:
+                                break
+                            evicted.append(popped)
                     break
-                evicted.append(popped)
+            pending.wait()
 
-        client = self._new_client(config, workspace, timeout_seconds)
         try:
+            client = self._new_client(config, workspace, timeout_seconds)
             client.start()
         except Exception:
-            for evicted_key, c in evicted:
-                self._clients[evicted_key] = c
-                self._lease_counts.setdefault(evicted_key, 0)
+            with self._lock:
+                del self._starting[key]
+                for evicted_key, c in evicted:
+                    self._clients[evicted_key] = c
+                    self._lease_counts.setdefault(evicted_key, 0)
+                    self._last_used.setdefault(evicted_key, time.monotonic())
+            ready.set()
             raise
 
-        # Log eviction only after successful start — if start() fails above,
-        # evicted clients are restored and no misleading events are emitted.
-        for evicted_key, _ in evicted:
-            log_lsp_client_evicted(evicted_key[1], evicted_key[0], len(self._clients), "pool_full")
+        with self._lock:
+            del self._starting[key]
+            # Log eviction only after successful start — if start() fails above,
+            # evicted clients are restored and no misleading events are emitted.
+            for evicted_key, _ in evicted:
+                log_lsp_client_evicted(
+                    evicted_key[1], evicted_key[0], len(self._clients), "pool_full"
+                )
 
-        self._clients[key] = client
-        self._lease_counts[key] = 1 if lease else 0
-        log_lsp_client_created(config.language_id, workspace, len(self._clients))
-        return (client, evicted)
+            self._clients[key] = client
+            self._lease_counts[key] = 1 if lease else 0
+            self._last_used[key] = time.monotonic()
+            self._ensure_reaper_locked()
+            log_lsp_client_created(config.language_id, workspace, len(self._clients))
+        ready.set()
+        return (key, client, evicted)
 
     @contextmanager
     def session(
@@ -126,18 +247,15 @@ class LSPClientManager:
         timeout_seconds: float | None = None,
     ) -> "Generator[LSPClient, None, None]":
         """Acquire a leased LSP client for a workspace."""
-        clients_to_shutdown: list[LSPClient] = []
-        key = (workspace, config.language_id)
-        with self._lock:
-            client, evicted = self._get_or_create_client_locked(
-                config,
-                workspace,
-                timeout_seconds=timeout_seconds,
-                lease=True,
-            )
-            clients_to_shutdown = [c for _, c in evicted]
+        key, client, evicted = self._get_or_create_client(
+            config,
+            workspace,
+            timeout_seconds=timeout_seconds,
+            lease=True,
+            pick_replica=True,
+        )
 
-        for old_client in clients_to_shutdown:
+        for _, old_client in evicted:
             try:
                 old_client.shutdown()
             except Exception:  # nosec B110 - best-effort cleanup
@@ -149,6 +267,8 @@ class LSPClientManager:
             evicted_in_finally: list[tuple[tuple[str, str], LSPClient]] = []
             with self._lock:
                 self._lease_counts[key] = max(0, self._lease_counts.get(key, 0) - 1)
+                if key in self._clients:
+                    self._last_used[key] = time.monotonic()
                 if self._max_clients > 0:
                     while len(self._clients) > self._max_clients:
                         popped = self._pop_oldest_idle_client_locked()
@@ -173,26 +293,87 @@ class LSPClientManager:
         timeout_seconds: float | None = None,
     ) -> "LSPClient":
         """Get or create a client for the given workspace."""
-        clients_to_shutdown: list[LSPClient] = []
-        client_to_return: LSPClient
-
-        with self._lock:
-            client, evicted = self._get_or_create_client_locked(
-                config,
-                workspace,
-                timeout_seconds=timeout_seconds,
-                lease=False,
-            )
-            client_to_return = client
-            clients_to_shutdown = [c for _, c in evicted]
+        _, client, evicted = self._get_or_create_client(
+            config,
+            workspace,
+            timeout_seconds=timeout_seconds,
+            lease=False,
+        )
 
-        for old_client in clients_to_shutdown:
+        for _, old_client in evicted:
             try:
                 old_client.shutdown()
             except Exception:  # nosec B110 - best-effort cleanup
                 pass
 
-        return client_to_return
+        return client
+
+    def prewarm(
+        self,
+        workspace: str,
+        language_ids: Iterable[str] | None = None,
+        *,
+        timeout_seconds: float | None = None,
+    ) -> threading.Thread:
+        """Start language servers for a workspace in a background thread.
+
+        Each server is started and then given SEARCH_LSP_READY_TIMEOUT_SECONDS
+        to finish its initial indexing, so the first tool call finds it warm.
+        Failures (e.g. a server that is not installed) are logged and skipped.
+
+        Args:
+            workspace: Resolved workspace path, as passed to session().
+            language_ids: Languages to start; defaults to the languages detected
+                in the workspace whose servers are installed, limited to
+                SEARCH_LSP_MAX_CLIENTS.
+            timeout_seconds: Client timeout; must match what session() callers
+                pass since the started clients are reused by them.
+
+        Returns:
+            The started (daemon) thread.
+        """
+        thread = threading.Thread(
+            target=self._prewarm,
+            args=(workspace, language_ids, timeout_seconds),
+            name="lsp-prewarm",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _prewarm(
+        self,
+        workspace: str,
+        language_ids: Iterable[str] | None,
+        timeout_seconds: float | None,
+    ) -> None:
+        from relace_mcp.lsp.languages import (
+            LANGUAGE_CONFIGS,
+            detect_available_lsp_servers,
+            get_lsp_languages,
+        )
+
+        if language_ids is None:
+            detected = get_lsp_languages(Path(workspace)) & detect_available_lsp_servers()
+            languages = sorted(detected)
+            if self._max_clients > 0:
+                languages = languages[: self._max_clients]
+        else:
+            languages = list(language_ids)
+
+        for language_id in languages:
+            config = LANGUAGE_CONFIGS.get(language_id)
+            if config is None:
+                continue
+            started = time.perf_counter()
+            try:
+                client = self.get_client(config, workspace, timeout_seconds=timeout_seconds)
+                ready = client.wait_until_ready(float(_settings.SEARCH_LSP_READY_TIMEOUT_SECONDS))
+            except Exception as exc:
+                logger.debug("LSP prewarm failed for %s: %s", language_id, exc)
+                continue
+            latency_ms = (time.perf_counter() - started) * 1000
+            log_lsp_client_prewarmed(language_id, workspace, latency_ms, ready)
 
 
 __all__ = ["LSPClientManager"]
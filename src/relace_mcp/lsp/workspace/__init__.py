@@ -3,17 +3,24 @@ from relace_mcp.lsp.workspace.settings import (
     load_project_workspace_settings,
 )
 from relace_mcp.lsp.workspace.sync import (
+    WorkspaceFileFilter,
     WorkspaceSyncOutcome,
     WorkspaceSyncState,
     extract_analysis_patterns,
+    flush_workspace_changes,
     sync_workspace_changes,
 )
+from relace_mcp.lsp.workspace.watcher import InotifyWorkspaceWatcher, inotify_available
 
 __all__ = [
     "build_workspace_settings",
     "load_project_workspace_settings",
+    "InotifyWorkspaceWatcher",
+    "WorkspaceFileFilter",
     "WorkspaceSyncOutcome",
     "WorkspaceSyncState",
     "extract_analysis_patterns",
+    "flush_workspace_changes",
+    "inotify_available",
     "sync_workspace_changes",
 ]
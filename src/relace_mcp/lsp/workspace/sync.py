@@ -114,6 +114,64 @@ def _extract_glob_prefix(raw: str) -> str:
     return "/".join(prefix_parts)
 
 
+@dataclass(frozen=True)
+class WorkspaceFileFilter:
+    """Decides which workspace paths are reported to the language server."""
+
+    workspace_root: Path
+    include_patterns: list[str]
+    exclude_patterns: list[str]
+    config_files: frozenset[str]
+    file_extensions: tuple[str, ...]
+    ignored_dir_names: frozenset[str]
+
+    @classmethod
+    def build(
+        cls,
+        *,
+        workspace: str,
+        workspace_settings: dict[str, Any],
+        config_files: tuple[str, ...],
+        file_extensions: tuple[str, ...],
+        ignored_dir_names: frozenset[str],
+    ) -> "WorkspaceFileFilter":
+        include_raw, exclude_raw, _ = extract_analysis_patterns(workspace_settings)
+        return cls(
+            workspace_root=Path(workspace),
+            include_patterns=_expand_glob_patterns(include_raw),
+            exclude_patterns=_expand_glob_patterns(exclude_raw),
+            config_files=frozenset(config_files),
+            file_extensions=file_extensions,
+            ignored_dir_names=ignored_dir_names,
+        )
+
+    def should_consider(self, rel_path: str) -> bool:
+        if self.include_patterns and not _matches_any_pattern(rel_path, self.include_patterns):
+            return False
+        if _matches_any_pattern(rel_path, self.exclude_patterns):
+            return False
+        return True
+
+    def should_skip_dir(self, rel_dir: str, dir_name: str) -> bool:
+        if rel_dir not in ("", ".") and dir_name in self.ignored_dir_names:
+            return True
+        if _matches_any_pattern(rel_dir, self.exclude_patterns):
+            return True
+        return False
+
+    def is_skipped_path(self, rel_path: str) -> bool:
+        """True if any parent directory of rel_path is skipped."""
+        return any(
+            self.should_skip_dir(parent, parent.rsplit("/", 1)[-1])
+            for parent in _iter_parent_paths(rel_path)
+        )
+
+    def tracks_file(self, rel_path: str) -> bool:
+        if rel_path in self.config_files:
+            return True
+        return rel_path.endswith(self.file_extensions) and self.should_consider(rel_path)
+
+
 def sync_workspace_changes(
     *,
     workspace: str,
@@ -133,10 +191,15 @@ def sync_workspace_changes(
     last_sync = now
 
     workspace_root = Path(workspace)
-    include_raw, exclude_raw, _ = extract_analysis_patterns(workspace_settings)
-    include_patterns = _expand_glob_patterns(include_raw)
-    exclude_patterns = _expand_glob_patterns(exclude_raw)
-    config_files_set = frozenset(config_files)
+    include_raw, _, _ = extract_analysis_patterns(workspace_settings)
+    file_filter = WorkspaceFileFilter.build(
+        workspace=workspace,
+        workspace_settings=workspace_settings,
+        config_files=config_files,
+        file_extensions=file_extensions,
+        ignored_dir_names=ignored_dir_names,
+    )
+    config_files_set = file_filter.config_files
 
     scan_roots: list[Path] = []
     if include_raw:
@@ -158,19 +221,8 @@ def sync_workspace_changes(
     scanned_files = 0
     truncated = False
 
-    def should_consider(rel_path: str) -> bool:
-        if include_patterns and not _matches_any_pattern(rel_path, include_patterns):
-            return False
-        if _matches_any_pattern(rel_path, exclude_patterns):
-            return False
-        return True
-
-    def should_skip_dir(rel_dir: str, dir_name: str) -> bool:
-        if rel_dir not in ("", ".") and dir_name in ignored_dir_names:
-            return True
-        if _matches_any_pattern(rel_dir, exclude_patterns):
-            return True
-        return False
+    should_consider = file_filter.should_consider
+    should_skip_dir = file_filter.should_skip_dir
 
     current_snapshot: dict[str, tuple[int, int]] = {}
 
@@ -293,7 +345,89 @@ def sync_workspace_changes(
         snapshot_initialized=True,
         last_sync=last_sync,
     )
+    return _build_outcome(next_state, changes, config_changed, workspace_root, max_events)
+
+
+def flush_workspace_changes(
+    *,
+    file_filter: WorkspaceFileFilter,
+    state: WorkspaceSyncState,
+    changed_paths: set[str],
+    changed_dirs: set[str],
+    max_events: int,
+) -> WorkspaceSyncOutcome:
+    """Diff only the paths a file watcher reported against the snapshot.
+
+    Args:
+        file_filter: Filter used for the initial scan.
+        state: Snapshot from an earlier sync_workspace_changes call.
+        changed_paths: Relative file paths with create/modify/delete events.
+        changed_dirs: Relative directories created, deleted or moved as a
+            whole; every tracked file under them is re-checked.
+        max_events: Restart threshold, as in sync_workspace_changes.
+    """
+    workspace_root = file_filter.workspace_root
+    candidates = {p for p in changed_paths if not file_filter.is_skipped_path(p)}
+    for rel_dir in changed_dirs:
+        if rel_dir and (
+            file_filter.is_skipped_path(rel_dir)
+            or file_filter.should_skip_dir(rel_dir, rel_dir.rsplit("/", 1)[-1])
+        ):
+            continue
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        candidates.update(p for p in state.snapshot if p.startswith(prefix))
+        for dirpath, dirnames, filenames in os.walk(workspace_root / rel_dir):
+            rel_parent = Path(dirpath).relative_to(workspace_root).as_posix()
+            rel_parent = "" if rel_parent == "." else rel_parent
+            dirnames[:] = [
+                d
+                for d in dirnames
+                if not file_filter.should_skip_dir(f"{rel_parent}/{d}".lstrip("/"), d)
+            ]
+            candidates.update(f"{rel_parent}/{name}".lstrip("/") for name in filenames)
+
+    next_snapshot = dict(state.snapshot)
+    changes: list[tuple[int, str]] = []
+    config_changed = False
+    for rel_path in sorted(candidates):
+        if not file_filter.tracks_file(rel_path):
+            continue
+        path = workspace_root / rel_path
+        prev = next_snapshot.get(rel_path)
+        meta: tuple[int, int] | None = None
+        if not path.is_symlink():
+            try:
+                st = path.stat()
+            except OSError:
+                pass
+            else:
+                meta = (st.st_mtime_ns, st.st_size)
+        if meta == prev:
+            continue
+        if meta is None:
+            next_snapshot.pop(rel_path, None)
+            changes.append((3, rel_path))
+        else:
+            next_snapshot[rel_path] = meta
+            changes.append((1 if prev is None else 2, rel_path))
+        if rel_path in file_filter.config_files:
+            config_changed = True
+
+    next_state = WorkspaceSyncState(
+        snapshot=next_snapshot,
+        snapshot_initialized=True,
+        last_sync=time.monotonic(),
+    )
+    return _build_outcome(next_state, changes, config_changed, workspace_root, max_events)
 
+
+def _build_outcome(
+    next_state: WorkspaceSyncState,
+    changes: list[tuple[int, str]],
+    config_changed: bool,
+    workspace_root: Path,
+    max_events: int,
+) -> WorkspaceSyncOutcome:
     if config_changed:
         return WorkspaceSyncOutcome(
             state=next_state,
@@ -328,8 +462,10 @@ def sync_workspace_changes(
 
 
 __all__ = [
+    "WorkspaceFileFilter",
     "WorkspaceSyncOutcome",
     "WorkspaceSyncState",
     "extract_analysis_patterns",
+    "flush_workspace_changes",
     "sync_workspace_changes",
 ]
@@ -0,0 +1,213 @@
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+
+from relace_mcp.lsp.workspace.sync import WorkspaceFileFilter
+
+logger = logging.getLogger(__name__)
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+_POLL_INTERVAL_SECONDS = 0.5
+
+_libc: ctypes.CDLL | None = None
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    global _libc
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        except OSError:
+            return None
+    return _libc
+
+
+def inotify_available() -> bool:
+    libc = _load_libc()
+    return libc is not None and hasattr(libc, "inotify_init1")
+
+
+class InotifyWorkspaceWatcher:
+    """Collects changed workspace paths from inotify in a background thread.
+
+    Directories skipped by the file filter are never watched. `drain()`
+    returns what changed since the previous call. `overflowed` is set when
+    the kernel queue overflowed and events were lost (rescan once); `failed`
+    is set when a directory could no longer be watched (stop using the
+    watcher).
+    """
+
+    def __init__(self, file_filter: WorkspaceFileFilter, *, max_watches: int) -> None:
+        self._filter = file_filter
+        self._root = file_filter.workspace_root
+        self._max_watches = max_watches
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._fd = -1
+        self._libc: ctypes.CDLL | None = None
+        self._wds: dict[int, str] = {}
+        self._changed_paths: set[str] = set()
+        self._changed_dirs: set[str] = set()
+        self._thread: threading.Thread | None = None
+        self.overflowed = False
+        self.failed = False
+
+    def start(self) -> None:
+        """Watch every non-skipped directory and start the reader thread.
+
+        Raises:
+            OSError: inotify is unavailable or the watch limit was reached.
+        """
+        libc = _load_libc()
+        if libc is None or not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        self._libc = libc
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        try:
+            self._watch_tree("")
+        except OSError:
+            self.close()
+            raise
+        self._thread = threading.Thread(target=self._run, name="lsp-workspace-watcher", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._fd >= 0:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = -1
+
+    def drain(self) -> tuple[set[str], set[str]]:
+        """Return and reset (changed_paths, changed_dirs), relative to the workspace."""
+        with self._lock:
+            paths, dirs = self._changed_paths, self._changed_dirs
+            self._changed_paths, self._changed_dirs = set(), set()
+            return paths, dirs
+
+    def _add_watch(self, rel_dir: str) -> None:
+        libc = self._libc
+        if libc is None or self._fd < 0:
+            raise OSError(errno.EBADF, "Workspace watcher is not started")
+        if len(self._wds) >= self._max_watches:
+            raise OSError(errno.ENOSPC, f"More than {self._max_watches} directories to watch")
+        path = os.fsencode(self._root / rel_dir if rel_dir else self._root)
+        wd = libc.inotify_add_watch(self._fd, path, _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(err, os.strerror(err))
+        self._wds[wd] = rel_dir
+
+    def _watch_tree(self, rel_dir: str) -> None:
+        self._add_watch(rel_dir)
+        pending = [rel_dir]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(self._root / current if current else self._root) as it:
+                    entries = [
+                        entry.name
+                        for entry in it
+                        if entry.is_dir(follow_symlinks=False) and not entry.is_symlink()
+                    ]
+            except OSError:
+                continue
+            for name in entries:
+                child = f"{current}/{name}" if current else name
+                if self._filter.should_skip_dir(child, name):
+                    continue
+                self._add_watch(child)
+                pending.append(child)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([self._fd], [], [], _POLL_INTERVAL_SECONDS)
+                if not ready:
+                    continue
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                continue
+            except (OSError, ValueError):
+                if not self._stop.is_set():
+                    logger.debug("Workspace watcher stopped reading", exc_info=True)
+                    self.failed = True
+                return
+            self._handle_events(data)
+
+    def _handle_events(self, data: bytes) -> None:
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + _EVENT_HEADER.size : offset + _EVENT_HEADER.size + name_len]
+            offset += _EVENT_HEADER.size + name_len
+            if mask & _IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+            if mask & _IN_IGNORED:
+                self._wds.pop(wd, None)
+                continue
+            parent = self._wds.get(wd)
+            if parent is None:
+                continue
+            name = os.fsdecode(raw_name.rstrip(b"\0"))
+            rel_path = f"{parent}/{name}" if parent and name else (parent or name)
+            if not mask & _IN_ISDIR:
+                with self._lock:
+                    self._changed_paths.add(rel_path)
+                continue
+            if mask & (_IN_CREATE | _IN_MOVED_TO) and not self._filter.should_skip_dir(
+                rel_path, name
+            ):
+                try:
+                    self._watch_tree(rel_path)
+                except OSError:
+                    logger.debug("Cannot watch new directory %s", rel_path, exc_info=True)
+                    self.failed = True
+            if mask & (_IN_CREATE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_DELETE):
+                with self._lock:
+                    self._changed_dirs.add(rel_path)
+
+
+__all__ = ["InotifyWorkspaceWatcher", "inotify_available"]
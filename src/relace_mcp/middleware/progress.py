@@ -5,7 +5,7 @@ from typing import Any
 from fastmcp.server.context import Context
 from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
 
-_HEARTBEAT_TOOLS: frozenset[str] = frozenset({"fast_apply"})
+_HEARTBEAT_TOOLS: frozenset[str] = frozenset({"fast_apply", "fast_apply_batch"})
 
 
 class ProgressHeartbeatMiddleware(Middleware):
@@ -1,4 +1,3 @@
-import glob
 import hashlib
 import json
 import logging
@@ -8,11 +7,13 @@ from typing import Any
 
 from ..config import settings
 from .context import get_trace_id, tool_name
+from .writer import BufferedJsonlWriter, encode_line, rotate_file
 
 logger = logging.getLogger(__name__)
 
 MAX_ROTATED_LOGS = 5
 _LOG_LOCK = threading.Lock()
+_LOG_WRITER = BufferedJsonlWriter("event", max_rotated=MAX_ROTATED_LOGS)
 
 _LEVEL_RANK: dict[str, int] = {
     "debug": 10,
@@ -145,22 +146,16 @@ def rotate_log_if_needed() -> None:
     try:
         log_path = settings.LOG_PATH
         if log_path.exists() and log_path.stat().st_size > settings.MAX_LOG_SIZE_BYTES:
-            ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-            stem = log_path.stem
-            suffix = log_path.suffix
-            rotated_path = log_path.with_name(f"{stem}.{ts}{suffix}")
-            log_path.rename(rotated_path)
-            logger.debug("Rotated log file to %s", rotated_path)
-
-            pattern = f"{glob.escape(stem)}.*{glob.escape(suffix)}"
-            rotated_logs = sorted(log_path.parent.glob(pattern), reverse=True)
-            for old_log in rotated_logs[MAX_ROTATED_LOGS:]:
-                old_log.unlink(missing_ok=True)
-                logger.debug("Cleaned up old log file: %s", old_log)
+            rotate_file(log_path, MAX_ROTATED_LOGS)
     except Exception as exc:
         logger.warning("Failed to rotate log file: %s", exc)
 
 
+def flush_event_log(timeout: float = 5.0) -> bool:
+    """Wait for buffered events (MCP_LOG_ASYNC) to reach the log file."""
+    return _LOG_WRITER.flush(timeout)
+
+
 def log_event(event: dict[str, Any]) -> None:
     """Write a single JSON event to local log file.
 
@@ -192,6 +187,10 @@ def log_event(event: dict[str, Any]) -> None:
 
         event = _sanitize_event(event)
 
+        if settings.MCP_LOG_ASYNC:
+            _LOG_WRITER.submit(settings.LOG_PATH, settings.MAX_LOG_SIZE_BYTES, encode_line(event))
+            return
+
         with _LOG_LOCK:
             if settings.LOG_PATH.is_dir():
                 logger.warning("Log path is a directory, skipping log write")
@@ -0,0 +1,380 @@
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from .writer import _FSYNC_INTERVAL_SECONDS, BufferedJsonlWriter, _OpenFile
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".seg.gz"
+INDEX_SUFFIX = ".seg.idx"
+MAX_TRACE_SEGMENTS = 20
+
+# gzip container (wbits=31) so each segment is also readable with zcat.
+_GZIP_WBITS = 31
+_COMPRESS_LEVEL = 6
+# Traces whose message hashes are remembered for deduplication.
+_DEDUP_MAX_TRACES = 256
+_BLOB_KEY = "$blob"
+
+
+def _message_hash(message: Any) -> str:
+    data = json.dumps(message, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def _segment_stem(index_path: Path) -> str:
+    return index_path.name[: -len(INDEX_SUFFIX)]
+
+
+class TraceSegmentStore:
+    """Appends trace events to gzip segments with a sidecar index.
+
+    Each append becomes one gzip member; the segment's index file gets one
+    JSON line per member with its offset, length, timestamp range, kind
+    counts and trace ids, so readers can decompress only the members they
+    need. Messages repeated across turns of a trace are stored once: later
+    occurrences are replaced by {"$blob": <hash>}.
+
+    Segment names carry the writer's pid, so server processes sharing a log
+    directory never append to each other's segments; a segment pruned by
+    another process is replaced by a new one on the next append.
+
+    Not thread-safe; callers serialize appends.
+    """
+
+    def __init__(
+        self, directory: Path, stem: str, *, max_segment_bytes: int, max_segments: int
+    ) -> None:
+        self._directory = directory
+        self._stem = stem
+        self._max_segment_bytes = max_segment_bytes
+        self._max_segments = max_segments
+        self._segment: _OpenFile | None = None
+        self._index: _OpenFile | None = None
+        self._seen: OrderedDict[str, set[str]] = OrderedDict()
+        self._last_fsync = time.monotonic()
+        self._pid = os.getpid()
+
+    def append(self, lines: list[bytes]) -> None:
+        events: list[dict[str, Any]] = []
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(event, dict):
+                events.append(self._dedupe(event))
+        if not events:
+            return
+
+        segment, index = self._open()
+        payload = "".join(
+            json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in events
+        ).encode("utf-8")
+        compressor = zlib.compressobj(_COMPRESS_LEVEL, zlib.DEFLATED, _GZIP_WBITS)
+        member = compressor.compress(payload) + compressor.flush()
+        offset = segment.size
+        segment.handle.write(member)
+        segment.handle.flush()
+        segment.size += len(member)
+
+        kinds: dict[str, int] = {}
+        for e in events:
+            kind = str(e.get("kind", "unknown"))
+            kinds[kind] = kinds.get(kind, 0) + 1
+        timestamps = [str(e["timestamp"]) for e in events if e.get("timestamp")]
+        entry = {
+            "offset": offset,
+            "length": len(member),
+            "events": len(events),
+            "first_ts": min(timestamps, default=None),
+            "last_ts": max(timestamps, default=None),
+            "kinds": kinds,
+            "trace_ids": sorted({str(e["trace_id"]) for e in events if e.get("trace_id")}),
+        }
+        index.handle.write((json.dumps(entry) + "\n").encode("utf-8"))
+        index.handle.flush()
+
+        now = time.monotonic()
+        if now - self._last_fsync >= _FSYNC_INTERVAL_SECONDS:
+            self._last_fsync = now
+            for f in (segment, index):
+                try:
+                    os.fsync(f.handle.fileno())
+                except OSError:
+                    pass
+
+    def close(self) -> None:
+        for f in (self._segment, self._index):
+            if f is not None:
+                f.close()
+        self._segment = None
+        self._index = None
+
+    def close_if_replaced(self) -> None:
+        """Release the open segment if another process pruned it."""
+        segment, index = self._segment, self._index
+        if segment is not None and index is not None:
+            if segment.replaced() or index.replaced():
+                self.close()
+
+    def _dedupe(self, event: dict[str, Any]) -> dict[str, Any]:
+        messages = event.get("messages")
+        trace_id = event.get("trace_id")
+        if not isinstance(messages, list) or not trace_id:
+            return event
+        seen = self._seen.get(str(trace_id))
+        if seen is None:
+            seen = set()
+            self._seen[str(trace_id)] = seen
+            while len(self._seen) > _DEDUP_MAX_TRACES:
+                self._seen.popitem(last=False)
+        else:
+            self._seen.move_to_end(str(trace_id))
+
+        stored: list[Any] = []
+        for message in messages:
+            digest = _message_hash(message)
+            if digest in seen:
+                stored.append({_BLOB_KEY: digest})
+            else:
+                seen.add(digest)
+                stored.append({_BLOB_KEY: digest, "value": message})
+        return {**event, "messages": stored}
+
+    def _open(self) -> tuple[_OpenFile, _OpenFile]:
+        self.close_if_replaced()
+        segment, index = self._segment, self._index
+        if segment is not None and index is not None:
+            if segment.size <= self._max_segment_bytes:
+                return segment, index
+            self.close()
+        else:
+            # Resume our own newest segment (after a writer error, or a restart
+            # that reused the pid); another process's segment may still be growing.
+            existing = sorted(self._directory.glob(f"{self._stem}.*.{self._pid}{INDEX_SUFFIX}"))
+            if existing:
+                name = _segment_stem(existing[-1])
+                segment = _OpenFile(self._directory / f"{name}{SEGMENT_SUFFIX}")
+                if segment.size <= self._max_segment_bytes:
+                    self._segment = segment
+                    self._index = _OpenFile(existing[-1])
+                    return self._segment, self._index
+                segment.close()
+
+        ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S_%f")
+        name = f"{self._stem}.{ts}.{self._pid}"
+        self._segment = _OpenFile(self._directory / f"{name}{SEGMENT_SUFFIX}")
+        self._index = _OpenFile(self._directory / f"{name}{INDEX_SUFFIX}")
+        self._prune()
+        return self._segment, self._index
+
+    def _prune(self) -> None:
+        indexes = sorted(self._directory.glob(f"{self._stem}.*{INDEX_SUFFIX}"), reverse=True)
+        for old in indexes[self._max_segments :]:
+            name = _segment_stem(old)
+            (self._directory / f"{name}{SEGMENT_SUFFIX}").unlink(missing_ok=True)
+            old.unlink(missing_ok=True)
+            logger.debug("Cleaned up old trace segment: %s", name)
+
+
+class SegmentedTraceWriter(BufferedJsonlWriter):
+    """BufferedJsonlWriter that compresses each batch into a trace segment.
+
+    The queued path is the configured trace file; segments are written next
+    to it, named after its stem.
+    """
+
+    def __init__(self, name: str, *, max_segments: int) -> None:
+        super().__init__(name, max_rotated=max_segments)
+        self._stores: dict[Path, TraceSegmentStore] = {}
+
+    def store_for(self, path: Path, max_bytes: int) -> TraceSegmentStore:
+        store = self._stores.get(path)
+        if store is None:
+            for other in self._stores.values():
+                other.close()
+            self._stores.clear()
+            store = TraceSegmentStore(
+                path.parent,
+                path.stem,
+                max_segment_bytes=max_bytes,
+                max_segments=self._max_rotated,
+            )
+            self._stores[path] = store
+        return store
+
+    def _write_batch(self, batch: list[tuple[Path, int, bytes]]) -> None:
+        groups: list[tuple[Path, int, list[bytes]]] = []
+        for path, max_bytes, data in batch:
+            if groups and groups[-1][0] == path:
+                groups[-1][2].append(data)
+            else:
+                groups.append((path, max_bytes, [data]))
+        for path, max_bytes, lines in groups:
+            if self._unreported_drops:
+                lines.insert(0, self._drop_notice())
+            self.store_for(path, max_bytes).append(lines)
+            self.written += len(lines)
+
+    def _maintain(self) -> None:
+        for store in self._stores.values():
+            store.close_if_replaced()
+
+    def _close_file(self) -> None:
+        for store in self._stores.values():
+            store.close()
+        self._stores.clear()
+
+
+def _load_index(index_path: Path) -> list[dict[str, Any]]:
+    entries: list[dict[str, Any]] = []
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    entries.append(entry)
+    except OSError:
+        return []
+    return entries
+
+
+def _read_member(segment_path: Path, offset: int, length: int) -> list[dict[str, Any]]:
+    with open(segment_path, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+    text = zlib.decompress(data, _GZIP_WBITS).decode("utf-8", errors="replace")
+    events: list[dict[str, Any]] = []
+    for line in text.splitlines():
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(event, dict):
+            events.append(event)
+    return events
+
+
+def _resolve_blobs(event: dict[str, Any], blobs: dict[str, Any]) -> tuple[dict[str, Any], bool]:
+    """Expand {"$blob": h} messages; returns the event and whether all resolved.
+
+    References whose value is not in blobs are returned as
+    {"$blob": h, "unresolved": True}.
+    """
+    messages = event.get("messages")
+    if not isinstance(messages, list):
+        return event, True
+    complete = True
+    resolved: list[Any] = []
+    for item in messages:
+        if isinstance(item, dict) and _BLOB_KEY in item:
+            if "value" in item:
+                blobs[item[_BLOB_KEY]] = item["value"]
+                resolved.append(item["value"])
+            elif item[_BLOB_KEY] in blobs:
+                resolved.append(blobs[item[_BLOB_KEY]])
+            else:
+                complete = False
+                resolved.append({_BLOB_KEY: item[_BLOB_KEY], "unresolved": True})
+        else:
+            resolved.append(item)
+    return {**event, "messages": resolved}, complete
+
+
+def _read_member_events(segment_path: Path, entry: dict[str, Any]) -> list[dict[str, Any]]:
+    try:
+        return _read_member(segment_path, int(entry["offset"]), int(entry["length"]))
+    except (OSError, KeyError, ValueError, zlib.error) as exc:
+        logger.debug("Skipping unreadable trace member in %s: %s", segment_path, exc)
+        return []
+
+
+def _load_earlier_blobs(
+    skipped: list[tuple[Path, dict[str, Any]]], trace_id: str, blobs: dict[str, Any]
+) -> None:
+    """Collect message values of trace_id from members skipped before the time range."""
+    remaining: list[tuple[Path, dict[str, Any]]] = []
+    for segment_path, entry in skipped:
+        if trace_id not in entry.get("trace_ids", ()):
+            remaining.append((segment_path, entry))
+            continue
+        for event in _read_member_events(segment_path, entry):
+            if event.get("trace_id") == trace_id:
+                _resolve_blobs(event, blobs)
+    skipped[:] = remaining
+
+
+def iter_trace_events(
+    trace_path: Path,
+    *,
+    trace_id: str | None = None,
+    time_start: datetime | None = None,
+    time_end: datetime | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield trace events from the segments next to trace_path, oldest first.
+
+    Only index entries that can match trace_id and the time range are
+    decompressed. Deduplicated messages are expanded from their first
+    occurrence; when that lies in a member before the time range, the
+    earlier members of the same trace are read on demand. References that
+    cannot be resolved (e.g. defined in a pruned segment) are yielded as
+    {"$blob": <hash>, "unresolved": True}.
+    """
+    directory, stem = trace_path.parent, trace_path.stem
+    start = time_start.isoformat() if time_start else None
+    end = time_end.isoformat() if time_end else None
+    blobs: dict[str, Any] = {}
+    # Members before time_start, read only if a later event references them.
+    skipped: list[tuple[Path, dict[str, Any]]] = []
+    for index_path in sorted(directory.glob(f"{stem}.*{INDEX_SUFFIX}")):
+        segment_path = directory / f"{_segment_stem(index_path)}{SEGMENT_SUFFIX}"
+        for entry in _load_index(index_path):
+            if trace_id is not None and trace_id not in entry.get("trace_ids", ()):
+                continue
+            if start and entry.get("last_ts") and entry["last_ts"] < start:
+                skipped.append((segment_path, entry))
+                continue
+            if end and entry.get("first_ts") and entry["first_ts"] > end:
+                continue
+            for raw in _read_member_events(segment_path, entry):
+                event, complete = _resolve_blobs(raw, blobs)
+                if trace_id is not None and event.get("trace_id") != trace_id:
+                    continue
+                ts = str(event.get("timestamp") or "")
+                if start and ts and ts < start:
+                    continue
+                if end and ts and ts > end:
+                    continue
+                if not complete and skipped and event.get("trace_id"):
+                    _load_earlier_blobs(skipped, str(event["trace_id"]), blobs)
+                    event, _ = _resolve_blobs(raw, blobs)
+                yield event
+
+
+def read_trace(trace_path: Path, trace_id: str) -> list[dict[str, Any]]:
+    """Return every event of one trace from the segments next to trace_path."""
+    return list(iter_trace_events(trace_path, trace_id=trace_id))
+
+
+__all__ = [
+    "INDEX_SUFFIX",
+    "MAX_TRACE_SEGMENTS",
+    "SEGMENT_SUFFIX",
+    "SegmentedTraceWriter",
+    "TraceSegmentStore",
+    "iter_trace_events",
+    "read_trace",
+]
@@ -1,4 +1,3 @@
-import glob
 import json
 import logging
 import threading
@@ -7,11 +6,15 @@ from typing import Any
 
 from ..config import settings
 from .context import get_trace_id
+from .segments import MAX_TRACE_SEGMENTS, SegmentedTraceWriter
+from .writer import BufferedJsonlWriter, encode_line, rotate_file
 
 logger = logging.getLogger(__name__)
 
 MAX_ROTATED_TRACES = 5
 _TRACE_LOCK = threading.Lock()
+_TRACE_WRITER = BufferedJsonlWriter("trace", max_rotated=MAX_ROTATED_TRACES)
+_SEGMENT_WRITER = SegmentedTraceWriter("trace-segment", max_segments=MAX_TRACE_SEGMENTS)
 
 
 def _normalize_kind(value: object) -> str:
@@ -30,25 +33,17 @@ def rotate_trace_if_needed() -> None:
     try:
         trace_path = settings.TRACE_PATH
         if trace_path.exists() and trace_path.stat().st_size > settings.MAX_TRACE_LOG_SIZE_BYTES:
-            ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-            stem = trace_path.stem
-            suffix = trace_path.suffix
-            rotated_path = trace_path.with_name(f"{stem}.{ts}{suffix}")
-            trace_path.rename(rotated_path)
-            logger.debug("Rotated trace file to %s", rotated_path)
-
-            pattern = f"{glob.escape(stem)}.*{glob.escape(suffix)}"
-            rotated_traces = sorted(
-                trace_path.parent.glob(pattern),
-                reverse=True,
-            )
-            for old_trace in rotated_traces[MAX_ROTATED_TRACES:]:
-                old_trace.unlink(missing_ok=True)
-                logger.debug("Cleaned up old trace file: %s", old_trace)
+            rotate_file(trace_path, MAX_ROTATED_TRACES)
     except Exception as exc:
         logger.warning("Failed to rotate trace file: %s", exc)
 
 
+def flush_trace_log(timeout: float = 5.0) -> bool:
+    """Wait for buffered trace events (MCP_LOG_ASYNC) to reach the trace file."""
+    flushed = _TRACE_WRITER.flush(timeout)
+    return _SEGMENT_WRITER.flush(timeout) and flushed
+
+
 def log_trace_event(event: dict[str, Any]) -> None:
     """Write a single JSON trace event to the local trace file.
 
@@ -83,6 +78,24 @@ def log_trace_event(event: dict[str, Any]) -> None:
         if "trace_id" not in event:
             event["trace_id"] = get_trace_id()
 
+        if settings.MCP_TRACE_SEGMENTS:
+            line = encode_line(event)
+            if settings.MCP_LOG_ASYNC:
+                _SEGMENT_WRITER.submit(settings.TRACE_PATH, settings.MAX_TRACE_LOG_SIZE_BYTES, line)
+                return
+            with _TRACE_LOCK:
+                store = _SEGMENT_WRITER.store_for(
+                    settings.TRACE_PATH, settings.MAX_TRACE_LOG_SIZE_BYTES
+                )
+                store.append([line])
+            return
+
+        if settings.MCP_LOG_ASYNC:
+            _TRACE_WRITER.submit(
+                settings.TRACE_PATH, settings.MAX_TRACE_LOG_SIZE_BYTES, encode_line(event)
+            )
+            return
+
         with _TRACE_LOCK:
             if settings.TRACE_PATH.is_dir():
                 logger.warning("Trace path is a directory, skipping trace write")
@@ -0,0 +1,246 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+_QUEUE_MAX_LINES = 10_000
+_BATCH_MAX_LINES = 512
+# How long a caller blocks on a full queue before the line is dropped.
+_PUT_TIMEOUT_SECONDS = 0.05
+_FLUSH_INTERVAL_SECONDS = 0.5
+_FSYNC_INTERVAL_SECONDS = 5.0
+
+
+def rotate_file(path: Path, max_rotated: int) -> None:
+    """Rename path to <stem>.<timestamp><suffix> and prune old rotated files."""
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    stem = path.stem
+    suffix = path.suffix
+    rotated_path = path.with_name(f"{stem}.{ts}{suffix}")
+    path.rename(rotated_path)
+    logger.debug("Rotated %s to %s", path.name, rotated_path)
+
+    pattern = f"{glob.escape(stem)}.*{glob.escape(suffix)}"
+    rotated = sorted(path.parent.glob(pattern), reverse=True)
+    for old in rotated[max_rotated:]:
+        old.unlink(missing_ok=True)
+        logger.debug("Cleaned up old rotated file: %s", old)
+
+
+class _OpenFile:
+    def __init__(self, path: Path) -> None:
+        if path.is_dir():
+            raise IsADirectoryError(f"Log path is a directory: {path}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            path.parent.chmod(0o700)
+        except OSError:
+            pass
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.chmod(path, 0o600)
+        except OSError:
+            pass
+        self.path = path
+        self.handle: BinaryIO = os.fdopen(fd, "ab")
+        st = os.fstat(fd)
+        self.size = st.st_size
+        self.inode = st.st_ino
+        self.dirty = False
+
+    def replaced(self) -> bool:
+        """True if the path no longer refers to the open file (deleted or rotated away)."""
+        try:
+            return self.path.stat().st_ino != self.inode
+        except OSError:
+            return True
+
+    def close(self) -> None:
+        try:
+            self.handle.close()
+        except OSError:
+            pass
+
+
+class BufferedJsonlWriter:
+    """Appends pre-encoded JSON lines to a log file from a background thread.
+
+    Callers only enqueue bytes; the writer thread keeps the file open, writes
+    in batches, fsyncs periodically and rotates by counting written bytes.
+    When the queue is full a caller waits briefly and then the line is
+    dropped; drops are counted and reported in the log itself.
+    """
+
+    def __init__(self, name: str, *, max_rotated: int) -> None:
+        self._name = name
+        self._max_rotated = max_rotated
+        self._queue: queue.Queue[tuple[Path, int, bytes]] = queue.Queue(_QUEUE_MAX_LINES)
+        self._start_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._file: _OpenFile | None = None
+        self._last_fsync = time.monotonic()
+        # Lines submitted but not yet written (or dropped by the writer).
+        self._pending = 0
+        self._drained = threading.Condition()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self._unreported_drops = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "write_errors": self.write_errors,
+            "queued": self._queue.qsize(),
+        }
+
+    def submit(self, path: Path, max_bytes: int, data: bytes) -> bool:
+        """Queue one encoded line; returns False if it was dropped."""
+        self._ensure_started()
+        with self._drained:
+            self._pending += 1
+        try:
+            self._queue.put((path, max_bytes, data), timeout=_PUT_TIMEOUT_SECONDS)
+        except queue.Full:
+            with self._drained:
+                self._pending -= 1
+                self.dropped += 1
+                self._unreported_drops += 1
+                self._drained.notify_all()
+            return False
+        with self._drained:
+            self.enqueued += 1
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued line has been written and flushed."""
+        if self._thread is None:
+            return True
+        with self._drained:
+            return self._drained.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(
+                    target=self._run, name=f"relace-{self._name}-writer", daemon=True
+                )
+                thread.start()
+                self._thread = thread
+                atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=_FLUSH_INTERVAL_SECONDS)
+            except queue.Empty:
+                self._maintain()
+                continue
+            batch = [first]
+            while len(batch) < _BATCH_MAX_LINES:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception as exc:
+                self.write_errors += 1
+                logger.warning("Failed to write %s log: %s", self._name, exc)
+                self._close_file()
+            finally:
+                with self._drained:
+                    self._pending -= len(batch)
+                    self._drained.notify_all()
+
+    def _write_batch(self, batch: list[tuple[Path, int, bytes]]) -> None:
+        for path, max_bytes, data in batch:
+            current = self._open(path)
+            if current.size > max_bytes:
+                rotated = self._rotate(current)
+                current = self._open(path)
+                if not rotated:
+                    # Keep appending; retry after another max_bytes.
+                    current.size = 0
+            if self._unreported_drops:
+                data = self._drop_notice() + data
+            current.handle.write(data)
+            current.size += len(data)
+            current.dirty = True
+            self.written += 1
+        self._maintain()
+
+    def _drop_notice(self) -> bytes:
+        with self._drained:
+            dropped, self._unreported_drops = self._unreported_drops, 0
+        event = {
+            "kind": "log_writer_dropped",
+            "level": "warning",
+            "timestamp": datetime.now(UTC).isoformat(),
+            "dropped": dropped,
+            "dropped_total": self.dropped,
+        }
+        return (json.dumps(event) + "\n").encode("utf-8")
+
+    def _open(self, path: Path) -> _OpenFile:
+        current = self._file
+        if current is not None and current.path == path:
+            return current
+        self._close_file()
+        self._file = _OpenFile(path)
+        return self._file
+
+    def _rotate(self, current: _OpenFile) -> bool:
+        self._close_file()
+        try:
+            rotate_file(current.path, self._max_rotated)
+        except OSError as exc:
+            logger.warning("Failed to rotate %s log: %s", self._name, exc)
+            return False
+        return True
+
+    def _maintain(self) -> None:
+        current = self._file
+        if current is None:
+            return
+        if current.dirty:
+            current.handle.flush()
+            current.dirty = False
+        now = time.monotonic()
+        if now - self._last_fsync < _FSYNC_INTERVAL_SECONDS:
+            return
+        self._last_fsync = now
+        try:
+            os.fsync(current.handle.fileno())
+        except OSError:
+            pass
+        # Reopen on the next write if the file was deleted or rotated externally.
+        if current.replaced():
+            self._close_file()
+
+    def _close_file(self) -> None:
+        current = self._file
+        self._file = None
+        if current is not None:
+            current.close()
+
+
+def encode_line(event: dict[str, Any]) -> bytes:
+    return (json.dumps(event, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+__all__ = ["BufferedJsonlWriter", "encode_line", "rotate_file"]
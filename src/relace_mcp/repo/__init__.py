@@ -3,6 +3,7 @@ from .cloud import (
     cloud_info_logic,
     cloud_list_logic,
     cloud_search_logic,
+    cloud_search_logic_async,
     cloud_sync_logic,
 )
 from .core import SyncState, get_repo_identity, load_sync_state
@@ -13,6 +14,7 @@ __all__ = [
     "cloud_info_logic",
     "cloud_list_logic",
     "cloud_search_logic",
+    "cloud_search_logic_async",
     "cloud_sync_logic",
     "get_repo_identity",
     "load_sync_state",
@@ -1,7 +1,7 @@
 from .clear import cloud_clear_logic
 from .info import cloud_info_logic
 from .list import cloud_list_logic
-from .search import cloud_search_logic
+from .search import cloud_search_logic, cloud_search_logic_async
 from .sync import cloud_sync_logic
 
 __all__ = [
@@ -9,5 +9,6 @@ __all__ = [
     "cloud_info_logic",
     "cloud_list_logic",
     "cloud_search_logic",
+    "cloud_search_logic_async",
     "cloud_sync_logic",
 ]
@@ -13,6 +13,9 @@ def _compute_diff_operations(
     base_dir: str,
     current_files: dict[str, str],
     cached_state: SyncState | None,
+    *,
+    read_content: bool = True,
+    contents: dict[str, bytes] | None = None,
 ) -> tuple[list[dict[str, Any]], dict[str, str], set[str]]:
     """Compute diff operations between current files and cached state.
 
@@ -20,6 +23,9 @@ def _compute_diff_operations(
         base_dir: Base directory path.
         current_files: Dict mapping relative path to hash.
         cached_state: Previous sync state, or None for full sync.
+        read_content: If False, write operations carry only the filename and
+            binary/unreadable detection is left to the uploader (streaming mode).
+        contents: Raw bytes already read while hashing, keyed by relative path.
 
     Returns:
         Tuple of (operations list, new file hashes, skipped files set).
@@ -35,8 +41,13 @@ def _compute_diff_operations(
         cached_hash = cached_files.get(rel_path)
         was_skipped = rel_path in cached_skipped
 
-        if cached_hash != current_hash or was_skipped:
-            content = _read_file_content(base_dir, rel_path)
+        if (cached_hash != current_hash or was_skipped) and not read_content:
+            operations.append({"type": "write", "filename": rel_path})
+            new_hashes[rel_path] = current_hash
+        elif cached_hash != current_hash or was_skipped:
+            content = contents.pop(rel_path, None) if contents else None
+            if content is None:
+                content = _read_file_content(base_dir, rel_path)
             if content is not None:
                 content_str = _decode_file_content(content, path=Path(base_dir) / rel_path)
                 if content_str is None:
@@ -72,3 +83,44 @@ def _compute_diff_operations(
             )
 
     return operations, new_hashes, new_skipped
+
+
+def _pair_renames(
+    operations: list[dict[str, Any]],
+    renamed: tuple[tuple[str, str], ...],
+    current_hashes: dict[str, str],
+    cached_files: dict[str, str],
+) -> list[dict[str, Any]]:
+    """Fold delete(old) + write(new) pairs into rename operations.
+
+    Only pairs reported by git as renames whose content is byte-identical
+    (same hash as the synced old path) are folded, so the cloud repo never
+    receives a rename that would leave it with stale content.
+    """
+    if not renamed:
+        return operations
+
+    deletes = {op["filename"] for op in operations if op["type"] == "delete"}
+    writes = {op["filename"] for op in operations if op["type"] == "write"}
+    pairs: dict[str, str] = {}
+    for old, new in renamed:
+        if old not in deletes or new not in writes or old in pairs or new in pairs.values():
+            continue
+        old_hash = cached_files.get(old)
+        if old_hash is not None and current_hashes.get(new) == old_hash:
+            pairs[old] = new
+
+    if not pairs:
+        return operations
+
+    targets = set(pairs.values())
+    result = [
+        op
+        for op in operations
+        if not (op["type"] == "delete" and op["filename"] in pairs)
+        and not (op["type"] == "write" and op["filename"] in targets)
+    ]
+    result.extend(
+        {"type": "rename", "old_filename": old, "new_filename": new} for old, new in pairs.items()
+    )
+    return result
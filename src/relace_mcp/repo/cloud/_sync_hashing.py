@@ -1,54 +1,112 @@
 # pyright: reportUnusedFunction=false
+import hashlib
 import logging
+import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path, PurePosixPath, PureWindowsPath
 
 from ...config import settings as _settings
-from ..core import compute_file_hash
+from ...utils import racy_cutoff_ns
+from ..core import SyncState, compute_file_hash
+from ._sync_constants import SYNC_MAX_FILE_SIZE_BYTES
 
 logger = logging.getLogger(__name__)
 
+FileStat = tuple[int, int, int]
+
+
+def _file_stat(st: os.stat_result) -> FileStat:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
 
 def _compute_file_hashes(
     base_dir: str,
     files: list[str],
+    *,
+    cached_state: SyncState | None = None,
+    stats: dict[str, FileStat] | None = None,
+    contents: dict[str, bytes] | None = None,
 ) -> dict[str, str]:
     """Compute SHA-256 hashes for files in parallel.
 
+    Files whose (mtime_ns, size, inode) match `cached_state.file_stats` reuse
+    the cached hash without being read. Other files are read once; when
+    `contents` is given, the bytes of files whose hash changed are kept there
+    so the diff step does not read them again.
+
     Args:
         base_dir: Base directory path.
         files: List of relative file paths.
+        cached_state: Previous sync state providing hashes and stats to reuse.
+        stats: Optional output dict receiving trusted stats per file.
+        contents: Optional output dict receiving raw bytes of changed files.
 
     Returns:
         Dict mapping relative path to "sha256:..." hash.
     """
     hashes: dict[str, str] = {}
     base_path = Path(base_dir).resolve()
+    cached_files = cached_state.files if cached_state else {}
+    cached_stats = cached_state.file_stats if cached_state else {}
+    cached_skipped = cached_state.skipped_files if cached_state else set()
+    trusted_before_ns = racy_cutoff_ns()
+    stat_hits = 0
 
-    def hash_file(rel_path: str) -> tuple[str, str | None]:
+    def hash_file(rel_path: str) -> tuple[str, str | None, FileStat | None, bytes | None, bool]:
         try:
             if PurePosixPath(rel_path).is_absolute() or PureWindowsPath(rel_path).is_absolute():
                 logger.warning("Blocked absolute path in hash: %s", rel_path)
-                return (rel_path, None)
+                return (rel_path, None, None, None, False)
             candidate = base_path / rel_path
             if candidate.is_symlink():
                 logger.warning("Blocked symlink in hash: %s", rel_path)
-                return (rel_path, None)
+                return (rel_path, None, None, None, False)
             file_path = candidate.resolve()
         except (OSError, RuntimeError) as exc:
             logger.debug("Failed to resolve for hash %s: %s", rel_path, exc)
-            return (rel_path, None)
+            return (rel_path, None, None, None, False)
         if not file_path.is_relative_to(base_path):
             logger.warning("Blocked path traversal in hash: %s", rel_path)
-            return (rel_path, None)
-        file_hash = compute_file_hash(file_path)
-        return (rel_path, file_hash)
+            return (rel_path, None, None, None, False)
+
+        try:
+            st = os.stat(file_path)
+        except OSError as exc:
+            logger.debug("Failed to stat %s: %s", rel_path, exc)
+            return (rel_path, None, None, None, False)
+        file_stat = _file_stat(st)
+        trusted_stat = file_stat if st.st_mtime_ns < trusted_before_ns else None
+
+        cached_hash = cached_files.get(rel_path)
+        cached_stat = cached_stats.get(rel_path)
+        if cached_hash and cached_stat is not None and tuple(cached_stat) == file_stat:
+            return (rel_path, cached_hash, trusted_stat, None, True)
+
+        if contents is None or st.st_size > SYNC_MAX_FILE_SIZE_BYTES:
+            return (rel_path, compute_file_hash(file_path), trusted_stat, None, False)
+
+        try:
+            data = file_path.read_bytes()
+        except OSError as exc:
+            logger.debug("Failed to hash %s: %s", rel_path, exc)
+            return (rel_path, None, None, None, False)
+        file_hash = f"sha256:{hashlib.sha256(data).hexdigest()}"
+        changed = file_hash != cached_hash or rel_path in cached_skipped
+        return (rel_path, file_hash, trusted_stat, data if changed else None, False)
 
     with ThreadPoolExecutor(max_workers=_settings.RELACE_UPLOAD_MAX_WORKERS) as executor:
         futures = [executor.submit(hash_file, f) for f in files]
         for future in as_completed(futures):
-            rel_path, file_hash = future.result()
-            if file_hash:
-                hashes[rel_path] = file_hash
+            rel_path, file_hash, file_stat, data, stat_hit = future.result()
+            if not file_hash:
+                continue
+            hashes[rel_path] = file_hash
+            stat_hits += stat_hit
+            if stats is not None and file_stat is not None:
+                stats[rel_path] = file_stat
+            if contents is not None and data is not None:
+                contents[rel_path] = data
 
+    if cached_stats:
+        logger.debug("Hashed %d files (%d unchanged by stat)", len(hashes), stat_hits)
     return hashes
@@ -0,0 +1,154 @@
+# pyright: reportUnusedFunction=false
+import logging
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ...clients.repo import RelaceRepoClient
+from ._sync_files import _decode_file_content, _read_file_content
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _UploadChunk:
+    """One size-bounded `update_repo` request."""
+
+    operations: list[dict[str, Any]] = field(default_factory=list)
+    written: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    renamed: list[tuple[str, str]] = field(default_factory=list)
+    nbytes: int = 0
+
+
+@dataclass
+class _BatchedUploadResult:
+    repo_head: str
+    written: list[str]
+    skipped: set[str]
+    chunks: int
+
+
+def _iter_upload_chunks(
+    base_dir: str,
+    operations: list[dict[str, Any]],
+    max_bytes: int,
+    skipped: set[str],
+) -> Iterator[_UploadChunk]:
+    """Yield size-bounded chunks, reading write content from disk lazily.
+
+    Write operations without "content" are read and decoded only when their
+    chunk is built, so at most a few chunks are resident at once. Files that
+    turn out binary or unreadable are added to `skipped`. Deletes and renames
+    are small and ride along with the final chunk.
+    """
+    chunk = _UploadChunk()
+    path_ops: list[dict[str, Any]] = []
+
+    for op in operations:
+        if op["type"] != "write":
+            path_ops.append(op)
+            continue
+
+        rel_path = op["filename"]
+        content = op.get("content")
+        if content is None:
+            raw = _read_file_content(base_dir, rel_path)
+            content = (
+                None if raw is None else _decode_file_content(raw, path=Path(base_dir) / rel_path)
+            )
+            if content is None:
+                logger.debug("Skipping binary/unreadable file: %s", rel_path)
+                skipped.add(rel_path)
+                continue
+            size = len(raw) if raw is not None else 0
+        else:
+            size = len(content.encode("utf-8"))
+
+        if chunk.operations and chunk.nbytes + size > max_bytes:
+            yield chunk
+            chunk = _UploadChunk()
+        chunk.operations.append({"type": "write", "filename": rel_path, "content": content})
+        chunk.written.append(rel_path)
+        chunk.nbytes += size
+
+    for op in path_ops:
+        chunk.operations.append(op)
+        if op["type"] == "rename":
+            chunk.renamed.append((op["old_filename"], op["new_filename"]))
+        else:
+            chunk.deleted.append(op["filename"])
+    if chunk.operations:
+        yield chunk
+
+
+def _upload_in_batches(
+    client: RelaceRepoClient,
+    repo_id: str,
+    base_dir: str,
+    operations: list[dict[str, Any]],
+    *,
+    max_bytes: int,
+    max_workers: int,
+    on_chunk_done: Callable[[_UploadChunk, str], None],
+    trace_id: str = "unknown",
+) -> _BatchedUploadResult:
+    """Upload operations as concurrent size-bounded `update_repo` calls.
+
+    All chunks but the last are uploaded with at most `max_workers` requests in
+    flight. The last chunk is sent alone after the others finish, so the
+    repo_head it returns reflects every write. `on_chunk_done` runs on the
+    calling thread after each successful chunk (used for checkpointing).
+    """
+    skipped: set[str] = set()
+    written: list[str] = []
+    repo_head = ""
+    chunks = 0
+    in_flight: dict[Future[str], _UploadChunk] = {}
+
+    def send(chunk: _UploadChunk) -> str:
+        result = client.update_repo(repo_id, chunk.operations, trace_id=trace_id)
+        return str(result.get("repo_head", ""))
+
+    def record(chunk: _UploadChunk, head: str) -> None:
+        nonlocal repo_head, chunks
+        repo_head = head or repo_head
+        chunks += 1
+        written.extend(chunk.written)
+        on_chunk_done(chunk, head)
+
+    def drain(limit: int) -> None:
+        while len(in_flight) > limit:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                record(in_flight.pop(future), future.result())
+
+    last: _UploadChunk | None = None
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="relace-sync-upload"
+    ) as executor:
+        try:
+            for chunk in _iter_upload_chunks(base_dir, operations, max_bytes, skipped):
+                if last is not None:
+                    drain(max_workers - 1)
+                    in_flight[executor.submit(send, last)] = last
+                last = chunk
+            drain(0)
+        except BaseException:
+            for future in in_flight:
+                future.cancel()
+            # Keep progress from requests that still completed successfully.
+            for future, chunk in in_flight.items():
+                if not future.cancelled() and future.exception() is None:
+                    record(chunk, future.result())
+            raise
+
+    if last is not None:
+        logger.debug("[%s] Uploading final chunk (%d ops)", trace_id, len(last.operations))
+        record(last, send(last))
+
+    return _BatchedUploadResult(
+        repo_head=repo_head, written=written, skipped=skipped, chunks=chunks
+    )
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 import uuid
@@ -8,6 +9,7 @@ from ...clients.repo import RelaceRepoClient
 from ...observability import get_trace_id
 from ...observability import tool_name as tool_name_ctx
 from ..core import (
+    SyncState,
     build_cloud_error_details,
     extract_error_fields,
     get_current_git_info,
@@ -31,43 +33,50 @@ def _is_commit_not_indexed_404(exc: Exception, hash_to_send: str) -> bool:
     return "commit" in code_lower or "not_indexed" in code_lower or "commit" in msg_lower
 
 
-def cloud_search_logic(
-    client: RelaceRepoClient,
-    base_dir: str,
-    query: str,
-    branch: str = "",
-    score_threshold: float = 0.3,
-    token_limit: int = 30000,
-) -> dict[str, Any]:
-    """Execute semantic search over the cloud-synced codebase.
+# Official behavior: `retrieve(hash=...)` may return 404 until the commit is indexed.
+# We retry a few times with exponential backoff to smooth out indexing lag.
+_RETRIEVE_RETRY_DELAYS = (0.5, 1.0, 2.0)
 
-    Args:
-        client: RelaceRepoClient instance.
-        query: Natural language search query.
-        branch: Branch to search (empty string uses API default branch).
-        score_threshold: Minimum relevance score (0.0-1.0).
-        token_limit: Maximum tokens to return in results.
 
-    Returns:
-        Dict containing:
-        - query: Original query
-        - branch: Branch searched (empty if using default)
-        - results: List of matching files with content
-        - repo_id: Repository ID used
-        - hash: Commit SHA used for search (if available)
-        - error: Error message if failed (optional)
-    """
-    trace_id = get_trace_id() if tool_name_ctx.get() else str(uuid.uuid4())[:8]
-    logger.debug("[%s] Starting cloud semantic search", trace_id)
-    t0 = time.perf_counter()
+class _CloudSearch:
+    """State shared by the sync and async cloud_search entry points."""
 
-    local_repo_name: str | None = None
-    cloud_repo_name: str | None = None
-    hash_used = ""
-    hash_to_send = ""
+    def __init__(
+        self,
+        base_dir: str,
+        query: str,
+        branch: str,
+        score_threshold: float,
+        token_limit: int,
+    ) -> None:
+        self.base_dir = base_dir
+        self.query = query
+        self.branch = branch
+        self.score_threshold = score_threshold
+        self.token_limit = token_limit
+        self.trace_id = get_trace_id() if tool_name_ctx.get() else str(uuid.uuid4())[:8]
+        self.t0 = time.perf_counter()
+        self.local_repo_name: str | None = None
+        self.cloud_repo_name: str | None = None
+        self.cached_state: SyncState | None = None
+        self.repo_id = ""
+        self.hash_used = ""
+        self.hash_to_send = ""
+        self.warnings: list[str] = []
+        logger.debug("[%s] Starting cloud semantic search", self.trace_id)
 
-    try:
-        local_repo_name, cloud_repo_name, _project_fingerprint = get_repo_identity(base_dir)
+    def _latency_ms(self) -> int:
+        return round((time.perf_counter() - self.t0) * 1000)
+
+    def prepare(self) -> dict[str, Any] | None:
+        """Resolve sync state and warnings; return an error result to stop early."""
+        trace_id = self.trace_id
+        query = self.query
+        branch = self.branch
+
+        local_repo_name, cloud_repo_name, _project_fingerprint = get_repo_identity(self.base_dir)
+        self.local_repo_name = local_repo_name
+        self.cloud_repo_name = cloud_repo_name
         if not local_repo_name or not cloud_repo_name:
             error_result: dict[str, Any] = {
                 "trace_id": trace_id,
@@ -83,7 +92,7 @@ def cloud_search_logic(
                 trace_id,
                 repo_name=None,
                 cloud_repo_name=None,
-                latency_ms=round((time.perf_counter() - t0) * 1000),
+                latency_ms=self._latency_ms(),
                 **extract_error_fields(error_result),
             )
             return error_result
@@ -95,15 +104,15 @@ def cloud_search_logic(
             cloud_repo_name=cloud_repo_name,
             query_preview=(query or "")[:500],
             branch=branch,
-            score_threshold=score_threshold,
-            token_limit=token_limit,
+            score_threshold=self.score_threshold,
+            token_limit=self.token_limit,
         )
 
         # Read repo_id from sync state (requires prior cloud_sync)
-        cached_state = load_sync_state(base_dir)
+        cached_state = load_sync_state(self.base_dir)
 
         if cached_state and cached_state.repo_id:
-            repo_id = cached_state.repo_id
+            self.repo_id = cached_state.repo_id
             git_head = cached_state.git_head_sha or ""
             logger.debug("[%s] Using cached repo state", trace_id)
         else:
@@ -124,13 +133,14 @@ def cloud_search_logic(
                 trace_id,
                 repo_name=local_repo_name,
                 cloud_repo_name=cloud_repo_name,
-                latency_ms=round((time.perf_counter() - t0) * 1000),
+                latency_ms=self._latency_ms(),
                 **extract_error_fields(no_sync_result),
             )
             return no_sync_result
+        self.cached_state = cached_state
 
-        warnings_list: list[str] = []
-        _, current_head = get_current_git_info(base_dir)
+        warnings_list = self.warnings
+        _, current_head = get_current_git_info(self.base_dir)
         if current_head and git_head and current_head != git_head:
             warnings_list.append(
                 f"Local git HEAD ({current_head[:8]}) differs from last synced HEAD ({git_head[:8]}). "
@@ -140,7 +150,7 @@ def cloud_search_logic(
             warnings_list.append(
                 "Sync state is missing git_head_sha; search is not pinned to a specific commit."
             )
-        if is_git_dirty(base_dir):
+        if is_git_dirty(self.base_dir):
             warnings_list.append(
                 "Local git working tree has uncommitted changes; results reflect the last synced revision."
             )
@@ -149,6 +159,11 @@ def cloud_search_logic(
                 f"Last sync was limited to {cached_state.files_selected}/{cached_state.files_found} files "
                 f"(REPO_SYNC_MAX_FILES={cached_state.file_limit}); results may be incomplete."
             )
+        if cached_state.upload_checkpoint:
+            warnings_list.append(
+                "Last cloud_sync was interrupted mid-upload; results may be incomplete. "
+                "Run cloud_sync to resume."
+            )
         if cached_state.skipped_files:
             warnings_list.append(
                 f"Last sync skipped {len(cached_state.skipped_files)} files (binary/oversize/unreadable); "
@@ -160,85 +175,87 @@ def cloud_search_logic(
         # This prevents ignoring user's branch selection when API prioritizes hash over branch
         # NOTE: Use repo_head (cloud commit), NOT git_head_sha (local git commit)
         use_cached_hash = (not branch) or (branch == cached_state.git_branch)
-        hash_to_send = cached_state.repo_head if use_cached_hash else ""
-        hash_used = hash_to_send
+        self.hash_to_send = cached_state.repo_head if use_cached_hash else ""
+        self.hash_used = self.hash_to_send
 
         if branch and not use_cached_hash:
             warnings_list.append(
                 f"Searching branch '{branch}' without commit pinning (differs from synced branch "
                 f"'{cached_state.git_branch}'). Results reflect the latest indexed state of '{branch}'."
             )
+        return None
 
-        # Execute semantic retrieval with commit hash.
-        # Official behavior: `retrieve(hash=...)` may return 404 until the commit is indexed.
-        # We retry a few times with exponential backoff to smooth out indexing lag.
-        retry_delays = (0.5, 1.0, 2.0)
-        result: dict[str, Any] | None = None
-        for attempt in range(len(retry_delays) + 1):
-            try:
-                result = client.retrieve(
-                    repo_id=repo_id,
-                    query=query,
-                    branch=branch,
-                    hash=hash_to_send,
-                    score_threshold=score_threshold,
-                    token_limit=token_limit,
-                    include_content=True,
-                    trace_id=trace_id,
-                )
-                if attempt:
-                    warnings_list.append(
-                        f"Commit hash {hash_to_send[:8]} was not indexed yet; succeeded after {attempt} retries."
-                    )
-                break
-            except Exception as exc:
-                if not _is_commit_not_indexed_404(exc, hash_to_send):
-                    raise
-                if attempt >= len(retry_delays):
-                    raise
-                time.sleep(retry_delays[attempt])
+    def retrieve_kwargs(self) -> dict[str, Any]:
+        return {
+            "repo_id": self.repo_id,
+            "query": self.query,
+            "branch": self.branch,
+            "hash": self.hash_to_send,
+            "score_threshold": self.score_threshold,
+            "token_limit": self.token_limit,
+            "include_content": True,
+            "trace_id": self.trace_id,
+        }
+
+    def retry_delay(self, exc: Exception, attempt: int) -> float:
+        """Return the backoff for a not-yet-indexed commit, re-raising anything else."""
+        if not _is_commit_not_indexed_404(exc, self.hash_to_send):
+            raise exc
+        if attempt >= len(_RETRIEVE_RETRY_DELAYS):
+            raise exc
+        return _RETRIEVE_RETRY_DELAYS[attempt]
 
+    def complete(self, result: dict[str, Any] | None, attempt: int) -> dict[str, Any]:
         if result is None:
             raise RuntimeError("cloud_search retrieve returned no result")
+        assert self.cached_state is not None  # nosec B101 - set by prepare()
+
+        if attempt:
+            self.warnings.append(
+                f"Commit hash {self.hash_to_send[:8]} was not indexed yet; succeeded after {attempt} retries."
+            )
 
         # Format results
         raw_results = result.get("results")
         results: list[Any] = raw_results if isinstance(raw_results, list) else []
         logger.debug(
             "[%s] Cloud search completed, found %d results",
-            trace_id,
+            self.trace_id,
             len(results),
         )
 
+        cloud_repo_name = self.cached_state.cloud_repo_name or self.cloud_repo_name
         result_payload = {
-            "trace_id": trace_id,
-            "query": query,
-            "branch": branch,
-            "hash": hash_to_send,
+            "trace_id": self.trace_id,
+            "query": self.query,
+            "branch": self.branch,
+            "hash": self.hash_to_send,
             "results": results,
-            "repo_id": repo_id,
+            "repo_id": self.repo_id,
             "result_count": len(results),
-            "repo_name": local_repo_name,
-            "cloud_repo_name": cached_state.cloud_repo_name or cloud_repo_name,
-            "warnings": warnings_list,
+            "repo_name": self.local_repo_name,
+            "cloud_repo_name": cloud_repo_name,
+            "warnings": self.warnings,
         }
         log_cloud_event(
             "cloud_search_complete",
-            trace_id,
-            repo_name=local_repo_name,
-            cloud_repo_name=cached_state.cloud_repo_name or cloud_repo_name,
+            self.trace_id,
+            repo_name=self.local_repo_name,
+            cloud_repo_name=cloud_repo_name,
             result_count=len(results),
-            latency_ms=round((time.perf_counter() - t0) * 1000),
+            latency_ms=self._latency_ms(),
         )
         return result_payload
 
-    except Exception as exc:
-        logger.error("[%s] Cloud search failed: %s", trace_id, exc)
-        commit_not_indexed = bool(hash_used) and _is_commit_not_indexed_404(exc, hash_to_send)
+    def fail(self, exc: Exception) -> dict[str, Any]:
+        logger.error("[%s] Cloud search failed: %s", self.trace_id, exc)
+        commit_not_indexed = bool(self.hash_used) and _is_commit_not_indexed_404(
+            exc, self.hash_to_send
+        )
         exc_result: dict[str, Any] = {
-            "trace_id": trace_id,
-            "query": query,
-            "branch": branch,
+            "trace_id": self.trace_id,
+            "query": self.query,
+            "branch": self.branch,
             "hash": "",
             "results": [],
             "repo_id": None,
@@ -251,15 +268,96 @@ def cloud_search_logic(
                 "Commit may not be indexed yet (404). Retry with exponential backoff, "
                 "or omit hash/choose a different branch. If the repo itself is missing, run cloud_sync()."
             )
-        if local_repo_name and cloud_repo_name:
-            exc_result["repo_name"] = local_repo_name
-            exc_result["cloud_repo_name"] = cloud_repo_name
+        if self.local_repo_name and self.cloud_repo_name:
+            exc_result["repo_name"] = self.local_repo_name
+            exc_result["cloud_repo_name"] = self.cloud_repo_name
         log_cloud_event(
             "cloud_search_error",
-            trace_id,
-            repo_name=local_repo_name,
-            cloud_repo_name=cloud_repo_name,
-            latency_ms=round((time.perf_counter() - t0) * 1000),
+            self.trace_id,
+            repo_name=self.local_repo_name,
+            cloud_repo_name=self.cloud_repo_name,
+            latency_ms=self._latency_ms(),
             **extract_error_fields(exc_result),
         )
         return exc_result
+
+
+def cloud_search_logic(
+    client: RelaceRepoClient,
+    base_dir: str,
+    query: str,
+    branch: str = "",
+    score_threshold: float = 0.3,
+    token_limit: int = 30000,
+) -> dict[str, Any]:
+    """Execute semantic search over the cloud-synced codebase.
+
+    Args:
+        client: RelaceRepoClient instance.
+        query: Natural language search query.
+        branch: Branch to search (empty string uses API default branch).
+        score_threshold: Minimum relevance score (0.0-1.0).
+        token_limit: Maximum tokens to return in results.
+
+    Returns:
+        Dict containing:
+        - query: Original query
+        - branch: Branch searched (empty if using default)
+        - results: List of matching files with content
+        - repo_id: Repository ID used
+        - hash: Commit SHA used for search (if available)
+        - error: Error message if failed (optional)
+    """
+    search = _CloudSearch(base_dir, query, branch, score_threshold, token_limit)
+    try:
+        early_result = search.prepare()
+        if early_result is not None:
+            return early_result
+
+        result: dict[str, Any] | None = None
+        attempt = 0
+        while True:
+            try:
+                result = client.retrieve(**search.retrieve_kwargs())
+                break
+            except Exception as exc:
+                time.sleep(search.retry_delay(exc, attempt))
+                attempt += 1
+        return search.complete(result, attempt)
+
+    except Exception as exc:
+        return search.fail(exc)
+
+
+async def cloud_search_logic_async(
+    client: RelaceRepoClient,
+    base_dir: str,
+    query: str,
+    branch: str = "",
+    score_threshold: float = 0.3,
+    token_limit: int = 30000,
+) -> dict[str, Any]:
+    """Async counterpart of `cloud_search_logic`.
+
+    Local git/sync-state checks run in a worker thread; the retrieve call uses
+    the client's pooled async HTTP connection instead of blocking a thread.
+    """
+    search = _CloudSearch(base_dir, query, branch, score_threshold, token_limit)
+    try:
+        early_result = await asyncio.to_thread(search.prepare)
+        if early_result is not None:
+            return early_result
+
+        result: dict[str, Any] | None = None
+        attempt = 0
+        while True:
+            try:
+                result = await client.aretrieve(**search.retrieve_kwargs())
+                break
+            except Exception as exc:
+                await asyncio.sleep(search.retry_delay(exc, attempt))
+                attempt += 1
+        return search.complete(result, attempt)
+
+    except Exception as exc:
+        return search.fail(exc)
@@ -1,10 +1,12 @@
 import logging
 import time
 import uuid
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
 from ...clients.repo import RelaceRepoClient
+from ...config import settings as _settings
 from ...config.settings import REPO_SYNC_MAX_FILES
 from ...observability import get_trace_id
 from ...observability import tool_name as tool_name_ctx
@@ -13,6 +15,7 @@ from ..core import (
     build_cloud_error_details,
     extract_error_fields,
     get_current_git_info,
+    get_git_changes,
     get_git_root,
     get_repo_identity,
     load_sync_state,
@@ -20,13 +23,45 @@ from ..core import (
     save_sync_state,
 )
 from ._sync_constants import CODE_EXTENSIONS, SPECIAL_FILENAMES
-from ._sync_diff import _compute_diff_operations
+from ._sync_diff import _compute_diff_operations, _pair_renames
 from ._sync_discovery import _get_git_tracked_files, _scan_directory
-from ._sync_hashing import _compute_file_hashes
+from ._sync_hashing import FileStat, _compute_file_hashes
+from ._sync_upload import _upload_in_batches, _UploadChunk
 
 logger = logging.getLogger(__name__)
 
 
+def _start_checkpoint(cached_state: SyncState | None, repo_id: str, target_head: str) -> SyncState:
+    """Build the state persisted after each uploaded chunk.
+
+    It keeps the previous sync's git metadata, so an interrupted run is
+    re-diffed against exactly the files already uploaded on the next sync.
+    """
+    checkpoint = SyncState(
+        repo_id=repo_id,
+        repo_head=cached_state.repo_head if cached_state else "",
+        last_sync="",
+        git_branch=cached_state.git_branch if cached_state else "",
+        git_head_sha=cached_state.git_head_sha if cached_state else "",
+        files=dict(cached_state.files) if cached_state else {},
+        file_stats=dict(cached_state.file_stats) if cached_state else {},
+        skipped_files=set(cached_state.skipped_files) if cached_state else set(),
+    )
+    checkpoint.upload_checkpoint = {
+        "target_git_head": target_head,
+        "started_at": datetime.now(UTC).isoformat(),
+        "chunks_done": 0,
+    }
+    return checkpoint
+
+
+def _git_changed_paths(base_dir: str, head: str) -> set[str] | None:
+    if not head:
+        return None
+    changes = get_git_changes(base_dir, head)
+    return set(changes.paths) if changes is not None else None
+
+
 def cloud_sync_logic(
     client: RelaceRepoClient,
     base_dir: str,
@@ -58,6 +93,8 @@ def cloud_sync_logic(
         - ref_changed: Whether git ref changed since last sync
         - sync_mode: "incremental" | "safe_full" | "mirror_full"
         - deletes_suppressed: Number of delete operations suppressed (safe_full mode)
+        - files_renamed: Number of files uploaded as rename operations
+        - change_detection: "git" if changes came from git diff, else "hash"
         - error: Error message if failed (optional)
     """
     trace_id = get_trace_id() if tool_name_ctx.get() else str(uuid.uuid4())[:8]
@@ -179,14 +216,70 @@ def cloud_sync_logic(
             files = files[:REPO_SYNC_MAX_FILES]
         files_selected = len(files)
 
+        batch_bytes = _settings.RELACE_SYNC_BATCH_BYTES
+        # Mirror sync overwrites the whole repo in one request, so it cannot be chunked.
+        batched = batch_bytes > 0 and sync_mode != "mirror_full"
+
+        use_git_diff = _settings.RELACE_SYNC_GIT_DIFF
+        # Paths differing from HEAD now; recorded so the next sync can trust git.
+        dirty_files = _git_changed_paths(base_dir, current_head) if use_git_diff else None
+        git_changes = None
+        if (
+            use_git_diff
+            and diff_state is not None
+            and diff_state.dirty_files is not None
+            and not diff_state.upload_checkpoint
+        ):
+            git_changes = get_git_changes(base_dir, diff_state.git_head_sha)
+
+        file_stats: dict[str, FileStat] = {}
+        # Streaming uploads re-read content per chunk, so only keep bytes otherwise.
+        changed_contents: dict[str, bytes] | None = None if batched else {}
+        to_hash = files
+        reused_hashes: dict[str, str] = {}
+        if git_changes is not None and diff_state is not None:
+            # Only paths git reports as changed since the last synced commit (or
+            # that were dirty then) can differ from the stored hashes.
+            candidates = git_changes.paths | (diff_state.dirty_files or set())
+            to_hash = []
+            for rel_path in files:
+                cached_hash = diff_state.files.get(rel_path)
+                if (
+                    cached_hash is None
+                    or rel_path in candidates
+                    or rel_path in diff_state.skipped_files
+                ):
+                    to_hash.append(rel_path)
+                else:
+                    reused_hashes[rel_path] = cached_hash
+                    cached_stat = diff_state.file_stats.get(rel_path)
+                    if cached_stat is not None:
+                        file_stats[rel_path] = (cached_stat[0], cached_stat[1], cached_stat[2])
+            logger.debug(
+                "[%s] Git change detection: hashing %d of %d files",
+                trace_id,
+                len(to_hash),
+                len(files),
+            )
+
         logger.debug("[%s] Computing file hashes...", trace_id)
-        current_hashes = _compute_file_hashes(base_dir, files)
+        current_hashes = _compute_file_hashes(
+            base_dir,
+            to_hash,
+            cached_state=diff_state,
+            stats=file_stats,
+            contents=changed_contents,
+        )
+        current_hashes.update(reused_hashes)
 
         operations, new_hashes, new_skipped = _compute_diff_operations(
-            base_dir, current_hashes, diff_state
+            base_dir,
+            current_hashes,
+            diff_state,
+            read_content=not batched,
+            contents=changed_contents,
         )
 
-        writes = [op for op in operations if op["type"] == "write"]
         deletes = [op for op in operations if op["type"] == "delete"]
 
         if sync_mode == "safe_full" and deletes:
@@ -206,25 +299,17 @@ def cloud_sync_logic(
                 operations = [op for op in operations if op["type"] != "delete"]
                 deletes = []
 
-        cached_files = cached_state.files if cached_state else {}
-        files_created = sum(1 for op in writes if op["filename"] not in cached_files)
-        files_updated = sum(1 for op in writes if op["filename"] in cached_files)
-        files_deleted = len(deletes)
-        files_skipped = len(new_skipped)
-        files_unchanged = len(new_hashes) - len(writes) - files_skipped
-
-        logger.debug(
-            "[%s] Diff computed: %d created, %d updated, %d deleted, %d unchanged, %d skipped",
-            trace_id,
-            files_created,
-            files_updated,
-            files_deleted,
-            files_unchanged,
-            files_skipped,
-        )
+        if git_changes is not None and diff_state is not None and deletes:
+            operations = _pair_renames(
+                operations, git_changes.renamed, current_hashes, diff_state.files
+            )
+            deletes = [op for op in operations if op["type"] == "delete"]
 
+        upload_chunks = 0
+        resumed = bool(cached_state and cached_state.upload_checkpoint)
         repo_head = ""
         if sync_mode == "mirror_full":
+            writes = [op for op in operations if op["type"] == "write"]
             logger.debug("[%s] Mirror full sync: uploading %d files...", trace_id, len(writes))
             file_contents = [
                 {"filename": op["filename"], "content": op["content"]} for op in writes
@@ -240,6 +325,57 @@ def cloud_sync_logic(
                 trace_id,
                 repo_head[:8] if repo_head else "none",
             )
+        elif operations and batched:
+            logger.debug(
+                "[%s] Applying %d operations in chunks of ~%d bytes...",
+                trace_id,
+                len(operations),
+                batch_bytes,
+            )
+            checkpoint = _start_checkpoint(cached_state, repo_id, current_head)
+
+            def _save_progress(chunk: _UploadChunk, head: str) -> None:
+                for rel_path in chunk.written:
+                    checkpoint.files[rel_path] = new_hashes[rel_path]
+                    checkpoint.skipped_files.discard(rel_path)
+                    if rel_path in file_stats:
+                        checkpoint.file_stats[rel_path] = list(file_stats[rel_path])
+                    else:
+                        checkpoint.file_stats.pop(rel_path, None)
+                for rel_path in chunk.deleted:
+                    checkpoint.files.pop(rel_path, None)
+                    checkpoint.file_stats.pop(rel_path, None)
+                for old_path, new_path in chunk.renamed:
+                    checkpoint.files.pop(old_path, None)
+                    checkpoint.file_stats.pop(old_path, None)
+                    checkpoint.files[new_path] = new_hashes[new_path]
+                checkpoint.repo_head = head or checkpoint.repo_head
+                checkpoint.upload_checkpoint["chunks_done"] += 1
+                save_sync_state(base_dir, checkpoint)
+
+            batch = _upload_in_batches(
+                client,
+                repo_id,
+                base_dir,
+                operations,
+                max_bytes=batch_bytes,
+                max_workers=_settings.RELACE_UPLOAD_MAX_WORKERS,
+                on_chunk_done=_save_progress,
+                trace_id=trace_id,
+            )
+            repo_head = batch.repo_head
+            upload_chunks = batch.chunks
+            new_skipped |= batch.skipped
+            written = set(batch.written)
+            operations = [
+                op for op in operations if op["type"] != "write" or op["filename"] in written
+            ]
+            logger.debug(
+                "[%s] Batched update completed (%d chunks), new head=%s",
+                trace_id,
+                upload_chunks,
+                repo_head[:8] if repo_head else "none",
+            )
         elif operations:
             logger.debug("[%s] Applying %d operations via update API...", trace_id, len(operations))
             result = client.update_repo(repo_id, operations, trace_id=trace_id)
@@ -253,6 +389,25 @@ def cloud_sync_logic(
             logger.debug("[%s] No changes detected, skipping update", trace_id)
             repo_head = cached_state.repo_head if cached_state else ""
 
+        writes = [op for op in operations if op["type"] == "write"]
+        cached_files = cached_state.files if cached_state else {}
+        files_created = sum(1 for op in writes if op["filename"] not in cached_files)
+        files_updated = sum(1 for op in writes if op["filename"] in cached_files)
+        files_deleted = len(deletes)
+        files_renamed = sum(1 for op in operations if op["type"] == "rename")
+        files_skipped = len(new_skipped)
+        files_unchanged = len(new_hashes) - len(writes) - files_renamed - files_skipped
+
+        logger.debug(
+            "[%s] Diff applied: %d created, %d updated, %d deleted, %d unchanged, %d skipped",
+            trace_id,
+            files_created,
+            files_updated,
+            files_deleted,
+            files_unchanged,
+            files_skipped,
+        )
+
         new_state = SyncState(
             repo_id=repo_id,
             repo_head=repo_head,
@@ -263,12 +418,22 @@ def cloud_sync_logic(
             git_branch=current_branch,
             git_head_sha=current_head,
             files=new_hashes,
+            file_stats={
+                rel_path: list(stat)
+                for rel_path, stat in file_stats.items()
+                if rel_path in new_hashes
+            },
             skipped_files=new_skipped,
             files_found=files_found,
             files_selected=files_selected,
             file_limit=REPO_SYNC_MAX_FILES,
             files_truncated=files_truncated,
         )
+        if dirty_files is not None:
+            # Re-check after upload: a file edited mid-sync may differ from what was hashed.
+            dirty_after = _git_changed_paths(base_dir, current_head)
+            if dirty_after is not None:
+                new_state.dirty_files = dirty_files | dirty_after
         state_saved = save_sync_state(base_dir, new_state)
 
         warnings_list: list[str] = []
@@ -288,6 +453,10 @@ def cloud_sync_logic(
             warnings_list.append(
                 f"Suppressed {deletes_suppressed} delete operations (safe_full); cloud repo may contain stale files."
             )
+        if resumed:
+            warnings_list.append(
+                "Resumed an interrupted batched upload; files uploaded before the interruption were not re-sent."
+            )
         if not state_saved:
             warnings_list.append(
                 "Failed to save local sync state; next cloud_search may fail until re-sync."
@@ -315,7 +484,11 @@ def cloud_sync_logic(
             "ref_changed": ref_changed,
             "sync_mode": sync_mode,
             "deletes_suppressed": deletes_suppressed,
+            "files_renamed": files_renamed,
+            "change_detection": "git" if git_changes is not None else "hash",
             "state_saved": state_saved,
+            "upload_chunks": upload_chunks,
+            "resumed": resumed,
             "warnings": warnings_list,
         }
         log_cloud_event(
@@ -1,7 +1,11 @@
 from .errors import build_cloud_error_details
 from .git import (
+    GitChanges,
+    WorktreeState,
     get_current_git_info,
+    get_git_changes,
     get_git_root,
+    get_worktree_state,
     is_git_dirty,
 )
 from .logging import extract_error_fields, log_cloud_event
@@ -15,14 +19,18 @@ from .state import (
 )
 
 __all__ = [
+    "GitChanges",
     "SyncState",
+    "WorktreeState",
     "build_cloud_error_details",
     "clear_sync_state",
     "compute_file_hash",
     "extract_error_fields",
     "get_current_git_info",
+    "get_git_changes",
     "get_git_root",
     "get_repo_identity",
+    "get_worktree_state",
     "is_git_dirty",
     "load_sync_state",
     "log_cloud_event",
@@ -1,5 +1,7 @@
 import logging
+import re
 import subprocess  # nosec B404
+from dataclasses import dataclass
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -144,3 +146,170 @@ def is_git_dirty(base_dir: str) -> bool:
     except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
         logger.debug("Failed to get git dirty status")
     return False
+
+
+_SHA_RE = re.compile(r"[0-9a-fA-F]{7,64}")
+
+
+@dataclass(frozen=True)
+class GitChanges:
+    """Paths that differ between a commit and the current working tree.
+
+    Paths are relative to the repository root (POSIX separators).
+    """
+
+    modified: frozenset[str]  # added, modified, type-changed or untracked
+    deleted: frozenset[str]
+    renamed: tuple[tuple[str, str], ...]  # (old, new) pairs detected by git
+
+    @property
+    def paths(self) -> set[str]:
+        touched = set(self.modified) | set(self.deleted)
+        for old, new in self.renamed:
+            touched.add(old)
+            touched.add(new)
+        return touched
+
+
+def _parse_name_status_z(output: str) -> GitChanges:
+    modified: set[str] = set()
+    deleted: set[str] = set()
+    renamed: list[tuple[str, str]] = []
+    tokens = output.split("\0")
+    i = 0
+    while i < len(tokens) and tokens[i]:
+        status = tokens[i]
+        kind = status[:1]
+        if kind in ("R", "C"):
+            if i + 2 >= len(tokens):
+                break
+            old, new = tokens[i + 1], tokens[i + 2]
+            if kind == "R":
+                renamed.append((old, new))
+            else:
+                modified.add(new)
+            i += 3
+            continue
+        if i + 1 >= len(tokens):
+            break
+        path = tokens[i + 1]
+        if kind == "D":
+            deleted.add(path)
+        else:
+            modified.add(path)
+        i += 2
+    return GitChanges(frozenset(modified), frozenset(deleted), tuple(renamed))
+
+
+def get_git_changes(base_dir: str, since_sha: str) -> GitChanges | None:
+    """Return what changed between `since_sha` and the working tree.
+
+    Combines `git diff --name-status -M <since_sha>` (committed, staged and
+    unstaged changes to tracked files) with untracked, non-ignored files. Git
+    compares stat data from its index, so this does not read file contents.
+
+    Args:
+        base_dir: Any directory inside a git repository.
+        since_sha: Commit to compare against (e.g. the last synced HEAD).
+
+    Returns:
+        GitChanges, or None if git is unavailable or the commit is unknown
+        (e.g. after a shallow fetch or history rewrite).
+    """
+    if not _SHA_RE.fullmatch(since_sha):
+        return None
+    repo_root = get_git_root(base_dir)
+    try:
+        diff = subprocess.run(  # nosec B603 B607 - fixed argv, sha passed as one argument
+            ["git", "diff", "--name-status", "-z", "-M", "--no-ext-diff", since_sha, "--"],
+            cwd=repo_root,
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        if diff.returncode != 0:
+            logger.debug("git diff against %s failed: %s", since_sha[:8], diff.stderr.strip())
+            return None
+        untracked = subprocess.run(  # nosec B603 B607
+            ["git", "ls-files", "--others", "--exclude-standard", "-z"],
+            cwd=repo_root,
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        if untracked.returncode != 0:
+            return None
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        logger.debug("Failed to get git changes")
+        return None
+
+    changes = _parse_name_status_z(diff.stdout)
+    new_files = {p for p in untracked.stdout.split("\0") if p}
+    if not new_files:
+        return changes
+    return GitChanges(changes.modified | new_files, changes.deleted, changes.renamed)
+
+
+@dataclass(frozen=True)
+class WorktreeState:
+    """HEAD plus the paths that differ from it, as reported by `git status`.
+
+    Paths are relative to `repo_root` (POSIX separators) and include untracked,
+    non-ignored files.
+    """
+
+    repo_root: Path
+    head: str
+    changed: tuple[str, ...]
+
+
+def _parse_status_v2_z(output: str) -> tuple[str, list[str]]:
+    head = ""
+    changed: list[str] = []
+    tokens = output.split("\0")
+    i = 0
+    while i < len(tokens):
+        entry = tokens[i]
+        i += 1
+        if entry.startswith("# branch.oid "):
+            head = entry[len("# branch.oid ") :]
+        elif entry.startswith("1 "):
+            changed.append(entry.split(" ", 8)[8])
+        elif entry.startswith("2 "):
+            changed.append(entry.split(" ", 9)[9])
+            i += 1  # original path of the rename/copy
+        elif entry.startswith("u "):
+            changed.append(entry.split(" ", 10)[10])
+        elif entry.startswith("? "):
+            changed.append(entry[2:])
+    return head, changed
+
+
+def get_worktree_state(base_dir: str) -> WorktreeState | None:
+    """Return HEAD and every changed or untracked path with one `git status` call.
+
+    Args:
+        base_dir: Any directory inside a git repository.
+
+    Returns:
+        WorktreeState, or None if base_dir is not in a git repository or git
+        is unavailable.
+    """
+    repo_root = get_git_root(base_dir)
+    try:
+        result = subprocess.run(  # nosec B603 B607
+            ["git", "status", "--porcelain=v2", "--branch", "-z", "--untracked-files=all"],
+            cwd=repo_root,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        if result.returncode != 0:
+            return None
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        logger.debug("Failed to get git worktree state")
+        return None
+    head, changed = _parse_status_v2_z(result.stdout)
+    if not head:
+        return None
+    return WorktreeState(repo_root, head, tuple(sorted(changed)))
@@ -57,11 +57,17 @@ class SyncState:
     git_branch: str = ""  # Git branch name at sync time (e.g., "main", "HEAD" for detached)
     git_head_sha: str = ""  # Git HEAD commit SHA at sync time
     files: dict[str, str] = field(default_factory=dict)
+    # (mtime_ns, size, inode) per file; a match lets the next sync skip hashing it.
+    file_stats: dict[str, list[int]] = field(default_factory=dict)
     skipped_files: set[str] = field(default_factory=set)  # Paths of binary/oversize files
+    # Paths that differed from git_head_sha when synced (None = not recorded).
+    dirty_files: set[str] | None = None
     files_found: int = 0  # Count before applying REPO_SYNC_MAX_FILES limit
     files_selected: int = 0  # Count after applying limit
     file_limit: int = 0  # REPO_SYNC_MAX_FILES used during last sync
     files_truncated: int = 0  # files_found - files_selected when truncated
+    # Progress of an interrupted batched upload; empty once a sync completes.
+    upload_checkpoint: dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -75,11 +81,14 @@ class SyncState:
             "git_branch": self.git_branch,
             "git_head_sha": self.git_head_sha,
             "files": self.files,
+            "file_stats": self.file_stats,
             "skipped_files": list(self.skipped_files),
+            "dirty_files": sorted(self.dirty_files) if self.dirty_files is not None else None,
             "files_found": self.files_found,
             "files_selected": self.files_selected,
             "file_limit": self.file_limit,
             "files_truncated": self.files_truncated,
+            "upload_checkpoint": self.upload_checkpoint,
         }
 
     @classmethod
@@ -99,11 +108,14 @@ class SyncState:
             git_branch=data.get("git_branch", ""),
             git_head_sha=data.get("git_head_sha", ""),
             files=data.get("files", {}),
+            file_stats=data.get("file_stats") or {},
             skipped_files=set(data.get("skipped_files", [])),
+            dirty_files=(set(data["dirty_files"]) if data.get("dirty_files") is not None else None),
             files_found=data.get("files_found", 0),
             files_selected=data.get("files_selected", 0),
             file_limit=data.get("file_limit", 0),
             files_truncated=data.get("files_truncated", 0),
+            upload_checkpoint=data.get("upload_checkpoint") or {},
         )
 
 
@@ -1,7 +1,9 @@
 import os
 import time
 from dataclasses import dataclass
+from pathlib import Path
 
+from ..config import settings as _settings
 from .backends.index_state import (
     _CHUNKHOUND_DIRTY_TS_FILE,
     _CHUNKHOUND_HEAD_FILE,
@@ -11,7 +13,19 @@ from .backends.index_state import (
     _read_dirty_ts,
     _read_indexed_head,
 )
-from .core import get_current_git_info, is_git_dirty, load_sync_state
+from .cloud._sync_constants import CODE_EXTENSIONS, SPECIAL_FILENAMES
+from .core import (
+    SyncState,
+    compute_file_hash,
+    get_current_git_info,
+    get_git_changes,
+    get_git_root,
+    is_git_dirty,
+    load_sync_state,
+)
+
+# Above this many changed paths, re-hashing is not worth it; report stale.
+_MAX_FRESHNESS_HASH_FILES = 2000
 
 
 @dataclass(frozen=True)
@@ -39,6 +53,42 @@ def _has_local_index_artifacts(base_dir: str, backend: str) -> bool:
     raise ValueError(f"Unsupported local backend: {backend}")
 
 
+def _synced_files_changed(base_dir: str, sync_state: SyncState) -> bool | None:
+    """Return whether any file the cloud index covers differs from the synced copy.
+
+    Uses git to list paths changed since the synced commit (plus paths that
+    were already dirty at sync time), then compares only those against the
+    stored hashes. Returns None when git cannot answer.
+    """
+    if sync_state.dirty_files is None or not sync_state.git_head_sha:
+        return None
+    changes = get_git_changes(base_dir, sync_state.git_head_sha)
+    if changes is None:
+        return None
+
+    repo_root = get_git_root(base_dir)
+    candidates = [
+        rel_path
+        for rel_path in changes.paths | sync_state.dirty_files
+        if rel_path in sync_state.files
+        or Path(rel_path).suffix.lower() in CODE_EXTENSIONS
+        or Path(rel_path).name.lower() in SPECIAL_FILENAMES
+    ]
+    if len(candidates) > _MAX_FRESHNESS_HASH_FILES:
+        return True
+    for rel_path in candidates:
+        file_path = repo_root / rel_path
+        if not file_path.is_file():
+            if rel_path in sync_state.files:
+                return True
+            continue
+        if rel_path in sync_state.skipped_files:
+            continue
+        if compute_file_hash(file_path) != sync_state.files.get(rel_path):
+            return True
+    return False
+
+
 def classify_cloud_index_freshness(base_dir: str) -> FreshnessStatus:
     sync_state = load_sync_state(base_dir)
     if sync_state is None:
@@ -58,6 +108,14 @@ def classify_cloud_index_freshness(base_dir: str) -> FreshnessStatus:
             reason="git_head_unavailable",
         )
 
+    if _settings.RELACE_SYNC_GIT_DIFF and _synced_files_changed(base_dir, sync_state) is False:
+        return FreshnessStatus(
+            freshness="fresh",
+            hints_usable=True,
+            refresh_recommended=False,
+            reason="no_synced_files_changed",
+        )
+
     if sync_state.git_head_sha and sync_state.git_head_sha != current_head:
         return FreshnessStatus(
             freshness="stale",
@@ -1,4 +1,4 @@
-from .bash import bash_handler
+from .bash import bash_handler, bash_handler_async
 from .bash_security import (
     BASH_BLOCKED_COMMANDS,
     BASH_BLOCKED_PATTERNS,
@@ -22,10 +22,10 @@ from .constants import (
     MAX_VIEW_DIRECTORY_CHARS,
     MAX_VIEW_FILE_CHARS,
 )
-from .context import estimate_context_size, truncate_for_context
+from .context import estimate_context_size, message_size, truncate_for_context
 
 # from .glob import glob_handler  # Disabled glob tool (pending removal)
-from .grep_search import grep_search_handler
+from .grep_search import grep_search_handler, grep_search_handler_async
 from .lsp import (
     # --- Disabled LSP tools (kept for future re-enablement) ---
     # CallGraphParams,
@@ -72,9 +72,12 @@ __all__ = [
     "find_symbol_handler",
     "is_blocked_command",
     "bash_handler",
+    "bash_handler_async",
     "estimate_context_size",
+    "message_size",
     # "glob_handler",  # Disabled glob tool (pending removal)
     "grep_search_handler",
+    "grep_search_handler_async",
     # "get_type_handler",
     # "list_symbols_handler",
     "map_repo_path",
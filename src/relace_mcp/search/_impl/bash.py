@@ -1,3 +1,4 @@
+import asyncio
 import os
 import re
 import shutil
@@ -51,6 +52,33 @@ def _translate_repo_paths_in_command(command: str, base_dir: str) -> str:
     return re.sub(r"/repo(?:/[\w.+\-/]*)?(?![\w.+\-])", _replace, command)
 
 
+def _prepare_bash_command(command: str, base_dir: str) -> tuple[list[str], dict[str, str]] | str:
+    """Validate a command and build its argv and environment, or return an error."""
+    blocked, reason = is_blocked_command(command, base_dir)
+
+    if blocked:
+        return f"Error: Command blocked for security reasons. {reason}"
+
+    translated_command = _translate_repo_paths_in_command(command, base_dir)
+    # Defense-in-depth: disable glob expansion to avoid path checks being bypassed
+    translated_command = f"set -f; {translated_command}"
+
+    bash_path = shutil.which("bash")
+    if bash_path is None:
+        return (
+            "Error: bash is not available on this system. "
+            "Install a bash shell (Linux/macOS) or use WSL/Git Bash on Windows."
+        )
+
+    env = {
+        "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+        "HOME": base_dir,
+        "LANG": "C.UTF-8",
+        "LC_ALL": "C.UTF-8",
+    }
+    return [bash_path, "-c", translated_command], env
+
+
 def bash_handler(command: str, base_dir: str) -> str:
     """Execute read-only bash command (Unix-only).
 
@@ -61,35 +89,19 @@ def bash_handler(command: str, base_dir: str) -> str:
     Returns:
         Command output or error message.
     """
-    blocked, reason = is_blocked_command(command, base_dir)
-
-    if blocked:
-        return f"Error: Command blocked for security reasons. {reason}"
-
-    translated_command = _translate_repo_paths_in_command(command, base_dir)
-    # Defense-in-depth: disable glob expansion to avoid path checks being bypassed
-    translated_command = f"set -f; {translated_command}"
-
     try:
-        bash_path = shutil.which("bash")
-        if bash_path is None:
-            return (
-                "Error: bash is not available on this system. "
-                "Install a bash shell (Linux/macOS) or use WSL/Git Bash on Windows."
-            )
+        prepared = _prepare_bash_command(command, base_dir)
+        if isinstance(prepared, str):
+            return prepared
+        argv, env = prepared
 
         result = subprocess.run(  # nosec B603 B602 B607
-            [bash_path, "-c", translated_command],
+            argv,
             cwd=base_dir,
             capture_output=True,
             text=True,
             timeout=BASH_TIMEOUT_SECONDS,
-            env={
-                "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
-                "HOME": base_dir,
-                "LANG": "C.UTF-8",
-                "LC_ALL": "C.UTF-8",
-            },
+            env=env,
             check=False,
         )
 
@@ -99,3 +111,43 @@ def bash_handler(command: str, base_dir: str) -> str:
         return f"Error: Command timed out after {BASH_TIMEOUT_SECONDS}s"
     except Exception as exc:
         return f"Error executing command: {exc}"
+
+
+async def bash_handler_async(command: str, base_dir: str) -> str:
+    """Async variant of bash_handler using an asyncio subprocess (no worker thread)."""
+    try:
+        prepared = _prepare_bash_command(command, base_dir)
+        if isinstance(prepared, str):
+            return prepared
+        argv, env = prepared
+
+        proc = await asyncio.create_subprocess_exec(  # nosec B603 B607
+            *argv,
+            cwd=base_dir,
+            env=env,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(), timeout=BASH_TIMEOUT_SECONDS
+            )
+        except (TimeoutError, asyncio.CancelledError):
+            if proc.returncode is None:
+                proc.kill()
+            await proc.wait()
+            raise
+
+        result = subprocess.CompletedProcess(
+            argv,
+            proc.returncode if proc.returncode is not None else -1,
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+        )
+        return _format_bash_result(result)
+
+    except TimeoutError:
+        return f"Error: Command timed out after {BASH_TIMEOUT_SECONDS}s"
+    except Exception as exc:
+        return f"Error executing command: {exc}"
@@ -12,6 +12,12 @@ MAX_GREP_MATCHES = 50
 GREP_TIMEOUT_SECONDS = 30
 # Python fallback grep max depth
 MAX_GREP_DEPTH = 10
+# Trigram index (SEARCH_GREP_INDEX): traversal depth, file count cap, per-file size cap
+GREP_INDEX_MAX_DEPTH = 32
+GREP_INDEX_MAX_FILES = 200_000
+GREP_INDEX_MAX_FILE_BYTES = 1024 * 1024
+# Changed files refreshed inline before a query; larger deltas rebuild in the background
+GREP_INDEX_MAX_INLINE_UPDATES = 256
 # Context truncation: max chars per tool result (by tool type)
 MAX_TOOL_RESULT_CHARS = 50000  # default limit for truncate_for_context
 MAX_VIEW_FILE_CHARS = 20000
@@ -34,3 +40,5 @@ BASH_MAX_OUTPUT_CHARS = 50000
 # === LSP Tool ===
 # Maximum number of results returned from LSP queries (definition/references)
 MAX_LSP_RESULTS = 50
+# Candidate columns find_symbol sends to the language server at once
+MAX_LSP_BATCH_POSITIONS = 8
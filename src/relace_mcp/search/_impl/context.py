@@ -40,27 +40,31 @@ def truncate_for_context(
     return truncated + hint_msg
 
 
-def estimate_context_size(messages: list[dict[str, Any]]) -> int:
-    """Estimate total character count of messages."""
+def message_size(msg: dict[str, Any]) -> int:
+    """Estimate the character count of a single message."""
     total = 0
-    for msg in messages:
-        content = msg.get("content", "")
-        if isinstance(content, str):
-            total += len(content)
-        elif isinstance(content, list):
-            # OpenAI-style multimodal content: [{"type":"text","text":"..."}, ...]
-            for part in content:
-                if isinstance(part, str):
-                    total += len(part)
-                elif isinstance(part, dict):
-                    for key in ("text", "input_text", "content"):
-                        value = part.get(key)
-                        if isinstance(value, str):
-                            total += len(value)
-                            break
-        # tool_calls also take space
-        tool_calls = msg.get("tool_calls") or []
-        for tc in tool_calls:
-            func = tc.get("function", {})
-            total += len(func.get("arguments", ""))
+    content = msg.get("content", "")
+    if isinstance(content, str):
+        total += len(content)
+    elif isinstance(content, list):
+        # OpenAI-style multimodal content: [{"type":"text","text":"..."}, ...]
+        for part in content:
+            if isinstance(part, str):
+                total += len(part)
+            elif isinstance(part, dict):
+                for key in ("text", "input_text", "content"):
+                    value = part.get(key)
+                    if isinstance(value, str):
+                        total += len(value)
+                        break
+    # tool_calls also take space
+    tool_calls = msg.get("tool_calls") or []
+    for tc in tool_calls:
+        func = tc.get("function", {})
+        total += len(func.get("arguments", ""))
     return total
+
+
+def estimate_context_size(messages: list[dict[str, Any]]) -> int:
+    """Estimate total character count of messages."""
+    return sum(message_size(msg) for msg in messages)
@@ -1,13 +1,12 @@
 import fnmatch
-import os
 from collections.abc import Sequence
 from functools import lru_cache
 from pathlib import Path
 
 from ...utils import validate_file_path
 from .constants import COMMON_IGNORED_DIRS, MAX_GLOB_DEPTH, MAX_GLOB_MATCHES
-from .gitignore import collect_gitignore_specs, is_ignored
 from .paths import map_repo_path
+from .tree_snapshot import get_tree_snapshot
 
 
 def _normalize_glob_pattern(pattern: str) -> tuple[str, bool] | tuple[None, bool]:
@@ -110,47 +109,34 @@ def glob_handler(
 
         matches: list[str] = []
         stop = False
-        base_path = Path(base_dir).resolve()
+        snapshot = get_tree_snapshot(base_dir)
 
-        for root, dirs, files in os.walk(resolved, followlinks=False):
-            root_path = Path(root)
-            rel_root = root_path.relative_to(resolved)
+        # Pre-order DFS over the shared snapshot (same visit order as os.walk).
+        stack: list[tuple[Path, Path]] = [(resolved, Path("."))]
+        while stack and not stop:
+            root_path, rel_root = stack.pop()
             if len(rel_root.parts) >= MAX_GLOB_DEPTH:
-                dirs.clear()
+                continue
+            listing = snapshot.listdir(root_path)
+            if listing is None:
                 continue
 
-            # Always prune heavy dependency/cache directories for predictable performance.
-            dirs[:] = [d for d in dirs if d not in COMMON_IGNORED_DIRS]
-
-            if not include_hidden:
-                dirs[:] = [d for d in dirs if not d.startswith(".")]
-                files = [f for f in files if not f.startswith(".")]
-
-            # Apply gitignore rules to prune directories
-            gitignore_specs = collect_gitignore_specs(root_path, base_path)
-            if gitignore_specs:
-                try:
-                    root_rel = root_path.relative_to(base_path).as_posix()
-                except ValueError:
-                    root_rel = ""
-
-                pruned_dirs = []
-                for d in dirs:
-                    dir_rel = f"{root_rel}/{d}" if root_rel else d
-                    if not is_ignored(dir_rel, True, gitignore_specs):
-                        pruned_dirs.append(d)
-                dirs[:] = pruned_dirs
-
-                # Also filter files by gitignore
-                pruned_files = []
-                for f in files:
-                    file_rel = f"{root_rel}/{f}" if root_rel else f
-                    if not is_ignored(file_rel, False, gitignore_specs):
-                        pruned_files.append(f)
-                files = pruned_files
-
-            dirs.sort()
-            files.sort()
+            dirs: list[str] = []
+            files: list[str] = []
+            descend: list[str] = []
+            for entry in listing.entries:
+                if not include_hidden and entry.name.startswith("."):
+                    continue
+                if entry.is_dir:
+                    # Always prune heavy dependency/cache directories for predictable performance.
+                    if entry.name in COMMON_IGNORED_DIRS or listing.is_ignored(entry.name, True):
+                        continue
+                    dirs.append(entry.name)
+                    # Symlinked directories are listed but never followed.
+                    if not entry.is_symlink:
+                        descend.append(entry.name)
+                elif not listing.is_ignored(entry.name, False):
+                    files.append(entry.name)
 
             # Match directories (only when pattern ends with '/')
             if dir_only:
@@ -166,30 +152,23 @@ def glob_handler(
                         if len(matches) >= requested_max:
                             stop = True
                             break
+            else:
+                for fname in files:
+                    rel_path = rel_root / fname
+                    rel_posix = rel_path.as_posix()
+                    if pattern_has_sep:
+                        ok = _match_glob_segments(pattern_segments, tuple(rel_posix.split("/")))
+                    else:
+                        ok = fnmatch.fnmatchcase(fname, normalized)
 
-            if stop:
-                break
-
-            # Match files
-            if dir_only:
-                continue
+                    if ok:
+                        matches.append(rel_posix)
+                        if len(matches) >= requested_max:
+                            stop = True
+                            break
 
-            for fname in files:
-                rel_path = rel_root / fname
-                rel_posix = rel_path.as_posix()
-                if pattern_has_sep:
-                    ok = _match_glob_segments(pattern_segments, tuple(rel_posix.split("/")))
-                else:
-                    ok = fnmatch.fnmatchcase(fname, normalized)
-
-                if ok:
-                    matches.append(rel_posix)
-                    if len(matches) >= requested_max:
-                        stop = True
-                        break
-
-            if stop:
-                break
+            for dname in reversed(descend):
+                stack.append((root_path / dname, rel_root / dname))
 
         if not matches:
             return "No matches found."
@@ -0,0 +1,512 @@
+import atexit
+import hashlib
+import logging
+import struct
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from ...config.settings import LOG_DIR
+from ...utils import racy_cutoff_ns
+from ..schemas import GrepSearchParams
+from .constants import (
+    GREP_INDEX_MAX_DEPTH,
+    GREP_INDEX_MAX_FILE_BYTES,
+    GREP_INDEX_MAX_FILES,
+    GREP_INDEX_MAX_INLINE_UPDATES,
+    GREP_TIMEOUT_SECONDS,
+    MAX_GREP_MATCHES,
+)
+from .grep_search import (
+    _compile_search_pattern,
+    _is_literal_query,
+    _iter_searchable_files,
+    _matches_file_patterns,
+    _search_in_file,
+)
+
+logger = logging.getLogger(__name__)
+
+# Cross-platform state directory for persisted indexes (one file per base_dir)
+_INDEX_DIR = LOG_DIR / "grep-index"
+_INDEX_MAGIC = b"RLGI"
+_INDEX_VERSION = 1
+# magic, version, base_dir byte length, entry count
+_HEADER = struct.Struct("<4sIHQ")
+# path byte length, mtime_ns, size, bloom bit width
+_ENTRY = struct.Struct("<HqqI")
+
+# Per-file bloom filter sizing: ~10 bits per distinct trigram, 2 probes, power-of-two widths.
+_BLOOM_MIN_BITS = 512
+_BLOOM_MAX_BITS = 1 << 17
+_BLOOM_BITS_PER_TRIGRAM = 10
+
+# When most files are candidates anyway, a ripgrep scan is faster than Python verification.
+_MAX_CANDIDATE_RATIO = 0.5
+# Persist inline refreshes once this many entries changed since the last save.
+_SAVE_AFTER_CHANGES = 64
+# Recorded instead of the real mtime for files modified within the racy window,
+# so they never match a later stat and are re-indexed on the next refresh.
+_UNTRUSTED_MTIME_NS = -1
+
+# Non-ASCII code points that re.IGNORECASE folds onto ASCII letters (UTF-8 encoded).
+# Folding them at index time keeps case-insensitive ASCII queries free of false negatives.
+_ASCII_CASE_FOLDS = (
+    (b"\xc5\xbf", b"s"),  # LATIN SMALL LETTER LONG S
+    (b"\xe2\x84\xaa", b"k"),  # KELVIN SIGN
+    (b"\xc4\xb0", b"i"),  # LATIN CAPITAL LETTER I WITH DOT ABOVE
+    (b"\xc4\xb1", b"i"),  # LATIN SMALL LETTER DOTLESS I
+)
+
+
+@dataclass(frozen=True, slots=True)
+class _IndexEntry:
+    mtime_ns: int
+    size: int
+    bloom: int
+    # 0 means the file was not indexed (too large/unreadable) and is always a candidate.
+    nbits: int
+
+
+def _probe_bits(code: int, nbits: int) -> tuple[int, int]:
+    """Return the two bloom bit positions for a 24-bit trigram code."""
+    mask = nbits - 1
+    return ((code * 0x9E3779B1) >> 8) & mask, ((code * 0x85EBCA77) >> 11) & mask
+
+
+def _fold_bytes(data: bytes) -> bytes:
+    """Case-fold raw file bytes the same way query literals are folded."""
+    data = data.lower()
+    if not data.isascii():
+        for src, dst in _ASCII_CASE_FOLDS:
+            data = data.replace(src, dst)
+    return data
+
+
+def _build_bloom(data: bytes) -> tuple[int, int]:
+    """Build a (bloom, nbits) filter over all byte trigrams in data."""
+    folded = _fold_bytes(data)
+    grams = {folded[i : i + 3] for i in range(len(folded) - 2)}
+    nbits = _BLOOM_MIN_BITS
+    target = len(grams) * _BLOOM_BITS_PER_TRIGRAM
+    while nbits < target and nbits < _BLOOM_MAX_BITS:
+        nbits <<= 1
+    bloom = bytearray(nbits >> 3)
+    for gram in grams:
+        for bit in _probe_bits(int.from_bytes(gram, "little"), nbits):
+            bloom[bit >> 3] |= 1 << (bit & 7)
+    return int.from_bytes(bloom, "little"), nbits
+
+
+def _literal_runs(query: str) -> list[str] | None:
+    """Extract literal substrings that every regex match must contain.
+
+    Conservative by design: anything that could make a literal optional
+    (alternation, inline groups/flags, optional groups, unknown escapes)
+    returns None so the caller skips index narrowing entirely.
+    """
+    if _is_literal_query(query):
+        return [query]
+    if "|" in query or "(?" in query:
+        return None
+
+    runs: list[str] = []
+    run: list[str] = []
+
+    def flush() -> None:
+        if run:
+            runs.append("".join(run))
+            run.clear()
+
+    i = 0
+    n = len(query)
+    while i < n:
+        ch = query[i]
+        if ch == "\\":
+            if i + 1 >= n:
+                return None
+            nxt = query[i + 1]
+            if nxt.isalnum():
+                # Anchors and shorthand classes break a run; other escapes
+                # (\x41, \1, \N{...}) are not worth decoding here.
+                if nxt not in "bBAZdDwWsS":
+                    return None
+                flush()
+            elif nxt.isascii():
+                run.append(nxt)
+            else:
+                flush()
+            i += 2
+            continue
+        if ch == "[":
+            flush()
+            j = i + 1
+            if j < n and query[j] == "^":
+                j += 1
+            if j < n and query[j] == "]":
+                j += 1
+            while j < n and query[j] != "]":
+                j += 2 if query[j] == "\\" else 1
+            if j >= n:
+                return None
+            i = j + 1
+            continue
+        if ch in "*?{":
+            # The quantifier makes the previous atom optional.
+            if run:
+                run.pop()
+            flush()
+            if ch == "{":
+                close = query.find("}", i)
+                i = close + 1 if close != -1 else i + 1
+            else:
+                i += 1
+            continue
+        if ch == ")":
+            flush()
+            if i + 1 < n and query[i + 1] in "*?{":
+                return None
+            i += 1
+            continue
+        if ch in "+.^$(" or not ch.isascii():
+            flush()
+            i += 1
+            continue
+        run.append(ch)
+        i += 1
+    flush()
+    return runs
+
+
+def _required_trigram_codes(query: str) -> set[int] | None:
+    """Return folded trigram codes required by query, or None if it cannot be narrowed."""
+    runs = _literal_runs(query)
+    if runs is None:
+        return None
+    codes: set[int] = set()
+    for literal in runs:
+        if len(literal) < 3 or not literal.isascii():
+            continue
+        folded = _fold_bytes(literal.encode("ascii"))
+        codes.update(int.from_bytes(folded[i : i + 3], "little") for i in range(len(folded) - 2))
+    return codes or None
+
+
+class GrepIndex:
+    """Per-base_dir trigram index refreshed incrementally from file mtime/size.
+
+    Each searchable file gets a small bloom filter over its case-folded byte
+    trigrams. A query's required trigrams select candidate files, which are then
+    verified with the regular Python matcher, so the index can only produce false
+    positives (filtered out by verification), never false negatives.
+    """
+
+    def __init__(self, base_path: Path, index_path: Path) -> None:
+        self.base_path = base_path
+        self.index_path = index_path
+        self._entries: dict[str, _IndexEntry] = {}
+        self._lock = threading.Lock()
+        self._ready = False
+        self._building = False
+        self._disabled = False
+        # Monotonic time at which the last completed refresh started scanning.
+        self._refreshed_at = 0.0
+        self._unsaved = 0
+        self._build_thread: threading.Thread | None = None
+        # Serializes saves so an older snapshot never replaces a newer one.
+        self._save_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready and not self._building and not self._disabled
+
+    def _scan(self) -> dict[str, tuple[int, int]] | None:
+        """Stat all searchable files. Returns None when the tree exceeds the file cap."""
+        stats: dict[str, tuple[int, int]] = {}
+        for filepath, rel_path in _iter_searchable_files(
+            self.base_path, None, None, max_depth=GREP_INDEX_MAX_DEPTH
+        ):
+            try:
+                st = filepath.stat()
+            except OSError:
+                continue
+            stats[rel_path.as_posix()] = (st.st_mtime_ns, st.st_size)
+            if len(stats) > GREP_INDEX_MAX_FILES:
+                return None
+        return stats
+
+    def _index_file(self, rel: str, mtime_ns: int, size: int) -> _IndexEntry:
+        if mtime_ns >= racy_cutoff_ns():
+            # A same-tick rewrite of the same size would otherwise keep this bloom.
+            mtime_ns = _UNTRUSTED_MTIME_NS
+        if size > GREP_INDEX_MAX_FILE_BYTES:
+            return _IndexEntry(mtime_ns, size, 0, 0)
+        try:
+            data = (self.base_path / rel).read_bytes()
+        except OSError:
+            return _IndexEntry(mtime_ns, size, 0, 0)
+        bloom, nbits = _build_bloom(data)
+        return _IndexEntry(mtime_ns, size, bloom, nbits)
+
+    def start_rebuild(self) -> None:
+        """Rebuild in a background thread (caller holds the lock or owns the index)."""
+        if self._building or self._disabled:
+            return
+        self._building = True
+        self._build_thread = threading.Thread(
+            target=self._rebuild, name="relace-grep-index", daemon=True
+        )
+        self._build_thread.start()
+
+    def _rebuild(self) -> None:
+        try:
+            started = time.monotonic()
+            stats = self._scan()
+            if stats is None:
+                logger.info(
+                    "Grep index disabled for %s: more than %d files",
+                    self.base_path,
+                    GREP_INDEX_MAX_FILES,
+                )
+                self._disabled = True
+                return
+            with self._lock:
+                previous = dict(self._entries)
+            entries: dict[str, _IndexEntry] = {}
+            for rel, (mtime_ns, size) in stats.items():
+                entry = previous.get(rel)
+                if entry is None or entry.mtime_ns != mtime_ns or entry.size != size:
+                    entry = self._index_file(rel, mtime_ns, size)
+                entries[rel] = entry
+            with self._lock:
+                self._entries = entries
+                self._refreshed_at = started
+                self._ready = True
+            logger.debug(
+                "Grep index built for %s: %d files in %.1fs",
+                self.base_path,
+                len(entries),
+                time.monotonic() - started,
+            )
+            self.save()
+        except Exception as exc:
+            logger.warning("Grep index build failed for %s: %s", self.base_path, exc)
+            self._disabled = True
+        finally:
+            self._building = False
+
+    def _refresh_locked(self) -> bool:
+        """Apply mtime/size changes inline. Returns False when the index is unusable now."""
+        started = time.monotonic()
+        stats = self._scan()
+        if stats is None:
+            self._disabled = True
+            return False
+
+        changed = [
+            rel
+            for rel, (mtime_ns, size) in stats.items()
+            if (entry := self._entries.get(rel)) is None
+            or entry.mtime_ns != mtime_ns
+            or entry.size != size
+        ]
+        removed = self._entries.keys() - stats.keys()
+        if len(changed) > GREP_INDEX_MAX_INLINE_UPDATES:
+            logger.debug(
+                "Grep index for %s is stale (%d changed files), rebuilding in background",
+                self.base_path,
+                len(changed),
+            )
+            self.start_rebuild()
+            return False
+
+        for rel in removed:
+            del self._entries[rel]
+        for rel in changed:
+            self._entries[rel] = self._index_file(rel, *stats[rel])
+        self._refreshed_at = started
+        self._unsaved += len(changed) + len(removed)
+        if self._unsaved >= _SAVE_AFTER_CHANGES:
+            threading.Thread(target=self.save, name="relace-grep-index-save", daemon=True).start()
+        return True
+
+    def candidates(self, codes: set[int], started_at: float) -> list[str] | None:
+        """Return sorted candidate paths for required trigram codes.
+
+        Refreshes the index first unless a refresh already started after
+        ``started_at`` (so parallel calls in one turn share a single stat pass).
+        Returns None when the index is missing, stale or not selective enough.
+        """
+        if not self.ready:
+            return None
+        with self._lock:
+            if self._refreshed_at < started_at and not self._refresh_locked():
+                return None
+            masks: dict[int, int] = {}
+            result: list[str] = []
+            for rel, entry in self._entries.items():
+                if entry.nbits:
+                    mask = masks.get(entry.nbits)
+                    if mask is None:
+                        mask = 0
+                        for code in codes:
+                            for bit in _probe_bits(code, entry.nbits):
+                                mask |= 1 << bit
+                        masks[entry.nbits] = mask
+                    if entry.bloom & mask != mask:
+                        continue
+                result.append(rel)
+            total = len(self._entries)
+        if total and len(result) > total * _MAX_CANDIDATE_RATIO:
+            return None
+        result.sort()
+        return result
+
+    def load(self) -> bool:
+        """Load a persisted index. Entries are revalidated on the next query."""
+        try:
+            data = self.index_path.read_bytes()
+        except OSError:
+            return False
+        try:
+            magic, version, base_len, count = _HEADER.unpack_from(data, 0)
+            if magic != _INDEX_MAGIC or version != _INDEX_VERSION:
+                return False
+            offset = _HEADER.size
+            base = data[offset : offset + base_len].decode("utf-8")
+            if base != str(self.base_path):
+                return False
+            offset += base_len
+            entries: dict[str, _IndexEntry] = {}
+            for _ in range(count):
+                path_len, mtime_ns, size, nbits = _ENTRY.unpack_from(data, offset)
+                offset += _ENTRY.size
+                rel = data[offset : offset + path_len].decode("utf-8")
+                offset += path_len
+                nbytes = nbits >> 3
+                if nbits and (nbits < _BLOOM_MIN_BITS or nbits & (nbits - 1)):
+                    raise ValueError(f"invalid bloom width {nbits}")
+                if offset + nbytes > len(data):
+                    raise ValueError("truncated bloom filter")
+                bloom = int.from_bytes(data[offset : offset + nbytes], "little")
+                offset += nbytes
+                entries[rel] = _IndexEntry(mtime_ns, size, bloom, nbits)
+            if offset != len(data):
+                raise ValueError(f"{len(data) - offset} trailing bytes")
+        except (struct.error, UnicodeDecodeError, ValueError) as exc:
+            logger.debug("Ignoring corrupt grep index %s: %s", self.index_path, exc)
+            return False
+        with self._lock:
+            self._entries = entries
+            self._refreshed_at = 0.0
+            self._ready = True
+        return True
+
+    def save(self) -> bool:
+        """Persist the index atomically (best-effort)."""
+        with self._save_lock:
+            with self._lock:
+                items = list(self._entries.items())
+                self._unsaved = 0
+            base = str(self.base_path).encode("utf-8")
+            chunks = [_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, len(base), len(items)), base]
+            for rel, entry in items:
+                rel_bytes = rel.encode("utf-8")
+                chunks.append(_ENTRY.pack(len(rel_bytes), entry.mtime_ns, entry.size, entry.nbits))
+                chunks.append(rel_bytes)
+                chunks.append(entry.bloom.to_bytes(entry.nbits >> 3, "little"))
+            # Unique per save: other processes may persist the same base_dir.
+            temp_path = self.index_path.with_name(
+                f"{self.index_path.name}.{uuid.uuid4().hex[:8]}.tmp"
+            )
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path.write_bytes(b"".join(chunks))
+                temp_path.replace(self.index_path)
+                return True
+            except OSError as exc:
+                temp_path.unlink(missing_ok=True)
+                logger.debug("Failed to save grep index %s: %s", self.index_path, exc)
+                return False
+
+
+_INDEXES: dict[str, GrepIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _index_path_for(base_path: Path) -> Path:
+    digest = hashlib.sha256(str(base_path).encode("utf-8")).hexdigest()[:16]
+    return _INDEX_DIR / f"{digest}.idx"
+
+
+def get_grep_index(base_dir: str) -> GrepIndex:
+    """Return the shared index for base_dir, loading or building it on first use."""
+    base_path = Path(base_dir).resolve()
+    key = str(base_path)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = GrepIndex(base_path, _index_path_for(base_path))
+            if not index.load():
+                index.start_rebuild()
+            _INDEXES[key] = index
+        return index
+
+
+def _save_dirty_indexes() -> None:
+    with _INDEXES_LOCK:
+        indexes = list(_INDEXES.values())
+    for index in indexes:
+        if index._unsaved and index.ready:
+            index.save()
+
+
+atexit.register(_save_dirty_indexes)
+
+
+def grep_search_indexed(params: GrepSearchParams) -> str | None:
+    """Answer grep_search via the trigram index.
+
+    Returns None whenever the index cannot answer exactly (missing, stale,
+    still building, or query not narrowable) so callers fall back to
+    ripgrep / the Python scan.
+    """
+    started_at = time.monotonic()
+    codes = _required_trigram_codes(params.query)
+    if not codes:
+        return None
+    pattern = _compile_search_pattern(params.query, params.case_sensitive)
+    if isinstance(pattern, str):
+        return None
+
+    candidates = get_grep_index(params.base_dir).candidates(codes, started_at)
+    if candidates is None:
+        return None
+
+    base_path = Path(params.base_dir)
+    matches: list[str] = []
+    for rel in candidates:
+        if time.monotonic() - started_at > GREP_TIMEOUT_SECONDS:
+            if matches:
+                result = "\n".join(matches)
+                return result + f"\n... search timed out, showing {len(matches)} matches ..."
+            return f"Operation timed out after {GREP_TIMEOUT_SECONDS}s"
+        rel_path = Path(rel)
+        if not _matches_file_patterns(
+            rel_path.name, params.include_pattern, params.exclude_pattern
+        ):
+            continue
+        remaining = MAX_GREP_MATCHES - len(matches)
+        if remaining <= 0:
+            break
+        matches.extend(_search_in_file(base_path / rel_path, pattern, rel_path, remaining))
+
+    if not matches:
+        return "No matches found."
+
+    result = "\n".join(matches)
+    if len(matches) >= MAX_GREP_MATCHES:
+        result += f"\n... output capped at {MAX_GREP_MATCHES} matches ..."
+    return result
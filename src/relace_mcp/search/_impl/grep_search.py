@@ -1,6 +1,6 @@
+import asyncio
 import fnmatch
 import logging
-import os
 import re
 import signal
 import subprocess  # nosec B404
@@ -12,10 +12,11 @@ from contextlib import AbstractContextManager, contextmanager
 from dataclasses import replace
 from pathlib import Path
 
+from ...config import settings as _settings
 from ...encoding import get_project_encoding, read_text_best_effort
 from ..schemas import GrepSearchParams
 from .constants import COMMON_IGNORED_DIRS, GREP_TIMEOUT_SECONDS, MAX_GREP_DEPTH, MAX_GREP_MATCHES
-from .gitignore import collect_gitignore_specs, is_ignored
+from .tree_snapshot import get_tree_snapshot
 
 logger = logging.getLogger(__name__)
 # Include "\" so escape-based regexes like `\bword\b` stay on the regex path.
@@ -62,24 +63,6 @@ def _timeout_context(seconds: int) -> "AbstractContextManager[None]":
     return timeout_impl()
 
 
-def _exceeds_max_depth(root: Path, base_path: Path, max_depth: int) -> bool:
-    """Check if directory depth exceeds limit.
-
-    Args:
-        root: Current directory path.
-        base_path: Base directory path.
-        max_depth: Maximum depth.
-
-    Returns:
-        True if depth exceeds limit.
-    """
-    try:
-        depth = len(Path(root).relative_to(base_path).parts)
-    except ValueError:
-        depth = 0
-    return depth >= max_depth
-
-
 def _matches_file_patterns(
     filename: str, include_pattern: str | None, exclude_pattern: str | None
 ) -> bool:
@@ -150,17 +133,17 @@ def _is_literal_query(query: str) -> bool:
     return not any(ch in _REGEX_SPECIAL_CHARS for ch in query)
 
 
-def _filter_visible_dirs(dirs: list[str]) -> list[str]:
-    """Filter out hidden directories.
+def _is_visible_dir(dirname: str) -> bool:
+    """Check whether a directory should be descended into.
 
     Args:
-        dirs: Directory name list.
+        dirname: Directory name.
 
     Returns:
-        Visible directory list.
+        False for hidden directories and heavy dependency/cache directories.
     """
     # Always prune heavy dependency/cache directories for predictable performance.
-    return [d for d in dirs if not d.startswith(".") and d not in COMMON_IGNORED_DIRS]
+    return not dirname.startswith(".") and dirname not in COMMON_IGNORED_DIRS
 
 
 def _is_searchable_file(
@@ -185,62 +168,57 @@ def _iter_searchable_files(
     base_path: Path,
     include_pattern: str | None,
     exclude_pattern: str | None,
+    max_depth: int = MAX_GREP_DEPTH,
 ) -> Iterator[tuple[Path, Path]]:
     """Generate file paths matching filter conditions.
 
+    Walks the shared tree snapshot, so repeated searches only re-list
+    directories whose mtime changed.
+
     Args:
         base_path: Search starting point.
         include_pattern: Filename include pattern (fnmatch).
         exclude_pattern: Filename exclude pattern (fnmatch).
+        max_depth: Maximum directory depth to descend into.
 
     Yields:
         (filepath, rel_path) tuple.
     """
-    for root, dirs, files in os.walk(base_path):
-        root_path = Path(root)
-        if _exceeds_max_depth(root_path, base_path, MAX_GREP_DEPTH):
-            dirs.clear()
+    snapshot = get_tree_snapshot(base_path)
+    root = snapshot.base_path
+    stack: list[tuple[Path, Path]] = [(root, Path("."))]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        if len(rel_dir.parts) >= max_depth:
+            continue
+        listing = snapshot.listdir(dir_path)
+        if listing is None:
             continue
 
-        dirs[:] = _filter_visible_dirs(dirs)
-
-        # Apply gitignore rules to prune directories and files
-        root_rel = ""
-        gitignore_specs = collect_gitignore_specs(root_path, base_path)
-        if gitignore_specs:
-            try:
-                root_rel = root_path.relative_to(base_path).as_posix()
-            except ValueError:
-                root_rel = ""
-
-            pruned_dirs = []
-            for d in dirs:
-                dir_rel = f"{root_rel}/{d}" if root_rel else d
-                if not is_ignored(dir_rel, True, gitignore_specs):
-                    pruned_dirs.append(d)
-            dirs[:] = pruned_dirs
-
-        for filename in files:
-            if not _is_searchable_file(filename, include_pattern, exclude_pattern):
+        subdirs: list[str] = []
+        for entry in listing.entries:
+            if entry.is_dir:
+                # Symlinked directories are never followed (matches ripgrep).
+                if (
+                    entry.is_symlink
+                    or not _is_visible_dir(entry.name)
+                    or listing.is_ignored(entry.name, True)
+                ):
+                    continue
+                subdirs.append(entry.name)
                 continue
 
-            filepath = root_path / filename
             # Match ripgrep's default behavior: do not follow file symlinks. This prevents
             # path escapes (e.g., a symlink inside base_dir pointing to /etc/passwd).
-            if filepath.is_symlink():
+            if entry.is_symlink:
                 continue
-            try:
-                rel_path = filepath.relative_to(base_path)
-            except ValueError:
+            if not _is_searchable_file(entry.name, include_pattern, exclude_pattern):
                 continue
+            if listing.is_ignored(entry.name, False):
+                continue
+            yield dir_path / entry.name, rel_dir / entry.name
 
-            # Check gitignore for files
-            if gitignore_specs:
-                file_rel = f"{root_rel}/{filename}" if root_rel else filename
-                if is_ignored(file_rel, False, gitignore_specs):
-                    continue
-
-            yield filepath, rel_path
+        stack.extend((dir_path / name, rel_dir / name) for name in reversed(subdirs))
 
 
 def _search_in_file(
@@ -353,6 +331,29 @@ def _process_ripgrep_output(stdout: str) -> str:
     return output
 
 
+def _ripgrep_argv(params: GrepSearchParams) -> list[str]:
+    """Build the ripgrep argv, including project-encoding flags."""
+    cmd = _build_ripgrep_command(params)
+    project_enc = get_project_encoding()
+    if project_enc and project_enc.lower() not in {"utf-8", "utf-8-sig", "ascii", "us-ascii"}:
+        # For regional-encoding projects (e.g., GBK/Big5), force rg to decode correctly.
+        cmd.insert(1, f"--encoding={project_enc.lower()}")
+    elif params.query.isascii():
+        # For ASCII queries, allow searching through non-UTF-8 files safely.
+        cmd.insert(1, "--text")
+    return cmd
+
+
+def _ripgrep_result(returncode: int | None, stdout: bytes) -> str:
+    if returncode == 0:
+        # Decode stdout, handling NUL bytes properly
+        return _process_ripgrep_output(stdout.decode("utf-8", errors="replace"))
+    elif returncode == 1:
+        return "No matches found."
+    else:
+        raise FileNotFoundError("ripgrep failed")
+
+
 def _try_ripgrep(params: GrepSearchParams) -> str:
     """Try to execute search using ripgrep.
 
@@ -366,46 +367,69 @@ def _try_ripgrep(params: GrepSearchParams) -> str:
         FileNotFoundError: ripgrep not available or execution failed.
         subprocess.TimeoutExpired: Search timed out.
     """
-    cmd = _build_ripgrep_command(params)
-    project_enc = get_project_encoding()
-    if project_enc and project_enc.lower() not in {"utf-8", "utf-8-sig", "ascii", "us-ascii"}:
-        # For regional-encoding projects (e.g., GBK/Big5), force rg to decode correctly.
-        cmd.insert(1, f"--encoding={project_enc.lower()}")
-    elif params.query.isascii():
-        # For ASCII queries, allow searching through non-UTF-8 files safely.
-        cmd.insert(1, "--text")
-
     # Use text=False to handle NUL bytes in field separator
     result = subprocess.run(  # nosec B603
-        cmd,
+        _ripgrep_argv(params),
         cwd=params.base_dir,
         capture_output=True,
         text=False,
         timeout=GREP_TIMEOUT_SECONDS,
         check=False,
     )
+    return _ripgrep_result(result.returncode, result.stdout)
 
-    if result.returncode == 0:
-        # Decode stdout, handling NUL bytes properly
-        stdout = result.stdout.decode("utf-8", errors="replace")
-        return _process_ripgrep_output(stdout)
-    elif result.returncode == 1:
-        return "No matches found."
-    else:
-        raise FileNotFoundError("ripgrep failed")
 
-
-def grep_search_handler(params: GrepSearchParams) -> str:
-    """grep_search tool implementation (uses ripgrep or fallback to Python re)."""
-    params = replace(
+async def _try_ripgrep_async(params: GrepSearchParams) -> str:
+    """Async variant of _try_ripgrep using an asyncio subprocess (same contract)."""
+    cmd = _ripgrep_argv(params)
+    proc = await asyncio.create_subprocess_exec(  # nosec B603
+        *cmd,
+        cwd=params.base_dir,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=GREP_TIMEOUT_SECONDS)
+    except (TimeoutError, asyncio.CancelledError) as exc:
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+        if isinstance(exc, TimeoutError):
+            raise subprocess.TimeoutExpired(cmd, GREP_TIMEOUT_SECONDS) from exc
+        raise
+    return _ripgrep_result(proc.returncode, stdout)
+
+
+def _normalize_params(params: GrepSearchParams) -> GrepSearchParams:
+    return replace(
         params,
         exclude_pattern=_normalize_glob_pattern(params.exclude_pattern),
         include_pattern=_normalize_include_pattern(params.include_pattern),
     )
+
+
+def _needs_python_search(params: GrepSearchParams) -> bool:
+    # Non-ASCII patterns cannot be reliably matched across unknown legacy encodings via rg.
+    # Fall back to per-file decoding to support GBK/Big5 mixed repos.
+    return get_project_encoding() is None and not params.query.isascii()
+
+
+def grep_search_handler(params: GrepSearchParams) -> str:
+    """grep_search tool implementation (uses ripgrep or fallback to Python re).
+
+    When SEARCH_GREP_INDEX is enabled, the persistent trigram index is consulted
+    first; it returns None whenever it cannot answer exactly.
+    """
+    params = _normalize_params(params)
     try:
-        # Non-ASCII patterns cannot be reliably matched across unknown legacy encodings via rg.
-        # Fall back to per-file decoding to support GBK/Big5 mixed repos.
-        if get_project_encoding() is None and not params.query.isascii():
+        if _settings.SEARCH_GREP_INDEX:
+            from .grep_index import grep_search_indexed
+
+            indexed = grep_search_indexed(params)
+            if indexed is not None:
+                return indexed
+        if _needs_python_search(params):
             logger.debug(
                 "Non-ASCII query detected without RELACE_DEFAULT_ENCODING; falling back to robust Python search"
             )
@@ -417,6 +441,22 @@ def grep_search_handler(params: GrepSearchParams) -> str:
         return f"Error in grep search: {exc}"
 
 
+async def grep_search_handler_async(params: GrepSearchParams) -> str:
+    """Async grep_search: ripgrep runs as an asyncio subprocess without a worker thread.
+
+    Paths that do in-process work (trigram index, Python fallback) run in a thread.
+    """
+    if _settings.SEARCH_GREP_INDEX or _needs_python_search(_normalize_params(params)):
+        return await asyncio.to_thread(grep_search_handler, params)
+    params = _normalize_params(params)
+    try:
+        return await _try_ripgrep_async(params)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return await asyncio.to_thread(_grep_search_python_fallback, params)
+    except Exception as exc:
+        return f"Error in grep search: {exc}"
+
+
 def _grep_search_python_fallback(params: GrepSearchParams) -> str:
     """Pure Python grep implementation (when ripgrep not available)."""
     # Always compile as a regex, even when _is_literal_query(query) is True.
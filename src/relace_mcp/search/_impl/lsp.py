@@ -1,3 +1,4 @@
+import concurrent.futures
 import logging
 import re
 from contextlib import AbstractContextManager
@@ -8,10 +9,10 @@ from typing import TYPE_CHECKING
 from relace_mcp.config import settings as _settings
 from relace_mcp.utils import map_path_no_resolve
 
-from .constants import MAX_LSP_RESULTS
+from .constants import MAX_LSP_BATCH_POSITIONS, MAX_LSP_RESULTS
 
 if TYPE_CHECKING:
-    from relace_mcp.lsp import LanguageServerConfig, Location, LSPClient
+    from relace_mcp.lsp import LanguageServerConfig, Location, LSPClient, SymbolInfo
 
 logger = logging.getLogger(__name__)
 
@@ -269,46 +270,26 @@ def find_symbol_handler(params: LSPQueryParams, base_dir: str) -> str:
         return client_result
     session, resolved_base_dir, _ = client_result
 
+    columns = [column_0] + _fallback_columns(path_result, line_0, column_0)
+
     try:
         with session as client:
-
-            def do_query(line: int, column: int) -> "list[Location]":
+            results: list[Location] = []
+            # Positions are queried in concurrent batches; the first non-empty
+            # answer in column order wins. This handles a column pointing at a
+            # keyword (def, class) instead of the symbol name.
+            for start in range(0, len(columns), MAX_LSP_BATCH_POSITIONS):
+                batch = columns[start : start + MAX_LSP_BATCH_POSITIONS]
                 if params.action == "definition":
-                    return client.definition(path_result.rel_path, line, column)
-                return client.references(path_result.rel_path, line, column)
-
-            # Try the requested position first
-            results = do_query(line_0, column_0)
-
-            # Fallback: if no results, try finding symbols on the line
-            # This handles cases where column points to keywords (def, class) instead of symbol names
-            if not results:
-                try:
-                    with open(path_result.abs_path, encoding="utf-8", errors="replace") as f:
-                        lines = f.readlines()
-                        if 0 <= line_0 < len(lines):
-                            line_content = lines[line_0]
-                            keywords = (
-                                _PYTHON_KEYWORDS
-                                if path_result.config.language_id == "python"
-                                else frozenset()
-                            )
-                            symbol_columns = _find_symbol_columns(line_content, keywords)
-                            # Skip the originally requested column
-                            for col in symbol_columns:
-                                if col == column_0:
-                                    continue
-                                results = do_query(line_0, col)
-                                if results:
-                                    logger.debug(
-                                        "Column fallback succeeded: line=%d, col=%d -> %d",
-                                        line_0,
-                                        column_0,
-                                        col,
-                                    )
-                                    break
-                except Exception as e:
-                    logger.debug("Column fallback failed: %s", e)
+                    results = client.definition(
+                        path_result.rel_path, line_0, batch[0], fallback_columns=batch[1:]
+                    )
+                else:
+                    results = client.references(
+                        path_result.rel_path, line_0, batch[0], fallback_columns=batch[1:]
+                    )
+                if results:
+                    break
 
             return _format_lsp_results(results, resolved_base_dir)
 
@@ -316,6 +297,20 @@ def find_symbol_handler(params: LSPQueryParams, base_dir: str) -> str:
         return _handle_lsp_error(exc, "query")
 
 
+def _fallback_columns(path_result: _ValidatedPath, line_0: int, column_0: int) -> list[int]:
+    """Other symbol columns on the queried line, in line order."""
+    try:
+        with open(path_result.abs_path, encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    except Exception as e:
+        logger.debug("Column fallback failed: %s", e)
+        return []
+    if not 0 <= line_0 < len(lines):
+        return []
+    keywords = _PYTHON_KEYWORDS if path_result.config.language_id == "python" else frozenset()
+    return [col for col in _find_symbol_columns(lines[line_0], keywords) if col != column_0]
+
+
 def _format_lsp_results(results: "list[Location]", base_dir: str) -> str:
     """Format LSP results into grep-like output, filtering external paths.
 
@@ -325,10 +320,12 @@ def _format_lsp_results(results: "list[Location]", base_dir: str) -> str:
     if not results:
         return "No results found."
 
-    lines = []
+    lines: list[str] = []
+    seen: set[str] = set()
     for r in results:
         line_str = r.to_grep_format(base_dir)
-        if line_str is not None:
+        if line_str is not None and line_str not in seen:
+            seen.add(line_str)
             lines.append(line_str)
             if len(lines) >= MAX_LSP_RESULTS:
                 break
@@ -366,35 +363,51 @@ def search_symbol_handler(params: SearchSymbolParams, base_dir: str) -> str:
         return "No supported LSP languages found in workspace."
 
     manager = LSPClientManager.get_instance()
+    configs = [
+        LANGUAGE_CONFIGS[lang_id] for lang_id in sorted(languages) if lang_id in LANGUAGE_CONFIGS
+    ]
+
+    def query_language(config: "LanguageServerConfig") -> "list[SymbolInfo]":
+        with manager.session(
+            config,
+            resolved_base_dir,
+            timeout_seconds=_settings.SEARCH_LSP_TIMEOUT_SECONDS,
+        ) as client:
+            return client.workspace_symbols(query)
+
+    # Servers are queried concurrently so a multi-language repo pays the
+    # slowest server's latency, not the sum; results merge in language order.
+    outcomes: list[list[SymbolInfo] | Exception] = []
+    if configs:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(configs), thread_name_prefix="lsp-symbol"
+        ) as executor:
+            futures = [executor.submit(query_language, config) for config in configs]
+            for future in futures:
+                try:
+                    outcomes.append(future.result())
+                except Exception as exc:
+                    outcomes.append(exc)
 
     lines: list[str] = []
+    seen: set[str] = set()
     any_success = False
     any_results = False
     errors: list[Exception] = []
 
-    for lang_id in sorted(languages):
-        config = LANGUAGE_CONFIGS.get(lang_id)
-        if config is None:
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            errors.append(outcome)
             continue
-        try:
-            with manager.session(
-                config,
-                resolved_base_dir,
-                timeout_seconds=_settings.SEARCH_LSP_TIMEOUT_SECONDS,
-            ) as client:
-                results = client.workspace_symbols(query)
-            any_success = True
-        except Exception as exc:
-            errors.append(exc)
-            continue
-
-        if results:
+        any_success = True
+        if outcome:
             any_results = True
 
-        for r in results:
+        for r in outcome:
             formatted = r.to_grep_format(resolved_base_dir)
-            if formatted is None:
+            if formatted is None or formatted in seen:
                 continue
+            seen.add(formatted)
             lines.append(formatted)
             if len(lines) >= MAX_LSP_RESULTS:
                 break
@@ -0,0 +1,215 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from ...utils import racy_cutoff_ns
+from .gitignore import (
+    GitIgnoreSpecs,
+    collect_gitignore_specs,
+    is_ignored,
+    load_gitignore_spec,
+)
+
+# Maximum number of base_dir snapshots kept in memory (LRU).
+MAX_TREE_SNAPSHOTS = 8
+
+# Repo-level files whose change invalidates every cached ignore verdict.
+_REPO_STAMP_FILES = (".git/index", ".git/info/exclude", ".git/HEAD")
+
+_Stamp = tuple[int, int] | None
+
+
+def _stamp(path: str) -> _Stamp:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+@dataclass(frozen=True, slots=True)
+class TreeEntry:
+    """One directory entry as observed when its parent was listed."""
+
+    name: str
+    # is_dir/is_file follow symlinks (os.walk semantics); is_symlink does not.
+    is_dir: bool
+    is_file: bool
+    is_symlink: bool
+
+
+class DirListing:
+    """Cached listing of one directory plus lazily memoized ignore verdicts."""
+
+    __slots__ = (
+        "entries",
+        "gitignore_stamp",
+        "generation",
+        "listed_at_ns",
+        "mtime_ns",
+        "rel_prefix",
+        "specs",
+        "_verdicts",
+    )
+
+    def __init__(
+        self,
+        entries: tuple[TreeEntry, ...],
+        *,
+        mtime_ns: int,
+        gitignore_stamp: _Stamp,
+        generation: int,
+        listed_at_ns: int,
+        specs: GitIgnoreSpecs,
+        rel_prefix: str,
+    ) -> None:
+        self.entries = entries
+        self.mtime_ns = mtime_ns
+        self.gitignore_stamp = gitignore_stamp
+        self.generation = generation
+        self.listed_at_ns = listed_at_ns
+        self.specs = specs
+        self.rel_prefix = rel_prefix
+        self._verdicts: dict[tuple[str, bool], bool] = {}
+
+    def is_ignored(self, name: str, is_dir: bool) -> bool:
+        """Return the gitignore verdict for an entry of this directory."""
+        if not self.specs:
+            return False
+        key = (name, is_dir)
+        verdict = self._verdicts.get(key)
+        if verdict is None:
+            rel = f"{self.rel_prefix}/{name}" if self.rel_prefix else name
+            verdict = is_ignored(rel, is_dir, self.specs)
+            self._verdicts[key] = verdict
+        return verdict
+
+    def _is_trusted(self, mtime_ns: int, gitignore_stamp: _Stamp, generation: int) -> bool:
+        if generation != self.generation:
+            return False
+        if mtime_ns != self.mtime_ns or gitignore_stamp != self.gitignore_stamp:
+            return False
+        newest = max(mtime_ns, gitignore_stamp[0] if gitignore_stamp else 0)
+        # Listings modified this close to the time they were read are not trusted.
+        return newest < racy_cutoff_ns(self.listed_at_ns)
+
+
+class TreeSnapshot:
+    """In-memory directory tree for one base_dir, shared by grep/glob/view_directory.
+
+    Listings are revalidated per directory with a single stat (directory mtime and
+    its .gitignore stamp), so repeated walks only re-read directories that changed.
+    A change to the git index, HEAD or .git/info/exclude invalidates everything.
+    """
+
+    def __init__(self, base_path: Path) -> None:
+        self.base_path = base_path
+        self._listings: dict[str, DirListing] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._repo_stamps: tuple[_Stamp, ...] | None = None
+
+    def revalidate(self) -> None:
+        """Invalidate all listings when repo-level git state changed."""
+        stamps = tuple(_stamp(str(self.base_path / rel)) for rel in _REPO_STAMP_FILES)
+        with self._lock:
+            if self._repo_stamps is not None and stamps != self._repo_stamps:
+                self._invalidate_ignore_rules_locked()
+            self._repo_stamps = stamps
+
+    def _invalidate_ignore_rules_locked(self) -> None:
+        self._generation += 1
+        load_gitignore_spec.cache_clear()
+        collect_gitignore_specs.cache_clear()
+
+    def listdir(self, directory: Path) -> DirListing | None:
+        """Return the (possibly cached) listing for directory, or None if unreadable."""
+        key = str(directory)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except OSError:
+            return None
+        gitignore_stamp = _stamp(os.path.join(key, ".gitignore"))
+
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is not None and cached._is_trusted(
+                mtime_ns, gitignore_stamp, self._generation
+            ):
+                return cached
+            if cached is not None and cached.gitignore_stamp != gitignore_stamp:
+                # Nested specs embed parent .gitignore rules; drop them all.
+                self._invalidate_ignore_rules_locked()
+            generation = self._generation
+
+        listing = self._read_listing(directory, mtime_ns, gitignore_stamp, generation)
+        with self._lock:
+            self._listings[key] = listing
+        return listing
+
+    def _read_listing(
+        self, directory: Path, mtime_ns: int, gitignore_stamp: _Stamp, generation: int
+    ) -> DirListing:
+        listed_at_ns = time.time_ns()
+        entries: list[TreeEntry] = []
+        try:
+            with os.scandir(directory) as it:
+                for dir_entry in it:
+                    try:
+                        is_symlink = dir_entry.is_symlink()
+                        is_dir = dir_entry.is_dir()
+                        is_file = dir_entry.is_file()
+                    except OSError:
+                        continue
+                    entries.append(
+                        TreeEntry(
+                            name=dir_entry.name,
+                            is_dir=is_dir,
+                            is_file=is_file,
+                            is_symlink=is_symlink,
+                        )
+                    )
+        except OSError:
+            entries = []
+        entries.sort(key=lambda e: e.name)
+
+        try:
+            rel_prefix = directory.relative_to(self.base_path).as_posix()
+        except ValueError:
+            rel_prefix = ""
+        if rel_prefix == ".":
+            rel_prefix = ""
+
+        return DirListing(
+            tuple(entries),
+            mtime_ns=mtime_ns,
+            gitignore_stamp=gitignore_stamp,
+            generation=generation,
+            listed_at_ns=listed_at_ns,
+            specs=collect_gitignore_specs(directory, self.base_path),
+            rel_prefix=rel_prefix,
+        )
+
+
+_SNAPSHOTS: "OrderedDict[str, TreeSnapshot]" = OrderedDict()
+_SNAPSHOTS_LOCK = threading.Lock()
+
+
+def get_tree_snapshot(base_dir: str | Path) -> TreeSnapshot:
+    """Return the shared snapshot for base_dir, revalidated against repo-level git state."""
+    base_path = Path(base_dir).resolve()
+    key = str(base_path)
+    with _SNAPSHOTS_LOCK:
+        snapshot = _SNAPSHOTS.get(key)
+        if snapshot is None:
+            snapshot = TreeSnapshot(base_path)
+            _SNAPSHOTS[key] = snapshot
+            while len(_SNAPSHOTS) > MAX_TREE_SNAPSHOTS:
+                _SNAPSHOTS.popitem(last=False)
+        else:
+            _SNAPSHOTS.move_to_end(key)
+    snapshot.revalidate()
+    return snapshot
@@ -4,8 +4,8 @@ from pathlib import Path
 
 from ...utils import validate_file_path
 from .constants import COMMON_IGNORED_DIRS, MAX_DIR_ITEMS
-from .gitignore import GitIgnoreSpecs, collect_gitignore_specs, is_ignored
 from .paths import map_repo_path
+from .tree_snapshot import DirListing, get_tree_snapshot
 
 
 def _strip_dot_prefix(path_str: str) -> str:
@@ -13,33 +13,14 @@ def _strip_dot_prefix(path_str: str) -> str:
     return path_str[2:] if path_str.startswith("./") else path_str
 
 
-def _collect_entries(
-    current_abs: Path,
-    include_hidden: bool,
-    gitignore_specs: GitIgnoreSpecs,
-    base_dir: Path,
-) -> tuple[list[tuple[str, Path]], list[tuple[str, Path]]]:
-    """Collect files and subdirectories in directory."""
-    try:
-        entries = list(current_abs.iterdir())
-    except PermissionError:
-        return [], []
-
-    dirs_list: list[tuple[str, Path]] = []
-    files_list: list[tuple[str, Path]] = []
-
-    # Compute relative path for gitignore matching
-    try:
-        rel_prefix = current_abs.relative_to(base_dir).as_posix()
-    except ValueError:
-        rel_prefix = ""
-    if rel_prefix == ".":
-        rel_prefix = ""
+def _collect_entries(listing: DirListing, include_hidden: bool) -> tuple[list[str], list[str]]:
+    """Collect file and subdirectory names from a cached directory listing."""
+    dirs_list: list[str] = []
+    files_list: list[str] = []
 
-    for entry in entries:
+    for entry in listing.entries:
         name = entry.name
-        is_symlink = entry.is_symlink()
-        is_dir = entry.is_dir() and not is_symlink
+        is_dir = entry.is_dir and not entry.is_symlink
 
         if is_dir and name in COMMON_IGNORED_DIRS:
             continue
@@ -48,22 +29,18 @@ def _collect_entries(
             continue
 
         # Check gitignore rules
-        if gitignore_specs:
-            entry_rel = f"{rel_prefix}/{name}" if rel_prefix else name
-            if is_ignored(entry_rel, is_dir, gitignore_specs):
-                continue
+        if listing.is_ignored(name, is_dir):
+            continue
 
         # Never follow symlinks (prevents traversal outside base_dir and cycles).
-        if is_symlink:
-            files_list.append((name, entry))
+        if entry.is_symlink:
+            files_list.append(name)
         elif is_dir:
-            dirs_list.append((name, entry))
-        elif entry.is_file():
-            files_list.append((name, entry))
-
-    dirs_list.sort(key=lambda x: x[0])
-    files_list.sort(key=lambda x: x[0])
+            dirs_list.append(name)
+        elif entry.is_file:
+            files_list.append(name)
 
+    # Listing entries are already sorted by name.
     return files_list, dirs_list
 
 
@@ -74,30 +51,30 @@ def _collect_directory_items(
     items: list[str] = []
     queue: deque[tuple[Path, Path]] = deque()
     queue.append((resolved, Path(".")))
+    snapshot = get_tree_snapshot(base_dir)
 
     while queue and len(items) < MAX_DIR_ITEMS:
         current_abs, current_rel = queue.popleft()
 
-        # Update gitignore specs for nested directories
-        nested_specs = collect_gitignore_specs(current_abs, base_dir)
-        files_list, dirs_list = _collect_entries(
-            current_abs, include_hidden, nested_specs, base_dir
-        )
+        listing = snapshot.listdir(current_abs)
+        if listing is None:
+            continue
+        files_list, dirs_list = _collect_entries(listing, include_hidden)
 
         # List current level files first
-        for name, _ in files_list:
+        for name in files_list:
             if len(items) >= MAX_DIR_ITEMS:
                 break
             rel_path = current_rel / name
             items.append(_strip_dot_prefix(rel_path.as_posix()))
 
         # List subdirectories and add to queue
-        for name, entry in dirs_list:
+        for name in dirs_list:
             if len(items) >= MAX_DIR_ITEMS:
                 break
             rel_path = current_rel / name
             items.append(_strip_dot_prefix(rel_path.as_posix()) + "/")
-            queue.append((entry, rel_path))
+            queue.append((current_abs / name, rel_path))
 
     truncated = len(items) >= MAX_DIR_ITEMS
     return items, truncated
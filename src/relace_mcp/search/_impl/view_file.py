@@ -2,7 +2,7 @@ from collections.abc import Sequence
 from pathlib import Path
 
 from ...config.settings import MAX_FILE_SIZE_BYTES
-from ...encoding import read_text_best_effort
+from ...encoding import CachedText, load_text
 from ...utils import validate_file_path
 from .paths import map_repo_path
 
@@ -51,21 +51,22 @@ def _parse_view_range(view_range: list[int], total_lines: int) -> tuple[int, int
     return start_idx, end_idx
 
 
-def _format_file_lines(lines: list[str], start_idx: int, end_idx: int) -> str:
+def _format_file_lines(cached: CachedText, start_idx: int, end_idx: int) -> str:
     """Format file lines (with line numbers).
 
     Args:
-        lines: All file lines.
+        cached: Decoded file with its line index.
         start_idx: Start index (0-indexed).
         end_idx: End index (0-indexed).
 
     Returns:
         Formatted content string.
     """
-    result_lines = [f"{idx + 1} {lines[idx]}" for idx in range(start_idx, end_idx)]
+    lines = cached.lines(start_idx, end_idx)
+    result_lines = [f"{start_idx + offset + 1} {line}" for offset, line in enumerate(lines)]
     result = "\n".join(result_lines)
 
-    if result_lines and end_idx < len(lines):
+    if result_lines and end_idx < cached.line_count:
         result += "\n... rest of file truncated ..."
 
     return result
@@ -87,13 +88,12 @@ def view_file_handler(
         if error:
             return error
 
-        content = read_text_best_effort(resolved)
-        if content is None:
+        cached = load_text(resolved)
+        if cached.text is None:
             return "Error: File appears to be binary and cannot be viewed as text."
-        lines = content.splitlines()
 
-        start_idx, end_idx = _parse_view_range(view_range, len(lines))
-        return _format_file_lines(lines, start_idx, end_idx)
+        start_idx, end_idx = _parse_view_range(view_range, cached.line_count)
+        return _format_file_lines(cached, start_idx, end_idx)
 
     except Exception as exc:
         return f"Error reading file: {exc}"
@@ -0,0 +1,82 @@
+import json
+from typing import Any
+
+from .constants import MIN_TURNS_BEFORE_STOP
+
+
+def _call_key(tool_call: dict[str, Any]) -> str:
+    func = tool_call.get("function") or {}
+    name = str(func.get("name") or "")
+    raw_args = func.get("arguments") or ""
+    try:
+        args = json.dumps(json.loads(raw_args), sort_keys=True)
+    except (TypeError, ValueError):
+        args = str(raw_args)
+    return f"{name}\0{args}"
+
+
+def _covered_lines(observed: dict[str, list[list[int]]]) -> int:
+    total = 0
+    for ranges in observed.values():
+        end = 0
+        for start, stop in sorted((r[0], r[1]) for r in ranges if len(r) == 2):
+            if stop <= end:
+                continue
+            total += stop - max(start - 1, end)
+            end = stop
+    return total
+
+
+class TurnBudget:
+    """Tracks information gain per turn to end stalled searches early.
+
+    A turn gains information when it adds a file or new lines to the observed
+    set. After one stalled turn the model is nudged to report; after
+    `stall_turns` consecutive stalled turns the harness stops and reports the
+    observed files itself. `stall_turns=0` disables both.
+    """
+
+    def __init__(self, stall_turns: int) -> None:
+        self.stall_turns = stall_turns
+        self.stalled = 0
+        self._calls: set[str] = set()
+        self._files: set[str] = set()
+        self._lines = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.stall_turns > 0
+
+    def record_turn(
+        self, tool_calls: list[dict[str, Any]], observed: dict[str, list[list[int]]]
+    ) -> dict[str, int]:
+        """Update gain counters after a turn's tools ran; returns the turn's stats."""
+        repeated = 0
+        for tc in tool_calls:
+            key = _call_key(tc)
+            if key in self._calls:
+                repeated += 1
+            else:
+                self._calls.add(key)
+        new_files = len(observed.keys() - self._files)
+        self._files.update(observed)
+        lines = _covered_lines(observed)
+        new_lines = max(0, lines - self._lines)
+        self._lines = max(self._lines, lines)
+        self.stalled = 0 if new_files or new_lines else self.stalled + 1
+        return {
+            "new_files": new_files,
+            "new_lines": new_lines,
+            "repeated_calls": repeated,
+            "stalled_turns": self.stalled,
+        }
+
+    def should_nudge(self) -> bool:
+        return self.enabled and self.stalled >= 1
+
+    def should_stop(self, turns_done: int) -> bool:
+        return (
+            self.enabled
+            and turns_done >= MIN_TURNS_BEFORE_STOP
+            and self.stalled >= self.stall_turns
+        )
@@ -19,3 +19,12 @@ MAX_PARALLEL_WORKERS = 12
 # Chars Budget Tracking (reference: MorphLLM Warp Grep implementation)
 # 160K chars ≈ 40K tokens, recommended context budget for search agent
 MAX_CONTEXT_BUDGET_CHARS = 160_000
+
+# Files warmed per turn by the speculative prefetcher (SEARCH_PREFETCH)
+PREFETCH_MAX_FILES = 8
+
+# Adaptive turn budget (SEARCH_STALL_TURNS): never stop before this many turns,
+# since early turns are often orientation only.
+MIN_TURNS_BEFORE_STOP = 3
+# Nudge the model to report once this share of the context budget is used.
+WRAP_UP_CONTEXT_RATIO = 0.8
@@ -1,10 +1,11 @@
 import asyncio
+import hashlib
+import json
 import logging
 import re
 import time
 import uuid
 from collections.abc import Awaitable, Callable
-from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -12,7 +13,6 @@ if TYPE_CHECKING:
 
 from ...config import RelaceConfig, load_prompt_file
 from ...config import settings as _settings
-from .._impl import estimate_context_size
 from ..logging import (
     log_search_complete,
     log_search_error,
@@ -23,12 +23,17 @@ from ..schemas import (
     build_system_prompt,
     get_tool_schemas,
 )
+from .budget import TurnBudget
 from .constants import (
     MAX_CONTEXT_BUDGET_CHARS,
     MAX_TOTAL_CONTEXT_CHARS,
+    WRAP_UP_CONTEXT_RATIO,
 )
-from .messages import MessageHistoryMixin
+from .memo import ToolMemo, get_session_memo
+from .messages import MessageHistoryMixin, MessageLog
 from .observed import ObservedFilesMixin
+from .prefetch import Prefetcher, rank_prefetch_candidates, view_file_targets
+from .result_cache import get_result_cache, normalize_query, repo_fingerprint
 from .tool_calls import ToolCallsMixin
 
 logger = logging.getLogger(__name__)
@@ -66,6 +71,9 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
         self._view_line_re = re.compile(r"^(\d+)\s")
         self._lsp_languages = lsp_languages if lsp_languages is not None else frozenset()
         self._user_prompt_override = user_prompt_override
+        self._prefetcher: Prefetcher | None = None
+        self._memo: ToolMemo | None = None
+        self._memo_turns: dict[str, int] = {}
 
         # Resolve enabled tools first (runtime LSP detection happens here)
         enabled_tools = self._enabled_tool_names()
@@ -88,8 +96,13 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
             has_lsp=has_lsp,
             lsp_section=prompts.get("lsp_section", ""),
         )
+        # Built once and reused every turn so the request prefix (system prompt,
+        # tool schemas, user query) stays byte-identical for prompt caching.
+        self._tool_schemas = get_tool_schemas(self._lsp_languages)
 
-    def _get_turn_hint(self, turn: int, max_turns: int, chars_used: int) -> str:
+    def _get_turn_hint(
+        self, turn: int, max_turns: int, chars_used: int, *, wrap_up: bool = False
+    ) -> str:
         """Generate turn status hint.
 
         Only shows urgency instruction on final turn.
@@ -98,10 +111,12 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
             turn: Current turn number (0-indexed internally, displayed as 1-indexed).
             max_turns: Maximum allowed turns.
             chars_used: Total characters used in context so far.
+            wrap_up: Ask the model to report early (adaptive turn budget).
         """
         remaining = max_turns - turn
-        mode = "final" if remaining == 1 else "normal"
-        instruction = self._turn_instructions[mode]
+        mode = "final" if remaining == 1 else ("wrap_up" if wrap_up else "normal")
+        # Custom prompt files may predate the wrap_up instruction.
+        instruction = self._turn_instructions.get(mode) or self._turn_instructions["normal"]
         chars_pct = int((chars_used / MAX_CONTEXT_BUDGET_CHARS) * 100)
 
         return str(self._turn_hint_template).format(
@@ -143,6 +158,7 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
 
         # Reset observed_files (used to accumulate explored files)
         self._observed_files = {}
+        self._reset_tool_memo()
 
         try:
             result = self._run_search_loop(
@@ -205,8 +221,30 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
 
         # Reset observed_files (used to accumulate explored files)
         self._observed_files = {}
+        self._reset_tool_memo()
+        self._prefetcher = Prefetcher() if _settings.SEARCH_PREFETCH else None
 
         try:
+            cache_key: str | None = None
+            if _settings.SEARCH_RESULT_CACHE and not self._trace and self._config.base_dir:
+                cache_key = await asyncio.to_thread(
+                    self._result_cache_key, query, semantic_hints_section
+                )
+            if cache_key is not None:
+                cache = get_result_cache(str(self._config.base_dir))
+                cached = await asyncio.to_thread(cache.get, cache_key)
+                if cached is not None:
+                    cached.update(query=query, trace_id=tid, cached=True)
+                    logger.debug("[%s] Serving cached search result", tid)
+                    log_search_complete(
+                        tid,
+                        0,
+                        len(cached.get("files", {})),
+                        False,
+                        (time.perf_counter() - start_time) * 1000,
+                    )
+                    return cached
+
             result = await self._run_search_loop_async(
                 query,
                 tid,
@@ -223,6 +261,8 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
                 result.get("partial", False),
                 total_ms,
             )
+            if cache_key is not None and not result.get("partial"):
+                await asyncio.to_thread(cache.put, cache_key, result)
             return result
         except Exception as exc:
             logger.exception("[%s] Search failed with error", tid)
@@ -237,6 +277,31 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
                 "error": str(exc),
                 "trace_id": tid,
             }
+        finally:
+            if self._prefetcher is not None:
+                await self._prefetcher.aclose()
+                self._prefetcher = None
+
+    def _result_cache_key(self, query: str, semantic_hints_section: str) -> str | None:
+        """Key a search by its prompt inputs and the repository state.
+
+        Returns None when the repository state cannot be fingerprinted, in
+        which case the result cache is bypassed.
+        """
+        fingerprint = repo_fingerprint(str(self._config.base_dir))
+        if fingerprint is None:
+            return None
+        parts = [
+            fingerprint,
+            normalize_query(query),
+            semantic_hints_section,
+            self._user_prompt_override or "",
+            self._user_prompt_template,
+            self._system_prompt,
+            json.dumps(self._tool_schemas, sort_keys=True),
+            self._client.model,
+        ]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
 
     def _run_search_loop(
         self,
@@ -255,13 +320,16 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
                 semantic_hints_section=semantic_hints_section,
             )
         )
-        messages: list[dict[str, Any]] = [
-            {"role": "system", "content": self._system_prompt},
-            {"role": "user", "content": user_content},
-        ]
+        messages = MessageLog(
+            [
+                {"role": "system", "content": self._system_prompt},
+                {"role": "user", "content": user_content},
+            ]
+        )
 
         turns_log: list[dict[str, Any]] = []
         result_dict: dict[str, Any]
+        budget = TurnBudget(_settings.SEARCH_STALL_TURNS)
 
         for turn in range(_settings.SEARCH_MAX_TURNS):
             if (time.perf_counter() - start_time) > _settings.SEARCH_TIMEOUT_SECONDS:
@@ -289,8 +357,14 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
 
             # Inject unified turn hint (from turn 2 onwards)
             if turn > 0:
-                chars_for_hint = estimate_context_size(messages)
-                turn_hint = self._get_turn_hint(turn, _settings.SEARCH_MAX_TURNS, chars_for_hint)
+                chars_for_hint = messages.chars
+                wrap_up = budget.should_nudge() or (
+                    budget.enabled
+                    and chars_for_hint >= MAX_CONTEXT_BUDGET_CHARS * WRAP_UP_CONTEXT_RATIO
+                )
+                turn_hint = self._get_turn_hint(
+                    turn, _settings.SEARCH_MAX_TURNS, chars_for_hint, wrap_up=wrap_up
+                )
                 messages.append({"role": "user", "content": turn_hint})
                 logger.debug(
                     "[%s] Injected turn hint at turn %d (chars: %d/%d)",
@@ -301,7 +375,7 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
                 )
 
             # Check context size AFTER all user messages are added
-            ctx_size = estimate_context_size(messages)
+            ctx_size = messages.chars
 
             if ctx_size > MAX_TOTAL_CONTEXT_CHARS:
                 logger.warning(
@@ -311,16 +385,16 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
                     MAX_TOTAL_CONTEXT_CHARS,
                 )
                 # Keep system + user + most recent 6 messages
-                messages = self._truncate_messages(messages)
+                messages = messages.truncated()
+                # Earlier results may be gone; repeat them in full next time.
+                self._memo_turns.clear()
 
             # Ensure tool_calls and tool results are paired correctly
             self._repair_tool_call_integrity(messages, trace_id)
 
             # Track LLM API latency
             llm_start = time.perf_counter()
-            response = self._client.chat(
-                messages, tools=get_tool_schemas(self._lsp_languages), trace_id=trace_id
-            )
+            response = self._client.chat(messages, tools=self._tool_schemas, trace_id=trace_id)
             llm_latency_ms = (time.perf_counter() - llm_start) * 1000
 
             # Parse response
@@ -369,6 +443,7 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
                 )
                 # Add assistant message to context and continue
                 messages.append({"role": "assistant", "content": content})
+                progress = budget.record_turn([], self._observed_files)
                 if self._trace:
                     trace_entry: dict[str, Any] = {
                         "turn": turn + 1,
@@ -377,8 +452,11 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
                         "tool_calls_raw": [],
                         "tool_results": [],
                         "report_back": None,
+                        "progress": progress,
                     }
                     turns_log.append(trace_entry)
+                if budget.should_stop(turn + 1):
+                    return self._stalled_result(query, turn + 1, turns_log, trace_id)
                 continue
 
             # Guardrail: detect report_back mixed with other tools
@@ -396,6 +474,7 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
 
             # Add all tool results to messages (per OpenAI protocol)
             self._append_tool_results_to_messages(messages, tool_results)
+            progress = budget.record_turn(tool_calls, self._observed_files)
 
             if self._trace:
                 trace_entry = {
@@ -405,6 +484,7 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
                     "tool_calls_raw": tool_calls,
                     "tool_results": tool_traces,
                     "report_back": report_back_result,
+                    "progress": progress,
                 }
                 turns_log.append(trace_entry)
 
@@ -439,6 +519,9 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
                     result_dict["turns_log"] = turns_log
                 return result_dict
 
+            if budget.should_stop(turn + 1):
+                return self._stalled_result(query, turn + 1, turns_log, trace_id)
+
         # Exceeded limit, return partial report (don't raise)
         logger.warning(
             "[%s] Search did not complete within %d turns, returning partial results",
@@ -460,6 +543,41 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
             result_dict["turns_log"] = turns_log
         return result_dict
 
+    def _reset_tool_memo(self) -> None:
+        """Start a search with a fresh (or the shared session) tool-call memo."""
+        self._memo_turns = {}
+        if not _settings.SEARCH_TOOL_MEMO:
+            self._memo = None
+        elif _settings.SEARCH_TOOL_MEMO_SESSION and self._config.base_dir:
+            self._memo = get_session_memo(str(self._config.base_dir))
+        else:
+            self._memo = ToolMemo()
+
+    def _stalled_result(
+        self, query: str, turns_used: int, turns_log: list[dict[str, Any]], trace_id: str
+    ) -> dict[str, Any]:
+        """Build the report for a search ended early by the adaptive turn budget."""
+        merged_files = self._merge_observed_ranges()
+        logger.info(
+            "[%s] Search stopped after %d turns without new findings, reporting %d files",
+            trace_id,
+            turns_used,
+            len(merged_files),
+        )
+        result_dict: dict[str, Any] = {
+            "query": query,
+            "explanation": (
+                f"[EARLY STOP] Exploration stopped finding new code after {turns_used} turns. "
+                f"Returning {len(merged_files)} observed files based on exploration."
+            ),
+            "files": merged_files,
+            "turns_used": turns_used,
+            "partial": True,
+        }
+        if self._trace:
+            result_dict["turns_log"] = turns_log
+        return result_dict
+
     async def _run_search_loop_async(
         self,
         query: str,
@@ -478,202 +596,231 @@ class FastAgenticSearchHarness(ObservedFilesMixin, MessageHistoryMixin, ToolCall
                 semantic_hints_section=semantic_hints_section,
             )
         )
-        messages: list[dict[str, Any]] = [
-            {"role": "system", "content": self._system_prompt},
-            {"role": "user", "content": user_content},
-        ]
+        messages = MessageLog(
+            [
+                {"role": "system", "content": self._system_prompt},
+                {"role": "user", "content": user_content},
+            ]
+        )
 
         turns_log: list[dict[str, Any]] = []
         result_dict: dict[str, Any]
+        budget = TurnBudget(_settings.SEARCH_STALL_TURNS)
+        last_tool_traces: list[dict[str, Any]] = []
 
-        loop = asyncio.get_running_loop()
-        # Use an explicit ThreadPoolExecutor for blocking tool execution.
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            for turn in range(_settings.SEARCH_MAX_TURNS):
-                if (time.perf_counter() - start_time) > _settings.SEARCH_TIMEOUT_SECONDS:
-                    merged_files = self._merge_observed_ranges()
-                    result_dict = {
-                        "query": query,
-                        "explanation": (
-                            f"[PARTIAL] Search exceeded SEARCH_TIMEOUT_SECONDS={_settings.SEARCH_TIMEOUT_SECONDS}s. "
-                            f"Returning {len(merged_files)} observed files based on exploration."
-                        ),
-                        "files": merged_files,
-                        "turns_used": turn,
-                        "partial": True,
-                        "error": f"Search timed out after {_settings.SEARCH_TIMEOUT_SECONDS}s",
-                    }
-                    if self._trace:
-                        result_dict["turns_log"] = turns_log
-                    return result_dict
+        for turn in range(_settings.SEARCH_MAX_TURNS):
+            if (time.perf_counter() - start_time) > _settings.SEARCH_TIMEOUT_SECONDS:
+                merged_files = self._merge_observed_ranges()
+                result_dict = {
+                    "query": query,
+                    "explanation": (
+                        f"[PARTIAL] Search exceeded SEARCH_TIMEOUT_SECONDS={_settings.SEARCH_TIMEOUT_SECONDS}s. "
+                        f"Returning {len(merged_files)} observed files based on exploration."
+                    ),
+                    "files": merged_files,
+                    "turns_used": turn,
+                    "partial": True,
+                    "error": f"Search timed out after {_settings.SEARCH_TIMEOUT_SECONDS}s",
+                }
+                if self._trace:
+                    result_dict["turns_log"] = turns_log
+                return result_dict
+            logger.debug(
+                "[%s] Turn %d/%d",
+                trace_id,
+                turn + 1,
+                _settings.SEARCH_MAX_TURNS,
+            )
+
+            if on_progress is not None:
+                try:
+                    await on_progress(turn + 1, _settings.SEARCH_MAX_TURNS)
+                except Exception:  # nosec B110 — progress is best-effort
+                    pass
+
+            # Inject unified turn hint (from turn 2 onwards)
+            if turn > 0:
+                chars_for_hint = messages.chars
+                wrap_up = budget.should_nudge() or (
+                    budget.enabled
+                    and chars_for_hint >= MAX_CONTEXT_BUDGET_CHARS * WRAP_UP_CONTEXT_RATIO
+                )
+                turn_hint = self._get_turn_hint(
+                    turn, _settings.SEARCH_MAX_TURNS, chars_for_hint, wrap_up=wrap_up
+                )
+                messages.append({"role": "user", "content": turn_hint})
                 logger.debug(
-                    "[%s] Turn %d/%d",
+                    "[%s] Injected turn hint at turn %d (chars: %d/%d)",
                     trace_id,
                     turn + 1,
-                    _settings.SEARCH_MAX_TURNS,
+                    chars_for_hint,
+                    MAX_CONTEXT_BUDGET_CHARS,
                 )
 
-                if on_progress is not None:
-                    try:
-                        await on_progress(turn + 1, _settings.SEARCH_MAX_TURNS)
-                    except Exception:  # nosec B110 — progress is best-effort
-                        pass
+            # Check context size AFTER all user messages are added
+            ctx_size = messages.chars
 
-                # Inject unified turn hint (from turn 2 onwards)
-                if turn > 0:
-                    chars_for_hint = estimate_context_size(messages)
-                    turn_hint = self._get_turn_hint(
-                        turn, _settings.SEARCH_MAX_TURNS, chars_for_hint
-                    )
-                    messages.append({"role": "user", "content": turn_hint})
-                    logger.debug(
-                        "[%s] Injected turn hint at turn %d (chars: %d/%d)",
-                        trace_id,
-                        turn + 1,
-                        chars_for_hint,
-                        MAX_CONTEXT_BUDGET_CHARS,
-                    )
+            if ctx_size > MAX_TOTAL_CONTEXT_CHARS:
+                logger.warning(
+                    "[%s] Context size %d exceeds limit %d, truncating old messages",
+                    trace_id,
+                    ctx_size,
+                    MAX_TOTAL_CONTEXT_CHARS,
+                )
+                # Keep system + user + most recent 6 messages
+                messages = messages.truncated()
+                # Earlier results may be gone; repeat them in full next time.
+                self._memo_turns.clear()
 
-                # Check context size AFTER all user messages are added
-                ctx_size = estimate_context_size(messages)
+            # Ensure tool_calls and tool results are paired correctly
+            self._repair_tool_call_integrity(messages, trace_id)
 
-                if ctx_size > MAX_TOTAL_CONTEXT_CHARS:
-                    logger.warning(
-                        "[%s] Context size %d exceeds limit %d, truncating old messages",
-                        trace_id,
-                        ctx_size,
-                        MAX_TOTAL_CONTEXT_CHARS,
+            # Warm likely next reads while the model is thinking
+            if self._prefetcher is not None and turn > 0:
+                self._prefetcher.start(
+                    rank_prefetch_candidates(
+                        last_tool_traces, self._observed_files, self._to_absolute_path
                     )
-                    # Keep system + user + most recent 6 messages
-                    messages = self._truncate_messages(messages)
-
-                # Ensure tool_calls and tool results are paired correctly
-                self._repair_tool_call_integrity(messages, trace_id)
-
-                # Track LLM API latency
-                llm_start = time.perf_counter()
-                response = await self._client.chat_async(
-                    messages, tools=get_tool_schemas(self._lsp_languages), trace_id=trace_id
                 )
-                llm_latency_ms = (time.perf_counter() - llm_start) * 1000
 
-                # Parse response
-                choices = response.get("choices", [])
-                if not choices:
-                    name = self._client._provider_config.display_name
-                    raise RuntimeError(f"{name} Search API returned empty choices")
-
-                message = choices[0].get("message", {})
-                # Defense: some providers/mocks may lack role, avoid breaking block/repair logic
-                message.setdefault("role", "assistant")
-                tool_calls = message.get("tool_calls") or []
+            # Track LLM API latency
+            llm_start = time.perf_counter()
+            response = await self._client.chat_async(
+                messages, tools=self._tool_schemas, trace_id=trace_id
+            )
+            llm_latency_ms = (time.perf_counter() - llm_start) * 1000
 
-                # Extract usage for token tracking
-                usage = response.get("usage")
+            # Parse response
+            choices = response.get("choices", [])
+            if not choices:
+                name = self._client._provider_config.display_name
+                raise RuntimeError(f"{name} Search API returned empty choices")
 
-                # Log turn state after getting response (includes LLM latency and token usage)
-                log_search_turn(
-                    trace_id,
-                    turn + 1,
-                    _settings.SEARCH_MAX_TURNS,
-                    ctx_size,
-                    len(tool_calls),
-                    llm_latency_ms=llm_latency_ms,
-                    usage=usage,
-                )
+            message = choices[0].get("message", {})
+            # Defense: some providers/mocks may lack role, avoid breaking block/repair logic
+            message.setdefault("role", "assistant")
+            tool_calls = message.get("tool_calls") or []
 
-                # If no tool_calls, check for content (model may respond directly)
-                if not tool_calls:
-                    content = message.get("content") or ""
-                    logger.warning(
-                        "[%s] No tool calls in turn %d (content_len=%d)",
-                        trace_id,
-                        turn + 1,
-                        len(content),
-                    )
-                    # Add assistant message to context and continue
-                    messages.append({"role": "assistant", "content": content})
-                    if self._trace:
-                        trace_entry: dict[str, Any] = {
-                            "turn": turn + 1,
-                            "llm_latency_ms": round(llm_latency_ms, 1),
-                            "llm_response": response,
-                            "tool_calls_raw": [],
-                            "tool_results": [],
-                            "report_back": None,
-                        }
-                        turns_log.append(trace_entry)
-                    continue
-
-                # Guardrail: detect report_back mixed with other tools
-                tool_calls, message, mixed_rb_ids = self._strip_mixed_report_back(
-                    tool_calls, message, trace_id
-                )
+            # Extract usage for token tracking
+            usage = response.get("usage")
 
-                # Add assistant message (with tool_calls) to messages
-                messages.append(self._sanitize_assistant_message(message))
+            # Log turn state after getting response (includes LLM latency and token usage)
+            log_search_turn(
+                trace_id,
+                turn + 1,
+                _settings.SEARCH_MAX_TURNS,
+                ctx_size,
+                len(tool_calls),
+                llm_latency_ms=llm_latency_ms,
+                usage=usage,
+            )
 
-                # Execute tool calls off the event loop to avoid blocking.
-                tool_results, tool_traces, report_back_result = await loop.run_in_executor(
-                    executor,
-                    self._execute_tools_parallel,
-                    tool_calls,
+            # If no tool_calls, check for content (model may respond directly)
+            if not tool_calls:
+                content = message.get("content") or ""
+                logger.warning(
+                    "[%s] No tool calls in turn %d (content_len=%d)",
                     trace_id,
                     turn + 1,
+                    len(content),
                 )
-
-                # Add all tool results to messages (per OpenAI protocol)
-                self._append_tool_results_to_messages(messages, tool_results)
-
+                # Add assistant message to context and continue
+                messages.append({"role": "assistant", "content": content})
+                progress = budget.record_turn([], self._observed_files)
                 if self._trace:
-                    trace_entry = {
+                    trace_entry: dict[str, Any] = {
                         "turn": turn + 1,
                         "llm_latency_ms": round(llm_latency_ms, 1),
                         "llm_response": response,
-                        "tool_calls_raw": tool_calls,
-                        "tool_results": tool_traces,
-                        "report_back": report_back_result,
+                        "tool_calls_raw": [],
+                        "tool_results": [],
+                        "report_back": None,
+                        "progress": progress,
                     }
                     turns_log.append(trace_entry)
+                if budget.should_stop(turn + 1):
+                    return self._stalled_result(query, turn + 1, turns_log, trace_id)
+                continue
 
-                # If we stripped report_back, inject a correction hint for next turn
-                if mixed_rb_ids:
-                    messages.append(
-                        {
-                            "role": "user",
-                            "content": (
-                                "Your previous turn mixed report_back with other tools — "
-                                "report_back was discarded. If you are done exploring, "
-                                "call report_back ALONE as the ONLY tool in your next turn."
-                            ),
-                        }
-                    )
+            # Guardrail: detect report_back mixed with other tools
+            tool_calls, message, mixed_rb_ids = self._strip_mixed_report_back(
+                tool_calls, message, trace_id
+            )
 
-                # After processing all tool calls, if report_back was called, return
-                if report_back_result is not None:
-                    logger.debug(
-                        "[%s] Search completed in %d turns, found %d files",
-                        trace_id,
-                        turn + 1,
-                        len(report_back_result.get("files", {})),
-                    )
-                    if on_progress is not None:
-                        try:
-                            await on_progress(
-                                _settings.SEARCH_MAX_TURNS,
-                                _settings.SEARCH_MAX_TURNS,
-                            )
-                        except Exception:  # nosec B110 — progress is best-effort
-                            pass
-                    result_dict = {
-                        "query": query,
-                        "explanation": report_back_result.get("explanation", ""),
-                        "files": self._normalize_report_files(report_back_result.get("files", {})),
-                        "turns_used": turn + 1,
+            # Add assistant message (with tool_calls) to messages
+            messages.append(self._sanitize_assistant_message(message))
+
+            prefetch_stats = None
+            if self._prefetcher is not None and turn > 0:
+                prefetch_stats = self._prefetcher.score(
+                    view_file_targets(tool_calls, self._normalize_view_path)
+                )
+
+            # Execute tool calls without blocking the event loop.
+            tool_results, tool_traces, report_back_result = await self._execute_tools_async(
+                tool_calls, trace_id, turn + 1
+            )
+            last_tool_traces = tool_traces
+
+            # Add all tool results to messages (per OpenAI protocol)
+            self._append_tool_results_to_messages(messages, tool_results)
+            progress = budget.record_turn(tool_calls, self._observed_files)
+
+            if self._trace:
+                trace_entry = {
+                    "turn": turn + 1,
+                    "llm_latency_ms": round(llm_latency_ms, 1),
+                    "llm_response": response,
+                    "tool_calls_raw": tool_calls,
+                    "tool_results": tool_traces,
+                    "report_back": report_back_result,
+                    "progress": progress,
+                }
+                if prefetch_stats is not None:
+                    trace_entry["prefetch"] = prefetch_stats
+                turns_log.append(trace_entry)
+
+            # If we stripped report_back, inject a correction hint for next turn
+            if mixed_rb_ids:
+                messages.append(
+                    {
+                        "role": "user",
+                        "content": (
+                            "Your previous turn mixed report_back with other tools — "
+                            "report_back was discarded. If you are done exploring, "
+                            "call report_back ALONE as the ONLY tool in your next turn."
+                        ),
                     }
-                    if self._trace:
-                        result_dict["turns_log"] = turns_log
-                    return result_dict
+                )
+
+            # After processing all tool calls, if report_back was called, return
+            if report_back_result is not None:
+                logger.debug(
+                    "[%s] Search completed in %d turns, found %d files",
+                    trace_id,
+                    turn + 1,
+                    len(report_back_result.get("files", {})),
+                )
+                if on_progress is not None:
+                    try:
+                        await on_progress(
+                            _settings.SEARCH_MAX_TURNS,
+                            _settings.SEARCH_MAX_TURNS,
+                        )
+                    except Exception:  # nosec B110 — progress is best-effort
+                        pass
+                result_dict = {
+                    "query": query,
+                    "explanation": report_back_result.get("explanation", ""),
+                    "files": self._normalize_report_files(report_back_result.get("files", {})),
+                    "turns_used": turn + 1,
+                }
+                if self._trace:
+                    result_dict["turns_log"] = turns_log
+                return result_dict
+
+            if budget.should_stop(turn + 1):
+                return self._stalled_result(query, turn + 1, turns_log, trace_id)
 
         # Exceeded limit, return partial report (don't raise)
         logger.warning(
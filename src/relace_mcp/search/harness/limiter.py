@@ -0,0 +1,53 @@
+import asyncio
+import threading
+import weakref
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+from ...config import settings as _settings
+
+# Slots are shared by every harness instance in the process, so N concurrent
+# agentic_search calls cannot fan out to N * MAX_PARALLEL_WORKERS subprocesses.
+# Async runs share one semaphore per event loop (the MCP server runs one loop);
+# synchronous runs share a thread semaphore.
+_lock = threading.Lock()
+_thread_slots: tuple[int, threading.BoundedSemaphore] | None = None
+_loop_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[int, asyncio.Semaphore]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _thread_semaphore() -> threading.BoundedSemaphore:
+    global _thread_slots
+    limit = _settings.SEARCH_MAX_CONCURRENT_TOOLS
+    with _lock:
+        if _thread_slots is None or _thread_slots[0] != limit:
+            _thread_slots = (limit, threading.BoundedSemaphore(limit))
+        return _thread_slots[1]
+
+
+def _loop_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    limit = _settings.SEARCH_MAX_CONCURRENT_TOOLS
+    with _lock:
+        entry = _loop_slots.get(loop)
+        if entry is None or entry[0] != limit:
+            entry = (limit, asyncio.Semaphore(limit))
+            _loop_slots[loop] = entry
+        return entry[1]
+
+
+@contextmanager
+def tool_slot() -> Iterator[None]:
+    """Hold one process-wide tool slot (blocking; for worker threads)."""
+    semaphore = _thread_semaphore()
+    with semaphore:
+        yield
+
+
+@asynccontextmanager
+async def async_tool_slot() -> AsyncIterator[None]:
+    """Hold one process-wide tool slot without blocking the event loop."""
+    semaphore = _loop_semaphore()
+    async with semaphore:
+        yield
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+# Read-only tools whose results can be reused while the files they read are unchanged.
+MEMO_TOOLS = frozenset(
+    {"view_file", "view_directory", "grep_search", "find_symbol", "search_symbol"}
+)
+_MAX_ENTRIES = 512
+
+
+def memo_key(name: str, args: dict[str, Any], state: str) -> str:
+    """Key for a tool call: tool name, normalized arguments and file-state fingerprint."""
+    payload = json.dumps([name, args, state], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def same_as_note(name: str, turn: int) -> str:
+    """Compact stand-in for a result the model already saw in an earlier turn."""
+    return (
+        f"[Same result as the identical {name} call in turn {turn}; "
+        "nothing it reads has changed since.]"
+    )
+
+
+class ToolMemo:
+    """Bounded LRU of successful tool results, safe to share between threads."""
+
+    def __init__(self, max_entries: int = _MAX_ENTRIES) -> None:
+        self._entries: OrderedDict[str, str | dict[str, Any]] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | dict[str, Any] | None:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: str, result: str | dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+_SESSION_MEMOS: dict[str, ToolMemo] = {}
+_SESSION_MEMOS_LOCK = threading.Lock()
+
+
+def get_session_memo(base_dir: str) -> ToolMemo:
+    """Return the process-wide memo shared by every search of base_dir."""
+    key = str(Path(base_dir).resolve())
+    with _SESSION_MEMOS_LOCK:
+        memo = _SESSION_MEMOS.get(key)
+        if memo is None:
+            memo = _SESSION_MEMOS[key] = ToolMemo()
+        return memo
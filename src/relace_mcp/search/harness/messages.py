@@ -1,5 +1,6 @@
 import json
 import logging
+from collections.abc import Iterable
 from typing import Any
 
 from .._impl import (
@@ -7,6 +8,7 @@ from .._impl import (
     MAX_GREP_SEARCH_CHARS,
     MAX_VIEW_DIRECTORY_CHARS,
     MAX_VIEW_FILE_CHARS,
+    message_size,
     truncate_for_context,
 )
 
@@ -14,6 +16,82 @@ logger = logging.getLogger(__name__)
 
 _ALLOWED_ASSISTANT_FIELDS = frozenset({"role", "content", "tool_calls", "name"})
 
+# Truncation keeps about this many recent messages (with 50% slack for whole blocks).
+_TRUNCATE_TARGET_MESSAGES = 6
+
+
+class MessageLog(list[dict[str, Any]]):
+    """Append-only chat history that tracks its size and turn blocks as it grows.
+
+    The first `prefix_len` messages (system prompt + user query) form a stable
+    prefix that truncation never touches, so it stays byte-identical across
+    turns and providers with prompt caching can reuse it. Messages after the
+    prefix are grouped into the same turn blocks `_truncate_messages` builds
+    (an assistant message plus its tool results; any other message alone),
+    but incrementally, so neither the size estimate nor truncation re-walks
+    the whole history each turn.
+
+    Only append/extend keep the bookkeeping in sync; the harness never
+    edits history in place.
+    """
+
+    def __init__(self, prefix: Iterable[dict[str, Any]] = ()) -> None:
+        super().__init__()
+        self.chars = 0
+        # (start index, orphan) per block; orphans are tool results without an
+        # owning assistant message and are dropped on truncation.
+        self._blocks: list[tuple[int, bool]] = []
+        self._open_assistant = False
+        for msg in prefix:
+            super().append(msg)
+            self.chars += message_size(msg)
+        self.prefix_len = len(self)
+
+    def append(self, msg: dict[str, Any]) -> None:
+        index = len(self)
+        super().append(msg)
+        self.chars += message_size(msg)
+        role = msg.get("role", "")
+        if role == "assistant":
+            self._blocks.append((index, False))
+            self._open_assistant = True
+        elif role == "tool":
+            if not self._open_assistant:
+                self._blocks.append((index, True))
+        else:
+            self._blocks.append((index, False))
+            self._open_assistant = False
+
+    def extend(self, msgs: Iterable[dict[str, Any]]) -> None:
+        for msg in msgs:
+            self.append(msg)
+
+    def truncated(self) -> "MessageLog":
+        """Keep the prefix and the most recent complete turn blocks."""
+        if len(self) <= self.prefix_len + _TRUNCATE_TARGET_MESSAGES:
+            return self
+        kept: list[tuple[int, int]] = []
+        total = 0
+        end = len(self)
+        for start, orphan in reversed(self._blocks):
+            block_size = end - start
+            block_end, end = end, start
+            if orphan:
+                continue
+            if total + block_size <= _TRUNCATE_TARGET_MESSAGES * 1.5:
+                kept.append((start, block_end))
+                total += block_size
+            else:
+                if total == 0:
+                    # Keep at least the last block (even if exceeds limit)
+                    kept.append((start, block_end))
+                break
+
+        result = MessageLog(self[: self.prefix_len])
+        for start, block_end in reversed(kept):
+            result.extend(self[start:block_end])
+        return result
+
 
 class MessageHistoryMixin:
     def _sanitize_assistant_message(self, message: dict[str, Any]) -> dict[str, Any]:
@@ -74,6 +152,8 @@ class MessageHistoryMixin:
         Turn block definition: one assistant(tool_calls) + all its corresponding tool results.
         Truncates by complete blocks to avoid orphan tool messages.
         """
+        if isinstance(messages, MessageLog):
+            return messages.truncated()
         if len(messages) <= 8:
             return messages
 
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import logging
+import os
+import re
+from collections import Counter
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from ...config.settings import MAX_FILE_SIZE_BYTES
+from ...encoding import warm_text
+from .constants import PREFETCH_MAX_FILES
+
+logger = logging.getLogger(__name__)
+
+_GREP_LINE_RE = re.compile(r":(\d+):")
+
+
+def rank_prefetch_candidates(
+    tool_traces: Iterable[dict[str, Any]],
+    observed_files: dict[str, list[list[int]]],
+    to_absolute: Callable[[str], str | None],
+    limit: int = PREFETCH_MAX_FILES,
+) -> list[str]:
+    """Guess which files the next turn will view.
+
+    Files with the most grep hits in the last turn come first, then other
+    observed files (most observed ranges first). Returns absolute paths.
+    """
+    grep_hits: Counter[str] = Counter()
+    for trace in tool_traces:
+        result = trace.get("result")
+        if trace.get("name") != "grep_search" or not isinstance(result, str):
+            continue
+        for line in result.split("\n"):
+            m = _GREP_LINE_RE.search(line)
+            if not m:
+                continue
+            rel_path = line[: m.start()].removeprefix("./")
+            abs_path = to_absolute(rel_path)
+            if abs_path:
+                grep_hits[abs_path] += 1
+
+    ranked = [path for path, _ in grep_hits.most_common()]
+    seen = set(ranked)
+    for path, _ranges in sorted(observed_files.items(), key=lambda item: -len(item[1])):
+        if path not in seen:
+            ranked.append(path)
+            seen.add(path)
+    return ranked[:limit]
+
+
+def _warm(path: str) -> bool:
+    try:
+        if os.path.getsize(path) > MAX_FILE_SIZE_BYTES:
+            return False
+    except OSError:
+        return False
+    return warm_text(Path(path))
+
+
+def view_file_targets(
+    tool_calls: Iterable[dict[str, Any]], normalize: Callable[[Any], str | None]
+) -> list[str]:
+    """Absolute paths requested by the view_file calls of one turn."""
+    targets: list[str] = []
+    for tc in tool_calls:
+        function = tc.get("function", {})
+        if function.get("name") != "view_file":
+            continue
+        try:
+            args = json.loads(function.get("arguments", "{}"))
+        except json.JSONDecodeError:
+            continue
+        path = normalize(args.get("path")) if isinstance(args, dict) else None
+        if path:
+            targets.append(path)
+    return targets
+
+
+class Prefetcher:
+    """Warms the view_file cache for likely next reads while the model is thinking.
+
+    One instance lives for one search run. `start` schedules background reads
+    for a batch of paths; `score` reports how many of the next turn's view_file
+    calls hit a path whose prefetch had already finished and warmed the cache.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[str, asyncio.Task[bool]] = {}
+        self._batch: set[str] = set()
+
+    def start(self, paths: list[str]) -> None:
+        logger.debug("Prefetching %d files", len(paths))
+        self._batch = set(paths)
+        for path in paths:
+            if path not in self._tasks:
+                self._tasks[path] = asyncio.create_task(asyncio.to_thread(_warm, path))
+
+    def _warmed(self, path: str) -> bool:
+        task = self._tasks.get(path)
+        if task is None or not task.done() or task.cancelled():
+            return False
+        return task.exception() is None and task.result()
+
+    def score(self, view_paths: list[str]) -> dict[str, int]:
+        hits = sum(1 for path in view_paths if path in self._batch and self._warmed(path))
+        return {"prefetched": len(self._batch), "view_calls": len(view_paths), "hits": hits}
+
+    async def aclose(self) -> None:
+        pending = [task for task in self._tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks.clear()
@@ -0,0 +1,163 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from ...config import settings as _settings
+from ...config.settings import LOG_DIR
+from ...repo.core import get_worktree_state
+from ...utils import racy_cutoff_ns
+
+logger = logging.getLogger(__name__)
+
+# One JSON file of cached results per base_dir.
+_CACHE_DIR = LOG_DIR / "search-cache"
+_CACHE_VERSION = 1
+_MAX_ENTRIES = 256
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so trivially different phrasings share a key."""
+    return " ".join(query.casefold().split()).rstrip("?.!")
+
+
+def repo_fingerprint(base_dir: str) -> str | None:
+    """Digest of git HEAD plus the stat data of every uncommitted or untracked file.
+
+    Returns:
+        The digest, or None when base_dir is not in a git repository or a
+        changed file was modified too recently for its stat data to be trusted.
+    """
+    state = get_worktree_state(base_dir)
+    if state is None:
+        return None
+    digest = hashlib.sha256(state.head.encode("utf-8"))
+    cutoff_ns = racy_cutoff_ns()
+    for rel in state.changed:
+        try:
+            st = (state.repo_root / rel).stat()
+        except OSError:
+            stat_key = "-"
+        else:
+            if st.st_mtime_ns >= cutoff_ns:
+                return None
+            stat_key = f"{st.st_mtime_ns}:{st.st_size}"
+        digest.update(f"\0{rel}\0{stat_key}".encode())
+    return digest.hexdigest()
+
+
+def _file_stats(paths: list[str]) -> dict[str, list[int]] | None:
+    stats: dict[str, list[int]] = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stats[path] = [st.st_mtime_ns, st.st_size]
+    return stats
+
+
+class SearchResultCache:
+    """LRU of finished search results for one base_dir, persisted as JSON.
+
+    Entries expire after SEARCH_RESULT_CACHE_TTL_SECONDS and are only served
+    while every reported file still has the size and mtime it had when the
+    result was stored.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.debug("Ignoring unreadable search cache %s: %s", self._path, exc)
+            return
+        if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION:
+            return
+        for entry in data.get("entries") or []:
+            if isinstance(entry, dict) and isinstance(entry.get("key"), str):
+                self._entries[entry["key"]] = entry
+
+    def _save(self) -> None:
+        payload = {"version": _CACHE_VERSION, "entries": list(self._entries.values())}
+        temp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(json.dumps(payload), encoding="utf-8")
+            temp_path.replace(self._path)
+        except OSError as exc:
+            logger.debug("Failed to save search cache %s: %s", self._path, exc)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return a copy of the cached result for key if it is still valid."""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expired = time.time() - entry.get("stored_at", 0) > (
+                _settings.SEARCH_RESULT_CACHE_TTL_SECONDS
+            )
+            files = entry.get("files") or {}
+            if expired or _file_stats(list(files)) != files:
+                del self._entries[key]
+                self._save()
+                return None
+            self._entries.move_to_end(key)
+            result: dict[str, Any] = copy.deepcopy(entry["result"])
+            return result
+
+    def put(self, key: str, result: dict[str, Any]) -> bool:
+        """Store a finished result; returns False if its files cannot be fingerprinted."""
+        files = _file_stats(list(result.get("files") or {}))
+        if files is None:
+            return False
+        cutoff_ns = racy_cutoff_ns()
+        if any(mtime_ns >= cutoff_ns for mtime_ns, _ in files.values()):
+            return False
+        stored = {k: v for k, v in result.items() if k not in ("trace_id", "turns_log")}
+        with self._lock:
+            self._load()
+            self._entries[key] = {
+                "key": key,
+                "stored_at": time.time(),
+                "files": files,
+                "result": stored,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > _MAX_ENTRIES:
+                self._entries.popitem(last=False)
+            self._save()
+        return True
+
+
+_CACHES: dict[str, SearchResultCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_result_cache(base_dir: str) -> SearchResultCache:
+    """Return the shared result cache for base_dir."""
+    key = str(Path(base_dir).resolve())
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+            cache = SearchResultCache(_CACHE_DIR / f"{digest}.json")
+            _CACHES[key] = cache
+        return cache
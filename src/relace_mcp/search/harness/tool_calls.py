@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import time
@@ -6,6 +7,7 @@ from typing import TYPE_CHECKING, Any
 
 from ...config import settings
 from ...observability import log_trace_event
+from ...utils import file_fingerprint
 from .._impl import (
     # --- Disabled LSP tools (kept for future re-enablement) ---
     # CallGraphParams,
@@ -14,11 +16,13 @@ from .._impl import (
     LSPQueryParams,
     SearchSymbolParams,
     bash_handler,
+    bash_handler_async,
     # call_graph_handler,
     find_symbol_handler,
     # get_type_handler,
     # glob_handler,  # Disabled glob tool (pending removal)
     grep_search_handler,
+    grep_search_handler_async,
     # list_symbols_handler,
     report_back_handler,
     search_symbol_handler,
@@ -28,6 +32,9 @@ from .._impl import (
 from ..logging import log_tool_call
 from ..schemas import GrepSearchParams, get_tool_schemas
 from .constants import MAX_PARALLEL_WORKERS, PARALLEL_SAFE_TOOLS
+from .limiter import async_tool_slot, tool_slot
+from .memo import MEMO_TOOLS, ToolMemo, memo_key, same_as_note
+from .result_cache import repo_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -38,9 +45,15 @@ if TYPE_CHECKING:
 class ToolCallsMixin:
     _config: "RelaceConfig"
     _lsp_languages: frozenset[str]
+    # Per-search memo state (SEARCH_TOOL_MEMO); _memo_turns maps keys whose
+    # full result is still in the context to the turn that showed it.
+    _memo: ToolMemo | None
+    _memo_turns: dict[str, int]
 
     if TYPE_CHECKING:
 
+        def _to_absolute_path(self, _path: str) -> str | None: ...
+
         def _maybe_record_observed(
             self,
             _name: str,
@@ -135,24 +148,190 @@ class ToolCallsMixin:
             (tool_results, tool_traces, report_back_result) tuple.
         """
         parallel_calls, sequential_calls = self._parse_and_classify_tool_calls(tool_calls, trace_id)
+        memo_traces, parallel_calls, memo_keys = self._memo_lookup(parallel_calls, turn)
 
         tool_traces = self._execute_parallel_batch(parallel_calls, trace_id, turn)
+        self._memo_store(tool_traces, memo_keys, turn)
+        tool_traces.extend(memo_traces)
         seq_traces, report_back_result = self._execute_sequential_batch(
             sequential_calls, trace_id, turn
         )
         tool_traces.extend(seq_traces)
 
+        return self._order_tool_results(tool_calls, tool_traces), tool_traces, report_back_result
+
+    async def _execute_tools_async(
+        self, tool_calls: list[dict[str, Any]], trace_id: str, turn: int | None = None
+    ) -> tuple[
+        list[tuple[str, str, str | dict[str, Any]]],
+        list[dict[str, Any]],
+        dict[str, Any] | None,
+    ]:
+        """Async counterpart of _execute_tools_parallel.
+
+        Parallel-safe tools run as concurrent tasks on the event loop; grep and
+        bash use asyncio subprocesses, other handlers run in the default thread
+        pool. Every call holds a process-wide slot (SEARCH_MAX_CONCURRENT_TOOLS).
+        """
+        parallel_calls, sequential_calls = self._parse_and_classify_tool_calls(tool_calls, trace_id)
+        memo_traces: list[dict[str, Any]] = []
+        memo_keys: dict[str, str] = {}
+        if self._memo is not None:
+            memo_traces, parallel_calls, memo_keys = await asyncio.to_thread(
+                self._memo_lookup, parallel_calls, turn
+            )
+
+        async def run_parallel(
+            tc_id: str, func_name: str, func_args: dict[str, Any] | None
+        ) -> dict[str, Any]:
+            if func_args is None:
+                return self._build_tool_trace(
+                    tc_id, func_name, "Error: Missing arguments", latency_ms=0.0, success=False
+                )
+            logger.debug("[%s] Tool call (parallel): %s", trace_id, func_name)
+            result, latency_ms, success = await self._dispatch_tool_timed_async(
+                func_name, func_args, trace_id, turn
+            )
+            self._maybe_record_observed(func_name, func_args, result)
+            return self._build_tool_trace(
+                tc_id, func_name, result, latency_ms=latency_ms, success=success
+            )
+
+        if parallel_calls:
+            logger.debug("[%s] Executing %d tools concurrently", trace_id, len(parallel_calls))
+        tool_traces = list(
+            await asyncio.gather(
+                *(run_parallel(tc_id, name, args) for tc_id, name, _, args in parallel_calls)
+            )
+        )
+        self._memo_store(tool_traces, memo_keys, turn)
+        tool_traces.extend(memo_traces)
+
+        report_back_result: dict[str, Any] | None = None
+        for tc_id, func_name, error, func_args in sequential_calls:
+            if error or func_args is None:
+                tool_traces.append(
+                    self._build_tool_trace(
+                        tc_id,
+                        func_name,
+                        error or "Error: Missing arguments",
+                        latency_ms=0.0,
+                        success=False,
+                    )
+                )
+                continue
+
+            logger.debug("[%s] Tool call (sequential): %s", trace_id, func_name)
+            result, latency_ms, success = await self._dispatch_tool_timed_async(
+                func_name, func_args, trace_id, turn
+            )
+            self._maybe_record_observed(func_name, func_args, result)
+            if func_name == "report_back" and isinstance(result, dict):
+                report_back_result = result
+            tool_traces.append(
+                self._build_tool_trace(
+                    tc_id, func_name, result, latency_ms=latency_ms, success=success
+                )
+            )
+
+        return self._order_tool_results(tool_calls, tool_traces), tool_traces, report_back_result
+
+    def _memo_call_key(
+        self, name: str, args: dict[str, Any], repo_state: list[str | None]
+    ) -> str | None:
+        """Memo key for a call, or None when the state it reads cannot be fingerprinted."""
+        base_dir = self._config.base_dir
+        if base_dir is None:
+            return None
+        norm_args = dict(args)
+        if name == "view_file":
+            path = self._to_absolute_path(str(args.get("path", "")))
+            state = file_fingerprint(path) if path else None
+            norm_args["path"] = path
+            norm_args.setdefault("view_range", [1, 100])
+        else:
+            # Directory listings, grep and LSP answers depend on the whole tree.
+            if not repo_state:
+                repo_state.append(repo_fingerprint(base_dir))
+            state = repo_state[0]
+            if name == "view_directory":
+                norm_args["path"] = self._to_absolute_path(str(args.get("path", "")))
+        return memo_key(name, norm_args, state) if state is not None else None
+
+    def _memo_lookup(
+        self,
+        calls: list[tuple[str, str, str, dict[str, Any] | None]],
+        turn: int | None,
+    ) -> tuple[
+        list[dict[str, Any]],
+        list[tuple[str, str, str, dict[str, Any] | None]],
+        dict[str, str],
+    ]:
+        """Answer repeated read-only calls from the memo.
+
+        Returns:
+            (hit_traces, remaining_calls, miss_keys) where miss_keys maps the
+            tool call id of each memoizable miss to its key for _memo_store.
+        """
+        if self._memo is None:
+            return [], calls, {}
+        hits: list[dict[str, Any]] = []
+        remaining: list[tuple[str, str, str, dict[str, Any] | None]] = []
+        miss_keys: dict[str, str] = {}
+        repo_state: list[str | None] = []
+        for call in calls:
+            tc_id, func_name, _, func_args = call
+            key = None
+            if func_name in MEMO_TOOLS and isinstance(func_args, dict):
+                key = self._memo_call_key(func_name, func_args, repo_state)
+            result = self._memo.get(key) if key is not None else None
+            if key is None or result is None or func_args is None:
+                remaining.append(call)
+                if key is not None:
+                    miss_keys[tc_id] = key
+                continue
+            self._maybe_record_observed(func_name, func_args, result)
+            shown_turn = self._memo_turns.get(key)
+            if shown_turn is not None and settings.SEARCH_TOOL_MEMO_REFERENCE:
+                result = same_as_note(func_name, shown_turn)
+            elif turn is not None:
+                self._memo_turns.setdefault(key, turn)
+            trace = self._build_tool_trace(tc_id, func_name, result, latency_ms=0.0, success=True)
+            trace["memo_hit"] = True
+            hits.append(trace)
+        return hits, remaining, miss_keys
+
+    def _memo_store(
+        self, tool_traces: list[dict[str, Any]], miss_keys: dict[str, str], turn: int | None
+    ) -> None:
+        """Remember successful results of memoizable calls that were executed."""
+        if self._memo is None:
+            return
+        for trace in tool_traces:
+            key = miss_keys.get(str(trace.get("id", "")))
+            if key is None:
+                continue
+            trace["memo_hit"] = False
+            if not trace.get("success"):
+                continue
+            self._memo.put(key, trace["result"])
+            if turn is not None:
+                self._memo_turns.setdefault(key, turn)
+
+    @staticmethod
+    def _order_tool_results(
+        tool_calls: list[dict[str, Any]], tool_traces: list[dict[str, Any]]
+    ) -> list[tuple[str, str, str | dict[str, Any]]]:
+        """Sort traces into the original call order and return (id, name, result) tuples."""
         # Sort by original order (maintain API protocol consistency)
         original_order = {tc.get("id", ""): i for i, tc in enumerate(tool_calls)}
         tool_traces.sort(key=lambda x: original_order.get(str(x.get("id", "")), 999))
 
-        tool_results: list[tuple[str, str, str | dict[str, Any]]] = [
+        return [
             (str(item.get("id", "")), str(item.get("name", "")), item.get("result", ""))
             for item in tool_traces
         ]
 
-        return tool_results, tool_traces, report_back_result
-
     @staticmethod
     def _strip_mixed_report_back(
         tool_calls: list[dict[str, Any]],
@@ -342,13 +521,39 @@ class ToolCallsMixin:
         self, name: str, args: dict[str, Any], trace_id: str, turn: int | None = None
     ) -> tuple[str | dict[str, Any], float, bool]:
         """Dispatch tool call with timing (always) and optional logging."""
-        start = time.perf_counter()
-        try:
-            result = self._dispatch_tool(name, args)
-        except Exception as exc:
-            logger.error("[%s] Tool %s raised exception: %s", trace_id, name, exc)
-            result = f"Error: {exc}"
-        latency_ms = (time.perf_counter() - start) * 1000
+        with tool_slot():
+            start = time.perf_counter()
+            try:
+                result = self._dispatch_tool(name, args)
+            except Exception as exc:
+                logger.error("[%s] Tool %s raised exception: %s", trace_id, name, exc)
+                result = f"Error: {exc}"
+            latency_ms = (time.perf_counter() - start) * 1000
+        return self._finish_tool_call(name, args, result, latency_ms, trace_id, turn)
+
+    async def _dispatch_tool_timed_async(
+        self, name: str, args: dict[str, Any], trace_id: str, turn: int | None = None
+    ) -> tuple[str | dict[str, Any], float, bool]:
+        """Async counterpart of _dispatch_tool_timed."""
+        async with async_tool_slot():
+            start = time.perf_counter()
+            try:
+                result = await self._dispatch_tool_async(name, args)
+            except Exception as exc:
+                logger.error("[%s] Tool %s raised exception: %s", trace_id, name, exc)
+                result = f"Error: {exc}"
+            latency_ms = (time.perf_counter() - start) * 1000
+        return self._finish_tool_call(name, args, result, latency_ms, trace_id, turn)
+
+    @staticmethod
+    def _finish_tool_call(
+        name: str,
+        args: dict[str, Any],
+        result: str | dict[str, Any],
+        latency_ms: float,
+        trace_id: str,
+        turn: int | None,
+    ) -> tuple[str | dict[str, Any], float, bool]:
         success = not (isinstance(result, str) and result.startswith("Error:"))
 
         if settings.MCP_LOGGING:
@@ -385,6 +590,34 @@ class ToolCallsMixin:
 
         return result, latency_ms, success
 
+    async def _dispatch_tool_async(self, name: str, args: dict[str, Any]) -> str | dict[str, Any]:
+        """Dispatch without tying up a thread for subprocess-backed tools.
+
+        grep_search and bash await asyncio subprocesses; everything else (and
+        every validation error path) goes through _dispatch_tool in a thread.
+        """
+        base_dir = self._config.base_dir
+        if (
+            isinstance(args, dict)
+            and name in ("grep_search", "bash")
+            and base_dir is not None
+            and name in self._enabled_tool_names()
+        ):
+            if name == "grep_search":
+                return await grep_search_handler_async(self._grep_params(args, base_dir))
+            return await bash_handler_async(command=args.get("command", ""), base_dir=base_dir)
+        return await asyncio.to_thread(self._dispatch_tool, name, args)
+
+    @staticmethod
+    def _grep_params(args: dict[str, Any], base_dir: str) -> GrepSearchParams:
+        return GrepSearchParams(
+            query=args.get("query", ""),
+            case_sensitive=args.get("case_sensitive", True),
+            exclude_pattern=args.get("exclude_pattern"),
+            include_pattern=args.get("include_pattern"),
+            base_dir=base_dir,
+        )
+
     def _dispatch_tool(self, name: str, args: dict[str, Any]) -> str | dict[str, Any]:
         """Dispatch tool call to corresponding handler and accumulate observed_files."""
         # Defense: if args is not dict (e.g., model returns "arguments": "\"oops\"")
@@ -429,14 +662,7 @@ class ToolCallsMixin:
                 extra_paths=extra_paths,
             )
         elif name == "grep_search":
-            params = GrepSearchParams(
-                query=args.get("query", ""),
-                case_sensitive=args.get("case_sensitive", True),
-                exclude_pattern=args.get("exclude_pattern"),
-                include_pattern=args.get("include_pattern"),
-                base_dir=base_dir,
-            )
-            return grep_search_handler(params)
+            return grep_search_handler(self._grep_params(args, base_dir))
         # --- Disabled glob tool (pending removal) ---
         # elif name == "glob":
         #     return glob_handler(
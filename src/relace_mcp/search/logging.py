@@ -47,6 +47,11 @@ def log_search_turn(
             event["completion_tokens"] = usage["completion_tokens"]
         if "total_tokens" in usage:
             event["total_tokens"] = usage["total_tokens"]
+        cached = _cached_prompt_tokens(usage)
+        if cached is not None:
+            event["cached_tokens"] = cached
+            if usage["prompt_tokens"]:
+                event["cache_hit_ratio"] = round(cached / usage["prompt_tokens"], 3)
     else:
         # Fallback: estimate tokens from chars (1 token ≈ 4 chars)
         event["tokens_estimated"] = True
@@ -55,6 +60,21 @@ def log_search_turn(
     log_event(event)
 
 
+def _cached_prompt_tokens(usage: dict[str, Any]) -> int | None:
+    """Prompt tokens served from the provider's prompt cache, if reported.
+
+    OpenAI-compatible APIs report `prompt_tokens_details.cached_tokens`; some
+    providers (e.g. DeepSeek) use `prompt_cache_hit_tokens` instead.
+    """
+    details = usage.get("prompt_tokens_details")
+    if isinstance(details, dict) and isinstance(details.get("cached_tokens"), int):
+        return int(details["cached_tokens"])
+    hit = usage.get("prompt_cache_hit_tokens")
+    if isinstance(hit, int):
+        return hit
+    return None
+
+
 def log_tool_call(
     trace_id: str,
     tool_name: str,
@@ -20,7 +20,7 @@ from ..repo.backends import (
     schedule_bg_chunkhound_index,
     schedule_bg_codanna_full_index,
 )
-from ..repo.cloud.search import cloud_search_logic
+from ..repo.cloud.search import cloud_search_logic_async
 from ..repo.freshness import classify_cloud_index_freshness, classify_local_index_freshness
 from .harness import FastAgenticSearchHarness
 
@@ -395,8 +395,7 @@ async def agentic_retrieval_logic(
                     )
 
                 try:
-                    cloud_result = await _run_blocking_retrieval_call(
-                        cloud_search_logic,
+                    cloud_result = await cloud_search_logic_async(
                         repo_client,
                         base_dir,
                         query,
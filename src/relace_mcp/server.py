@@ -5,8 +5,10 @@ import shutil
 import sys
 import tempfile
 import warnings
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from fastmcp import FastMCP
@@ -172,7 +174,7 @@ def build_server(
         RootsMiddleware,
         ToolTracingMiddleware,
     )
-    from .tools import register_tools
+    from .tools import ToolClients, register_tools
 
     if config is None:
         config = RelaceConfig.from_env()
@@ -186,7 +188,18 @@ def build_server(
             raise
 
     background_index_monitor = BackgroundIndexMonitor(config)
-    mcp = FastMCP("Relace Fast Apply MCP", lifespan=background_index_monitor.lifespan)
+    clients = ToolClients(config)
+
+    @asynccontextmanager
+    async def lifespan(server: "FastMCP") -> AsyncIterator[dict[str, Any]]:
+        async with background_index_monitor.lifespan(server) as state:
+            try:
+                yield state
+            finally:
+                # Release pooled HTTP connections on shutdown.
+                await clients.aclose()
+
+    mcp = FastMCP("Relace Fast Apply MCP", lifespan=lifespan)
     mcp._relace_background_index_monitor = background_index_monitor  # type: ignore[attr-defined]
 
     # Register middleware to handle MCP notifications (e.g., roots/list_changed)
@@ -194,10 +207,27 @@ def build_server(
     mcp.add_middleware(ProgressHeartbeatMiddleware())
     mcp.add_middleware(ToolTracingMiddleware())
 
-    register_tools(mcp, config)
+    register_tools(mcp, config, clients)
     return mcp
 
 
+def _maybe_prewarm_lsp(config: "RelaceConfig") -> None:
+    """Start language servers for a pinned MCP_BASE_DIR (SEARCH_LSP_PREWARM)."""
+    from .config import settings as _settings
+
+    if not (_settings.SEARCH_LSP_PREWARM and _settings.SEARCH_LSP_TOOLS and config.base_dir):
+        return
+    try:
+        from .lsp.manager import LSPClientManager
+
+        LSPClientManager.get_instance().prewarm(
+            str(Path(config.base_dir).resolve()),
+            timeout_seconds=_settings.SEARCH_LSP_TIMEOUT_SECONDS,
+        )
+    except Exception:
+        logger.debug("Failed to start LSP prewarm", exc_info=True)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         prog="relace-mcp",
@@ -279,6 +309,7 @@ def main() -> None:
         # Startup logging must never break MCP stdio transport.
         logger.debug("Failed to write server_start event", exc_info=True)
     server = build_server(config, initialize_runtime=False)
+    _maybe_prewarm_lsp(config)
 
     if args.transport in ("http", "streamable-http"):
         logger.debug(
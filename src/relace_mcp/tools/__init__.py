@@ -1,3 +1,4 @@
+from ._clients import ToolClients
 from .register import register_tools
 
-__all__ = ["register_tools"]
+__all__ = ["ToolClients", "register_tools"]
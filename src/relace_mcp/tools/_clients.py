@@ -51,3 +51,9 @@ class ToolClients:
 
                     self._repo_inst = RelaceRepoClient(self._config)
         return self._repo_inst
+
+    async def aclose(self) -> None:
+        """Close the connection pools of clients created so far."""
+        repo = self._repo_inst
+        if repo is not None:
+            await repo.aclose()
@@ -5,7 +5,7 @@ from fastmcp import FastMCP
 from fastmcp.server.context import Context
 from pydantic import Field
 
-from ..apply import apply_file_logic
+from ..apply import apply_batch_logic, apply_file_logic
 from ..config import resolve_base_dir
 from ._registry import ToolRegistryDeps
 
@@ -76,7 +76,7 @@ def register_apply_tools(mcp: FastMCP, deps: ToolRegistryDeps) -> None:
         if ctx is not None:
             await ctx.info(f"Applying to {path}")
 
-        async def _on_progress(progress: int, total: int, message: str) -> None:
+        async def _on_progress(progress: float, total: float, message: str) -> None:
             if ctx is not None:
                 await ctx.report_progress(progress=progress, total=total, message=message)
 
@@ -93,3 +93,49 @@ def register_apply_tools(mcp: FastMCP, deps: ToolRegistryDeps) -> None:
             diff_preview = (result.get("diff") or "")[:200]
             await ctx.debug(f"Edit applied: {diff_preview}...")
         return result
+
+    @mcp.tool(
+        timeout=600.0,
+        annotations={
+            "readOnlyHint": False,
+            "destructiveHint": True,
+            "idempotentHint": False,
+            "openWorldHint": False,
+        },
+    )
+    async def fast_apply_batch(
+        edits: Annotated[
+            list[dict[str, str]],
+            Field(
+                description="Edits to apply together. Each item has `path` and `edit_snippet` "
+                "(same format as fast_apply) and an optional `instruction`. Several items may "
+                "target the same file; they are merged in one request, in list order."
+            ),
+        ],
+        instruction: Annotated[
+            str,
+            Field(description="Optional default hint for items without their own instruction."),
+        ] = "",
+        ctx: Context | None = None,
+    ) -> dict[str, Any]:
+        """Apply edits to several files in one call, all-or-nothing.
+
+        Merges run concurrently. Files are written only when every edit merged and
+        passed validation; otherwise nothing is changed and `results` lists the
+        per-file errors (same codes as fast_apply) under code BATCH_ABORTED.
+
+        On success: {status: "ok", diff: str | None (combined unified diff with
+        a/<path> b/<path> headers), results: [{path, edits, message}]}.
+        """
+        base_dir, _ = await resolve_base_dir(deps.config.base_dir, ctx)
+        await deps.ensure_encoding(ctx, base_dir)
+        if ctx is not None:
+            await ctx.info(f"Applying {len(edits)} edits")
+
+        return await apply_batch_logic(
+            backend=deps.clients.get_apply(),
+            edits=edits,
+            instruction=instruction or None,
+            base_dir=base_dir,
+            extra_paths=deps.config.extra_paths,
+        )
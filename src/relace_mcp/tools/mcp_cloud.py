@@ -97,14 +97,13 @@ def register_cloud_components(mcp: FastMCP, deps: ToolRegistryDeps) -> None:
                   query (str), branch (str), repo_id (str)}.
         Check warnings[] for stale index alerts (e.g., uncommitted local changes).
         """
-        from ..repo.cloud.search import cloud_search_logic
+        from ..repo.cloud.search import cloud_search_logic_async
 
         score_threshold = 0.3
         token_limit = 30000
 
         base_dir, _ = await resolve_base_dir(deps.config.base_dir, ctx)
-        return await asyncio.to_thread(
-            cloud_search_logic,
+        return await cloud_search_logic_async(
             deps.clients.get_repo(),
             base_dir,
             query,
@@ -23,11 +23,14 @@ def _should_register_index_status() -> bool:
     )
 
 
-def register_tools(mcp: FastMCP, config: RelaceConfig) -> None:
-    """Register Relace tools to the FastMCP instance."""
+def register_tools(mcp: FastMCP, config: RelaceConfig, clients: ToolClients | None = None) -> None:
+    """Register Relace tools to the FastMCP instance.
+
+    Pass clients to own their lifetime (e.g. close pools on server shutdown).
+    """
     deps = ToolRegistryDeps(
         config=config,
-        clients=ToolClients(config),
+        clients=clients or ToolClients(config),
         encoding_state=EncodingState(),
     )
 
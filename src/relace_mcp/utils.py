@@ -1,9 +1,31 @@
 import os
+import time
 from collections.abc import Sequence
 from pathlib import Path
 from urllib.parse import unquote, urlparse
 from urllib.request import url2pathname
 
+# Stat data (mtime, size) of a file modified this close to being read is not
+# trusted: a same-tick rewrite would keep the same key (the "racy git"
+# problem). Covers coarse filesystem timestamp granularity.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def racy_cutoff_ns(now_ns: int | None = None) -> int:
+    """Modification times strictly before this are old enough to trust."""
+    return (time.time_ns() if now_ns is None else now_ns) - RACY_WINDOW_NS
+
+
+def file_fingerprint(path: str | Path) -> str | None:
+    """Stat key (mtime_ns:size:inode) of a file, or None if missing or modified too recently."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if st.st_mtime_ns >= racy_cutoff_ns():
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}:{st.st_ino}"
+
 
 def uri_to_path(uri: str) -> str:
     """Convert file:// URI to filesystem path robustly.
@@ -0,0 +1,208 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from relace_mcp.apply import apply_batch_logic
+from relace_mcp.apply.core import _path_locks
+from relace_mcp.clients.apply import ApplyLLMClient, ApplyRequest, ApplyResponse
+from relace_mcp.encoding import atomic_write
+
+
+@pytest.fixture(autouse=True)
+def _clear_path_locks():
+    _path_locks.clear()
+    yield
+    _path_locks.clear()
+
+
+def _rename_backend(old: str, new: str) -> AsyncMock:
+    """Backend whose merge replaces `old` with `new` in the original file."""
+
+    async def merge(request: ApplyRequest) -> ApplyResponse:
+        return ApplyResponse(merged_code=request.initial_code.replace(old, new), usage={})
+
+    backend = AsyncMock(spec=ApplyLLMClient)
+    backend.apply.side_effect = merge
+    return backend
+
+
+def _write(path: Path, content: str) -> Path:
+    path.write_bytes(content.encode("utf-8"))
+    return path
+
+
+_SOURCE = "def compute_total_value():\n    return original_value\n\n\ndef other():\n    pass\n"
+_SNIPPET = "def compute_total_value():\n    return renamed_value\n"
+
+
+class TestApplyBatchSuccess:
+    async def test_edits_multiple_files_with_combined_diff(self, tmp_path: Path) -> None:
+        a = _write(tmp_path / "a.py", _SOURCE)
+        b = _write(tmp_path / "b.py", _SOURCE)
+        backend = _rename_backend("original_value", "renamed_value")
+
+        result = await apply_batch_logic(
+            backend,
+            [
+                {"path": str(a), "edit_snippet": _SNIPPET},
+                {"path": str(b), "edit_snippet": _SNIPPET},
+            ],
+            None,
+            str(tmp_path),
+        )
+
+        assert result["status"] == "ok"
+        assert backend.apply.await_count == 2
+        assert "renamed_value" in a.read_text() and "renamed_value" in b.read_text()
+        assert "--- a/a.py" in result["diff"] and "+++ b/b.py" in result["diff"]
+        assert [r["path"] for r in result["results"]] == [str(a), str(b)]
+
+    async def test_same_file_snippets_are_merged_once(self, tmp_path: Path) -> None:
+        a = _write(tmp_path / "a.py", _SOURCE)
+        backend = _rename_backend("original_value", "renamed_value")
+
+        result = await apply_batch_logic(
+            backend,
+            [
+                {"path": str(a), "edit_snippet": _SNIPPET},
+                {"path": "a.py", "edit_snippet": "def other():\n    pass\n"},
+            ],
+            None,
+            str(tmp_path),
+        )
+
+        assert result["status"] == "ok"
+        backend.apply.assert_awaited_once()
+        request = backend.apply.await_args.args[0]
+        assert request.edit_snippet == (
+            "def compute_total_value():\n    return renamed_value\n"
+            "# ... existing code ...\n"
+            "def other():\n    pass\n"
+        )
+        assert result["results"][0]["edits"] == 2
+
+    async def test_creates_new_file_alongside_edit(self, tmp_path: Path) -> None:
+        a = _write(tmp_path / "a.py", _SOURCE)
+        backend = _rename_backend("original_value", "renamed_value")
+
+        result = await apply_batch_logic(
+            backend,
+            [
+                {"path": str(a), "edit_snippet": _SNIPPET},
+                {"path": "pkg/new.py", "edit_snippet": "VALUE = 1\n"},
+            ],
+            None,
+            str(tmp_path),
+        )
+
+        assert result["status"] == "ok"
+        assert (tmp_path / "pkg" / "new.py").read_text() == "VALUE = 1\n"
+        assert "+++ b/pkg/new.py" in result["diff"]
+
+    async def test_merges_respect_concurrency_limit(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.APPLY_BATCH_MAX_CONCURRENCY", 2)
+        paths = [_write(tmp_path / f"f{i}.py", _SOURCE) for i in range(5)]
+        in_flight = 0
+        peak = 0
+
+        async def merge(request: ApplyRequest) -> ApplyResponse:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return ApplyResponse(
+                merged_code=request.initial_code.replace("original_value", "renamed_value"),
+                usage={},
+            )
+
+        backend = AsyncMock(spec=ApplyLLMClient)
+        backend.apply.side_effect = merge
+
+        result = await apply_batch_logic(
+            backend,
+            [{"path": str(p), "edit_snippet": _SNIPPET} for p in paths],
+            None,
+            str(tmp_path),
+        )
+
+        assert result["status"] == "ok"
+        assert peak == 2
+
+
+class TestApplyBatchAllOrNothing:
+    async def test_failed_merge_leaves_all_files_untouched(self, tmp_path: Path) -> None:
+        a = _write(tmp_path / "a.py", _SOURCE)
+        b = _write(tmp_path / "b.py", "def unrelated():\n    return 1\n")
+        backend = _rename_backend("original_value", "renamed_value")
+
+        result = await apply_batch_logic(
+            backend,
+            [
+                {"path": str(a), "edit_snippet": _SNIPPET},
+                {"path": str(b), "edit_snippet": "def nowhere_to_be_found():\n    return 2\n"},
+            ],
+            None,
+            str(tmp_path),
+        )
+
+        assert result["status"] == "error"
+        assert result["code"] == "BATCH_ABORTED"
+        assert [r["code"] for r in result["results"]] == ["NEEDS_MORE_CONTEXT"]
+        assert a.read_text() == _SOURCE
+
+    async def test_invalid_edit_aborts_before_merging(self, tmp_path: Path) -> None:
+        a = _write(tmp_path / "a.py", _SOURCE)
+        backend = _rename_backend("original_value", "renamed_value")
+
+        result = await apply_batch_logic(
+            backend,
+            [
+                {"path": str(a), "edit_snippet": _SNIPPET},
+                {"path": str(a), "edit_snippet": "   "},
+            ],
+            None,
+            str(tmp_path),
+        )
+
+        assert result["code"] == "BATCH_ABORTED"
+        backend.apply.assert_not_awaited()
+
+    async def test_empty_edits(self, tmp_path: Path) -> None:
+        result = await apply_batch_logic(AsyncMock(), [], None, str(tmp_path))
+
+        assert result["status"] == "error"
+        assert result["code"] == "INVALID_INPUT"
+
+    async def test_write_failure_restores_written_files(self, tmp_path: Path) -> None:
+        a = _write(tmp_path / "a.py", _SOURCE)
+        b = _write(tmp_path / "b.py", _SOURCE)
+        backend = _rename_backend("original_value", "renamed_value")
+        calls = 0
+
+        def flaky_write(path: Path, content: str, encoding: str) -> None:
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise OSError(28, "No space left on device")
+            atomic_write(path, content, encoding)
+
+        with patch("relace_mcp.apply.batch.atomic_write", side_effect=flaky_write):
+            result = await apply_batch_logic(
+                backend,
+                [
+                    {"path": str(a), "edit_snippet": _SNIPPET},
+                    {"path": str(b), "edit_snippet": _SNIPPET},
+                ],
+                None,
+                str(tmp_path),
+            )
+
+        assert result["code"] == "BATCH_ABORTED"
+        assert result["results"][0]["code"] == "FS_ERROR"
+        assert a.read_text() == _SOURCE
+        assert b.read_text() == _SOURCE
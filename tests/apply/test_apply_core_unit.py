@@ -5,7 +5,7 @@ from unittest.mock import AsyncMock, patch
 import pytest
 
 from relace_mcp.apply.core import _get_path_lock, _path_locks, apply_file_logic
-from relace_mcp.clients.apply import ApplyLLMClient, ApplyResponse
+from relace_mcp.clients.apply import ApplyLLMClient, ApplyRequest, ApplyResponse
 
 
 @pytest.fixture(autouse=True)
@@ -663,3 +663,234 @@ class TestImprovedErrorMessage:
         assert "process_request" in result["message"]
         assert "handle_response" in result["message"]
         assert "MyService" in result["message"]
+
+
+def _make_streaming_backend(chunks: list[str]) -> tuple[AsyncMock, list[str]]:
+    """Backend whose apply_stream feeds chunks to on_delta; returns (backend, delivered)."""
+    delivered: list[str] = []
+
+    async def apply_stream(request, on_delta):
+        for chunk in chunks:
+            await on_delta(chunk)
+            delivered.append(chunk)
+        return ApplyResponse(merged_code="".join(chunks), usage={})
+
+    backend = AsyncMock(spec=ApplyLLMClient)
+    backend.apply_stream.side_effect = apply_stream
+    return backend, delivered
+
+
+class TestStreamingApply:
+    @pytest.fixture(autouse=True)
+    def _enable_streaming(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.APPLY_STREAM", True)
+
+    async def test_marker_leak_aborts_mid_stream(self, tmp_path: Path) -> None:
+        source = tmp_path / "leak.py"
+        initial = "def foo():\n    return 1\n\n\ndef bar():\n    return 3\n"
+        source.write_text(initial, encoding="utf-8", newline="")
+        chunks = ["def foo():\n    return 2\n", "# ... existing", " code ...\n", "def bar():\n"]
+        backend, delivered = _make_streaming_backend(chunks)
+
+        result = await apply_file_logic(
+            backend,
+            str(source),
+            "def foo():\n    return 2\n# ... existing code ...\n",
+            None,
+            str(tmp_path),
+        )
+
+        assert result["code"] == "MARKER_LEAKAGE"
+        # Aborted on the chunk that completed the marker line; later chunks never arrive.
+        assert delivered == chunks[:2]
+        backend.apply.assert_not_awaited()
+        assert source.read_text(encoding="utf-8") == initial
+
+    async def test_reports_byte_progress_then_done(self, tmp_path: Path) -> None:
+        source = tmp_path / "progress.py"
+        body = "".join(f"    value_{i} = {i}\n" for i in range(40))
+        initial = "def foo():\n" + body + "    return 1\n"
+        source.write_text(initial, encoding="utf-8", newline="")
+        merged = initial.replace("return 1", "return 2")
+        chunks = [merged[i : i + 40] for i in range(0, len(merged), 40)]
+        backend, _ = _make_streaming_backend(chunks)
+        progress_events: list[tuple[float, float, str]] = []
+
+        async def on_progress(progress: float, total: float, message: str) -> None:
+            progress_events.append((progress, total, message))
+
+        result = await apply_file_logic(
+            backend,
+            str(source),
+            "def foo():\n# ... existing code ...\n    return 2\n",
+            None,
+            str(tmp_path),
+            on_progress=on_progress,
+        )
+
+        assert result["status"] == "ok"
+        assert progress_events[0] == (1, 2, "Merging")
+        assert progress_events[-1] == (2, 2, "Done")
+        streamed = progress_events[1:-1]
+        assert len(streamed) > 3
+        assert all(1 < p < 2 and "bytes received" in m for p, _, m in streamed)
+        values = [p for p, _, _ in progress_events]
+        assert values == sorted(values)
+
+
+class TestLocalMerge:
+    _INITIAL = (
+        "def compute_total_value(items):\n"
+        "    total = sum(items)\n"
+        "    return total\n"
+        "\n"
+        "\n"
+        "def describe_total_value(items):\n"
+        "    return f'total={compute_total_value(items)}'\n"
+    )
+
+    @pytest.fixture(autouse=True)
+    def _enable_local_merge(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.APPLY_LOCAL_MERGE", True)
+
+    async def test_unambiguous_snippet_skips_remote_call(self, tmp_path: Path) -> None:
+        source = tmp_path / "totals.py"
+        source.write_text(self._INITIAL, encoding="utf-8", newline="")
+        backend = _make_mock_backend("unused")
+
+        result = await apply_file_logic(
+            backend,
+            str(source),
+            "def compute_total_value(items):\n"
+            "    total = sum(item.price for item in items)\n"
+            "    return total\n",
+            None,
+            str(tmp_path),
+        )
+
+        assert result["status"] == "ok"
+        assert result["merge_path"] == "local"
+        backend.apply.assert_not_awaited()
+        assert "item.price" in source.read_text(encoding="utf-8")
+
+    async def test_ambiguous_snippet_uses_remote_merge(self, tmp_path: Path) -> None:
+        source = tmp_path / "totals.py"
+        source.write_text(self._INITIAL, encoding="utf-8", newline="")
+        merged = self._INITIAL.replace("    return total\n", "    return round(total, 2)\n")
+        backend = _make_mock_backend(merged)
+
+        result = await apply_file_logic(
+            backend,
+            str(source),
+            "def compute_total_value(items):\n    total = sum(items)\n    return round(total, 2)\n",
+            None,
+            str(tmp_path),
+        )
+
+        assert result["status"] == "ok"
+        assert result["merge_path"] == "remote"
+        backend.apply.assert_awaited_once()
+
+    async def test_local_merge_failing_guard_falls_back(self, tmp_path: Path) -> None:
+        source = tmp_path / "totals.py"
+        source.write_text(self._INITIAL, encoding="utf-8", newline="")
+        merged = self._INITIAL.replace("sum(items)", "sum(items) + 1")
+        backend = _make_mock_backend(merged)
+
+        # Splices cleanly but leaves an unclosed paren, so the syntax guard rejects it.
+        result = await apply_file_logic(
+            backend,
+            str(source),
+            "def compute_total_value(items):\n    total = (sum(items) + 1\n    return total\n",
+            None,
+            str(tmp_path),
+        )
+
+        assert result["status"] == "ok"
+        assert result["merge_path"] == "remote"
+        backend.apply.assert_awaited_once()
+
+
+class TestWindowedMerge:
+    _INITIAL = "".join(f"def func_{i}():\n    return {i}\n\n\n" for i in range(100))
+
+    @pytest.fixture(autouse=True)
+    def _enable_window(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.APPLY_WINDOW_MIN_LINES", 100)
+
+    async def test_large_file_sends_only_window(self, tmp_path: Path) -> None:
+        source = tmp_path / "funcs.py"
+        source.write_text(self._INITIAL, encoding="utf-8", newline="")
+        backend = AsyncMock(spec=ApplyLLMClient)
+
+        async def merge(request: ApplyRequest) -> ApplyResponse:
+            return ApplyResponse(
+                merged_code=request.initial_code.replace("return 50\n", "return 'fifty'\n"),
+                usage={},
+            )
+
+        backend.apply.side_effect = merge
+
+        result = await apply_file_logic(
+            backend,
+            str(source),
+            "def func_50():\n    return 'fifty'\n",
+            None,
+            str(tmp_path),
+        )
+
+        assert result["status"] == "ok"
+        assert result["merge_path"] == "window"
+        request = backend.apply.await_args.args[0]
+        assert len(request.initial_code) < len(self._INITIAL) // 2
+        assert source.read_text(encoding="utf-8") == self._INITIAL.replace(
+            "return 50\n", "return 'fifty'\n"
+        )
+        # func_50's body is line 202 of the file.
+        assert "@@ -199,7 +199,7 @@" in result["diff"]
+
+    async def test_blast_radius_is_relative_to_window(self, tmp_path: Path) -> None:
+        source = tmp_path / "funcs.py"
+        source.write_text(self._INITIAL, encoding="utf-8", newline="")
+        backend = AsyncMock(spec=ApplyLLMClient)
+
+        async def merge(request: ApplyRequest) -> ApplyResponse:
+            # Rewrites every line of the window: tiny against the file, total within it.
+            rewritten = "".join(
+                f"value_{n} = {n}\n" for n in range(len(request.initial_code.splitlines()))
+            )
+            return ApplyResponse(merged_code=rewritten, usage={})
+
+        backend.apply.side_effect = merge
+
+        result = await apply_file_logic(
+            backend,
+            str(source),
+            "def func_50():\n    return 'fifty'\n",
+            None,
+            str(tmp_path),
+        )
+
+        assert result["status"] == "error"
+        assert result["code"] == "BLAST_RADIUS_EXCEEDED"
+        assert source.read_text(encoding="utf-8") == self._INITIAL
+
+    async def test_small_file_sends_whole_file(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.APPLY_WINDOW_MIN_LINES", 10_000)
+        source = tmp_path / "funcs.py"
+        source.write_text(self._INITIAL, encoding="utf-8", newline="")
+        backend = _make_mock_backend(self._INITIAL.replace("return 50\n", "return 'fifty'\n"))
+
+        result = await apply_file_logic(
+            backend,
+            str(source),
+            "def func_50():\n    return 'fifty'\n",
+            None,
+            str(tmp_path),
+        )
+
+        assert result["status"] == "ok"
+        assert result["merge_path"] == "remote"
+        assert backend.apply.await_args.args[0].initial_code == self._INITIAL
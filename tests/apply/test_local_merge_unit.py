@@ -0,0 +1,95 @@
+from relace_mcp.apply.local_merge import splice_snippet
+
+_SOURCE = (
+    "import os\n"
+    "\n"
+    "def load_settings(path):\n"
+    "    data = read_file(path)\n"
+    "    return parse(data)\n"
+    "\n"
+    "def save_settings(path, data):\n"
+    "    write_file(path, dump(data))\n"
+)
+
+
+class TestSpliceSnippet:
+    def test_replaces_lines_between_unique_anchors(self) -> None:
+        snippet = (
+            "# ... existing code ...\n"
+            "def load_settings(path):\n"
+            "    data = read_file(path, encoding='utf-8')\n"
+            "    return parse(data)\n"
+            "# ... existing code ...\n"
+        )
+
+        merged = splice_snippet(_SOURCE, snippet)
+
+        assert merged == _SOURCE.replace("read_file(path)", "read_file(path, encoding='utf-8')")
+
+    def test_inserts_between_adjacent_anchors(self) -> None:
+        snippet = "    return parse(data)\n\ndef reset_settings():\n    pass\n\ndef save_settings(path, data):\n"
+
+        merged = splice_snippet(_SOURCE, snippet)
+
+        assert merged is not None
+        assert "def reset_settings():\n    pass\n\ndef save_settings" in merged
+        assert merged.startswith("import os\n") and merged.endswith("dump(data))\n")
+
+    def test_multiple_segments_in_order(self) -> None:
+        snippet = (
+            "import os\nimport sys\n\ndef load_settings(path):\n"
+            "# ... existing code ...\n"
+            "def save_settings(path, data):\n"
+            "    validate(data)\n"
+            "    write_file(path, dump(data))\n"
+        )
+
+        merged = splice_snippet(_SOURCE, snippet)
+
+        assert merged is not None
+        assert merged.startswith("import os\nimport sys\n")
+        assert merged.endswith("    validate(data)\n    write_file(path, dump(data))\n")
+
+    def test_preserves_crlf_newlines(self) -> None:
+        source = _SOURCE.replace("\n", "\r\n")
+        snippet = "def load_settings(path):\n    data = fetch(path)\n    return parse(data)\n"
+
+        merged = splice_snippet(source, snippet)
+
+        assert merged == source.replace("read_file(path)", "fetch(path)")
+
+    def test_missing_end_anchor_is_ambiguous(self) -> None:
+        snippet = "def load_settings(path):\n    return {}\n"
+
+        assert splice_snippet(_SOURCE, snippet) is None
+
+    def test_duplicate_anchor_is_ambiguous(self) -> None:
+        source = _SOURCE + "\ndef load_settings(path):\n    return None\n"
+        snippet = "def load_settings(path):\n    data = x\n    return parse(data)\n"
+
+        assert splice_snippet(source, snippet) is None
+
+    def test_trivial_anchor_is_ambiguous(self) -> None:
+        source = "def f():\n    x = compute_value()\n    return\n"
+        snippet = "    x = compute_value()\n    log(x)\n    return\n"
+
+        assert splice_snippet(source, snippet) is None
+
+    def test_out_of_order_segments_are_ambiguous(self) -> None:
+        snippet = (
+            "def save_settings(path, data):\n    write_file(path, dump(data))\n"
+            "# ... existing code ...\n"
+            "def load_settings(path):\n    data = read_file(path)\n"
+        )
+
+        assert splice_snippet(_SOURCE, snippet) is None
+
+    def test_span_much_larger_than_segment_is_ambiguous(self) -> None:
+        snippet = "import os\n    write_file(path, dump(data))\n"
+
+        assert splice_snippet(_SOURCE, snippet) is None
+
+    def test_remove_directive_is_left_to_model(self) -> None:
+        snippet = "# remove load_settings\ndef save_settings(path, data):\n"
+
+        assert splice_snippet(_SOURCE, snippet) is None
@@ -11,6 +11,7 @@ from relace_mcp.apply.snippet import (
     extract_remove_targets,
     extract_top_level_symbols,
     is_truncation_placeholder,
+    join_edit_snippets,
     normalize_edit_snippet,
     post_check_merged_code,
     validate_syntax_delta,
@@ -72,6 +73,21 @@ class TestNormalizeEditSnippet:
         assert normalize_edit_snippet(snippet, path) == snippet
 
 
+class TestJoinEditSnippets:
+    def test_single_snippet_is_unchanged(self) -> None:
+        assert join_edit_snippets(["x = 1"], "a.py") == "x = 1"
+
+    @pytest.mark.parametrize(
+        ("path", "marker"),
+        [("a.py", "# ... existing code ..."), ("a.ts", "// ... existing code ...")],
+    )
+    def test_separates_with_placeholder_in_file_comment_style(self, path: str, marker: str) -> None:
+        joined = join_edit_snippets(["a\n", "\nb\n"], path)
+
+        assert joined == f"a\n{marker}\nb\n"
+        assert contains_truncation_markers(joined)
+
+
 class TestContainsTruncationMarkers:
     def test_detects_marker_lines(self) -> None:
         assert contains_truncation_markers("# ... existing code ...\n") is True
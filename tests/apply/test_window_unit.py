@@ -0,0 +1,50 @@
+from relace_mcp.apply.window import locate_window
+
+_SOURCE = "".join(f"def func_{i}():\n    return {i}\n\n" for i in range(200))
+
+
+class TestLocateWindow:
+    def test_window_spans_unique_anchors_plus_context(self) -> None:
+        window = locate_window(_SOURCE, "def func_100():\n    return 'changed'\n", context=5)
+
+        assert window is not None
+        assert (window.start, window.end) == (295, 306)
+        assert window.prefix + window.text + window.suffix == _SOURCE
+        assert "def func_100():" in window.text
+
+    def test_no_unique_anchor_returns_none(self) -> None:
+        assert locate_window(_SOURCE, "    pass\n") is None
+
+    def test_remove_directive_returns_none(self) -> None:
+        snippet = "def func_100():\n    return 100\n# remove func_150\n"
+
+        assert locate_window(_SOURCE, snippet, context=5) is None
+
+    def test_window_covering_most_of_file_returns_none(self) -> None:
+        snippet = "def func_1():\n# ... existing code ...\ndef func_198():\n"
+
+        assert locate_window(_SOURCE, snippet, context=5) is None
+
+
+class TestMergeWindow:
+    def test_splice_and_diff_use_file_line_numbers(self) -> None:
+        window = locate_window(_SOURCE, "def func_100():\n", context=2)
+        assert window is not None
+        merged_window = window.text.replace("return 100", "return 'changed'")
+
+        merged = window.splice(merged_window)
+        diff = window.diff(merged_window)
+
+        assert merged == _SOURCE.replace("return 100\n", "return 'changed'\n")
+        assert diff.startswith("--- before\n+++ after\n")
+        # func_100's body is line 302 of the file.
+        assert "@@ -299,5 +299,5 @@" in diff
+        assert "-    return 100\n+    return 'changed'\n" in diff
+
+    def test_splice_restores_missing_trailing_newline(self) -> None:
+        window = locate_window(_SOURCE, "def func_100():\n", context=1)
+        assert window is not None
+
+        merged = window.splice(window.text.removesuffix("\n"))
+
+        assert merged == _SOURCE
@@ -1,8 +1,10 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import openai
+import pytest
 
-from relace_mcp.backend.openai_backend import _should_retry
+from relace_mcp.backend.openai_backend import OpenAIChatClient, _should_retry
+from relace_mcp.config.provider import ProviderConfig
 
 
 class TestShouldRetry:
@@ -113,3 +115,97 @@ class TestShouldRetry:
         state = MagicMock()
         state.outcome = None
         assert _should_retry(state) is False
+
+
+class _FakeStream:
+    def __init__(self, chunks: list[object]) -> None:
+        self._chunks = chunks
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for chunk in self._chunks:
+            yield chunk
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _chunk(content: str | None, finish_reason: str | None = None) -> MagicMock:
+    chunk = MagicMock()
+    chunk.usage = None
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = content
+    chunk.choices[0].finish_reason = finish_reason
+    return chunk
+
+
+class TestChatCompletionsStream:
+    def _client(self, stream: _FakeStream) -> OpenAIChatClient:
+        config = ProviderConfig(
+            provider="openai",
+            api_compat="openai",
+            base_url="http://localhost",
+            model="m",
+            api_key="k",
+            timeout_seconds=5.0,
+            display_name="OpenAI",
+        )
+        client = OpenAIChatClient(config)
+        client._async_client = MagicMock()
+        client._async_client.chat.completions.create = AsyncMock(return_value=stream)
+        return client
+
+    async def test_assembles_completion_payload(self) -> None:
+        stream = _FakeStream([_chunk("def "), _chunk("f(): pass\n"), _chunk(None, "stop")])
+        deltas: list[str] = []
+
+        async def on_delta(delta: str) -> None:
+            deltas.append(delta)
+
+        payload, _ = await self._client(stream).chat_completions_stream_async(
+            [{"role": "user", "content": "x"}], temperature=0.0, on_delta=on_delta
+        )
+
+        assert deltas == ["def ", "f(): pass\n"]
+        assert payload["choices"][0]["message"]["content"] == "def f(): pass\n"
+        assert payload["choices"][0]["finish_reason"] == "stop"
+        assert stream.closed
+
+    async def test_reports_usage_from_final_chunk(self) -> None:
+        usage_chunk = MagicMock()
+        usage_chunk.choices = []
+        usage_chunk.usage.model_dump.return_value = {
+            "prompt_tokens": 12,
+            "completion_tokens": 3,
+            "total_tokens": 15,
+        }
+        stream = _FakeStream([_chunk("x"), _chunk(None, "stop"), usage_chunk])
+        client = self._client(stream)
+
+        async def on_delta(delta: str) -> None:
+            pass
+
+        payload, _ = await client.chat_completions_stream_async(
+            [{"role": "user", "content": "x"}], temperature=0.0, on_delta=on_delta
+        )
+
+        create = client._async_client.chat.completions.create
+        assert create.await_args.kwargs["stream_options"] == {"include_usage": True}
+        assert payload["usage"]["total_tokens"] == 15
+        assert payload["choices"][0]["finish_reason"] == "stop"
+
+    async def test_on_delta_error_closes_stream(self) -> None:
+        stream = _FakeStream([_chunk("a"), _chunk("b")])
+
+        async def on_delta(delta: str) -> None:
+            raise RuntimeError("abort")
+
+        with pytest.raises(RuntimeError, match="abort"):
+            await self._client(stream).chat_completions_stream_async(
+                [{"role": "user", "content": "x"}], temperature=0.0, on_delta=on_delta
+            )
+
+        assert stream.closed
@@ -10,6 +10,8 @@ from relace_mcp.config.settings import (
 )
 
 _RELOAD_KEYS = (
+    "MCP_LOG_ASYNC",
+    "MCP_TRACE_SEGMENTS",
     "MCP_LOGGING_MODE",
     "MCP_LOGGING",
     "MCP_LOG_REDACT",
@@ -33,14 +35,33 @@ _TOOL_RELOAD_KEYS = (
     "SEARCH_LSP_TOOLS",
     "SEARCH_TOOL_STRICT",
     "SEARCH_MAX_TURNS",
+    "SEARCH_STALL_TURNS",
     "SEARCH_PARALLEL_TOOL_CALLS",
+    "SEARCH_MAX_CONCURRENT_TOOLS",
+    "SEARCH_PREFETCH",
+    "SEARCH_RESULT_CACHE",
+    "SEARCH_RESULT_CACHE_TTL_SECONDS",
+    "SEARCH_TOOL_MEMO",
+    "SEARCH_TOOL_MEMO_SESSION",
+    "SEARCH_TOOL_MEMO_REFERENCE",
     "SEARCH_TOP_P",
     "SEARCH_LSP_TIMEOUT_SECONDS",
     "SEARCH_LSP_MAX_CLIENTS",
+    "SEARCH_LSP_MAX_OPEN_DOCUMENTS",
+    "SEARCH_LSP_FS_WATCH",
+    "SEARCH_LSP_PIPELINE",
+    "SEARCH_LSP_REPLICAS",
+    "SEARCH_LSP_PREWARM",
+    "SEARCH_LSP_IDLE_TTL_SECONDS",
+    "SEARCH_LSP_READY_TIMEOUT_SECONDS",
+    "SEARCH_GREP_INDEX",
+    "MCP_FILE_CACHE_MB",
     "MCP_BACKGROUND_INDEX_MONITOR",
     "MCP_BACKGROUND_INDEX_INTERVAL_SECONDS",
     "MCP_BACKGROUND_INDEX_INITIAL_DELAY_SECONDS",
     "RELACE_UPLOAD_MAX_WORKERS",
+    "RELACE_SYNC_BATCH_BYTES",
+    "RELACE_SYNC_GIT_DIFF",
     "RELACE_API_KEY",
     "MCP_BASE_DIR",
     "MCP_EXTRA_PATHS",
@@ -1,4 +1,5 @@
-from collections.abc import Generator
+import subprocess
+from collections.abc import Callable, Generator
 from pathlib import Path
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -144,11 +145,41 @@ def clean_env(monkeypatch: pytest.MonkeyPatch) -> None:
                 monkeypatch.delenv(key, raising=False)
 
 
+@pytest.fixture
+def git() -> Callable[..., None]:
+    """Run git in a directory with a throwaway identity: git(root, "commit", "-qm", "msg")."""
+
+    def run(root: Path, *args: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.email=t@example.com", "-c", "user.name=t", *args],
+            cwd=root,
+            check=True,
+            capture_output=True,
+        )
+
+    return run
+
+
+@pytest.fixture
+def trust_fresh_files(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Trust stat data of just-written files so caching is observable without sleeping."""
+    monkeypatch.setattr("relace_mcp.utils.RACY_WINDOW_NS", -(10**18))
+
+
+@pytest.fixture
+def isolated_text_cache(monkeypatch: pytest.MonkeyPatch, trust_fresh_files: None) -> None:
+    """Fresh process-wide decoded-text cache for one test."""
+    from relace_mcp.encoding.cache import TextCache
+
+    monkeypatch.setattr("relace_mcp.encoding.cache._TEXT_CACHE", TextCache())
+
+
 @pytest.fixture(autouse=True)
 def mock_log_path(tmp_path: Path) -> Generator[Path, None, None]:
     log_file = tmp_path / "test.log"
     with (
         patch("relace_mcp.config.settings.MCP_LOGGING", True),
+        patch("relace_mcp.config.settings.MCP_LOG_ASYNC", False),
         patch("relace_mcp.config.settings.MCP_LOG_REDACT", False),
         patch("relace_mcp.config.settings.LOG_PATH", log_file),
     ):
@@ -1,7 +1,17 @@
-from relace_dashboard.log_reader import get_log_path
+from pathlib import Path
+
+import pytest
+
+from relace_dashboard.log_reader import get_log_path, get_trace_path
 
 
 class TestDashboardLogPath:
     def test_default_platformdirs(self) -> None:
         result = get_log_path()
         assert result.name == "relace.log"
+
+    def test_trace_path_follows_settings(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.TRACE_PATH", tmp_path / "t.jsonl")
+        assert get_trace_path() == tmp_path / "t.jsonl"
@@ -1,4 +1,19 @@
-from relace_dashboard.log_reader import ALL_KINDS, ERROR_KINDS
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from relace_dashboard import log_reader
+from relace_dashboard.log_reader import (
+    ALL_KINDS,
+    ERROR_KINDS,
+    iter_log_events,
+    read_log_events,
+    read_trace_events,
+)
+from relace_mcp.observability.segments import TraceSegmentStore
+from relace_mcp.observability.writer import encode_line
 
 
 class TestDashboardEventKinds:
@@ -31,3 +46,103 @@ class TestDashboardEventKinds:
         }
         assert expected.issubset(ERROR_KINDS)
         assert "backend_disabled" not in ERROR_KINDS
+
+
+class TestReadTraceEvents:
+    def test_reads_plain_trace_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        trace_path = tmp_path / "relace.trace.jsonl"
+        trace_path.write_text(
+            json.dumps({"kind": "llm_request", "trace_id": "t1"})
+            + "\n"
+            + json.dumps({"kind": "llm_request", "trace_id": "t2"})
+            + "\n"
+        )
+        monkeypatch.setattr(log_reader, "get_trace_path", lambda: trace_path)
+
+        assert [e["trace_id"] for e in read_trace_events("t2")] == ["t2"]
+
+    def test_prefers_segment_index(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        trace_path = tmp_path / "relace.trace.jsonl"
+        store = TraceSegmentStore(
+            tmp_path, "relace.trace", max_segment_bytes=1 << 20, max_segments=5
+        )
+        store.append([encode_line({"kind": "llm_request", "trace_id": "t1", "messages": []})])
+        store.close()
+        monkeypatch.setattr(log_reader, "get_trace_path", lambda: trace_path)
+
+        assert [e["kind"] for e in read_trace_events("t1")] == ["llm_request"]
+
+    def test_reads_rotated_trace_files_oldest_first(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        trace_path = tmp_path / "relace.trace.jsonl"
+        for path, turn in (
+            (tmp_path / "relace.trace.20260102_000000.jsonl", 2),
+            (tmp_path / "relace.trace.20260101_000000.jsonl", 1),
+            (trace_path, 3),
+        ):
+            path.write_text(json.dumps({"kind": "llm_request", "trace_id": "t1", "turn": turn}))
+        monkeypatch.setattr("relace_mcp.config.settings.TRACE_PATH", trace_path)
+
+        assert [e["turn"] for e in read_trace_events("t1")] == [1, 2, 3]
+
+
+def _write_log(path: Path, minutes: range, base: datetime) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for m in minutes:
+            ts = (base + timedelta(minutes=m)).isoformat()
+            f.write(json.dumps({"kind": "tool_call", "timestamp": ts, "minute": m}) + "\n")
+            if m % 7 == 0:
+                f.write("not json\n")
+
+
+class TestReadLogEvents:
+    BASE = datetime(2026, 1, 1, tzinfo=UTC)
+
+    @pytest.fixture
+    def logs(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        log_path = tmp_path / "relace.log"
+        _write_log(tmp_path / "relace.20260101_010000.log", range(0, 60), self.BASE)
+        _write_log(tmp_path / "relace.20260101_020000.log", range(60, 120), self.BASE)
+        _write_log(log_path, range(120, 180), self.BASE)
+        monkeypatch.setattr(log_reader, "get_log_path", lambda: log_path)
+        return log_path
+
+    def test_returns_most_recent_events_across_rotated_logs(self, logs: Path) -> None:
+        events = read_log_events(max_events=70)
+
+        assert [e["minute"] for e in events] == list(range(110, 180))
+
+    def test_time_range_is_seeked_not_scanned(
+        self, logs: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        parsed: list[str] = []
+        real_parse = log_reader.parse_log_event
+
+        def counting_parse(line: str) -> dict | None:
+            parsed.append(line)
+            return real_parse(line)
+
+        monkeypatch.setattr(log_reader, "parse_log_event", counting_parse)
+
+        events = list(
+            iter_log_events(
+                time_start=self.BASE + timedelta(minutes=50),
+                time_end=self.BASE + timedelta(minutes=65),
+            )
+        )
+
+        assert [e["minute"] for e in events] == list(range(50, 66))
+        # Binary search touches a handful of lines per file, not all 180+.
+        assert len(parsed) < 80
+
+    def test_reverse_iteration(self, logs: Path) -> None:
+        events = iter_log_events(time_start=self.BASE + timedelta(minutes=118), reverse=True)
+
+        assert [e["minute"] for e in events][:4] == [179, 178, 177, 176]
+        assert [e["minute"] for e in iter_log_events(reverse=True)][-1] == 0
+
+    def test_missing_log(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(log_reader, "get_log_path", lambda: tmp_path / "relace.log")
+
+        assert read_log_events() == []
@@ -0,0 +1,142 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import relace_mcp.encoding.cache as cache_mod
+from relace_mcp.encoding import (
+    EncodingDetectionError,
+    load_text,
+    read_text_with_fallback,
+    set_project_encoding,
+    warm_text,
+)
+from relace_mcp.search._impl import view_file_handler
+
+pytestmark = pytest.mark.usefixtures("isolated_text_cache")
+
+
+def _bump_mtime(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+class TestLineIndex:
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            "one",
+            "one\ntwo\n",
+            "a\r\nb\rc\n\nd",
+            "x\x0by\x0cz\x1c end ",
+            "\n\n\n",
+        ],
+    )
+    def test_matches_splitlines(self, text: str) -> None:
+        cached = cache_mod.CachedText(text, "utf-8", None)
+
+        expected = text.splitlines()
+        assert cached.line_count == len(expected)
+        assert cached.lines(0, len(expected) + 5) == expected
+        assert cached.lines(1, 3) == expected[1:3]
+
+
+class TestLoadText:
+    def test_repeated_reads_are_served_from_cache(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.py"
+        target.write_text("one\ntwo\nthree\n")
+        assert "2 two" in view_file_handler("/repo/a.py", [2, 2], str(tmp_path))
+
+        with patch.object(Path, "read_bytes", side_effect=OSError("boom")):
+            assert "3 three" in view_file_handler("/repo/a.py", [3, 3], str(tmp_path))
+            assert read_text_with_fallback(target) == ("one\ntwo\nthree\n", "utf-8")
+
+    def test_modified_file_is_reread(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.py"
+        target.write_text("old\n")
+        assert load_text(target).text == "old\n"
+
+        target.write_text("new content\n")
+        _bump_mtime(target)
+
+        assert load_text(target).text == "new content\n"
+
+    def test_recent_files_are_not_cached(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.utils.RACY_WINDOW_NS", 10**18)
+        target = tmp_path / "a.py"
+        target.write_text("x\n")
+
+        load_text(target)
+
+        assert cache_mod._TEXT_CACHE.contains(target) is False
+
+    def test_project_encoding_change_misses(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.py"
+        target.write_text("x\n")
+        load_text(target)
+        try:
+            set_project_encoding("gbk")
+            assert cache_mod._TEXT_CACHE.contains(target) is False
+        finally:
+            set_project_encoding(None)
+
+    def test_binary_file(self, tmp_path: Path) -> None:
+        target = tmp_path / "blob.bin"
+        target.write_bytes(b"\x00\x01\x02" * 100)
+
+        assert load_text(target).text is None
+        with pytest.raises(EncodingDetectionError):
+            read_text_with_fallback(target)
+
+    def test_missing_file_raises_oserror(self, tmp_path: Path) -> None:
+        with pytest.raises(OSError):
+            load_text(tmp_path / "missing.py")
+
+    def test_warm_reports_only_new_loads(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.py"
+        target.write_text("x\n")
+
+        assert warm_text(target) is True
+        assert warm_text(target) is False
+
+
+class TestMemoryBudget:
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        cache = cache_mod.TextCache()
+        paths = {}
+        for name in "abcde":
+            paths[name] = tmp_path / f"{name}.py"
+            paths[name].write_text(name * 2000)
+        per_entry = cache.load(paths["a"], 10**9).nbytes
+        cache.clear()
+        # Room for four entries; each stays under the quarter-budget size cap.
+        budget = per_entry * 4 + per_entry // 2
+
+        for name in "abacde":
+            cache.load(paths[name], budget)
+
+        assert not cache.contains(paths["b"])
+        assert all(cache.contains(paths[name]) for name in "acde")
+
+    def test_oversized_entry_is_not_cached(self, tmp_path: Path) -> None:
+        cache = cache_mod.TextCache()
+        target = tmp_path / "big.py"
+        target.write_text("x" * 10_000)
+
+        cache.load(target, 1024)
+
+        assert cache.contains(target) is False
+
+    def test_zero_budget_disables_cache(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.MCP_FILE_CACHE_MB", 0)
+        target = tmp_path / "a.py"
+        target.write_text("x\n")
+
+        assert load_text(target).text == "x\n"
+        assert cache_mod._TEXT_CACHE.contains(target) is False
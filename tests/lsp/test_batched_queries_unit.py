@@ -0,0 +1,189 @@
+import concurrent.futures
+import threading
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from relace_mcp.lsp import PYTHON_CONFIG, Location, LSPError, SymbolInfo
+from relace_mcp.lsp.client import LSPClient
+from relace_mcp.lsp.io.transport import JsonRpcTransport
+from relace_mcp.search._impl.lsp import (
+    LSPQueryParams,
+    SearchSymbolParams,
+    find_symbol_handler,
+    search_symbol_handler,
+)
+
+
+def _batch_client(
+    tmp_path: Path, answers: dict[int, Any]
+) -> tuple[LSPClient, dict[int, concurrent.futures.Future[Any]], list[int]]:
+    """Client whose requests resolve per column: a list result, an exception, or None (pending)."""
+    (tmp_path / "a.py").write_text("x = foo(bar)\n")
+    client = LSPClient(PYTHON_CONFIG, str(tmp_path), timeout_seconds=0.2)
+    client._initialized = True
+    client._sync_workspace_changes_best_effort = lambda: None  # type: ignore[assignment]
+    client._session._send_notification = lambda method, params: None
+    futures: dict[int, concurrent.futures.Future[Any]] = {}
+    cancelled: list[int] = []
+
+    def start_request(method: str, params: dict[str, Any]) -> tuple[int, Any]:
+        column = params["position"]["character"]
+        future: concurrent.futures.Future[Any] = concurrent.futures.Future()
+        answer = answers[column]
+        if isinstance(answer, Exception):
+            future.set_exception(answer)
+        elif answer is not None:
+            future.set_result(answer)
+        futures[column] = future
+        return column, future
+
+    client._start_request = start_request  # type: ignore[assignment]
+    client._cancel_request = cancelled.append  # type: ignore[assignment]
+    return client, futures, cancelled
+
+
+def _location(tmp_path: Path, line: int) -> dict[str, Any]:
+    return {
+        "uri": (tmp_path / "a.py").as_uri(),
+        "range": {"start": {"line": line, "character": 0}, "end": {"line": line, "character": 1}},
+    }
+
+
+class TestBatchedPositions:
+    def test_first_non_empty_answer_in_column_order(self, tmp_path: Path) -> None:
+        client, futures, cancelled = _batch_client(
+            tmp_path, {0: [], 4: [_location(tmp_path, 3)], 8: None}
+        )
+
+        results = client.definition("a.py", 0, 0, fallback_columns=[4, 8])
+
+        assert [r.line for r in results] == [3]
+        assert set(futures) == {0, 4, 8}
+        # The still-pending request is cancelled.
+        assert cancelled == [8]
+        assert client._inflight == 0
+
+    def test_earlier_column_wins_over_faster_later_one(self, tmp_path: Path) -> None:
+        client, futures, _ = _batch_client(tmp_path, {0: None, 4: [_location(tmp_path, 9)]})
+        timer = threading.Timer(0.05, lambda: futures[0].set_result([_location(tmp_path, 1)]))
+        timer.start()
+
+        results = client.references("a.py", 0, 0, fallback_columns=[4])
+        timer.join()
+
+        assert [r.line for r in results] == [1]
+
+    def test_raises_only_when_every_position_failed(self, tmp_path: Path) -> None:
+        client, _, _ = _batch_client(tmp_path, {0: LSPError("boom"), 4: LSPError("other")})
+        with pytest.raises(LSPError, match="boom"):
+            client.definition("a.py", 0, 0, fallback_columns=[4])
+
+        client, _, _ = _batch_client(tmp_path, {0: LSPError("boom"), 4: []})
+        assert client.definition("a.py", 0, 0, fallback_columns=[4]) == []
+
+        client, _, cancelled = _batch_client(tmp_path, {0: [], 4: None})
+        assert client.definition("a.py", 0, 0, fallback_columns=[4]) == []
+        # Timed-out requests are cancelled too.
+        assert cancelled == [4]
+
+    def test_transport_cancel_request(self) -> None:
+        transport = JsonRpcTransport(
+            lock=threading.RLock(),
+            send_lock=threading.Lock(),
+            stop_event=threading.Event(),
+            on_server_request=MagicMock(),
+            read_chunk_size=1024,
+        )
+        process = MagicMock()
+        req_id, future = transport.start_request(process, "textDocument/definition", {})
+
+        transport.cancel_request(process, req_id)
+
+        assert future.cancelled()
+        assert transport._pending_requests == {}
+        sent = process.stdin.write.call_args_list[-1][0][0]
+        assert b"$/cancelRequest" in sent
+
+
+def _manager_with(clients: dict[str, MagicMock]) -> MagicMock:
+    def session(config: Any, *args: Any, **kwargs: Any) -> MagicMock:
+        mock_session = MagicMock()
+        mock_session.__enter__.return_value = clients[config.language_id]
+        mock_session.__exit__.return_value = False
+        return mock_session
+
+    manager = MagicMock()
+    manager.session.side_effect = session
+    return manager
+
+
+class TestBatchedHandlers:
+    @patch("relace_mcp.lsp.LSPClientManager")
+    def test_find_symbol_sends_line_candidates(
+        self, mock_manager_cls: MagicMock, tmp_path: Path
+    ) -> None:
+        (tmp_path / "a.py").write_text("def foo(bar): pass\n")
+        client = MagicMock()
+        client.definition.return_value = [
+            Location(uri=(tmp_path / "a.py").as_uri(), line=0, character=4)
+        ]
+        mock_manager_cls.get_instance.return_value = _manager_with({"python": client})
+
+        params = LSPQueryParams(action="definition", file="/repo/a.py", line=1, column=1)
+        result = find_symbol_handler(params, str(tmp_path))
+
+        assert "a.py:1:5" in result
+        client.definition.assert_called_once_with("a.py", 0, 0, fallback_columns=[4, 8])
+
+    @patch("relace_mcp.lsp.LSPClientManager")
+    def test_search_symbol_queries_languages_concurrently(
+        self, mock_manager_cls: MagicMock, tmp_path: Path
+    ) -> None:
+        (tmp_path / "a.py").write_text("class Foo: pass\n")
+        (tmp_path / "b.ts").write_text("class Foo {}\n")
+        barrier = threading.Barrier(2, timeout=2)
+
+        def symbols(path: str, line: int) -> Any:
+            def query(_query: str) -> list[SymbolInfo]:
+                barrier.wait()
+                uri = (tmp_path / path).as_uri()
+                return [SymbolInfo(name="Foo", kind=5, uri=uri, line=line, character=6)] * 2
+
+            return query
+
+        python, typescript = MagicMock(), MagicMock()
+        python.workspace_symbols.side_effect = symbols("a.py", 0)
+        typescript.workspace_symbols.side_effect = symbols("b.ts", 0)
+        mock_manager_cls.get_instance.return_value = _manager_with(
+            {"python": python, "typescript": typescript}
+        )
+
+        result = search_symbol_handler(SearchSymbolParams(query="Foo"), str(tmp_path))
+
+        # Both servers were in flight at once; duplicates are merged.
+        lines = result.splitlines()
+        assert len(lines) == 2
+        assert "a.py" in lines[0] and "b.ts" in lines[1]
+
+    @patch("relace_mcp.lsp.LSPClientManager")
+    def test_search_symbol_keeps_partial_results(
+        self, mock_manager_cls: MagicMock, tmp_path: Path
+    ) -> None:
+        (tmp_path / "a.py").write_text("class Foo: pass\n")
+        (tmp_path / "b.ts").write_text("class Foo {}\n")
+        python, typescript = MagicMock(), MagicMock()
+        python.workspace_symbols.side_effect = LSPError("pyright crashed")
+        typescript.workspace_symbols.return_value = [
+            SymbolInfo(name="Foo", kind=5, uri=(tmp_path / "b.ts").as_uri(), line=0, character=6)
+        ]
+        mock_manager_cls.get_instance.return_value = _manager_with(
+            {"python": python, "typescript": typescript}
+        )
+
+        result = search_symbol_handler(SearchSymbolParams(query="Foo"), str(tmp_path))
+
+        assert "b.ts" in result
+        assert "Error" not in result
@@ -0,0 +1,141 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from relace_mcp.lsp import PYTHON_CONFIG
+from relace_mcp.lsp.client import LSPClient
+from relace_mcp.lsp.manager import LSPClientManager
+
+
+def _client(workspace: Path, barrier: threading.Barrier) -> LSPClient:
+    client = LSPClient(PYTHON_CONFIG, str(workspace))
+    client._initialized = True
+    client._sync_workspace_changes_best_effort = lambda: None  # type: ignore[assignment]
+    client._session._send_notification = lambda method, params: None
+
+    def send_request(method: str, params: dict[str, Any], **kwargs: Any) -> list[Any]:
+        barrier.wait()
+        return []
+
+    client._send_request = send_request  # type: ignore[assignment]
+    return client
+
+
+def _run_pair(client: LSPClient) -> list[BaseException]:
+    errors: list[BaseException] = []
+
+    def call() -> None:
+        try:
+            client.definition("a.py", 0, 0)
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return errors
+
+
+class TestPipelinedRequests:
+    def test_requests_overlap_when_pipelined(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_LSP_PIPELINE", True)
+        (tmp_path / "a.py").write_text("x = 1\n")
+        client = _client(tmp_path, threading.Barrier(2, timeout=2))
+
+        assert _run_pair(client) == []
+        # Both requests released the shared document.
+        assert client._session._in_use == {}
+        assert client._inflight == 0
+
+    def test_requests_are_serialized_by_default(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("x = 1\n")
+        client = _client(tmp_path, threading.Barrier(2, timeout=0.3))
+
+        errors = _run_pair(client)
+
+        assert errors and all(isinstance(e, threading.BrokenBarrierError) for e in errors)
+
+
+class TestReplicas:
+    def test_busy_replica_starts_another(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_LSP_REPLICAS", 2)
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_LSP_MAX_CLIENTS", 0)
+        manager = LSPClientManager()
+
+        with patch.object(manager, "_new_client", side_effect=lambda *a: MagicMock()):
+            with manager.session(PYTHON_CONFIG, "/ws") as first:
+                with manager.session(PYTHON_CONFIG, "/ws") as second:
+                    with manager.session(PYTHON_CONFIG, "/ws") as third:
+                        assert first is not second
+                        # Only two replicas: the third lease shares one of them.
+                        assert third in (first, second)
+            with manager.session(PYTHON_CONFIG, "/ws") as again:
+                assert again is first
+
+        assert set(manager._clients) == {("/ws", "python"), ("/ws", "python#1")}
+        manager._cleanup_all()
+
+
+class TestClientStartup:
+    def test_slow_start_does_not_block_other_sessions(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_LSP_MAX_CLIENTS", 0)
+        manager = LSPClientManager()
+        release = threading.Event()
+        starts: list[str] = []
+
+        def new_client(config: Any, workspace: str, timeout: float | None) -> MagicMock:
+            client = MagicMock()
+            if workspace == "/slow":
+                client.start.side_effect = lambda: release.wait(5)
+            starts.append(workspace)
+            return client
+
+        slow_clients: list[Any] = []
+
+        def lease_slow() -> None:
+            with manager.session(PYTHON_CONFIG, "/slow") as client:
+                slow_clients.append(client)
+
+        with patch.object(manager, "_new_client", side_effect=new_client):
+            waiters = [threading.Thread(target=lease_slow) for _ in range(2)]
+            for thread in waiters:
+                thread.start()
+            while ("/slow", "python") not in manager._starting:
+                time.sleep(0.01)
+
+            with manager.session(PYTHON_CONFIG, "/fast") as fast:
+                assert fast is manager._clients[("/fast", "python")]
+            assert ("/slow", "python") not in manager._clients
+
+            release.set()
+            for thread in waiters:
+                thread.join(timeout=5)
+
+        # Both waiters got the one client that was started for the slot.
+        assert starts.count("/slow") == 1
+        assert slow_clients[0] is slow_clients[1]
+        assert manager._starting == {}
+        manager._cleanup_all()
+
+    def test_failed_start_drops_reserved_slot(self) -> None:
+        manager = LSPClientManager()
+        failing = MagicMock()
+        failing.start.side_effect = FileNotFoundError("pyright not installed")
+
+        with patch.object(manager, "_new_client", return_value=failing):
+            with pytest.raises(FileNotFoundError):
+                with manager.session(PYTHON_CONFIG, "/ws"):
+                    pass
+
+        assert manager._starting == {}
+        assert manager._clients == {}
@@ -7,6 +7,7 @@ import pytest
 from relace_mcp.lsp.events import (
     log_lsp_client_created,
     log_lsp_client_evicted,
+    log_lsp_client_prewarmed,
     log_lsp_request_error,
     log_lsp_server_error,
     log_lsp_server_start,
@@ -79,6 +80,13 @@ class TestLSPClientPoolLogging:
         assert payload["pool_size"] == 2
         assert payload["level"] == "info"
 
+    def test_log_lsp_client_prewarmed(self, mock_log_path: Path) -> None:
+        log_lsp_client_prewarmed("python", "/tmp/ws", 1234.5, False)
+        payload = json.loads(mock_log_path.read_text(encoding="utf-8").strip())
+        assert payload["kind"] == "lsp_client_prewarmed"
+        assert payload["latency_ms"] == 1234
+        assert payload["ready"] is False
+
 
 class TestLSPRequestErrorLogging:
     def test_log_lsp_request_error(self, mock_log_path: Path) -> None:
@@ -175,9 +183,7 @@ class TestEvictionNotLoggedOnStartupRollback:
 
         with patch.object(manager, "_new_client", return_value=failing_client):
             with pytest.raises(FileNotFoundError):
-                manager._get_or_create_client_locked(
-                    config, "/workspace", timeout_seconds=10, lease=True
-                )
+                manager._get_or_create_client(config, "/workspace", timeout_seconds=10, lease=True)
 
         # Evicted client should be restored.
         assert existing_key in manager._clients
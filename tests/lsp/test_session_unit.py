@@ -0,0 +1,194 @@
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from relace_mcp.lsp import PYTHON_CONFIG
+from relace_mcp.lsp._session import LSPSession
+from relace_mcp.lsp.types import LSPError
+
+
+def _session(
+    workspace: Path, notifications: list[tuple[str, dict[str, Any]]], max_open: int
+) -> LSPSession:
+    def noop(*_args: Any, **_kwargs: Any) -> None:
+        return None
+
+    return LSPSession(
+        config=PYTHON_CONFIG,
+        workspace=str(workspace),
+        workspace_settings={},
+        send_request_fn=noop,
+        send_notification_fn=lambda method, params: notifications.append((method, params)),
+        send_response_fn=noop,
+        send_error_response_fn=noop,
+        max_open_documents=max_open,
+    )
+
+
+pytestmark = pytest.mark.usefixtures("trust_fresh_files")
+
+
+class TestDocumentCache:
+    def test_unchanged_document_is_reused(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("x = 1\n")
+        sent: list[tuple[str, dict[str, Any]]] = []
+        session = _session(tmp_path, sent, max_open=4)
+
+        uri = session.open_file("a.py")
+        session.release_file(uri)
+        assert session.open_file("a.py") == uri
+        session.release_file(uri)
+
+        assert [method for method, _ in sent] == ["textDocument/didOpen"]
+
+    def test_same_tick_edit_is_resent(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.utils.RACY_WINDOW_NS", 10**18)
+        target = tmp_path / "a.py"
+        target.write_text("x = 1\n")
+        sent: list[tuple[str, dict[str, Any]]] = []
+        session = _session(tmp_path, sent, max_open=4)
+
+        session.release_file(session.open_file("a.py"))
+        # Same size and the original mtime: only the racy window catches this.
+        st = target.stat()
+        target.write_text("x = 2\n")
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+        session.release_file(session.open_file("a.py"))
+
+        method, params = sent[-1]
+        assert method == "textDocument/didChange"
+        assert params["contentChanges"] == [{"text": "x = 2\n"}]
+
+    def test_changed_document_sends_did_change(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.py"
+        target.write_text("x = 1\n")
+        sent: list[tuple[str, dict[str, Any]]] = []
+        session = _session(tmp_path, sent, max_open=4)
+
+        session.open_file("a.py")
+        target.write_text("x = 22\n")
+        os.utime(target, ns=(1, 1))
+        session.open_file("a.py")
+
+        method, params = sent[-1]
+        assert method == "textDocument/didChange"
+        assert params["textDocument"]["version"] == 2
+        assert params["contentChanges"] == [{"text": "x = 22\n"}]
+
+    def test_lru_eviction_closes_document(self, tmp_path: Path) -> None:
+        for name in ("a.py", "b.py", "c.py"):
+            (tmp_path / name).write_text("x = 1\n")
+        sent: list[tuple[str, dict[str, Any]]] = []
+        session = _session(tmp_path, sent, max_open=2)
+
+        for name in ("a.py", "b.py", "a.py", "c.py"):
+            session.release_file(session.open_file(name))
+        a_uri = (tmp_path / "a.py").resolve().as_uri()
+        b_uri = (tmp_path / "b.py").resolve().as_uri()
+
+        assert sent[-1] == ("textDocument/didClose", {"textDocument": {"uri": b_uri}})
+        assert a_uri in session._documents
+
+    def test_deleted_document_is_closed(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.py"
+        target.write_text("x = 1\n")
+        sent: list[tuple[str, dict[str, Any]]] = []
+        session = _session(tmp_path, sent, max_open=4)
+
+        uri = session.open_file("a.py")
+        session.release_file(uri)
+        target.unlink()
+
+        with pytest.raises(LSPError):
+            session.open_file("a.py")
+        assert sent[-1] == ("textDocument/didClose", {"textDocument": {"uri": uri}})
+
+    def test_cache_disabled_closes_after_each_request(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("x = 1\n")
+        sent: list[tuple[str, dict[str, Any]]] = []
+        session = _session(tmp_path, sent, max_open=0)
+
+        for _ in range(2):
+            session.release_file(session.open_file("a.py"))
+
+        assert [method for method, _ in sent] == [
+            "textDocument/didOpen",
+            "textDocument/didClose",
+        ] * 2
+
+    def test_documents_in_use_are_not_closed(self, tmp_path: Path) -> None:
+        for name in ("a.py", "b.py"):
+            (tmp_path / name).write_text("x = 1\n")
+        sent: list[tuple[str, dict[str, Any]]] = []
+        session = _session(tmp_path, sent, max_open=1)
+
+        a_uri = session.open_file("a.py")
+        b_uri = session.open_file("b.py")
+        # a.py is still used by an in-flight request, so it cannot be evicted yet.
+        assert set(session._documents) == {a_uri, b_uri}
+
+        session.release_file(a_uri)
+        assert sent[-1] == ("textDocument/didClose", {"textDocument": {"uri": a_uri}})
+        session.release_file(b_uri)
+        assert list(session._documents) == [b_uri]
+
+
+class TestWorkspaceChanges:
+    def test_edited_open_document_is_resent(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from relace_mcp.lsp import client as client_mod
+        from relace_mcp.lsp.client import LSPClient
+
+        monkeypatch.setattr(client_mod, "_FS_SYNC_MIN_INTERVAL_SECONDS", 0.0)
+        for name in ("a.py", "b.py", "c.py"):
+            (tmp_path / name).write_text("x = 1\n")
+        sent: list[tuple[str, dict[str, Any]]] = []
+        client = LSPClient(PYTHON_CONFIG, str(tmp_path))
+        client._initialized = True
+        client._send_notification = lambda method, params: sent.append((method, params))  # type: ignore[assignment]
+        client._session = client._build_session()
+
+        client._sync_workspace_changes()
+        uris = {}
+        for name in ("a.py", "b.py", "c.py"):
+            uris[name] = client._session.open_file(name)
+            client._session.release_file(uris[name])
+        # Edited and deleted while open between requests, not by the queried file.
+        (tmp_path / "b.py").write_text("x = 22\n")
+        os.utime(tmp_path / "b.py", ns=(1, 1))
+        (tmp_path / "c.py").unlink()
+        sent.clear()
+        client._sync_workspace_changes()
+
+        assert sent[0][0] == "workspace/didChangeWatchedFiles"
+        assert sent[1:] == [
+            (
+                "textDocument/didChange",
+                {
+                    "textDocument": {"uri": uris["b.py"], "version": 2},
+                    "contentChanges": [{"text": "x = 22\n"}],
+                },
+            ),
+            ("textDocument/didClose", {"textDocument": {"uri": uris["c.py"]}}),
+        ]
+        assert list(client._session._documents) == [uris["a.py"], uris["b.py"]]
+
+    def test_deleted_document_in_use_is_closed_on_release(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.py"
+        target.write_text("x = 1\n")
+        sent: list[tuple[str, dict[str, Any]]] = []
+        session = _session(tmp_path, sent, max_open=4)
+
+        uri = session.open_file("a.py")
+        target.unlink()
+        session.apply_workspace_changes([{"uri": target.absolute().as_uri(), "type": 3}])
+        assert sent[-1][0] == "textDocument/didOpen"
+
+        session.release_file(uri)
+        assert sent[-1] == ("textDocument/didClose", {"textDocument": {"uri": uri}})
+        assert not session._documents
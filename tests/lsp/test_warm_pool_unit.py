@@ -0,0 +1,169 @@
+import threading
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from relace_mcp.lsp import PYTHON_CONFIG
+from relace_mcp.lsp._session import LSPSession
+from relace_mcp.lsp.client import LSPClient
+from relace_mcp.lsp.io.transport import JsonRpcTransport
+from relace_mcp.lsp.languages import LANGUAGE_CONFIGS
+from relace_mcp.lsp.manager import LSPClientManager
+
+
+def _session(tmp_path: Path) -> LSPSession:
+    return LSPSession(
+        config=PYTHON_CONFIG,
+        workspace=str(tmp_path),
+        workspace_settings={},
+        send_request_fn=MagicMock(),
+        send_notification_fn=MagicMock(),
+        send_response_fn=MagicMock(),
+        send_error_response_fn=MagicMock(),
+    )
+
+
+def _progress(token: Any, kind: str) -> dict[str, Any]:
+    return {"token": token, "value": {"kind": kind}}
+
+
+class TestReadiness:
+    def test_ready_without_progress(self, tmp_path: Path) -> None:
+        assert _session(tmp_path).wait_until_ready(0) is True
+
+    def test_created_token_blocks_until_end(self, tmp_path: Path) -> None:
+        session = _session(tmp_path)
+        session.handle_server_request(1, "window/workDoneProgress/create", {"token": "idx"})
+        session._send_response.assert_called_once_with(1, None)  # type: ignore[attr-defined]
+        session.handle_server_notification("$/progress", _progress("idx", "begin"))
+        session.handle_server_notification("$/progress", _progress("idx", "report"))
+
+        assert session.wait_until_ready(0) is False
+
+        timer = threading.Timer(
+            0.05, session.handle_server_notification, ("$/progress", _progress("idx", "end"))
+        )
+        timer.start()
+        assert session.wait_until_ready(2) is True
+        timer.join()
+
+    def test_transport_forwards_notifications(self) -> None:
+        received: list[tuple[str, Any]] = []
+        transport = JsonRpcTransport(
+            lock=threading.RLock(),
+            send_lock=threading.Lock(),
+            stop_event=threading.Event(),
+            on_server_request=MagicMock(),
+            read_chunk_size=1024,
+            on_server_notification=lambda method, params: received.append((method, params)),
+        )
+
+        transport.handle_message({"method": "$/progress", "params": _progress(1, "begin")})
+        transport.handle_message({"method": "window/logMessage", "params": {"message": "hi"}})
+
+        assert received == [("$/progress", _progress(1, "begin"))]
+
+    def test_request_waits_for_indexing(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_LSP_READY_TIMEOUT_SECONDS", 5)
+        client = LSPClient(PYTHON_CONFIG, str(tmp_path))
+        client._initialized = True
+        client._sync_workspace_changes_best_effort = lambda: None  # type: ignore[assignment]
+        client._on_server_notification("$/progress", _progress("idx", "begin"))
+        finished = threading.Event()
+
+        def send_request(method: str, params: dict[str, Any], **kwargs: Any) -> list[Any]:
+            assert finished.is_set()
+            return []
+
+        client._send_request = send_request  # type: ignore[assignment]
+
+        def finish() -> None:
+            finished.set()
+            client._on_server_notification("$/progress", _progress("idx", "end"))
+
+        timer = threading.Timer(0.05, finish)
+        timer.start()
+        assert client.workspace_symbols("x") == []
+        timer.join()
+
+
+class TestIdleTTL:
+    def test_reaps_only_idle_unleased_clients(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_LSP_IDLE_TTL_SECONDS", 60)
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_LSP_MAX_CLIENTS", 0)
+        manager = LSPClientManager()
+        manager._reaper_stop.set()
+        now = [1000.0]
+        monkeypatch.setattr("relace_mcp.lsp.manager.time.monotonic", lambda: now[0])
+
+        with patch.object(manager, "_new_client", side_effect=lambda *a: MagicMock()):
+            idle = manager.get_client(PYTHON_CONFIG, "/idle")
+            with manager.session(PYTHON_CONFIG, "/busy") as busy:
+                now[0] += 61
+                assert manager.reap_idle_clients() == 1
+                idle.shutdown.assert_called_once()
+                busy.shutdown.assert_not_called()
+            # Releasing the lease restarts the idle clock.
+            assert manager.reap_idle_clients() == 0
+            now[0] += 61
+            assert manager.reap_idle_clients() == 1
+        assert manager._clients == {}
+
+    def test_disabled_by_default(self) -> None:
+        manager = LSPClientManager()
+        with patch.object(manager, "_new_client", side_effect=lambda *a: MagicMock()):
+            manager.get_client(PYTHON_CONFIG, "/ws")
+
+        assert manager.reap_idle_clients() == 0
+        assert manager._reaper is None
+
+
+class TestPrewarm:
+    def test_starts_detected_languages(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_LSP_MAX_CLIENTS", 1)
+        monkeypatch.setattr(
+            "relace_mcp.lsp.languages.get_lsp_languages",
+            lambda base: frozenset({"python", "go"}),
+        )
+        monkeypatch.setattr(
+            "relace_mcp.lsp.languages.detect_available_lsp_servers",
+            lambda: frozenset({"python", "go", "rust"}),
+        )
+        manager = LSPClientManager()
+        started: list[str] = []
+
+        def new_client(config: Any, workspace: str, timeout: float | None) -> MagicMock:
+            started.append(config.language_id)
+            client = MagicMock()
+            client.wait_until_ready.return_value = True
+            return client
+
+        with patch.object(manager, "_new_client", side_effect=new_client):
+            manager.prewarm(str(tmp_path), timeout_seconds=3.0).join(timeout=5)
+            # Limited to SEARCH_LSP_MAX_CLIENTS, in sorted order.
+            assert started == ["go"]
+            # The prewarmed client is what the first session gets.
+            with manager.session(LANGUAGE_CONFIGS["go"], str(tmp_path)) as client:
+                client.wait_until_ready.assert_called_once()
+
+        assert started == ["go"]
+
+    def test_failures_are_skipped(self, tmp_path: Path) -> None:
+        manager = LSPClientManager()
+        ok = MagicMock()
+
+        def new_client(config: Any, workspace: str, timeout: float | None) -> MagicMock:
+            if config.language_id == "go":
+                raise RuntimeError("gopls not installed")
+            return ok
+
+        with patch.object(manager, "_new_client", side_effect=new_client):
+            manager.prewarm(str(tmp_path), ["go", "python"]).join(timeout=5)
+
+        assert list(manager._clients.values()) == [ok]
@@ -0,0 +1,194 @@
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from relace_mcp.lsp import PYTHON_CONFIG
+from relace_mcp.lsp.workspace import (
+    InotifyWorkspaceWatcher,
+    WorkspaceFileFilter,
+    WorkspaceSyncState,
+    flush_workspace_changes,
+    inotify_available,
+)
+
+requires_inotify = pytest.mark.skipif(not inotify_available(), reason="inotify not available")
+
+
+def _filter(root: Path) -> WorkspaceFileFilter:
+    return WorkspaceFileFilter.build(
+        workspace=str(root),
+        workspace_settings={},
+        config_files=PYTHON_CONFIG.config_files,
+        file_extensions=PYTHON_CONFIG.file_extensions,
+        ignored_dir_names=frozenset({"node_modules"}),
+    )
+
+
+def _state(root: Path, *rel_paths: str) -> WorkspaceSyncState:
+    snapshot = {}
+    for rel in rel_paths:
+        st = (root / rel).stat()
+        snapshot[rel] = (st.st_mtime_ns, st.st_size)
+    return WorkspaceSyncState(snapshot=snapshot, snapshot_initialized=True, last_sync=0.0)
+
+
+def _wait_for(predicate: Any, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.02)
+    raise AssertionError("condition not met in time")
+
+
+class TestFlushWorkspaceChanges:
+    def test_reports_only_changed_paths(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("a = 1\n")
+        (tmp_path / "b.py").write_text("b = 1\n")
+        state = _state(tmp_path, "a.py", "b.py")
+        (tmp_path / "a.py").write_text("a = 22\n")
+        (tmp_path / "b.py").unlink()
+        (tmp_path / "c.py").write_text("c = 1\n")
+        (tmp_path / "notes.txt").write_text("ignored\n")
+
+        outcome = flush_workspace_changes(
+            file_filter=_filter(tmp_path),
+            state=state,
+            changed_paths={"a.py", "b.py", "c.py", "notes.txt"},
+            changed_dirs=set(),
+            max_events=100,
+        )
+
+        changes = {c["uri"].rsplit("/", 1)[-1]: c["type"] for c in outcome.changes}
+        assert changes == {"a.py": 2, "b.py": 3, "c.py": 1}
+        assert set(outcome.state.snapshot) == {"a.py", "c.py"}
+
+    def test_removed_directory_deletes_tracked_files(self, tmp_path: Path) -> None:
+        pkg = tmp_path / "pkg"
+        pkg.mkdir()
+        (pkg / "mod.py").write_text("x = 1\n")
+        state = _state(tmp_path, "pkg/mod.py")
+        (pkg / "mod.py").unlink()
+        pkg.rmdir()
+
+        outcome = flush_workspace_changes(
+            file_filter=_filter(tmp_path),
+            state=state,
+            changed_paths=set(),
+            changed_dirs={"pkg"},
+            max_events=100,
+        )
+
+        assert [c["type"] for c in outcome.changes] == [3]
+        assert outcome.state.snapshot == {}
+
+    def test_skipped_directories_are_ignored(self, tmp_path: Path) -> None:
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "x.py").write_text("x = 1\n")
+
+        outcome = flush_workspace_changes(
+            file_filter=_filter(tmp_path),
+            state=_state(tmp_path),
+            changed_paths={"node_modules/x.py"},
+            changed_dirs={"node_modules"},
+            max_events=100,
+        )
+
+        assert outcome.changes == []
+
+    def test_config_change_requests_restart(self, tmp_path: Path) -> None:
+        (tmp_path / "pyproject.toml").write_text("[project]\n")
+        state = _state(tmp_path, "pyproject.toml")
+        (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
+
+        outcome = flush_workspace_changes(
+            file_filter=_filter(tmp_path),
+            state=state,
+            changed_paths={"pyproject.toml"},
+            changed_dirs=set(),
+            max_events=100,
+        )
+
+        assert outcome.restart_reason == "Workspace configuration changed"
+
+
+@requires_inotify
+class TestInotifyWorkspaceWatcher:
+    def test_collects_file_and_directory_events(self, tmp_path: Path) -> None:
+        (tmp_path / "node_modules").mkdir()
+        watcher = InotifyWorkspaceWatcher(_filter(tmp_path), max_watches=100)
+        watcher.start()
+        try:
+            (tmp_path / "a.py").write_text("a = 1\n")
+            (tmp_path / "node_modules" / "skip.py").write_text("x = 1\n")
+            (tmp_path / "pkg").mkdir()
+            # Files in a directory created after start are watched too.
+            _wait_for(lambda: "pkg" in watcher._wds.values())
+            (tmp_path / "pkg" / "mod.py").write_text("m = 1\n")
+
+            seen_paths: set[str] = set()
+            seen_dirs: set[str] = set()
+
+            def collect() -> bool:
+                paths, dirs = watcher.drain()
+                seen_paths.update(paths)
+                seen_dirs.update(dirs)
+                return {"a.py", "pkg/mod.py"} <= seen_paths
+
+            _wait_for(collect)
+        finally:
+            watcher.close()
+
+        assert "pkg" in seen_dirs
+        assert not any(p.startswith("node_modules") for p in seen_paths)
+
+    def test_watch_limit_raises(self, tmp_path: Path) -> None:
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        watcher = InotifyWorkspaceWatcher(_filter(tmp_path), max_watches=2)
+
+        with pytest.raises(OSError):
+            watcher.start()
+
+
+@requires_inotify
+class TestLSPClientWatchedSync:
+    def test_watcher_replaces_rescans(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from relace_mcp.lsp import client as client_mod
+        from relace_mcp.lsp.client import LSPClient
+
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_LSP_FS_WATCH", True)
+        scans: list[int] = []
+        original_scan = client_mod.sync_workspace_changes
+
+        def counting_scan(**kwargs: Any) -> Any:
+            scans.append(1)
+            return original_scan(**kwargs)
+
+        monkeypatch.setattr(client_mod, "sync_workspace_changes", counting_scan)
+        (tmp_path / "a.py").write_text("a = 1\n")
+        client = LSPClient(PYTHON_CONFIG, str(tmp_path))
+        client._initialized = True
+        sent: list[tuple[str, dict[str, Any]]] = []
+        client._send_notification = lambda method, params: sent.append((method, params))  # type: ignore[assignment]
+
+        try:
+            client._sync_workspace_changes()
+            assert "a.py" in client._fs_sync_state.snapshot
+            (tmp_path / "b.py").write_text("b = 1\n")
+            _wait_for(lambda: "b.py" in client._fs_watcher._changed_paths)  # type: ignore[union-attr]
+            client._sync_workspace_changes()
+        finally:
+            client._stop_fs_watcher()
+
+        assert len(scans) == 1
+        assert sent == [
+            (
+                "workspace/didChangeWatchedFiles",
+                {"changes": [{"uri": (tmp_path / "b.py").absolute().as_uri(), "type": 1}]},
+            )
+        ]
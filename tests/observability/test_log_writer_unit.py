@@ -0,0 +1,102 @@
+import json
+import queue
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from relace_mcp.observability import writer as writer_mod
+from relace_mcp.observability.events import flush_event_log, log_event
+from relace_mcp.observability.traces import flush_trace_log, log_trace_event
+from relace_mcp.observability.writer import BufferedJsonlWriter, encode_line
+
+
+def _lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestBufferedLogging:
+    def test_events_and_traces_written_in_background(
+        self, tmp_path: Path, mock_log_path: Path
+    ) -> None:
+        trace_path = tmp_path / "relace.trace.jsonl"
+        with (
+            patch("relace_mcp.config.settings.MCP_LOG_ASYNC", True),
+            patch("relace_mcp.config.settings.MCP_TRACE_LOGGING", True),
+            patch("relace_mcp.config.settings.TRACE_PATH", trace_path),
+        ):
+            log_event({"kind": "first", "level": "info"})
+            log_event({"kind": "second", "level": "info"})
+            log_trace_event({"kind": "llm_request", "trace_id": "t1"})
+            assert flush_event_log()
+            assert flush_trace_log()
+
+        assert [e["kind"] for e in _lines(mock_log_path)] == ["first", "second"]
+        assert _lines(trace_path)[0]["trace_id"] == "t1"
+        assert mock_log_path.stat().st_mode & 0o777 == 0o600
+
+    def test_switches_file_when_path_changes(self, tmp_path: Path) -> None:
+        writer = BufferedJsonlWriter("test", max_rotated=5)
+        first, second = tmp_path / "a.log", tmp_path / "b.log"
+
+        writer.submit(first, 1 << 20, encode_line({"kind": "a"}))
+        writer.submit(second, 1 << 20, encode_line({"kind": "b"}))
+        assert writer.flush()
+
+        assert _lines(first) == [{"kind": "a"}]
+        assert _lines(second) == [{"kind": "b"}]
+        assert writer.stats()["written"] == 2
+
+
+class TestRotation:
+    def test_rotates_by_byte_count(self, tmp_path: Path) -> None:
+        writer = BufferedJsonlWriter("test", max_rotated=2)
+        path = tmp_path / "app.log"
+        line = encode_line({"kind": "x" * 20})
+
+        for _ in range(6):
+            writer.submit(path, len(line) - 1, line)
+        assert writer.flush()
+
+        rotated = sorted(tmp_path.glob("app.*.log"))
+        # Same-second rotations share a name; older rotated files are pruned.
+        assert 1 <= len(rotated) <= 2
+        assert path.read_bytes() == line
+
+    def test_reopens_file_removed_externally(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(writer_mod, "_FSYNC_INTERVAL_SECONDS", 0.0)
+        writer = BufferedJsonlWriter("test", max_rotated=2)
+        path = tmp_path / "app.log"
+
+        writer.submit(path, 1 << 20, encode_line({"kind": "before"}))
+        assert writer.flush()
+        path.unlink()
+        writer.submit(path, 1 << 20, encode_line({"kind": "flushed"}))
+        assert writer.flush()
+        writer.submit(path, 1 << 20, encode_line({"kind": "after"}))
+        assert writer.flush()
+
+        assert {"kind": "after"} in _lines(path)
+
+
+class TestBackpressure:
+    def test_full_queue_drops_and_reports(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(writer_mod, "_PUT_TIMEOUT_SECONDS", 0.0)
+        writer = BufferedJsonlWriter("test", max_rotated=2)
+        writer._queue = queue.Queue(1)
+        path = tmp_path / "app.log"
+
+        with patch.object(writer, "_ensure_started"):
+            assert writer.submit(path, 1 << 20, encode_line({"kind": "kept"}))
+            assert not writer.submit(path, 1 << 20, encode_line({"kind": "lost"}))
+        writer._ensure_started()
+        assert writer.flush()
+
+        events = _lines(path)
+        assert [e["kind"] for e in events] == ["log_writer_dropped", "kept"]
+        assert events[0]["dropped"] == 1
+        assert writer.stats()["dropped"] == 1
@@ -0,0 +1,210 @@
+import gzip
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from relace_mcp.observability import segments as segments_mod
+from relace_mcp.observability.segments import (
+    TraceSegmentStore,
+    iter_trace_events,
+    read_trace,
+)
+from relace_mcp.observability.traces import flush_trace_log, log_trace_event
+from relace_mcp.observability.writer import encode_line
+
+
+def _request(trace_id: str, ts: str, messages: list[dict]) -> bytes:
+    return encode_line(
+        {"kind": "llm_request", "trace_id": trace_id, "timestamp": ts, "messages": messages}
+    )
+
+
+def _indexes(directory: Path) -> list[Path]:
+    return sorted(directory.glob("relace.trace.*.seg.idx"))
+
+
+class TestTraceSegmentStore:
+    def test_dedupes_repeated_messages_and_reads_back(self, tmp_path: Path) -> None:
+        trace_path = tmp_path / "relace.trace.jsonl"
+        store = TraceSegmentStore(
+            tmp_path, "relace.trace", max_segment_bytes=1 << 20, max_segments=5
+        )
+        system = {"role": "system", "content": "x" * 2000}
+        user = {"role": "user", "content": "find foo"}
+        reply = {"role": "assistant", "content": "looking"}
+
+        store.append([_request("t1", "2026-01-01T00:00:00+00:00", [system, user])])
+        store.append([_request("t2", "2026-01-01T00:00:01+00:00", [system])])
+        store.append([_request("t1", "2026-01-01T00:00:02+00:00", [system, user, reply])])
+        store.close()
+
+        segment = next(tmp_path.glob("*.seg.gz"))
+        raw = [json.loads(line) for line in gzip.decompress(segment.read_bytes()).splitlines()]
+        # The second turn of t1 stores only the new message inline.
+        assert ["value" in m for m in raw[2]["messages"]] == [False, False, True]
+        # Deduplication is per trace.
+        assert "value" in raw[1]["messages"][0]
+
+        events = read_trace(trace_path, "t1")
+        assert [e["messages"] for e in events] == [[system, user], [system, user, reply]]
+        assert read_trace(trace_path, "missing") == []
+
+    def test_index_records_members(self, tmp_path: Path) -> None:
+        store = TraceSegmentStore(
+            tmp_path, "relace.trace", max_segment_bytes=1 << 20, max_segments=5
+        )
+        store.append(
+            [
+                _request("t1", "2026-01-01T00:00:00+00:00", []),
+                encode_line(
+                    {
+                        "kind": "llm_response",
+                        "trace_id": "t1",
+                        "timestamp": "2026-01-01T00:00:05+00:00",
+                    }
+                ),
+            ]
+        )
+        store.append([_request("t2", "2026-01-01T00:01:00+00:00", [])])
+        store.close()
+
+        (index,) = _indexes(tmp_path)
+        entries = [json.loads(line) for line in index.read_text().splitlines()]
+        assert entries[0]["kinds"] == {"llm_request": 1, "llm_response": 1}
+        assert entries[0]["first_ts"] == "2026-01-01T00:00:00+00:00"
+        assert entries[0]["last_ts"] == "2026-01-01T00:00:05+00:00"
+        assert entries[1]["offset"] == entries[0]["length"]
+        assert entries[1]["trace_ids"] == ["t2"]
+
+    def test_reader_skips_members_outside_filter(self, tmp_path: Path) -> None:
+        trace_path = tmp_path / "relace.trace.jsonl"
+        store = TraceSegmentStore(
+            tmp_path, "relace.trace", max_segment_bytes=1 << 20, max_segments=5
+        )
+        store.append([_request("t1", "2026-01-01T00:00:00+00:00", [])])
+        store.append([_request("t2", "2026-01-02T00:00:00+00:00", [])])
+        store.close()
+
+        with patch.object(segments_mod, "_read_member", wraps=segments_mod._read_member) as read:
+            events = list(
+                iter_trace_events(trace_path, time_start=datetime(2026, 1, 1, 12, tzinfo=UTC))
+            )
+        assert [e["trace_id"] for e in events] == ["t2"]
+        assert read.call_count == 1
+
+    def test_rolls_and_prunes_segments(self, tmp_path: Path) -> None:
+        store = TraceSegmentStore(tmp_path, "relace.trace", max_segment_bytes=1, max_segments=2)
+        for i in range(4):
+            store.append([_request(f"t{i}", f"2026-01-01T00:00:0{i}+00:00", [])])
+        store.close()
+
+        assert len(_indexes(tmp_path)) == 2
+        assert len(list(tmp_path.glob("*.seg.gz"))) == 2
+        events = list(iter_trace_events(tmp_path / "relace.trace.jsonl"))
+        assert [e["trace_id"] for e in events] == ["t2", "t3"]
+
+    def test_resumes_newest_segment(self, tmp_path: Path) -> None:
+        for trace_id in ("t1", "t2"):
+            store = TraceSegmentStore(
+                tmp_path, "relace.trace", max_segment_bytes=1 << 20, max_segments=5
+            )
+            store.append([_request(trace_id, "2026-01-01T00:00:00+00:00", [])])
+            store.close()
+
+        assert len(_indexes(tmp_path)) == 1
+        events = list(iter_trace_events(tmp_path / "relace.trace.jsonl"))
+        assert [e["trace_id"] for e in events] == ["t1", "t2"]
+
+    def test_time_range_read_resolves_blobs_from_earlier_members(self, tmp_path: Path) -> None:
+        trace_path = tmp_path / "relace.trace.jsonl"
+        store = TraceSegmentStore(tmp_path, "relace.trace", max_segment_bytes=1, max_segments=5)
+        system = {"role": "system", "content": "x" * 200}
+        user = {"role": "user", "content": "find foo"}
+        store.append([_request("t1", "2026-01-01T00:00:00+00:00", [system])])
+        store.append([_request("t2", "2026-01-01T00:00:01+00:00", [user])])
+        store.append([_request("t1", "2026-01-02T00:00:00+00:00", [system, user])])
+        store.close()
+
+        with patch.object(segments_mod, "_read_member", wraps=segments_mod._read_member) as read:
+            events = list(
+                iter_trace_events(trace_path, time_start=datetime(2026, 1, 1, 12, tzinfo=UTC))
+            )
+
+        assert [e["messages"] for e in events] == [[system, user]]
+        # The t2 member before the range is never decompressed.
+        assert read.call_count == 2
+
+    def test_unresolvable_blob_is_marked(self, tmp_path: Path) -> None:
+        system = {"role": "system", "content": "x" * 200}
+        store = TraceSegmentStore(tmp_path, "relace.trace", max_segment_bytes=1, max_segments=1)
+        store.append([_request("t1", "2026-01-01T00:00:00+00:00", [system])])
+        store.append([_request("t1", "2026-01-01T00:00:01+00:00", [system])])
+        store.close()
+
+        (event,) = read_trace(tmp_path / "relace.trace.jsonl", "t1")
+        (message,) = event["messages"]
+        assert message["unresolved"] is True
+        assert message["$blob"] == segments_mod._message_hash(system)
+
+    def test_writers_in_separate_processes_do_not_share_segments(self, tmp_path: Path) -> None:
+        trace_path = tmp_path / "relace.trace.jsonl"
+        stores = []
+        for pid in (1001, 1002):
+            with patch.object(segments_mod.os, "getpid", return_value=pid):
+                stores.append(
+                    TraceSegmentStore(
+                        tmp_path, "relace.trace", max_segment_bytes=1 << 20, max_segments=5
+                    )
+                )
+        a, b = stores
+        a.append([_request("ta", "2026-01-01T00:00:00+00:00", [{"n": 1}])])
+        b.append([_request("tb", "2026-01-01T00:00:01+00:00", [{"n": 1}])])
+        a.append([_request("ta", "2026-01-01T00:00:02+00:00", [{"n": 2}])])
+        b.append([_request("tb", "2026-01-01T00:00:03+00:00", [{"n": 2}])])
+        a.close()
+        b.close()
+
+        assert len(_indexes(tmp_path)) == 2
+        for trace_id in ("ta", "tb"):
+            events = read_trace(trace_path, trace_id)
+            assert [e["messages"] for e in events] == [[{"n": 1}], [{"n": 2}]]
+
+    def test_segment_pruned_by_another_process_is_replaced(self, tmp_path: Path) -> None:
+        stores = []
+        for pid in (1001, 1002):
+            with patch.object(segments_mod.os, "getpid", return_value=pid):
+                stores.append(
+                    TraceSegmentStore(
+                        tmp_path, "relace.trace", max_segment_bytes=1 << 20, max_segments=1
+                    )
+                )
+        a, b = stores
+        a.append([_request("ta", "2026-01-01T00:00:00+00:00", [])])
+        # b's first segment pushes a's out of the retention limit.
+        b.append([_request("tb", "2026-01-01T00:00:01+00:00", [])])
+        a.append([_request("ta", "2026-01-01T00:00:02+00:00", [])])
+        a.close()
+        b.close()
+
+        events = list(iter_trace_events(tmp_path / "relace.trace.jsonl"))
+        assert [e["timestamp"] for e in events] == ["2026-01-01T00:00:02+00:00"]
+
+
+class TestSegmentedTraceLogging:
+    def test_log_trace_event_writes_segments(self, tmp_path: Path) -> None:
+        trace_path = tmp_path / "relace.trace.jsonl"
+        messages = [{"role": "user", "content": "hi"}]
+        for log_async in (False, True):
+            with (
+                patch("relace_mcp.config.settings.MCP_LOG_ASYNC", log_async),
+                patch("relace_mcp.config.settings.MCP_TRACE_LOGGING", True),
+                patch("relace_mcp.config.settings.MCP_TRACE_SEGMENTS", True),
+                patch("relace_mcp.config.settings.TRACE_PATH", trace_path),
+            ):
+                log_trace_event({"kind": "llm_request", "trace_id": "t1", "messages": messages})
+                assert flush_trace_log()
+
+        assert not trace_path.exists()
+        events = read_trace(trace_path, "t1")
+        assert [e["messages"] for e in events] == [messages, messages]
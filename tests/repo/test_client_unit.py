@@ -1,6 +1,9 @@
+import asyncio
+import json
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from relace_mcp.clients.exceptions import RelaceAPIError
@@ -459,3 +462,133 @@ class TestRelaceRepoClientDeleteRepo:
 
         # Cached ID should remain unchanged on failure
         assert repo_client._cached_repo_ids["test-repo"] == "test-repo-id"
+
+
+class TestRelaceRepoClientConnectionPool:
+    """Test pooled HTTP client reuse."""
+
+    @staticmethod
+    def _ok_response() -> MagicMock:
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.is_success = True
+        mock_resp.json.return_value = {"items": []}
+        return mock_resp
+
+    def test_reuses_one_client_across_requests(self, repo_client: RelaceRepoClient) -> None:
+        """Should open the pooled client once and pass per-request timeouts."""
+        with patch("relace_mcp.clients.repo.httpx.Client") as mock_client_class:
+            mock_instance = MagicMock()
+            mock_instance.is_closed = False
+            mock_instance.request = MagicMock(return_value=self._ok_response())
+            mock_client_class.return_value = mock_instance
+
+            repo_client.list_repos()
+            repo_client.retrieve("repo-id", "query")
+            repo_client.update_repo("repo-id", [])
+
+        assert mock_client_class.call_count == 1
+        assert mock_instance.request.call_count == 3
+        assert mock_instance.request.call_args_list[0].kwargs["timeout"] == 60.0
+
+    def test_close_recreates_client_on_next_use(self, repo_client: RelaceRepoClient) -> None:
+        """Should rebuild the pool after close()."""
+        with patch("relace_mcp.clients.repo.httpx.Client") as mock_client_class:
+            mock_instance = MagicMock()
+            mock_instance.is_closed = False
+            mock_instance.request = MagicMock(return_value=self._ok_response())
+            mock_client_class.return_value = mock_instance
+
+            repo_client.list_repos()
+            repo_client.close()
+            repo_client.list_repos()
+
+        mock_instance.close.assert_called_once()
+        assert mock_client_class.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_aretrieve_uses_pooled_async_client(self, repo_client: RelaceRepoClient) -> None:
+        """Should send retrieve over one async client and reuse it."""
+        seen: list[dict[str, object]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(json.loads(request.content))
+            return httpx.Response(200, json={"results": [{"filename": "a.py"}]})
+
+        created: list[httpx.AsyncClient] = []
+        real_async_client = httpx.AsyncClient
+
+        def make_client(**kwargs: object) -> httpx.AsyncClient:
+            client = real_async_client(transport=httpx.MockTransport(handler))
+            created.append(client)
+            return client
+
+        with patch("relace_mcp.clients.repo.httpx.AsyncClient", side_effect=make_client):
+            first = await repo_client.aretrieve("repo-id", "auth", hash="abc")
+            await repo_client.aretrieve("repo-id", "login")
+            await repo_client.aclose()
+
+        assert first["results"] == [{"filename": "a.py"}]
+        assert len(created) == 1
+        assert created[0].is_closed
+        assert seen[0]["hash"] == "abc"
+        assert "hash" not in seen[1]
+
+    def test_async_client_replaced_on_new_loop_is_closed(
+        self, repo_client: RelaceRepoClient
+    ) -> None:
+        """Should close the pool of a previous event loop instead of leaking it."""
+
+        async def get_client() -> httpx.AsyncClient:
+            return repo_client._get_async_client()
+
+        first = asyncio.run(get_client())
+
+        async def replace() -> httpx.AsyncClient:
+            client = repo_client._get_async_client()
+            await asyncio.gather(*repo_client._closing_tasks)
+            return client
+
+        second = asyncio.run(replace())
+
+        assert second is not first
+        assert first.is_closed
+        assert not second.is_closed
+
+    @pytest.mark.asyncio
+    async def test_tool_clients_aclose(self, mock_config: RelaceConfig) -> None:
+        """Should close the repo client's pools only if it was created."""
+        from relace_mcp.tools import ToolClients
+
+        clients = ToolClients(mock_config)
+        await clients.aclose()
+
+        repo = clients.get_repo()
+        async_client = repo._get_async_client()
+        await clients.aclose()
+
+        assert async_client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_async_retry_on_429(self, repo_client: RelaceRepoClient) -> None:
+        """Should back off with asyncio.sleep on retryable errors."""
+        responses = iter(
+            [
+                httpx.Response(429, json={"code": "rate_limit", "message": "slow down"}),
+                httpx.Response(200, json={"results": []}),
+            ]
+        )
+        real_async_client = httpx.AsyncClient
+
+        def make_client(**kwargs: object) -> httpx.AsyncClient:
+            return real_async_client(transport=httpx.MockTransport(lambda _req: next(responses)))
+
+        with (
+            patch("relace_mcp.clients.repo.httpx.AsyncClient", side_effect=make_client),
+            patch("relace_mcp.clients.repo.asyncio.sleep", new=AsyncMock()) as sleep_mock,
+        ):
+            result = await repo_client.aretrieve("repo-id", "auth")
+            await repo_client.aclose()
+
+        assert result == {"results": []}
+        sleep_mock.assert_awaited_once()
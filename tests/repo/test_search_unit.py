@@ -1,14 +1,14 @@
 """Tests for cloud_search logic."""
 
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from relace_mcp.clients.exceptions import RelaceAPIError
 from relace_mcp.clients.repo import RelaceRepoClient
 from relace_mcp.config import RelaceConfig
-from relace_mcp.repo.cloud.search import cloud_search_logic
+from relace_mcp.repo.cloud.search import cloud_search_logic, cloud_search_logic_async
 from relace_mcp.repo.core.state import SyncState
 
 
@@ -375,3 +375,47 @@ class TestCloudSearchBranchParam:
 
         assert "error" in result
         assert result["branch"] == "main"
+
+
+@pytest.mark.usefixtures("mock_sync_state")
+class TestCloudSearchLogicAsync:
+    """Test cloud_search_logic_async function."""
+
+    @pytest.mark.asyncio
+    async def test_async_search_uses_aretrieve(
+        self, mock_repo_client: MagicMock, mock_sync_state: SyncState
+    ) -> None:
+        """Should call the async retrieve and return the same payload shape."""
+        mock_repo_client.aretrieve = AsyncMock(return_value=mock_repo_client.retrieve.return_value)
+
+        result = await cloud_search_logic_async(
+            mock_repo_client,
+            base_dir="/tmp/project",
+            query="user authentication",
+        )
+
+        assert result["result_count"] == 2
+        assert result["hash"] == mock_sync_state.repo_head
+        mock_repo_client.retrieve.assert_not_called()
+        assert mock_repo_client.aretrieve.await_args.kwargs["hash"] == mock_sync_state.repo_head
+
+    @pytest.mark.asyncio
+    async def test_async_search_retries_commit_not_indexed(
+        self, mock_repo_client: MagicMock
+    ) -> None:
+        """Should back off with asyncio.sleep while the commit is being indexed."""
+        not_indexed = RuntimeError("Repos API error (not_found): commit not indexed")
+        not_indexed.__cause__ = RelaceAPIError(
+            status_code=404, code="not_found", message="commit not indexed"
+        )
+        mock_repo_client.aretrieve = AsyncMock(side_effect=[not_indexed, {"results": []}])
+
+        with patch("relace_mcp.repo.cloud.search.asyncio.sleep", new=AsyncMock()) as sleep_mock:
+            result = await cloud_search_logic_async(
+                mock_repo_client,
+                base_dir="/tmp/project",
+                query="authentication",
+            )
+
+        sleep_mock.assert_awaited_once_with(0.5)
+        assert any("succeeded after 1 retries" in w for w in result["warnings"])
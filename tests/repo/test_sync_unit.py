@@ -1,3 +1,6 @@
+import os
+import subprocess
+from collections.abc import Callable
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -7,12 +10,12 @@ from relace_mcp.clients.repo import RelaceRepoClient
 from relace_mcp.config import RelaceConfig
 from relace_mcp.encoding import set_project_encoding
 from relace_mcp.repo.cloud._sync_constants import CODE_EXTENSIONS, SPECIAL_FILENAMES
-from relace_mcp.repo.cloud._sync_diff import _compute_diff_operations
+from relace_mcp.repo.cloud._sync_diff import _compute_diff_operations, _pair_renames
 from relace_mcp.repo.cloud._sync_discovery import _get_git_tracked_files, _scan_directory
 from relace_mcp.repo.cloud._sync_files import _read_file_content
 from relace_mcp.repo.cloud._sync_hashing import _compute_file_hashes
 from relace_mcp.repo.cloud.sync import cloud_sync_logic
-from relace_mcp.repo.core.git import get_current_git_info
+from relace_mcp.repo.core.git import _parse_name_status_z, get_current_git_info
 from relace_mcp.repo.core.state import (
     SyncState,
     compute_file_hash,
@@ -49,7 +52,6 @@ class TestGetGitTrackedFiles:
     def test_returns_files_in_git_repo(self, tmp_path: Path) -> None:
         """Should return tracked files in git repository."""
         # Initialize git repo
-        import subprocess
 
         subprocess.run(["git", "init"], cwd=tmp_path, capture_output=True)
         subprocess.run(
@@ -222,6 +224,91 @@ class TestComputeFileHashes:
         assert "exists.py" in hashes
 
 
+class TestStatFastPath:
+    """Test (mtime_ns, size, inode) reuse in _compute_file_hashes."""
+
+    @staticmethod
+    def _age(path: Path, seconds: int = 60) -> None:
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+    def _first_scan(self, root: Path) -> SyncState:
+        stats: dict[str, tuple[int, int, int]] = {}
+        hashes = _compute_file_hashes(str(root), ["main.py"], stats=stats)
+        return SyncState(
+            repo_id="r",
+            repo_head="h",
+            last_sync="",
+            files=hashes,
+            file_stats={k: list(v) for k, v in stats.items()},
+        )
+
+    def test_unchanged_stat_reuses_cached_hash_without_reading(self, tmp_path: Path) -> None:
+        target = tmp_path / "main.py"
+        target.write_text("print('hello')")
+        self._age(target)
+        cached = self._first_scan(tmp_path)
+        assert cached.file_stats
+
+        with (
+            patch("relace_mcp.repo.cloud._sync_hashing.compute_file_hash") as hash_mock,
+            patch.object(Path, "read_bytes", side_effect=AssertionError("read")),
+        ):
+            hashes = _compute_file_hashes(
+                str(tmp_path), ["main.py"], cached_state=cached, contents={}
+            )
+
+        hash_mock.assert_not_called()
+        assert hashes == cached.files
+
+    def test_recently_modified_files_are_not_trusted(self, tmp_path: Path) -> None:
+        (tmp_path / "main.py").write_text("print('hello')")
+        stats: dict[str, tuple[int, int, int]] = {}
+
+        _compute_file_hashes(str(tmp_path), ["main.py"], stats=stats)
+
+        assert stats == {}
+
+    def test_changed_file_is_read_once_and_content_kept(self, tmp_path: Path) -> None:
+        target = tmp_path / "main.py"
+        target.write_text("print('hello')")
+        self._age(target)
+        cached = self._first_scan(tmp_path)
+
+        target.write_text("print('changed')")
+        contents: dict[str, bytes] = {}
+        hashes = _compute_file_hashes(
+            str(tmp_path), ["main.py"], cached_state=cached, contents=contents
+        )
+
+        assert hashes["main.py"] != cached.files["main.py"]
+        assert contents == {"main.py": b"print('changed')"}
+        with patch(
+            "relace_mcp.repo.cloud._sync_diff._read_file_content",
+            side_effect=AssertionError("second read"),
+        ):
+            operations, _, _ = _compute_diff_operations(
+                str(tmp_path), hashes, cached, contents=contents
+            )
+        assert operations[0]["content"] == "print('changed')"
+
+    def test_sync_persists_stats_for_next_run(
+        self, tmp_path: Path, mock_repo_client: MagicMock
+    ) -> None:
+        target = tmp_path / "main.py"
+        target.write_text("print('hello')")
+        self._age(target)
+
+        with patch("relace_mcp.repo.cloud.sync._get_git_tracked_files", return_value=None):
+            with patch("relace_mcp.repo.cloud.sync.load_sync_state", return_value=None):
+                with patch("relace_mcp.repo.cloud.sync.save_sync_state") as save_mock:
+                    cloud_sync_logic(mock_repo_client, str(tmp_path))
+
+        state = save_mock.call_args.args[1]
+        assert state.file_stats["main.py"][1] == target.stat().st_size
+        assert SyncState.from_dict(state.to_dict()).file_stats == state.file_stats
+
+
 class TestComputeDiffOperations:
     """Test _compute_diff_operations function."""
 
@@ -552,7 +639,6 @@ class TestCloudSyncLogic:
         self, tmp_path: Path, mock_repo_client: MagicMock
     ) -> None:
         """Should avoid incorrect deletes when base_dir is a git subdirectory."""
-        import subprocess
 
         subprocess.run(["git", "init"], cwd=tmp_path, capture_output=True)
 
@@ -850,7 +936,6 @@ class TestGetCurrentGitInfo:
 
     def test_returns_branch_and_sha_in_git_repo(self, tmp_path: Path) -> None:
         """Should return branch name and HEAD SHA in git repo."""
-        import subprocess
 
         # Initialize git repo
         subprocess.run(["git", "init"], cwd=tmp_path, capture_output=True)
@@ -1054,3 +1139,222 @@ class TestSyncDebugFields:
         assert result["ref_changed"] is False  # No cache to compare
         assert result["sync_mode"] == "safe_full"
         assert result["deletes_suppressed"] == 0
+
+
+class TestBatchedUpload:
+    """Test chunked, resumable upload mode (RELACE_SYNC_BATCH_BYTES)."""
+
+    @pytest.fixture(autouse=True)
+    def _batched(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.RELACE_SYNC_BATCH_BYTES", 64)
+        monkeypatch.setattr("relace_mcp.config.settings.RELACE_UPLOAD_MAX_WORKERS", 2)
+
+    @staticmethod
+    def _write_files(root: Path, count: int) -> None:
+        for i in range(count):
+            (root / f"mod_{i}.py").write_text(f"# module {i}\n" + "x = 1\n" * 5)
+
+    def test_splits_operations_into_bounded_chunks(
+        self, tmp_path: Path, mock_repo_client: MagicMock
+    ) -> None:
+        """Should send several update_repo calls and report the final chunk's head."""
+        self._write_files(tmp_path, 6)
+        heads = iter(f"head-{i}" for i in range(100))
+        mock_repo_client.update_repo.side_effect = lambda *_a, **_k: {"repo_head": next(heads)}
+
+        with patch("relace_mcp.repo.cloud.sync._get_git_tracked_files", return_value=None):
+            with patch("relace_mcp.repo.cloud.sync.load_sync_state", return_value=None):
+                with patch("relace_mcp.repo.cloud.sync.save_sync_state") as save_mock:
+                    result = cloud_sync_logic(mock_repo_client, str(tmp_path))
+
+        calls = mock_repo_client.update_repo.call_args_list
+        assert len(calls) == result["upload_chunks"] > 1
+        uploaded = [op["filename"] for call in calls for op in call.args[1]]
+        assert sorted(uploaded) == [f"mod_{i}.py" for i in range(6)]
+        assert result["files_created"] == 6
+        assert result["repo_head"] == f"head-{len(calls) - 1}"
+        final_state = save_mock.call_args_list[-1].args[1]
+        assert final_state.upload_checkpoint == {}
+        assert final_state.repo_head == result["repo_head"]
+        # One checkpoint per chunk plus the final state.
+        assert save_mock.call_count == result["upload_chunks"] + 1
+
+    def test_interrupted_upload_checkpoints_and_resumes(
+        self, tmp_path: Path, mock_repo_client: MagicMock
+    ) -> None:
+        """A failed chunk keeps earlier progress; the next sync only sends the rest."""
+        self._write_files(tmp_path, 6)
+        saved: list[SyncState] = []
+
+        def fail_late(_repo_id: str, operations: list[dict[str, str]], **_kwargs: object):
+            if any(op["filename"] == "mod_5.py" for op in operations):
+                raise RuntimeError("Repos API request timed out after 300.0s")
+            return {"repo_head": "partial-head"}
+
+        mock_repo_client.update_repo.side_effect = fail_late
+
+        def capture(_base_dir: str, state: SyncState) -> bool:
+            saved.append(SyncState.from_dict(state.to_dict()))
+            return True
+
+        with patch("relace_mcp.repo.cloud.sync._get_git_tracked_files", return_value=None):
+            with patch("relace_mcp.repo.cloud.sync.load_sync_state", return_value=None):
+                with patch("relace_mcp.repo.cloud.sync.save_sync_state", side_effect=capture):
+                    failed = cloud_sync_logic(mock_repo_client, str(tmp_path))
+
+        assert failed["sync_mode"] == "error"
+        checkpoint = saved[-1]
+        assert checkpoint.upload_checkpoint["chunks_done"] >= 1
+        assert "mod_5.py" not in checkpoint.files
+        done_before = set(checkpoint.files)
+        assert done_before
+
+        mock_repo_client.update_repo.reset_mock()
+        mock_repo_client.update_repo.side_effect = None
+        mock_repo_client.update_repo.return_value = {"repo_head": "final-head"}
+
+        with patch("relace_mcp.repo.cloud.sync._get_git_tracked_files", return_value=None):
+            with patch("relace_mcp.repo.cloud.sync.load_sync_state", return_value=checkpoint):
+                with patch("relace_mcp.repo.cloud.sync.save_sync_state"):
+                    resumed = cloud_sync_logic(mock_repo_client, str(tmp_path))
+
+        resent = {
+            op["filename"]
+            for call in mock_repo_client.update_repo.call_args_list
+            for op in call.args[1]
+        }
+        assert resumed["resumed"] is True
+        assert "mod_5.py" in resent
+        assert not resent & done_before
+        assert resumed["repo_head"] == "final-head"
+
+    def test_binary_files_detected_while_streaming(
+        self, tmp_path: Path, mock_repo_client: MagicMock
+    ) -> None:
+        """Undecodable files are skipped during chunk building, not uploaded."""
+        (tmp_path / "main.py").write_text("print('hello')")
+        (tmp_path / "blob.py").write_bytes(b"\x00\x01\x02\xff" * 8)
+
+        with patch("relace_mcp.repo.cloud.sync._get_git_tracked_files", return_value=None):
+            with patch("relace_mcp.repo.cloud.sync.load_sync_state", return_value=None):
+                with patch("relace_mcp.repo.cloud.sync.save_sync_state"):
+                    result = cloud_sync_logic(mock_repo_client, str(tmp_path))
+
+        uploaded = [
+            op["filename"]
+            for call in mock_repo_client.update_repo.call_args_list
+            for op in call.args[1]
+        ]
+        assert uploaded == ["main.py"]
+        assert result["files_skipped"] == 1
+        assert result["files_created"] == 1
+
+
+class TestGitChangeDetection:
+    """Test git-based change detection (RELACE_SYNC_GIT_DIFF)."""
+
+    @pytest.fixture(autouse=True)
+    def _git_diff(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.RELACE_SYNC_GIT_DIFF", True)
+
+    @staticmethod
+    def _init_repo(root: Path, git: Callable[..., None]) -> None:
+        git(root, "init", "-q")
+        for name in ("a.py", "b.py", "c.py"):
+            (root / name).write_text(f"# {name}\nvalue = '{name}'\n")
+        git(root, "add", "-A")
+        git(root, "commit", "-qm", "init")
+
+    @staticmethod
+    def _sync(client: MagicMock, root: Path, cached: SyncState | None) -> tuple[dict, SyncState]:
+        with patch("relace_mcp.repo.cloud.sync.load_sync_state", return_value=cached):
+            with patch("relace_mcp.repo.cloud.sync.save_sync_state") as save_mock:
+                with patch(
+                    "relace_mcp.repo.cloud.sync._compute_file_hashes",
+                    wraps=_compute_file_hashes,
+                ) as hash_mock:
+                    result = cloud_sync_logic(client, str(root))
+        result["_hashed"] = sorted(hash_mock.call_args.args[1])
+        return result, save_mock.call_args.args[1]
+
+    def test_parse_name_status_handles_renames(self) -> None:
+        changes = _parse_name_status_z("M\0a.py\0R100\0old.py\0new.py\0D\0gone.py\0")
+
+        assert changes.modified == frozenset({"a.py"})
+        assert changes.deleted == frozenset({"gone.py"})
+        assert changes.renamed == (("old.py", "new.py"),)
+        assert changes.paths == {"a.py", "gone.py", "old.py", "new.py"}
+
+    def test_only_git_reported_files_are_hashed(
+        self, tmp_path: Path, mock_repo_client: MagicMock, git: Callable[..., None]
+    ) -> None:
+        self._init_repo(tmp_path, git)
+        first, state = self._sync(mock_repo_client, tmp_path, None)
+        assert first["change_detection"] == "hash"
+        assert state.dirty_files is not None
+        assert "a.py" not in state.dirty_files
+
+        (tmp_path / "a.py").write_text("# edited\n")
+        result, _ = self._sync(mock_repo_client, tmp_path, state)
+
+        assert result["change_detection"] == "git"
+        assert result["_hashed"] == ["a.py"]
+        assert result["files_updated"] == 1
+        assert result["files_unchanged"] == 2
+
+    def test_git_rename_becomes_rename_operation(
+        self, tmp_path: Path, mock_repo_client: MagicMock, git: Callable[..., None]
+    ) -> None:
+        self._init_repo(tmp_path, git)
+        _, state = self._sync(mock_repo_client, tmp_path, None)
+
+        git(tmp_path, "mv", "b.py", "d.py")
+        git(tmp_path, "commit", "-qm", "rename")
+        mock_repo_client.update_repo.reset_mock()
+        result, new_state = self._sync(mock_repo_client, tmp_path, state)
+
+        operations = mock_repo_client.update_repo.call_args.args[1]
+        assert operations == [{"type": "rename", "old_filename": "b.py", "new_filename": "d.py"}]
+        assert result["files_renamed"] == 1
+        assert result["files_deleted"] == 0
+        assert result["files_created"] == 0
+        assert set(new_state.files) == {"a.py", "c.py", "d.py"}
+
+    def test_previously_dirty_file_is_rechecked_after_revert(
+        self, tmp_path: Path, mock_repo_client: MagicMock, git: Callable[..., None]
+    ) -> None:
+        self._init_repo(tmp_path, git)
+        (tmp_path / "c.py").write_text("# dirty\n")
+        _, state = self._sync(mock_repo_client, tmp_path, None)
+        assert state.dirty_files is not None
+        assert "c.py" in state.dirty_files
+
+        git(tmp_path, "checkout", "--", "c.py")
+        result, _ = self._sync(mock_repo_client, tmp_path, state)
+
+        assert result["_hashed"] == ["c.py"]
+        assert result["files_updated"] == 1
+
+    def test_unknown_commit_falls_back_to_hashing(
+        self, tmp_path: Path, mock_repo_client: MagicMock, git: Callable[..., None]
+    ) -> None:
+        self._init_repo(tmp_path, git)
+        _, state = self._sync(mock_repo_client, tmp_path, None)
+        state.git_head_sha = "0" * 40
+
+        result, _ = self._sync(mock_repo_client, tmp_path, state)
+
+        assert result["change_detection"] == "hash"
+        assert result["_hashed"] == ["a.py", "b.py", "c.py"]
+
+    def test_renames_require_identical_content(self) -> None:
+        operations = [
+            {"type": "delete", "filename": "old.py"},
+            {"type": "write", "filename": "new.py", "content": "changed"},
+        ]
+
+        paired = _pair_renames(
+            operations, (("old.py", "new.py"),), {"new.py": "sha256:b"}, {"old.py": "sha256:a"}
+        )
+
+        assert paired == operations
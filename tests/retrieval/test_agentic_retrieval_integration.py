@@ -50,7 +50,7 @@ def mock_harness():
 
 @pytest.fixture
 def mock_cloud_search():
-    with patch(f"{_RETRIEVAL_MOD}.cloud_search_logic") as m:
+    with patch(f"{_RETRIEVAL_MOD}.cloud_search_logic_async") as m:
         m.return_value = {"results": list(SEMANTIC_RESULTS)}
         yield m
 
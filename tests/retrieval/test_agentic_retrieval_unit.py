@@ -78,7 +78,7 @@ class TestAgenticRetrievalLogic:
                 "relace_mcp.search.retrieval.classify_cloud_index_freshness",
                 return_value=FreshnessStatus("fresh", True, False, "up_to_date"),
             ),
-            patch("relace_mcp.search.retrieval.cloud_search_logic") as mock_cloud,
+            patch("relace_mcp.search.retrieval.cloud_search_logic_async") as mock_cloud,
             patch("relace_mcp.search.retrieval.FastAgenticSearchHarness") as mock_harness_cls,
         ):
             mock_cloud.return_value = {"error": "Network error", "results": []}
@@ -111,7 +111,7 @@ class TestAgenticRetrievalLogic:
                 "relace_mcp.search.retrieval.classify_cloud_index_freshness",
                 return_value=FreshnessStatus("fresh", True, False, "up_to_date"),
             ),
-            patch("relace_mcp.search.retrieval.cloud_search_logic") as mock_cloud,
+            patch("relace_mcp.search.retrieval.cloud_search_logic_async") as mock_cloud,
             patch("relace_mcp.search.retrieval.FastAgenticSearchHarness") as mock_harness_cls,
         ):
             mock_cloud.return_value = {
@@ -161,7 +161,7 @@ class TestAgenticRetrievalLogic:
                 "relace_mcp.search.retrieval.classify_cloud_index_freshness",
                 return_value=FreshnessStatus("fresh", True, False, "up_to_date"),
             ),
-            patch("relace_mcp.search.retrieval.cloud_search_logic") as mock_cloud,
+            patch("relace_mcp.search.retrieval.cloud_search_logic_async") as mock_cloud,
             patch("relace_mcp.search.retrieval.FastAgenticSearchHarness") as mock_harness_cls,
         ):
             mock_cloud.return_value = {"results": [{"filename": "src/core.py", "score": 0.9}]}
@@ -203,7 +203,7 @@ class TestAgenticRetrievalLogic:
                 "relace_mcp.search.retrieval.classify_cloud_index_freshness",
                 return_value=FreshnessStatus("stale", True, True, "git_head_changed"),
             ),
-            patch("relace_mcp.search.retrieval.cloud_search_logic") as mock_cloud,
+            patch("relace_mcp.search.retrieval.cloud_search_logic_async") as mock_cloud,
             patch("relace_mcp.search.retrieval.FastAgenticSearchHarness") as mock_harness_cls,
         ):
             mock_cloud.return_value = {"results": [{"filename": "src/core.py", "score": 0.9}]}
@@ -239,7 +239,7 @@ class TestAgenticRetrievalLogic:
                 "relace_mcp.search.retrieval.classify_cloud_index_freshness",
                 return_value=FreshnessStatus("stale", True, True, "git_head_changed"),
             ),
-            patch("relace_mcp.search.retrieval.cloud_search_logic") as mock_cloud,
+            patch("relace_mcp.search.retrieval.cloud_search_logic_async") as mock_cloud,
             patch("relace_mcp.search.retrieval.FastAgenticSearchHarness") as mock_harness_cls,
         ):
             mock_harness_cls.return_value = mock_harness
@@ -1,6 +1,13 @@
+import subprocess
 from unittest.mock import patch
 
-from relace_mcp.repo.freshness import classify_local_index_freshness
+import pytest
+
+from relace_mcp.repo.core import SyncState, compute_file_hash
+from relace_mcp.repo.freshness import (
+    classify_cloud_index_freshness,
+    classify_local_index_freshness,
+)
 
 
 class TestClassifyLocalIndexFreshness:
@@ -83,3 +90,60 @@ class TestClassifyLocalIndexFreshness:
         result = classify_local_index_freshness(str(tmp_path), "chunkhound")
         assert result.freshness == "missing"
         assert result.hints_usable is False
+
+
+class TestClassifyCloudIndexFreshnessGitDiff:
+    @pytest.fixture(autouse=True)
+    def _git_diff(self, monkeypatch):
+        monkeypatch.setattr("relace_mcp.config.settings.RELACE_SYNC_GIT_DIFF", True)
+
+    @staticmethod
+    def _synced_repo(root, git):
+        git(root, "init", "-q")
+        (root / "main.py").write_text("print('hi')\n")
+        (root / "data.bin").write_text("notes\n")
+        git(root, "add", "-A")
+        git(root, "commit", "-qm", "init")
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        return SyncState(
+            repo_id="r",
+            repo_head="h",
+            last_sync="",
+            git_head_sha=head,
+            files={"main.py": compute_file_hash(root / "main.py")},
+            dirty_files=set(),
+        )
+
+    def _classify(self, root, state):
+        with patch("relace_mcp.repo.freshness.load_sync_state", return_value=state):
+            return classify_cloud_index_freshness(str(root))
+
+    def test_fresh_when_only_unsynced_files_changed(self, tmp_path, git):
+        state = self._synced_repo(tmp_path, git)
+        (tmp_path / "data.bin").write_text("edited\n")
+        git(tmp_path, "commit", "-qam", "docs")
+
+        result = self._classify(tmp_path, state)
+
+        assert result.freshness == "fresh"
+        assert result.reason == "no_synced_files_changed"
+
+    def test_stale_when_synced_file_changed(self, tmp_path, git):
+        state = self._synced_repo(tmp_path, git)
+        (tmp_path / "main.py").write_text("print('bye')\n")
+
+        result = self._classify(tmp_path, state)
+
+        assert result.freshness == "stale"
+        assert result.reason == "dirty_worktree"
+
+    def test_falls_back_without_recorded_dirty_files(self, tmp_path, git):
+        state = self._synced_repo(tmp_path, git)
+        state.dirty_files = None
+        (tmp_path / "data.bin").write_text("edited\n")
+
+        result = self._classify(tmp_path, state)
+
+        assert result.reason == "dirty_worktree"
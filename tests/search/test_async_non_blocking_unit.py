@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from relace_mcp.config import RelaceConfig
+from relace_mcp.repo.freshness import FreshnessStatus
 from relace_mcp.search.retrieval import agentic_retrieval_logic
 
 
@@ -12,20 +13,29 @@ from relace_mcp.search.retrieval import agentic_retrieval_logic
 async def test_agentic_retrieval_cloud_search_does_not_block_event_loop(tmp_path):
     config = RelaceConfig(api_key="test", base_dir=str(tmp_path))
     repo_client = MagicMock()
+    repo_client.aretrieve = AsyncMock(return_value={"results": []})
 
     search_client = MagicMock()
     search_client.api_compat = "relace"
 
-    def blocking_cloud_search_logic(*_args, **_kwargs):
+    def blocking_load_sync_state(_base_dir):
         time.sleep(0.2)
-        return {"results": []}
+        return None
 
     harness = MagicMock()
     harness.run_async = AsyncMock(return_value={"explanation": "ok", "files": {}, "turns_used": 1})
 
     with (
         patch("relace_mcp.config.settings.RETRIEVAL_BACKEND", "relace"),
-        patch("relace_mcp.search.retrieval.cloud_search_logic", blocking_cloud_search_logic),
+        patch(
+            "relace_mcp.search.retrieval.classify_cloud_index_freshness",
+            return_value=FreshnessStatus("fresh", True, False, "up_to_date"),
+        ),
+        patch(
+            "relace_mcp.repo.cloud.search.get_repo_identity",
+            return_value=("project", "project__fp", "fp"),
+        ),
+        patch("relace_mcp.repo.cloud.search.load_sync_state", blocking_load_sync_state),
         patch("relace_mcp.lsp.languages.get_lsp_languages", return_value=[]),
         patch("relace_mcp.search.retrieval.FastAgenticSearchHarness") as mock_harness_cls,
     ):
@@ -41,7 +51,7 @@ async def test_agentic_retrieval_cloud_search_does_not_block_event_loop(tmp_path
             )
         )
         try:
-            # If cloud_search_logic runs on the event loop thread, time.sleep(0.2)
+            # If cloud search's local state checks run on the event loop thread, time.sleep(0.2)
             # will delay this small sleep too.
             t0 = time.perf_counter()
             await asyncio.sleep(0.01)
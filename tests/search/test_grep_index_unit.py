@@ -0,0 +1,247 @@
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+import relace_mcp.search._impl.grep_index as index_mod
+import relace_mcp.search._impl.grep_search as grep_mod
+from relace_mcp.config import settings
+from relace_mcp.search._impl import grep_search_handler
+from relace_mcp.search.schemas import GrepSearchParams
+
+
+@pytest.fixture(autouse=True)
+def _isolated_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, trust_fresh_files: None
+) -> None:
+    monkeypatch.setattr(index_mod, "_INDEX_DIR", tmp_path / "index-store")
+    monkeypatch.setattr(index_mod, "_INDEXES", {})
+
+
+def _params(base_dir: Path, query: str, *, case_sensitive: bool = True) -> GrepSearchParams:
+    return GrepSearchParams(
+        query=query,
+        case_sensitive=case_sensitive,
+        include_pattern=None,
+        exclude_pattern=None,
+        base_dir=str(base_dir),
+    )
+
+
+def _make_repo(root: Path, count: int = 10) -> Path:
+    repo = root / "repo"
+    (repo / "src").mkdir(parents=True)
+    for i in range(count):
+        (repo / "src" / f"mod_{i}.py").write_text(f"def helper_{i}():\n    return {i}\n")
+    (repo / "src" / "auth.py").write_text("def validate_jwt_token(token):\n    return token\n")
+    return repo
+
+
+def _built_index(repo: Path) -> index_mod.GrepIndex:
+    index = index_mod.get_grep_index(str(repo))
+    assert index._build_thread is not None
+    index._build_thread.join(timeout=10)
+    assert index.ready
+    return index
+
+
+class TestLiteralExtraction:
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("validate_jwt", ["validate_jwt"]),
+            (r"def\s+validate_jwt", ["def", "validate_jwt"]),
+            (r"foo\.bar", ["foo.bar"]),
+            ("colou?r_name", ["colo", "r_name"]),
+            ("ab+cdef", ["ab", "cdef"]),
+            ("[a-z]+_handler$", ["_handler"]),
+            ("(token)+_check", ["token", "_check"]),
+        ],
+    )
+    def test_required_literals(self, query: str, expected: list[str]) -> None:
+        assert index_mod._literal_runs(query) == expected
+
+    @pytest.mark.parametrize(
+        "query",
+        ["foo|bar", "(?i)token", "(token)?_check", r"\x41BCD", r"(\w+)\1"],
+    )
+    def test_ambiguous_patterns_are_not_narrowed(self, query: str) -> None:
+        assert index_mod._literal_runs(query) is None
+
+    def test_short_literals_yield_no_trigrams(self) -> None:
+        assert index_mod._required_trigram_codes(r"ab\s+cd") is None
+
+
+class TestGrepIndex:
+    def test_narrows_candidates_and_verifies(self, tmp_path: Path) -> None:
+        repo = _make_repo(tmp_path)
+        _built_index(repo)
+
+        result = index_mod.grep_search_indexed(_params(repo, "validate_jwt_token"))
+
+        assert result is not None
+        assert "auth.py:1:def validate_jwt_token(token):" in result
+
+    def test_returns_none_while_building(self, tmp_path: Path) -> None:
+        repo = _make_repo(tmp_path)
+        index = index_mod.get_grep_index(str(repo))
+        index._building = True
+        try:
+            assert index_mod.grep_search_indexed(_params(repo, "validate_jwt_token")) is None
+        finally:
+            index._building = False
+            assert index._build_thread is not None
+            index._build_thread.join(timeout=10)
+
+    def test_unselective_query_falls_back(self, tmp_path: Path) -> None:
+        repo = _make_repo(tmp_path)
+        _built_index(repo)
+
+        assert index_mod.grep_search_indexed(_params(repo, "return")) is None
+
+    def test_case_insensitive_match(self, tmp_path: Path) -> None:
+        repo = _make_repo(tmp_path)
+        _built_index(repo)
+
+        result = index_mod.grep_search_indexed(_params(repo, "VALIDATE_JWT", case_sensitive=False))
+
+        assert result is not None
+        assert "auth.py:1:" in result
+
+    def test_incremental_refresh_sees_new_and_deleted_files(self, tmp_path: Path) -> None:
+        repo = _make_repo(tmp_path)
+        _built_index(repo)
+
+        (repo / "src" / "auth.py").unlink()
+        (repo / "src" / "session.py").write_text("def validate_jwt_token(t):\n    pass\n")
+
+        result = index_mod.grep_search_indexed(_params(repo, "validate_jwt_token"))
+
+        assert result is not None
+        assert "session.py:1:" in result
+        assert "auth.py" not in result
+
+    def test_modified_file_is_reindexed(self, tmp_path: Path) -> None:
+        repo = _make_repo(tmp_path)
+        _built_index(repo)
+
+        target = repo / "src" / "mod_3.py"
+        target.write_text("def rotate_signing_keys():\n    pass\n")
+        st = target.stat()
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        result = index_mod.grep_search_indexed(_params(repo, "rotate_signing_keys"))
+
+        assert result is not None
+        assert "mod_3.py:1:" in result
+
+    def test_same_tick_rewrite_is_not_trusted(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.utils.RACY_WINDOW_NS", 10**18)
+        repo = _make_repo(tmp_path)
+        target = repo / "src" / "mod_3.py"
+        target.write_text("alpha_token = 1\n")
+        _built_index(repo)
+
+        # Same size and the original mtime: only the racy window catches this.
+        st = target.stat()
+        target.write_text("bravo_token = 1\n")
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        result = index_mod.grep_search_indexed(_params(repo, "bravo_token"))
+
+        assert result is not None
+        assert "mod_3.py:1:bravo_token = 1" in result
+
+    def test_large_delta_triggers_background_rebuild(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        repo = _make_repo(tmp_path)
+        index = _built_index(repo)
+        monkeypatch.setattr(index_mod, "GREP_INDEX_MAX_INLINE_UPDATES", 1)
+
+        for i in range(3):
+            (repo / "src" / f"new_{i}.py").write_text("def validate_jwt_token():\n    pass\n")
+
+        assert index_mod.grep_search_indexed(_params(repo, "validate_jwt_token")) is None
+        assert index._build_thread is not None
+        index._build_thread.join(timeout=10)
+
+        result = index_mod.grep_search_indexed(_params(repo, "validate_jwt_token"))
+        assert result is not None
+        assert "new_2.py:1:" in result
+
+    def test_persisted_index_round_trip(self, tmp_path: Path) -> None:
+        repo = _make_repo(tmp_path)
+        index = _built_index(repo)
+        assert index.index_path.is_file()
+
+        reloaded = index_mod.GrepIndex(index.base_path, index.index_path)
+
+        assert reloaded.load()
+        assert reloaded._entries == index._entries
+
+    def test_corrupt_index_is_ignored(self, tmp_path: Path) -> None:
+        repo = _make_repo(tmp_path)
+        index = _built_index(repo)
+        index.index_path.write_bytes(b"RLGI\x01garbage")
+
+        reloaded = index_mod.GrepIndex(index.base_path, index.index_path)
+
+        assert reloaded.load() is False
+
+    @pytest.mark.parametrize("damage", ["truncate", "extend"])
+    def test_truncated_or_padded_index_is_ignored(self, tmp_path: Path, damage: str) -> None:
+        repo = _make_repo(tmp_path)
+        index = _built_index(repo)
+        data = index.index_path.read_bytes()
+        index.index_path.write_bytes(data[:-1] if damage == "truncate" else data + b"\0")
+
+        reloaded = index_mod.GrepIndex(index.base_path, index.index_path)
+
+        assert reloaded.load() is False
+
+    def test_concurrent_saves_leave_a_loadable_index(self, tmp_path: Path) -> None:
+        repo = _make_repo(tmp_path)
+        index = _built_index(repo)
+
+        threads = [threading.Thread(target=index.save) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        reloaded = index_mod.GrepIndex(index.base_path, index.index_path)
+        assert reloaded.load()
+        assert reloaded._entries == index._entries
+        assert list(index.index_path.parent.glob("*.tmp")) == []
+
+
+class TestHandlerIntegration:
+    def test_handler_uses_index_when_enabled(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        repo = _make_repo(tmp_path)
+        _built_index(repo)
+        monkeypatch.setattr(settings, "SEARCH_GREP_INDEX", True)
+
+        def _fail(*_args: object, **_kwargs: object) -> str:
+            raise AssertionError("ripgrep should not run when the index answers")
+
+        monkeypatch.setattr(grep_mod, "_try_ripgrep", _fail)
+
+        result = grep_search_handler(_params(repo, "validate_jwt_token"))
+
+        assert "auth.py:1:" in result
+
+    def test_handler_falls_back_when_index_cannot_answer(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        repo = _make_repo(tmp_path)
+        _built_index(repo)
+        monkeypatch.setattr(settings, "SEARCH_GREP_INDEX", True)
+        monkeypatch.setattr(grep_mod, "_try_ripgrep", lambda _params: "from-ripgrep")
+
+        assert grep_search_handler(_params(repo, "foo|bar")) == "from-ripgrep"
@@ -9,6 +9,7 @@ from relace_mcp.encoding import set_project_encoding
 from relace_mcp.search._impl import (
     MAX_TOOL_RESULT_CHARS,
     bash_handler,
+    bash_handler_async,
     estimate_context_size,
     grep_search_handler,
     map_repo_path,
@@ -842,6 +843,15 @@ class TestBashHandler:
         result = bash_handler("ls -la", str(tmp_path))
         assert "test.py" in result
 
+    async def test_async_variant_matches_sync(self, tmp_path: Path) -> None:
+        """Async bash should return the same output and honor the blocklist."""
+        (tmp_path / "test.py").write_text("print('hello')\n")
+
+        assert await bash_handler_async("ls", str(tmp_path)) == bash_handler("ls", str(tmp_path))
+        blocked = await bash_handler_async("rm test.py", str(tmp_path))
+        assert blocked.startswith("Error: Command blocked")
+        assert (tmp_path / "test.py").exists()
+
     def test_executes_find_command(self, tmp_path: Path) -> None:
         """Should allow find command for file discovery."""
         (tmp_path / "src").mkdir()
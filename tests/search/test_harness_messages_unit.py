@@ -1,6 +1,9 @@
 from typing import Any
+from unittest.mock import patch
 
-from relace_mcp.search.harness.messages import MessageHistoryMixin
+from relace_mcp.search._impl import estimate_context_size
+from relace_mcp.search.harness.messages import MessageHistoryMixin, MessageLog
+from relace_mcp.search.logging import log_search_turn
 
 
 class ConcreteMessageHistory(MessageHistoryMixin):
@@ -195,6 +198,87 @@ class TestTruncateMessages:
         assert len(result) < len(messages)
 
 
+def _conversation(prefix: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    messages = list(prefix)
+    messages.append(_make_tool_result("orphan"))
+    for i in range(6):
+        messages.append(_make_assistant_tc(f"tc{i}", func_name=f"fn{i}"))
+        messages.append(_make_tool_result(f"tc{i}", content="x" * (i + 1)))
+        if i == 3:
+            messages.append({"role": "user", "content": "turn hint"})
+    return messages
+
+
+class TestMessageLog:
+    _PREFIX = [{"role": "system", "content": "sys"}, {"role": "user", "content": "query"}]
+
+    def test_running_chars_match_full_estimate(self) -> None:
+        log = MessageLog(self._PREFIX)
+        for msg in _conversation([]):
+            log.append(msg)
+            assert log.chars == estimate_context_size(log)
+
+    def test_truncation_matches_rebuilt_blocks(self) -> None:
+        messages = _conversation(self._PREFIX)
+        log = MessageLog(self._PREFIX)
+        log.extend(messages[2:])
+
+        truncated = log.truncated()
+
+        assert list(truncated) == ConcreteMessageHistory()._truncate_messages(messages)
+        assert truncated.chars == estimate_context_size(truncated)
+        assert truncated[0] is self._PREFIX[0] and truncated[1] is self._PREFIX[1]
+
+    def test_truncated_log_keeps_tracking_appends(self) -> None:
+        log = MessageLog(self._PREFIX)
+        log.extend(_conversation([]))
+        truncated = log.truncated()
+
+        truncated.append(_make_assistant_tc("tc_next"))
+        truncated.append(_make_tool_result("tc_next"))
+
+        assert truncated.chars == estimate_context_size(truncated)
+        assert len(truncated.truncated()) <= len(truncated)
+
+    def test_short_log_is_returned_as_is(self) -> None:
+        log = MessageLog(self._PREFIX)
+        log.append(_make_assistant_tc("tc0"))
+
+        assert log.truncated() is log
+        assert ConcreteMessageHistory()._truncate_messages(log) is log
+
+
+class TestLogSearchTurnCacheTelemetry:
+    def _logged(self, usage: dict[str, Any]) -> dict[str, Any]:
+        with patch("relace_mcp.search.logging.log_event") as log_event:
+            log_search_turn("t1", 2, 6, 1000, 1, llm_latency_ms=10.0, usage=usage)
+        return dict(log_event.call_args.args[0])
+
+    def test_openai_cached_tokens(self) -> None:
+        event = self._logged(
+            {
+                "prompt_tokens": 2000,
+                "completion_tokens": 50,
+                "prompt_tokens_details": {"cached_tokens": 1500},
+            }
+        )
+
+        assert event["cached_tokens"] == 1500
+        assert event["cache_hit_ratio"] == 0.75
+
+    def test_prompt_cache_hit_tokens(self) -> None:
+        event = self._logged({"prompt_tokens": 400, "prompt_cache_hit_tokens": 100})
+
+        assert event["cached_tokens"] == 100
+        assert event["cache_hit_ratio"] == 0.25
+
+    def test_no_cache_fields(self) -> None:
+        event = self._logged({"prompt_tokens": 400, "completion_tokens": 5})
+
+        assert "cached_tokens" not in event
+        assert "cache_hit_ratio" not in event
+
+
 class TestAppendToolResultsToMessages:
     def setup_method(self) -> None:
         self.mixin = ConcreteMessageHistory()
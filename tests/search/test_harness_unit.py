@@ -1,6 +1,8 @@
+import asyncio
 import json
 from pathlib import Path
-from unittest.mock import MagicMock
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -163,6 +165,36 @@ class TestFastAgenticSearchHarness:
 
         assert result["turns_used"] == 2
 
+    def test_request_prefix_is_identical_across_turns(
+        self,
+        mock_config: RelaceConfig,
+        mock_client: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """System prompt, user query and tool schemas must not change between turns."""
+        (tmp_path / "test.py").write_text("def hello(): pass\n")
+        responses = iter(
+            [
+                [_make_view_file_call("call_1", "/repo/test.py")],
+                [_make_view_directory_call("call_2", "/repo")],
+                [_make_report_back_call("call_3", "Found it", {"test.py": [[1, 1]]})],
+            ]
+        )
+        prefixes: list[str] = []
+
+        def chat(messages: list[dict[str, Any]], tools: list[dict[str, Any]], **_: Any) -> dict:
+            prefixes.append(json.dumps([messages[:2], tools]))
+            return {"choices": [{"message": {"tool_calls": next(responses)}}]}
+
+        mock_client.chat.side_effect = chat
+
+        harness = FastAgenticSearchHarness(mock_config, mock_client)
+        result = harness.run("Find hello")
+
+        assert result["turns_used"] == 3
+        assert len(prefixes) == 3
+        assert len(set(prefixes)) == 1
+
     def test_blocks_disabled_tools_defense_in_depth(
         self,
         mock_config: RelaceConfig,
@@ -369,6 +401,44 @@ class TestFastAgenticSearchHarness:
         assert all(r[0] > 0 and r[1] >= r[0] for r in ranges)
         assert all(r[1] != -1 for r in ranges)
 
+    def test_stops_early_when_exploration_stalls(
+        self,
+        mock_config: RelaceConfig,
+        mock_client: MagicMock,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Repeating the same read should end the search before SEARCH_MAX_TURNS."""
+        import relace_mcp.config.settings as test_settings
+
+        monkeypatch.setattr(test_settings, "SEARCH_STALL_TURNS", 2)
+        (tmp_path / "test.py").write_text("def hello(): pass\n")
+
+        mock_client.chat.return_value = {
+            "choices": [
+                {"message": {"tool_calls": [_make_view_file_call("call_1", "/repo/test.py")]}}
+            ]
+        }
+
+        harness = FastAgenticSearchHarness(mock_config, mock_client, trace=True)
+        result = harness.run("Find hello")
+
+        assert result["partial"] is True
+        assert result["turns_used"] == 3
+        assert "[EARLY STOP]" in result["explanation"]
+        assert str(tmp_path / "test.py") in result["files"]
+        progress = [entry["progress"] for entry in result["turns_log"]]
+        assert progress[0]["new_files"] == 1
+        assert progress[2] == {
+            "new_files": 0,
+            "new_lines": 0,
+            "repeated_calls": 1,
+            "stalled_turns": 2,
+        }
+        # The stalled turn asked the model to wrap up.
+        messages = mock_client.chat.call_args_list[2].args[0]
+        assert any("stopped turning up new code" in str(msg.get("content")) for msg in messages)
+
 
 class TestParallelToolCallsFix:
     """Test P0 fix: parallel tool calls with report_back not last."""
@@ -505,6 +575,90 @@ class TestParallelToolCallsFix:
         assert mock_client.chat.call_count == 2
 
 
+class TestAsyncToolExecution:
+    """Test the asyncio-native tool path used by run_async."""
+
+    @pytest.fixture
+    def mock_config(self, tmp_path: Path) -> RelaceConfig:
+        return RelaceConfig(api_key="rlc-test", base_dir=str(tmp_path))
+
+    @staticmethod
+    def _grep_call(call_id: str, query: str) -> dict:
+        return {
+            "id": call_id,
+            "function": {"name": "grep_search", "arguments": json.dumps({"query": query})},
+        }
+
+    async def test_run_async_executes_tools_in_order(
+        self, mock_config: RelaceConfig, tmp_path: Path
+    ) -> None:
+        (tmp_path / "auth.py").write_text("def validate_token():\n    pass\n")
+        client = MagicMock(spec=SearchLLMClient)
+        client.api_compat = "relace"
+        client.chat_async = AsyncMock(
+            side_effect=[
+                {
+                    "choices": [
+                        {
+                            "message": {
+                                "tool_calls": [
+                                    self._grep_call("call_1", "validate_token"),
+                                    _make_view_file_call("call_2", "/repo/auth.py"),
+                                ]
+                            }
+                        }
+                    ]
+                },
+                {
+                    "choices": [
+                        {
+                            "message": {
+                                "tool_calls": [
+                                    _make_report_back_call("call_3", "done", {"auth.py": [[1, 2]]})
+                                ]
+                            }
+                        }
+                    ]
+                },
+            ]
+        )
+
+        harness = FastAgenticSearchHarness(mock_config, client, trace=True)
+        result = await harness.run_async("Find token validation")
+
+        assert result["files"] == {str(tmp_path / "auth.py"): [[1, 2]]}
+        tool_results = result["turns_log"][0]["tool_results"]
+        assert [t["id"] for t in tool_results] == ["call_1", "call_2"]
+        assert "auth.py:1:def validate_token():" in tool_results[0]["result"]
+
+    async def test_concurrency_is_bounded_across_harnesses(
+        self,
+        mock_config: RelaceConfig,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_MAX_CONCURRENT_TOOLS", 2)
+        active = 0
+        peak = 0
+
+        async def slow_dispatch(_self: Any, _name: str, _args: dict) -> str:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return "ok"
+
+        monkeypatch.setattr(FastAgenticSearchHarness, "_dispatch_tool_async", slow_dispatch)
+        client = MagicMock(spec=SearchLLMClient)
+        client.api_compat = "relace"
+        harnesses = [FastAgenticSearchHarness(mock_config, client) for _ in range(3)]
+        calls = [self._grep_call(f"call_{i}", "x") for i in range(4)]
+
+        await asyncio.gather(*(h._execute_tools_async(calls, "t", 1) for h in harnesses))
+
+        assert peak == 2
+
+
 class TestToolSchemas:
     """Test tool schema definitions."""
 
@@ -0,0 +1,96 @@
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from relace_mcp.clients import SearchLLMClient
+from relace_mcp.config import RelaceConfig
+from relace_mcp.search import FastAgenticSearchHarness
+from relace_mcp.search.harness.prefetch import Prefetcher, rank_prefetch_candidates
+
+pytestmark = pytest.mark.usefixtures("isolated_text_cache")
+
+
+def _tool_call(call_id: str, name: str, args: dict) -> dict:
+    return {"id": call_id, "function": {"name": name, "arguments": json.dumps(args)}}
+
+
+class TestRankPrefetchCandidates:
+    def test_grep_hits_rank_before_observed_files(self, tmp_path: Path) -> None:
+        traces = [
+            {"name": "grep_search", "result": "./b.py:1:x\na.py:2:y\na.py:9:z"},
+            {"name": "view_file", "result": "1 ignored"},
+        ]
+        observed = {str(tmp_path / "c.py"): [[1, 5]], str(tmp_path / "a.py"): [[2, 2]]}
+
+        ranked = rank_prefetch_candidates(traces, observed, lambda p: str(tmp_path / p))
+
+        assert ranked == [str(tmp_path / n) for n in ("a.py", "b.py", "c.py")]
+
+    def test_respects_limit(self, tmp_path: Path) -> None:
+        observed = {str(tmp_path / f"{i}.py"): [[1, 1]] for i in range(20)}
+
+        assert len(rank_prefetch_candidates([], observed, lambda p: p, limit=3)) == 3
+
+
+class TestPrefetcher:
+    async def test_score_counts_finished_prefetches(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("x\n")
+        prefetcher = Prefetcher()
+        prefetcher.start([str(tmp_path / "a.py")])
+        await asyncio.gather(*prefetcher._tasks.values())
+
+        stats = prefetcher.score([str(tmp_path / "a.py"), str(tmp_path / "b.py")])
+
+        assert stats == {"prefetched": 1, "view_calls": 2, "hits": 1}
+        await prefetcher.aclose()
+
+    async def test_failed_prefetches_are_not_hits(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        missing = str(tmp_path / "missing.py")
+        (tmp_path / "big.py").write_text("x" * 64)
+        monkeypatch.setattr("relace_mcp.search.harness.prefetch.MAX_FILE_SIZE_BYTES", 8)
+        prefetcher = Prefetcher()
+        prefetcher.start([missing, str(tmp_path / "big.py")])
+        await asyncio.gather(*prefetcher._tasks.values())
+
+        stats = prefetcher.score([missing, str(tmp_path / "big.py")])
+
+        assert stats == {"prefetched": 2, "view_calls": 2, "hits": 0}
+        await prefetcher.aclose()
+
+    async def test_harness_reports_prefetch_hits_in_turns_log(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_PREFETCH", True)
+        (tmp_path / "auth.py").write_text("def validate_token():\n    pass\n")
+        client = MagicMock(spec=SearchLLMClient)
+        client.api_compat = "relace"
+
+        async def chat_async(messages: list, **_kwargs: object) -> dict:
+            turn = sum(1 for m in messages if m.get("role") == "assistant")
+            if turn == 0:
+                calls = [_tool_call("c1", "grep_search", {"query": "validate_token"})]
+            elif turn == 1:
+                # Give the background prefetch time to finish while "thinking".
+                await asyncio.sleep(0.05)
+                calls = [_tool_call("c2", "view_file", {"path": "/repo/auth.py"})]
+            else:
+                calls = [
+                    _tool_call(
+                        "c3", "report_back", {"explanation": "ok", "files": {"auth.py": [[1, 2]]}}
+                    )
+                ]
+            return {"choices": [{"message": {"tool_calls": calls}}]}
+
+        client.chat_async = AsyncMock(side_effect=chat_async)
+        config = RelaceConfig(api_key="rlc-test", base_dir=str(tmp_path))
+        harness = FastAgenticSearchHarness(config, client, trace=True)
+
+        result = await harness.run_async("find token validation")
+
+        assert "prefetch" not in result["turns_log"][0]
+        assert result["turns_log"][1]["prefetch"] == {"prefetched": 1, "view_calls": 1, "hits": 1}
@@ -0,0 +1,161 @@
+import os
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from relace_mcp.clients import SearchLLMClient
+from relace_mcp.config import RelaceConfig
+from relace_mcp.search import FastAgenticSearchHarness
+from relace_mcp.search.harness import result_cache as cache_mod
+from relace_mcp.search.harness.result_cache import (
+    SearchResultCache,
+    normalize_query,
+    repo_fingerprint,
+)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, trust_fresh_files: None
+) -> None:
+    monkeypatch.setattr(cache_mod, "_CACHE_DIR", tmp_path / "cache-store")
+    monkeypatch.setattr(cache_mod, "_CACHES", {})
+
+
+@pytest.fixture
+def repo(tmp_path: Path, git: Callable[..., None]) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "auth.py").write_text("def validate_token():\n    pass\n")
+    git(repo, "init", "-q")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-qm", "init")
+    return repo
+
+
+def _result(path: Path) -> dict:
+    return {"query": "q", "explanation": "found", "files": {str(path): [[1, 2]]}, "turns_used": 2}
+
+
+class TestRepoFingerprint:
+    def test_changes_with_worktree_edits(self, repo: Path) -> None:
+        clean = repo_fingerprint(str(repo))
+
+        (repo / "new.py").write_text("x = 1\n")
+        untracked = repo_fingerprint(str(repo))
+        (repo / "new.py").write_text("x = 22\n")
+        edited = repo_fingerprint(str(repo))
+
+        assert clean is not None
+        assert len({clean, untracked, edited}) == 3
+
+    def test_none_outside_git(self, tmp_path: Path) -> None:
+        assert repo_fingerprint(str(tmp_path)) is None
+
+    def test_normalize_query(self) -> None:
+        assert (
+            normalize_query("  Where is JWT\n validation done? ") == "where is jwt validation done"
+        )
+
+
+class TestSearchResultCache:
+    def test_round_trip_and_persistence(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.py"
+        target.write_text("print(1)\n")
+        store = tmp_path / "store.json"
+
+        assert SearchResultCache(store).put("k", {**_result(target), "trace_id": "t1"})
+        cached = SearchResultCache(store).get("k")
+
+        assert cached == _result(target)
+
+    def test_changed_file_invalidates_entry(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.py"
+        target.write_text("print(1)\n")
+        cache = SearchResultCache(tmp_path / "store.json")
+        cache.put("k", _result(target))
+
+        target.write_text("print('changed')\n")
+
+        assert cache.get("k") is None
+        assert cache.get("k") is None
+
+    def test_expired_entry_is_dropped(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        target = tmp_path / "a.py"
+        target.write_text("print(1)\n")
+        cache = SearchResultCache(tmp_path / "store.json")
+        cache.put("k", _result(target))
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_RESULT_CACHE_TTL_SECONDS", 1)
+        cache._entries["k"]["stored_at"] -= 5
+
+        assert cache.get("k") is None
+
+    def test_lru_eviction(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(cache_mod, "_MAX_ENTRIES", 2)
+        target = tmp_path / "a.py"
+        target.write_text("print(1)\n")
+        cache = SearchResultCache(tmp_path / "store.json")
+        cache.put("a", _result(target))
+        cache.put("b", _result(target))
+        cache.get("a")
+        cache.put("c", _result(target))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+
+    def test_missing_file_is_not_cached(self, tmp_path: Path) -> None:
+        cache = SearchResultCache(tmp_path / "store.json")
+
+        assert not cache.put("k", _result(tmp_path / "missing.py"))
+        assert not os.path.exists(tmp_path / "store.json")
+
+
+class TestHarnessResultCache:
+    @pytest.fixture(autouse=True)
+    def _enable_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_RESULT_CACHE", True)
+
+    def _client(self) -> MagicMock:
+        client = MagicMock(spec=SearchLLMClient)
+        client.api_compat = "relace"
+        client.model = "test-model"
+        report = {
+            "id": "c1",
+            "function": {
+                "name": "report_back",
+                "arguments": '{"explanation": "in auth.py", "files": {"auth.py": [[1, 2]]}}',
+            },
+        }
+        client.chat_async = AsyncMock(
+            return_value={"choices": [{"message": {"tool_calls": [report]}}]}
+        )
+        return client
+
+    async def test_repeated_query_is_served_from_cache(self, repo: Path) -> None:
+        client = self._client()
+        config = RelaceConfig(api_key="rlc-test", base_dir=str(repo))
+
+        first = await FastAgenticSearchHarness(config, client).run_async("Where is auth?")
+        second = await FastAgenticSearchHarness(config, client).run_async("where is  auth")
+
+        assert client.chat_async.await_count == 1
+        assert "cached" not in first
+        assert second["cached"] is True
+        assert second["files"] == first["files"]
+        assert second["query"] == "where is  auth"
+        assert second["trace_id"] != first["trace_id"]
+
+    async def test_repo_change_misses_cache(self, repo: Path) -> None:
+        client = self._client()
+        config = RelaceConfig(api_key="rlc-test", base_dir=str(repo))
+
+        await FastAgenticSearchHarness(config, client).run_async("where is auth")
+        (repo / "other.py").write_text("y = 2\n")
+        result = await FastAgenticSearchHarness(config, client).run_async("where is auth")
+
+        assert client.chat_async.await_count == 2
+        assert "cached" not in result
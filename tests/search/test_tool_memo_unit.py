@@ -0,0 +1,187 @@
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from relace_mcp.clients import SearchLLMClient
+from relace_mcp.config import RelaceConfig
+from relace_mcp.search import FastAgenticSearchHarness
+from relace_mcp.search.harness import memo as memo_mod
+from relace_mcp.search.harness import tool_calls as tool_calls_mod
+from relace_mcp.search.harness.memo import ToolMemo
+
+
+@pytest.fixture(autouse=True)
+def _enable_memo(monkeypatch: pytest.MonkeyPatch, trust_fresh_files: None) -> None:
+    monkeypatch.setattr("relace_mcp.config.settings.SEARCH_TOOL_MEMO", True)
+    monkeypatch.setattr(memo_mod, "_SESSION_MEMOS", {})
+
+
+def _call(call_id: str, name: str, **args: object) -> dict:
+    return {"id": call_id, "function": {"name": name, "arguments": json.dumps(args)}}
+
+
+def _counting(monkeypatch: pytest.MonkeyPatch, name: str) -> list[int]:
+    calls: list[int] = []
+    original = getattr(tool_calls_mod, name)
+
+    def wrapper(*args: object, **kwargs: object) -> object:
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(tool_calls_mod, name, wrapper)
+    return calls
+
+
+def _harness(base_dir: Path) -> FastAgenticSearchHarness:
+    config = RelaceConfig(api_key="rlc-test", base_dir=str(base_dir))
+    harness = FastAgenticSearchHarness(config, MagicMock(spec=SearchLLMClient))
+    harness._reset_tool_memo()
+    return harness
+
+
+class TestToolMemo:
+    def test_lru_eviction(self) -> None:
+        memo = ToolMemo(max_entries=2)
+        memo.put("a", "1")
+        memo.put("b", "2")
+        memo.get("a")
+        memo.put("c", "3")
+
+        assert memo.get("b") is None
+        assert memo.get("a") == "1" and memo.get("c") == "3"
+
+    def test_disabled_by_default(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_TOOL_MEMO", False)
+
+        assert _harness(tmp_path)._memo is None
+
+
+class TestHarnessToolMemo:
+    def test_repeated_view_file_is_served_from_memo(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "a.py").write_text("x = 1\n")
+        handler_calls = _counting(monkeypatch, "view_file_handler")
+        harness = _harness(tmp_path)
+
+        _, first, _ = harness._execute_tools_parallel(
+            [_call("c1", "view_file", path="/repo/a.py", view_range=[1, 100])], "t", turn=1
+        )
+        # Same file through a different path spelling and the default range.
+        results, second, _ = harness._execute_tools_parallel(
+            [_call("c2", "view_file", path="a.py")], "t", turn=2
+        )
+
+        assert len(handler_calls) == 1
+        assert first[0]["memo_hit"] is False
+        assert second[0]["memo_hit"] is True
+        assert second[0]["latency_ms"] == 0.0
+        assert results[0] == ("c2", "view_file", first[0]["result"])
+        assert str(tmp_path / "a.py") in harness._observed_files
+
+    def test_changed_file_is_read_again(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        target = tmp_path / "a.py"
+        target.write_text("x = 1\n")
+        handler_calls = _counting(monkeypatch, "view_file_handler")
+        harness = _harness(tmp_path)
+
+        harness._execute_tools_parallel([_call("c1", "view_file", path="a.py")], "t", turn=1)
+        target.write_text("x = 22\n")
+        os.utime(target, ns=(1, 1))
+        _, traces, _ = harness._execute_tools_parallel(
+            [_call("c2", "view_file", path="a.py")], "t", turn=2
+        )
+
+        assert len(handler_calls) == 2
+        assert traces[0]["memo_hit"] is False
+        assert "x = 22" in traces[0]["result"]
+
+    def test_reference_replaces_repeated_output(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_TOOL_MEMO_REFERENCE", True)
+        (tmp_path / "a.py").write_text("x = 1\n")
+        harness = _harness(tmp_path)
+
+        harness._execute_tools_parallel([_call("c1", "view_file", path="a.py")], "t", turn=1)
+        _, traces, _ = harness._execute_tools_parallel(
+            [_call("c2", "view_file", path="a.py")], "t", turn=3
+        )
+        assert traces[0]["result"] == memo_mod.same_as_note("view_file", 1)
+
+        # After truncation the original output may be gone, so it is repeated in full.
+        harness._memo_turns.clear()
+        _, traces, _ = harness._execute_tools_parallel(
+            [_call("c3", "view_file", path="a.py")], "t", turn=4
+        )
+        assert "x = 1" in traces[0]["result"]
+
+    def test_grep_memo_follows_git_worktree_state(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, git: Callable[..., None]
+    ) -> None:
+        # tmp_path itself also holds the test log file, which would change every turn.
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        (repo / "a.py").write_text("token = 1\n")
+        git(repo, "init", "-q")
+        git(repo, "add", "-A")
+        git(repo, "commit", "-qm", "init")
+        handler_calls = _counting(monkeypatch, "grep_search_handler")
+        harness = _harness(repo)
+        grep = _call("g", "grep_search", query="token")
+
+        harness._execute_tools_parallel([grep], "t", turn=1)
+        _, hit, _ = harness._execute_tools_parallel([grep], "t", turn=2)
+        (repo / "b.py").write_text("token = 2\n")
+        _, miss, _ = harness._execute_tools_parallel([grep], "t", turn=3)
+
+        assert len(handler_calls) == 2
+        assert hit[0]["memo_hit"] is True
+        assert miss[0]["memo_hit"] is False
+        assert "b.py" in miss[0]["result"]
+
+    def test_repo_wide_tools_are_not_memoized_outside_git(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "a.py").write_text("token = 1\n")
+        handler_calls = _counting(monkeypatch, "grep_search_handler")
+        harness = _harness(tmp_path)
+        grep = _call("g", "grep_search", query="token")
+
+        harness._execute_tools_parallel([grep], "t", turn=1)
+        _, traces, _ = harness._execute_tools_parallel([grep], "t", turn=2)
+
+        assert len(handler_calls) == 2
+        assert "memo_hit" not in traces[0]
+
+    async def test_session_memo_is_shared_across_searches(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.config.settings.SEARCH_TOOL_MEMO_SESSION", True)
+        (tmp_path / "a.py").write_text("x = 1\n")
+        handler_calls = _counting(monkeypatch, "view_file_handler")
+        config = RelaceConfig(api_key="rlc-test", base_dir=str(tmp_path))
+        view = _call("c1", "view_file", path="a.py")
+        report = _call("c2", "report_back", explanation="done", files={"a.py": [[1, 1]]})
+
+        client = MagicMock(spec=SearchLLMClient)
+        client.api_compat = "relace"
+        client.chat_async = AsyncMock(
+            side_effect=[
+                {"choices": [{"message": {"tool_calls": [view]}}]},
+                {"choices": [{"message": {"tool_calls": [report]}}]},
+            ]
+            * 2
+        )
+
+        for _ in range(2):
+            result = await FastAgenticSearchHarness(config, client, trace=True).run_async("q")
+
+        assert len(handler_calls) == 1
+        assert result["turns_log"][0]["tool_results"][0]["memo_hit"] is True
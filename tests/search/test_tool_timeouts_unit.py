@@ -13,6 +13,7 @@ async def test_tool_timeouts(tmp_path) -> None:
 
     expected = {
         "fast_apply": 300.0,
+        "fast_apply_batch": 600.0,
         "agentic_search": 600.0,
         "index_status": 120.0,
         "cloud_sync": 900.0,
@@ -0,0 +1,108 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import relace_mcp.search._impl.tree_snapshot as snap_mod
+from relace_mcp.search._impl import view_directory_handler
+from relace_mcp.search._impl.glob import glob_handler
+
+
+@pytest.fixture(autouse=True)
+def _isolated_snapshots(monkeypatch: pytest.MonkeyPatch, trust_fresh_files: None) -> None:
+    monkeypatch.setattr(snap_mod, "_SNAPSHOTS", snap_mod.OrderedDict())
+
+
+def _bump_mtime(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestTreeSnapshot:
+    def test_unchanged_directory_reuses_listing(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("x")
+        snapshot = snap_mod.get_tree_snapshot(tmp_path)
+
+        first = snapshot.listdir(tmp_path)
+
+        assert first is not None
+        assert snapshot.listdir(tmp_path) is first
+        assert [e.name for e in first.entries] == ["a.py"]
+
+    def test_mtime_change_relists_directory(self, tmp_path: Path) -> None:
+        snapshot = snap_mod.get_tree_snapshot(tmp_path)
+        first = snapshot.listdir(tmp_path)
+
+        (tmp_path / "b.py").write_text("x")
+        _bump_mtime(tmp_path)
+        second = snapshot.listdir(tmp_path)
+
+        assert second is not first
+        assert second is not None
+        assert [e.name for e in second.entries] == ["b.py"]
+
+    def test_racy_listing_is_not_trusted(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("relace_mcp.utils.RACY_WINDOW_NS", 10**18)
+        snapshot = snap_mod.get_tree_snapshot(tmp_path)
+        first = snapshot.listdir(tmp_path)
+
+        assert snapshot.listdir(tmp_path) is not first
+
+    def test_gitignore_change_updates_verdicts(self, tmp_path: Path) -> None:
+        (tmp_path / "keep.py").write_text("x")
+        (tmp_path / "gen.py").write_text("x")
+        snapshot = snap_mod.get_tree_snapshot(tmp_path)
+        listing = snapshot.listdir(tmp_path)
+        assert listing is not None
+        assert not listing.is_ignored("gen.py", False)
+
+        (tmp_path / ".gitignore").write_text("gen.py\n")
+        listing = snapshot.listdir(tmp_path)
+
+        assert listing is not None
+        assert listing.is_ignored("gen.py", False)
+        assert not listing.is_ignored("keep.py", False)
+
+    def test_git_index_change_invalidates_all_listings(self, tmp_path: Path) -> None:
+        (tmp_path / ".git").mkdir()
+        index_file = tmp_path / ".git" / "index"
+        index_file.write_bytes(b"v1")
+        snapshot = snap_mod.get_tree_snapshot(tmp_path)
+        first = snapshot.listdir(tmp_path)
+
+        index_file.write_bytes(b"v2-longer")
+        snapshot = snap_mod.get_tree_snapshot(tmp_path)
+
+        assert snapshot.listdir(tmp_path) is not first
+
+    def test_snapshots_are_bounded(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(snap_mod, "MAX_TREE_SNAPSHOTS", 2)
+        for name in ("a", "b", "c"):
+            (tmp_path / name).mkdir()
+            snap_mod.get_tree_snapshot(tmp_path / name)
+
+        assert list(snap_mod._SNAPSHOTS) == [str((tmp_path / n).resolve()) for n in ("b", "c")]
+
+
+class TestSharedAcrossTools:
+    def test_glob_and_view_directory_share_listings(self, tmp_path: Path) -> None:
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "main.py").write_text("x")
+
+        assert glob_handler("**/*.py", ".", False, 10, str(tmp_path)) == "src/main.py"
+        snapshot = snap_mod.get_tree_snapshot(tmp_path)
+        cached = snapshot.listdir(tmp_path / "src")
+
+        assert "src/main.py" in view_directory_handler(".", False, str(tmp_path))
+        assert snapshot.listdir(tmp_path / "src") is cached
+
+    def test_new_file_visible_after_directory_change(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("x")
+        assert glob_handler("*.py", ".", False, 10, str(tmp_path)) == "a.py"
+
+        (tmp_path / "b.py").write_text("x")
+        _bump_mtime(tmp_path)
+
+        assert glob_handler("*.py", ".", False, 10, str(tmp_path)) == "a.py\nb.py"
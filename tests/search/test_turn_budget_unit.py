@@ -0,0 +1,59 @@
+import json
+
+from relace_mcp.search.harness.budget import TurnBudget
+
+
+def _call(name: str, **args: object) -> dict:
+    return {"id": "c", "function": {"name": name, "arguments": json.dumps(args)}}
+
+
+class TestTurnBudget:
+    def test_disabled_never_nudges_or_stops(self) -> None:
+        budget = TurnBudget(0)
+        for _ in range(5):
+            budget.record_turn([], {})
+        assert not budget.enabled
+        assert not budget.should_nudge()
+        assert not budget.should_stop(5)
+
+    def test_new_files_and_lines_reset_stall(self) -> None:
+        budget = TurnBudget(2)
+        first = budget.record_turn([_call("view_file", path="a.py")], {"/a.py": [[1, 10]]})
+        assert first == {"new_files": 1, "new_lines": 10, "repeated_calls": 0, "stalled_turns": 0}
+
+        widened = budget.record_turn(
+            [_call("view_file", path="a.py", view_range=[5, 20])], {"/a.py": [[1, 10], [5, 20]]}
+        )
+        assert widened["new_files"] == 0
+        assert widened["new_lines"] == 10
+        assert widened["stalled_turns"] == 0
+        assert not budget.should_nudge()
+
+    def test_repeated_calls_counted_regardless_of_argument_order(self) -> None:
+        budget = TurnBudget(2)
+        observed = {"/a.py": [[1, 10]]}
+        budget.record_turn([_call("grep_search", query="x", include_pattern="*.py")], observed)
+        stats = budget.record_turn(
+            [
+                {
+                    "id": "c2",
+                    "function": {
+                        "name": "grep_search",
+                        "arguments": '{"include_pattern": "*.py", "query": "x"}',
+                    },
+                }
+            ],
+            observed,
+        )
+        assert stats["repeated_calls"] == 1
+        assert stats["stalled_turns"] == 1
+        assert budget.should_nudge()
+
+    def test_stop_requires_minimum_turns(self) -> None:
+        budget = TurnBudget(1)
+        budget.record_turn([], {})
+        assert budget.stalled == 1
+        assert not budget.should_stop(1)
+        budget.record_turn([], {})
+        budget.record_turn([], {})
+        assert budget.should_stop(3)
@@ -300,3 +300,17 @@ class TestMain:
             main()
 
         assert exc_info.value.code == 2  # argparse error exit code
+
+
+class TestServerShutdown:
+    @pytest.mark.asyncio
+    async def test_lifespan_closes_client_pools(self, mock_config: RelaceConfig) -> None:
+        """Should close pooled HTTP clients when the server shuts down."""
+        with patch(
+            "relace_mcp.tools._clients.ToolClients.aclose", new_callable=AsyncMock
+        ) as aclose:
+            server = build_server(config=mock_config)
+            async with Client(server):
+                aclose.assert_not_awaited()
+
+        aclose.assert_awaited_once()